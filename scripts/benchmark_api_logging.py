@@ -0,0 +1,144 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Benchmarks the overhead that API logging adds to each boto call.
+
+The botocore before-call and after-call event hooks are invoked directly with UpdateWorkerSchedule
+requests and responses for a worker running a number of sessions, and the API log is written to
+os.devnull. Heartbeats repeat the previous request and response, while updates change the progress
+of every session action or the assigned session actions. The overhead of each hook is reported in
+microseconds per call.
+
+Usage:
+
+    python scripts/benchmark_api_logging.py --sessions 4 --calls 20000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from types import SimpleNamespace
+from typing import Any, Callable
+import json
+import logging
+import os
+import time
+
+from deadline_worker_agent.session_events import log_after_call, log_before_call
+
+_URL = (
+    "https://scheduling.deadline.us-west-2.amazonaws.com/2023-10-12/farms/"
+    "farm-0123456789abcdef0123456789abcdef/fleets/fleet-0123456789abcdef0123456789abcdef/"
+    "workers/worker-0123456789abcdef0123456789abcdef/schedule"
+)
+
+
+def _request(sessions: int, progress: int) -> dict[str, Any]:
+    body = {
+        "updatedSessionActions": (
+            {
+                f"sessionaction-{session:032x}-{progress % 2}": {
+                    "startedAt": "2024-03-17T19:08:19.000000Z",
+                    "updatedAt": "2024-03-17T19:08:29.000000Z",
+                    "progressPercent": float(progress % 100),
+                    "progressMessage": f"Rendering frame {progress}",
+                }
+                for session in range(sessions)
+            }
+            if progress
+            else {}
+        )
+    }
+    return {
+        "url_path": _URL.split(".com", 1)[1],
+        "body": json.dumps(body).encode(),
+        "url": _URL,
+    }
+
+
+def _response(sessions: int, first_action: int = 0) -> dict[str, Any]:
+    return {
+        "ResponseMetadata": {"RequestId": "9885082b-3d0a-40f3", "HTTPStatusCode": 200},
+        "assignedSessions": {
+            f"session-{session:032x}": {
+                "queueId": "queue-0123456789abcdef0123456789abcdef",
+                "jobId": "job-0123456789abcdef0123456789abcdef",
+                "sessionActions": [
+                    {
+                        "sessionActionId": f"sessionaction-{session:032x}-{action}",
+                        "definition": {
+                            "taskRun": {
+                                "taskId": f"task-{action}",
+                                "stepId": "step-0123456789abcdef0123456789abcdef",
+                                "parameters": {"Frame": {"int": str(action)}},
+                            }
+                        },
+                    }
+                    for action in range(first_action, first_action + 10)
+                ],
+                "logConfiguration": {
+                    "logDriver": "awslogs",
+                    "options": {"logGroupName": "/aws/deadline/farm/queue", "logStreamName": "s"},
+                    "parameters": {"interval": "15"},
+                },
+            }
+            for session in range(sessions)
+        },
+        "cancelSessionActions": {},
+        "updateIntervalSeconds": 15,
+    }
+
+
+def _http_response(parsed: dict[str, Any]) -> SimpleNamespace:
+    """Returns a stand-in for the botocore HTTP response that the response was parsed from"""
+    body = {k: v for k, v in parsed.items() if k != "ResponseMetadata"}
+    return SimpleNamespace(content=json.dumps(body).encode())
+
+
+def _measure(calls: int, hook: Callable[[int], None]) -> float:
+    """Returns the mean microseconds per call of the hook"""
+    start = time.perf_counter()
+    for i in range(calls):
+        hook(i)
+    return (time.perf_counter() - start) / calls * 1_000_000
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="Number of assigned sessions")
+    parser.add_argument("--calls", type=int, default=20_000, help="Number of calls per case")
+    args = parser.parse_args()
+
+    handler = logging.FileHandler(os.devnull)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    api_logger = logging.getLogger("deadline_worker_agent")
+    api_logger.addHandler(handler)
+    api_logger.setLevel(logging.INFO)
+    api_logger.propagate = False
+
+    heartbeat = _request(args.sessions, 0)
+    updates = [_request(args.sessions, progress) for progress in range(1, 101)]
+    response = _response(args.sessions)
+    http_response = _http_response(response)
+    responses = [_response(args.sessions, first_action) for first_action in range(100)]
+    http_responses = [_http_response(parsed) for parsed in responses]
+    event_before = "before-call.deadline.UpdateWorkerSchedule"
+    event_after = "after-call.deadline.UpdateWorkerSchedule"
+
+    cases = {
+        "request (heartbeat)": lambda i: log_before_call(event_before, heartbeat),
+        "request (update)": lambda i: log_before_call(event_before, updates[i % len(updates)]),
+        "response (repeated)": lambda i: log_after_call(
+            event_after, response, http_response=http_response
+        ),
+        "response (update)": lambda i: log_after_call(
+            event_after,
+            responses[i % len(responses)],
+            http_response=http_responses[i % len(responses)],
+        ),
+    }
+    for name, hook in cases.items():
+        print(f"{name:<20} {_measure(args.calls, hook):>8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
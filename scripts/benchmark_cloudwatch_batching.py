@@ -0,0 +1,115 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Benchmarks the CPU cost of preparing session log lines for CloudWatch Logs.
+
+Log records of mixed lengths are emitted through a CloudWatchHandler and then collected into
+PutLogEvents batches, without uploading them. The throughput of each stage is reported in events
+per second.
+
+Usage:
+
+    python scripts/benchmark_cloudwatch_batching.py --lines 1000000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from logging import INFO, Formatter, LogRecord
+from unittest.mock import MagicMock
+import random
+import time
+
+from deadline_worker_agent.log_sync.cloudwatch import CloudWatchHandler, CloudWatchLogStreamThread
+
+
+def _make_messages(count: int, seed: int) -> list[str]:
+    """Returns log lines with a length distribution typical of render logs: mostly short lines,
+    some long lines and stack traces, a few non-ASCII lines, and rare lines over the max event
+    size that must be split."""
+    rng = random.Random(seed)
+    messages = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.90:
+            message = f"Rendering frame {i}: tile {rng.randrange(256)} " + "x" * rng.randrange(160)
+        elif kind < 0.98:
+            message = "Traceback line " + "y" * rng.randrange(200, 4000)
+        elif kind < 0.99999:
+            message = "Chargement de la scène " + "é" * rng.randrange(100)
+        else:
+            message = "z" * 300_000
+        messages.append(message)
+    return messages
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Number of log lines")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the line lengths")
+    parser.add_argument(
+        "--packing-window-ms",
+        type=int,
+        default=None,
+        help="Pack lines emitted within this window into one event (lines are 0.1ms apart)",
+    )
+    args = parser.parse_args()
+
+    messages = _make_messages(args.lines, args.seed)
+    start_time = time.time()
+    records = [
+        LogRecord(
+            name="benchmark",
+            level=INFO,
+            pathname=__file__,
+            lineno=1,
+            msg=message,
+            args=None,
+            exc_info=None,
+        )
+        for message in messages
+    ]
+    for i, record in enumerate(records):
+        record.created = start_time + i / 10_000
+
+    handler = CloudWatchHandler(
+        logs_client=MagicMock(),
+        log_group_name="benchmark",
+        log_stream_name="benchmark",
+        packing_window_ms=args.packing_window_ms,
+    )
+    handler.setFormatter(Formatter("%(message)s"))
+    # Stop the handler's upload thread so that the batches can be collected below
+    handler._stop_event.set()
+    handler._log_stream_thread.join()
+
+    emit_start = time.perf_counter()
+    for record in records:
+        handler.emit(record)
+    emit_seconds = time.perf_counter() - emit_start
+
+    stream_thread = CloudWatchLogStreamThread(
+        logs_client=MagicMock(),
+        log_event_queue=handler._log_event_queue,
+        log_group_name="benchmark",
+        log_stream_name="benchmark",
+        stop_event=handler._stop_event,
+        packing_window_ms=args.packing_window_ms,
+    )
+    batches = 0
+    events = 0
+    collect_start = time.perf_counter()
+    while log_events := stream_thread._collect_logs():
+        batches += 1
+        events += len(log_events)
+    collect_seconds = time.perf_counter() - collect_start
+
+    print(f"lines:   {args.lines:>12,}")
+    print(f"events:  {events:>12,} in {batches:,} batches")
+    print(f"emit:    {args.lines / emit_seconds:>12,.0f} events/s ({emit_seconds:.2f}s)")
+    print(f"collect: {events / collect_seconds:>12,.0f} events/s ({collect_seconds:.2f}s)")
+    total_seconds = emit_seconds + collect_seconds
+    print(f"total:   {args.lines / total_seconds:>12,.0f} events/s ({total_seconds:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
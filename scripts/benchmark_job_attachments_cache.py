@@ -0,0 +1,104 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Benchmarks syncing Job Attachments inputs for consecutive sessions with the worker-wide
+Job Attachments content cache.
+
+The S3 download is simulated by writing the files at a configurable transfer rate so that the
+benchmark runs without AWS resources. The first session populates the cache; later sessions
+materialize their inputs from it.
+
+Usage:
+
+    python scripts/benchmark_job_attachments_cache.py --files 200 --file-size-mb 5 --rate-mbps 100
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+import time
+
+from deadline.job_attachments.asset_manifests import BaseAssetManifest
+from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+from deadline.job_attachments.asset_sync import AssetSync
+from deadline.job_attachments.models import JobAttachmentS3Settings
+from deadline.job_attachments.progress_tracker import SummaryStatistics
+
+from deadline_worker_agent.job_attachments import CachingAssetSync, JobAttachmentsContentCache
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="Number of input files")
+    parser.add_argument("--file-size-mb", type=float, default=5, help="Size of each input file")
+    parser.add_argument(
+        "--rate-mbps", type=float, default=100, help="Simulated S3 transfer rate in MB/s"
+    )
+    parser.add_argument("--sessions", type=int, default=3, help="Number of consecutive sessions")
+    parser.add_argument(
+        "--dir", type=Path, default=None, help="Directory to run in (defaults to a temp dir)"
+    )
+    args = parser.parse_args()
+
+    file_size = int(args.file_size_mb * 1_000_000)
+    manifest = AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPath(path=f"inputs/file{i}.bin", hash=f"{i:032x}", size=file_size, mtime=0)
+            for i in range(args.files)
+        ],
+        total_size=file_size * args.files,
+    )
+    chunk = b"\0" * min(file_size, 1_000_000)
+
+    def simulated_download(
+        *, merged_manifests_by_root: dict[str, BaseAssetManifest], **kwargs
+    ) -> SummaryStatistics:
+        stats = SummaryStatistics()
+        for root, root_manifest in merged_manifests_by_root.items():
+            for manifest_path in root_manifest.paths:
+                destination = Path(root, manifest_path.path)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                with destination.open("wb") as f:
+                    remaining = manifest_path.size  # type: ignore[attr-defined]
+                    while remaining > 0:
+                        remaining -= f.write(chunk[:remaining])
+                stats.processed_files += 1
+                stats.processed_bytes += manifest_path.size  # type: ignore[attr-defined]
+        time.sleep(stats.processed_bytes / (args.rate_mbps * 1_000_000))
+        return stats
+
+    with TemporaryDirectory(dir=args.dir) as tmpdir:
+        cache = JobAttachmentsContentCache(
+            root_dir=Path(tmpdir, "cache"), max_size_bytes=2 * manifest.totalSize
+        )
+        asset_sync = CachingAssetSync(
+            content_cache=cache, farm_id="farm-benchmark", boto3_session=MagicMock()
+        )
+        s3_settings = JobAttachmentS3Settings(s3BucketName="bucket", rootPrefix="root")
+
+        print(
+            f"Syncing {args.files} files x {args.file_size_mb} MB per session, "
+            f"simulated transfer rate {args.rate_mbps} MB/s"
+        )
+        with patch.object(AssetSync, "copied_download", side_effect=simulated_download):
+            for session in range(1, args.sessions + 1):
+                session_dir = Path(tmpdir, f"session{session}")
+                start = time.perf_counter()
+                stats = asset_sync.copied_download(
+                    s3_settings=s3_settings,
+                    session_dir=session_dir,
+                    merged_manifests_by_root={str(session_dir / "assetroot"): manifest},
+                )
+                elapsed = time.perf_counter() - start
+                print(
+                    f"Session {session}: {elapsed:.3f}s "
+                    f"(downloaded {stats.processed_files}, from cache {stats.skipped_files})"
+                )
+
+
+if __name__ == "__main__":
+    main()
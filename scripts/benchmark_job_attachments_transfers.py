@@ -0,0 +1,178 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Benchmarks concurrent Job Attachments input syncs with the library's fixed transfer concurrency
+and with the worker-wide transfer governor.
+
+S3 is replaced by a local stand-in: each request waits for a fixed latency before its first byte,
+then shares a simulated network link with the other requests in flight, each request being limited
+to a per-connection rate. The stand-in also serves as the host's network counters, so the
+governor sees the link saturate as it would on a real host. The benchmark runs without AWS
+resources.
+
+Usage:
+
+    python scripts/benchmark_job_attachments_transfers.py --sessions 4 --files 400 --file-size-mb 1
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from threading import Lock
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+import time
+
+import deadline.job_attachments.download as download_mod
+from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+from deadline.job_attachments.models import JobAttachmentS3Settings
+from deadline.job_attachments.progress_tracker import ProgressTracker
+
+from deadline_worker_agent.job_attachments import CachingAssetSync, JobAttachmentsTransferGovernor
+import deadline_worker_agent.job_attachments.transfer_governor as governor_mod
+
+_CHUNK_BYTES = 256 * 1024
+
+
+class SimulatedS3:
+    """A stand-in for S3 behind a network link of limited bandwidth"""
+
+    def __init__(self, *, bandwidth: float, connection_rate: float, latency: float) -> None:
+        self._bandwidth = bandwidth
+        self._connection_rate = connection_rate
+        self._latency = latency
+        self._lock = Lock()
+        self._in_flight = 0
+        self.transferred_bytes = 0
+
+    def download_file(
+        self,
+        file: ManifestPath,
+        hash_algorithm: HashAlgorithm,
+        local_download_dir: str,
+        s3_bucket: str,
+        cas_prefix: Optional[str],
+        s3_client: Any = None,
+        session: Any = None,
+        modified_time_override: Optional[float] = None,
+        progress_tracker: Optional[ProgressTracker] = None,
+        *args: Any,
+    ) -> tuple[int, Optional[Path]]:
+        # Follows the signature of the library's download_file()
+        time.sleep(self._latency)
+        with self._lock:
+            self._in_flight += 1
+        try:
+            remaining = file.size  # type: ignore[attr-defined]
+            while remaining > 0:
+                chunk = min(_CHUNK_BYTES, remaining)
+                with self._lock:
+                    rate = min(self._connection_rate, self._bandwidth / self._in_flight)
+                time.sleep(chunk / rate)
+                with self._lock:
+                    self.transferred_bytes += chunk
+                remaining -= chunk
+                if progress_tracker is not None:
+                    progress_tracker.track_progress_callback(chunk)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        destination = Path(local_download_dir, file.path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with destination.open("wb") as f:
+            f.truncate(file.size)  # type: ignore[attr-defined]
+        return file.size, destination  # type: ignore[attr-defined]
+
+    def net_io_counters(self) -> MagicMock:
+        with self._lock:
+            return MagicMock(bytes_sent=0, bytes_recv=self.transferred_bytes)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="Number of concurrent sessions")
+    parser.add_argument("--files", type=int, default=400, help="Number of input files per session")
+    parser.add_argument("--file-size-mb", type=float, default=1, help="Size of each input file")
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=400, help="Simulated link bandwidth in MB/s"
+    )
+    parser.add_argument(
+        "--connection-mbps", type=float, default=8, help="Simulated per-request rate in MB/s"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=30, help="Simulated latency of each request"
+    )
+    parser.add_argument(
+        "--adjust-interval", type=float, default=1.0, help="Governor adjustment interval (s)"
+    )
+    parser.add_argument(
+        "--dir", type=Path, default=None, help="Directory to run in (defaults to a temp dir)"
+    )
+    args = parser.parse_args()
+
+    file_size = int(args.file_size_mb * 1_000_000)
+    manifest = AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPath(path=f"inputs/file{i}.bin", hash=f"{i:032x}", size=file_size, mtime=0)
+            for i in range(args.files)
+        ],
+        total_size=file_size * args.files,
+    )
+    s3_settings = JobAttachmentS3Settings(s3BucketName="bucket", rootPrefix="root")
+    total_bytes = file_size * args.files * args.sessions
+
+    print(
+        f"Syncing {args.files} files x {args.file_size_mb} MB in each of {args.sessions}"
+        f" concurrent sessions over a simulated {args.bandwidth_mbps} MB/s link"
+        f" ({args.connection_mbps} MB/s per request, {args.latency_ms} ms latency)"
+    )
+
+    for governed in (False, True):
+        s3 = SimulatedS3(
+            bandwidth=args.bandwidth_mbps * 1_000_000,
+            connection_rate=args.connection_mbps * 1_000_000,
+            latency=args.latency_ms / 1000,
+        )
+        governor = (
+            JobAttachmentsTransferGovernor(
+                link_speed_bytes_per_second=args.bandwidth_mbps * 1_000_000
+            )
+            if governed
+            else None
+        )
+        with (
+            TemporaryDirectory(dir=args.dir) as tmpdir,
+            patch.object(download_mod, "get_s3_client"),
+            patch.object(download_mod, "download_file", side_effect=s3.download_file),
+            patch.object(governor_mod.psutil, "net_io_counters", side_effect=s3.net_io_counters),
+            patch.object(governor_mod, "_ADJUST_INTERVAL_SECONDS", args.adjust_interval),
+        ):
+
+            def sync(session: int) -> None:
+                session_dir = Path(tmpdir, f"session{session}")
+                CachingAssetSync(
+                    farm_id="farm-benchmark",
+                    boto3_session=MagicMock(),
+                    transfer_governor=governor,
+                ).copied_download(
+                    s3_settings=s3_settings,
+                    session_dir=session_dir,
+                    merged_manifests_by_root={str(session_dir / "assetroot"): manifest},
+                )
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+                list(executor.map(sync, range(args.sessions)))
+            elapsed = time.perf_counter() - start
+
+        label = "Governed concurrency" if governed else "Library concurrency"
+        limit = f", final limit {governor.limit} streams" if governor is not None else ""
+        print(f"{label}: {elapsed:.2f}s ({total_bytes / elapsed / 1_000_000:.1f} MB/s{limit})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Benchmarks the memory held per log line and per session action update while they are pending.
+
+Each case holds a number of items and reports the bytes that tracemalloc attributes to each of
+them:
+
+- log event: a SessionActionLogEvent, as created for each line of the Worker Agent's log
+- queued log line: a formatted line in the queue of a CloudWatchHandler
+- partitioned log line: the same line once it has been prepared for a PutLogEvents batch
+- pending action update: a SessionActionStatus that the scheduler holds until it is sent in an
+  UpdateWorkerSchedule request
+
+The message strings and IDs are created before measuring, so only the cost of the representation
+of each item is reported.
+
+Usage:
+
+    python scripts/benchmark_memory.py --items 100000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable
+import gc
+import time
+import tracemalloc
+
+from openjd.sessions import ActionState, ActionStatus
+
+from deadline_worker_agent.log_messages import (
+    SessionActionLogEvent,
+    SessionActionLogEventSubtype,
+    SessionActionLogKind,
+)
+from deadline_worker_agent.log_sync.cloudwatch import (
+    CloudWatchLogEventPartitioner,
+    FormattedLogEntry,
+    _utf8_size,
+)
+from deadline_worker_agent.scheduler.session_action_status import SessionActionStatus
+
+
+def _bytes_per_item(create: Callable[[int], Any], items: int) -> float:
+    """Returns the bytes that are allocated per item to hold the items that create returns"""
+    held: list[Any] = [None] * items
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(items):
+            held[i] = create(i)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / items
+
+
+def _report(name: str, bytes_per_item: float) -> None:
+    print(f"{name:<24} {bytes_per_item:>8.1f} bytes")
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="Number of items per case")
+    args = parser.parse_args()
+
+    items: int = args.items
+    messages = [f"Rendering frame {i}: tile {i % 256}" for i in range(items)]
+    action_ids = [f"sessionaction-{i:032x}-0" for i in range(items)]
+    start_ms = int(time.time() * 1000)
+
+    _report(
+        "log event",
+        _bytes_per_item(
+            lambda i: SessionActionLogEvent(
+                subtype=SessionActionLogEventSubtype.START,
+                queue_id="queue-0123456789abcdef0123456789abcdef",
+                job_id="job-0123456789abcdef0123456789abcdef",
+                session_id="session-0123456789abcdef0123456789abcdef",
+                action_log_kind=SessionActionLogKind.TASK_RUN,
+                action_id=action_ids[i],
+                message=messages[i],
+            ),
+            items,
+        ),
+    )
+
+    # A line is queued by CloudWatchHandler.emit()
+    queue: deque[FormattedLogEntry] = deque()
+    _report(
+        "queued log line",
+        _bytes_per_item(
+            lambda i: queue.append(
+                FormattedLogEntry(
+                    timestamp=start_ms + i, message=messages[i], size=_utf8_size(messages[i])
+                )
+            ),
+            items,
+        ),
+    )
+
+    # The queued lines are kept alive, so that only the partitioned lines are measured
+    queued_lines = list(queue)
+    partitioner = CloudWatchLogEventPartitioner(raw_deque=queue)
+    _report("partitioned log line", _bytes_per_item(lambda i: partitioner.next(), items))
+    del queued_lines
+
+    # Updates are held in a dict by their action ID, as in WorkerScheduler._action_updates_map
+    pending_updates: dict[str, SessionActionStatus] = {}
+    start_time = datetime.now(tz=timezone.utc)
+
+    def _update(i: int) -> None:
+        pending_updates[action_ids[i]] = SessionActionStatus(
+            id=action_ids[i],
+            update_time=datetime.now(tz=timezone.utc),
+            start_time=start_time,
+            status=ActionStatus(state=ActionState.RUNNING, progress=50.0),
+        )
+
+    _report("pending action update", _bytes_per_item(_update, items))
+
+
+if __name__ == "__main__":
+    main()
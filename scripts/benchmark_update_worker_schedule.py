@@ -0,0 +1,144 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Benchmarks the CPU cost of processing UpdateWorkerSchedule responses for existing Sessions.
+
+A response assigning thousands of queued actions to long-running Sessions is processed repeatedly
+as the scheduler does on every heartbeat, each cycle with a fresh copy of it as boto3 would return: it is mapped by the DeadlineClient and the
+assigned actions are given to each Session's action queue. Each cycle is timed once with all
+Sessions processed in full, and once with unchanged Sessions skipped. The mean time per cycle is
+reported in milliseconds.
+
+Usage:
+
+    python scripts/benchmark_update_worker_schedule.py --sessions 4 --actions 5000 --cycles 50
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from copy import deepcopy
+from pathlib import Path
+from statistics import mean
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+import logging
+import time
+
+from deadline_worker_agent.boto.shim import DeadlineClient
+from deadline_worker_agent.scheduler.scheduler import WorkerScheduler
+from deadline_worker_agent.scheduler.session_queue import SessionActionQueue
+from deadline_worker_agent.startup.config import JobsRunAsUserOverride
+
+
+def _raw_response(sessions: int, actions: int) -> dict[str, Any]:
+    """Returns an UpdateWorkerSchedule response as returned by boto3"""
+    assigned_sessions = {}
+    for s in range(sessions):
+        session_id = f"session-{s:032x}"
+        session_actions = [
+            {
+                "sessionActionId": f"sessionaction-{s:032x}-0",
+                "definition": {"envEnter": {"environmentId": "JOB:env"}},
+            }
+        ]
+        session_actions.extend(
+            {
+                "sessionActionId": f"sessionaction-{s:032x}-{a}",
+                "definition": {
+                    "taskRun": {
+                        "stepId": f"step-{s:032x}",
+                        "taskId": f"task-{s:032x}-{a}",
+                        "parameters": {"Frame": {"int": str(a)}},
+                    }
+                },
+            }
+            for a in range(1, actions + 1)
+        )
+        assigned_sessions[session_id] = {
+            "queueId": "queue-0123456789abcdef0123456789abcdef",
+            "jobId": f"job-{s:032x}",
+            "sessionActions": session_actions,
+        }
+    return {
+        "assignedSessions": assigned_sessions,
+        "cancelSessionActions": {},
+        "updateIntervalSeconds": 15,
+    }
+
+
+def _scheduler(raw_response: dict[str, Any]) -> WorkerScheduler:
+    """Returns a scheduler with a running Session for each of the Sessions in the response"""
+    scheduler = WorkerScheduler(
+        farm_id="farm-1",
+        fleet_id="fleet-1",
+        worker_id="worker-1",
+        deadline=MagicMock(),
+        job_run_as_user_override=JobsRunAsUserOverride(run_as_agent=True),
+        boto_session=MagicMock(),
+        cleanup_session_user_processes=False,
+        worker_persistence_dir=Path("."),
+        worker_logs_dir=None,
+    )
+    sessions: dict[str, Any] = {}
+    for session_id in raw_response["assignedSessions"]:
+        queue = SessionActionQueue(
+            queue_id="queue-1",
+            job_id="job-1",
+            session_id=session_id,
+            job_entities=MagicMock(),
+            action_update_callback=lambda status: None,
+        )
+        future = MagicMock()
+        future.exception.side_effect = FutureTimeoutError()
+        sessions[session_id] = SimpleNamespace(
+            future=future,
+            session=SimpleNamespace(
+                replace_assigned_actions=queue.replace, cancel_actions=lambda action_ids: None
+            ),
+        )
+    scheduler._sessions = sessions  # type: ignore[assignment]
+    return scheduler
+
+
+def _measure(raw_response: dict[str, Any], cycles: int, incremental: bool) -> list[float]:
+    """Returns the milliseconds that each cycle took"""
+    client = DeadlineClient(MagicMock())
+    scheduler = _scheduler(raw_response)
+    durations = []
+    # The first cycle queues the actions
+    for _ in range(cycles + 1):
+        if not incremental:
+            client._mapped_session_actions.clear()
+            scheduler._assigned_action_ids.clear()
+        cycle_response = deepcopy(raw_response)
+        start = time.perf_counter()
+        response = DeadlineClient._parse_update_worker_schedule_response(
+            cycle_response, mapped_session_actions=client._mapped_session_actions
+        )
+        scheduler._update_session_actions_from_scheduler(
+            assigned_sessions=response["assignedSessions"],
+            canceled_session_action=response["cancelSessionActions"],
+        )
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations[1:]
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="Number of assigned Sessions")
+    parser.add_argument("--actions", type=int, default=5000, help="Queued actions per Session")
+    parser.add_argument("--cycles", type=int, default=50, help="Number of responses processed")
+    args = parser.parse_args()
+
+    # The action queues log each action that they process at debug level
+    logging.disable(logging.INFO)
+    raw_response = _raw_response(args.sessions, args.actions)
+    for name, incremental in (("full", False), ("incremental", True)):
+        durations = _measure(raw_response, args.cycles, incremental)
+        print(f"{name:<12} {mean(durations):>8.2f} ms per cycle")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ from ..._version import __version__ as version  # noqa
 from ...startup.config import Configuration
 from ...startup.capabilities import Capabilities
 from ...boto import DeadlineClient, NoOverflowExponentialBackoff as Backoff
+from .rate_limiter import DeadlineRateLimiter, DeadlineRequestPriority
 from ...api_models import (
     AssumeFleetRoleForWorkerResponse,
     AssumeQueueRoleForWorkerResponse,
@@ -151,6 +152,27 @@ def _get_resource_id_and_status_from_conflictexception_header(
     return resourceId, context.get("status")
 
 
+_rate_limiter = DeadlineRateLimiter()
+"""Limits the rate of the Deadline API requests of every thread in the Worker"""
+
+
+def get_deadline_rate_limiter() -> DeadlineRateLimiter:
+    """Returns the rate limiter that is shared by all of the Worker's Deadline API requests"""
+    return _rate_limiter
+
+
+def _acquire_request(
+    priority: DeadlineRequestPriority, interrupt_event: Optional[Event] = None
+) -> None:
+    """Waits until the shared rate limiter allows a Deadline API request to be sent.
+
+    Raises:
+        DeadlineRequestInterrupted - If the given interrupt_event was set while waiting.
+    """
+    if not _rate_limiter.acquire(priority, interrupt_event=interrupt_event):
+        raise DeadlineRequestInterrupted("Deadline API request interrupted")
+
+
 def assume_fleet_role_for_worker(
     *, deadline_client: DeadlineClient, farm_id: str, fleet_id: str, worker_id: str
 ) -> AssumeFleetRoleForWorkerResponse:
@@ -163,12 +185,14 @@ def assume_fleet_role_for_worker(
     # Note: Frozen credentials could expire while doing a retry loop; that's
     #  probably going to manifest as AccessDenied, but I'm not 100% certain.
     while True:
+        _acquire_request(DeadlineRequestPriority.CREDENTIALS)
         try:
             response = deadline_client.assume_fleet_role_for_worker(
                 farmId=farm_id,
                 fleetId=fleet_id,
                 workerId=worker_id,
             )
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             # Terminal errors:
@@ -183,6 +207,7 @@ def assume_fleet_role_for_worker(
             )
             code = _get_error_code_from_header(e.response)
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(
                     f"Throttled while attempting to refresh Worker AWS Credentials. Retrying in {delay} seconds..."
                 )
@@ -247,10 +272,12 @@ def assume_queue_role_for_worker(
     while True:
         if interrupt_event and interrupt_event.is_set():
             raise DeadlineRequestInterrupted("AssumeQueueRoleForWorker interrupted")
+        _acquire_request(DeadlineRequestPriority.CREDENTIALS, interrupt_event)
         try:
             response = deadline_client.assume_queue_role_for_worker(
                 farmId=farm_id, fleetId=fleet_id, workerId=worker_id, queueId=queue_id
             )
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             # Terminal errors:
@@ -265,6 +292,7 @@ def assume_queue_role_for_worker(
             )
             code = _get_error_code_from_header(e.response)
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(
                     f"Throttled while attempting to refresh Worker AWS Credentials. Retrying in {delay} seconds..."
                 )
@@ -350,10 +378,12 @@ def batch_get_job_entity(
     # Note: Frozen credentials could expire while doing a retry loop; that's
     #  probably going to manifest as AccessDenied, but I'm not 100% certain.
     while True:
+        _acquire_request(DeadlineRequestPriority.JOB_ENTITIES)
         try:
             response = deadline_client.batch_get_job_entity(
                 farmId=farm_id, fleetId=fleet_id, workerId=worker_id, identifiers=identifiers
             )
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             # Terminal errors:
@@ -366,6 +396,7 @@ def batch_get_job_entity(
             )
             code = _get_error_code_from_header(e.response)
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(f"Throttled calling BatchGetJobEntity. Retrying in {delay} seconds...")
             elif code == "InternalServerException":
                 _logger.info(
@@ -399,12 +430,14 @@ def create_worker(
     backoff = Backoff(max_backoff=30)
     retry = 0
     while True:
+        _acquire_request(DeadlineRequestPriority.WORKER_STATUS)
         try:
             response = deadline_client.create_worker(
                 farmId=config.farm_id,
                 fleetId=config.fleet_id,
                 hostProperties=host_properties,
             )
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             delay = backoff.delay_amount(RetryContext(retry))
@@ -413,6 +446,7 @@ def create_worker(
             )
             code = _get_error_code_from_header(e.response)
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(f"CreateWorker throttled. Retrying in {delay} seconds...")
             elif code == "InternalServerException":
                 _logger.warning(
@@ -471,10 +505,12 @@ def delete_worker(
     retry = 0
 
     while True:
+        _acquire_request(DeadlineRequestPriority.WORKER_STATUS)
         try:
             deadline_client.delete_worker(
                 farmId=config.farm_id, fleetId=config.fleet_id, workerId=worker_id
             )
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             delay = backoff.delay_amount(RetryContext(retry))
@@ -483,6 +519,7 @@ def delete_worker(
             )
             code = _get_error_code_from_header(e.response)
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(f"DeleteWorker throttled. Retrying in {delay} seconds...")
             elif code == "InternalServerException":
                 _logger.warning(
@@ -562,8 +599,10 @@ def update_worker(
 
         if interrupt_event and interrupt_event.is_set():
             raise DeadlineRequestInterrupted("UpdateWorker interrupted")
+        _acquire_request(DeadlineRequestPriority.WORKER_STATUS, interrupt_event)
         try:
             response = deadline_client.update_worker(**request)
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             delay = backoff.delay_amount(RetryContext(retry))
@@ -575,6 +614,7 @@ def update_worker(
             skip_sleep = False
 
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(f"UpdateWorker throttled. Retrying in {delay} seconds...")
             elif code == "InternalServerException":
                 _logger.warning(
@@ -733,9 +773,11 @@ def update_worker_schedule(
     while True:
         if interrupt_event is not None and interrupt_event.is_set():
             raise DeadlineRequestInterrupted("UpdateWorkerSchedule interrupted")
+        _acquire_request(DeadlineRequestPriority.WORKER_STATUS, interrupt_event)
         try:
             response = deadline_client.update_worker_schedule(**request)
             _logger.debug("UpdateWorkerSchedule response: %s", response)
+            _rate_limiter.on_success()
             break
         except ClientError as e:
             delay = backoff.delay_amount(RetryContext(retry))
@@ -745,6 +787,7 @@ def update_worker_schedule(
             code = _get_error_code_from_header(e.response)
 
             if code == "ThrottlingException":
+                _rate_limiter.on_throttle(_get_retry_after_seconds_from_header(e.response))
                 _logger.info(f"UpdateWorkerSchedule throttled. Retrying in {delay} seconds...")
             elif code == "InternalServerException":
                 _logger.warning(
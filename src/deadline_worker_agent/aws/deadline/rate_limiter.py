@@ -0,0 +1,222 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from threading import Condition, Event
+from time import monotonic
+from typing import Optional
+import logging
+
+_logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_RATE = 10.0
+"""The most Deadline API requests per second that the Worker sends"""
+
+_DEFAULT_MIN_RATE = 0.1
+"""The fewest Deadline API requests per second that the Worker is limited to when throttled"""
+
+_RATE_DECREASE_FACTOR = 0.5
+"""The request rate is multiplied by this when a request is throttled"""
+
+_RATE_DECREASE_COOLDOWN_SECONDS = 1.0
+"""Throttles within this long of the last rate decrease do not decrease it further. Requests that
+are in-flight when the service starts throttling are all throttled at once, and that is only one
+signal that the rate is too high."""
+
+_RATE_INCREASE_PER_SUCCESS = 0.1
+"""The request rate is increased by this many requests per second for every successful request"""
+
+_BURST_SECONDS = 1.0
+"""The bucket holds enough tokens for this many seconds of requests at the current rate"""
+
+_INTERRUPT_POLL_SECONDS = 0.5
+"""How often a request that is waiting for a token checks whether it has been interrupted"""
+
+
+class DeadlineRequestPriority(IntEnum):
+    """The priority of a Deadline API request. Lower values are higher priority."""
+
+    WORKER_STATUS = 0
+    """Requests that keep the Worker online, such as heartbeats (e.g. UpdateWorkerSchedule)"""
+
+    CREDENTIALS = 1
+    """Requests for AWS Credentials (e.g. AssumeQueueRoleForWorker)"""
+
+    JOB_ENTITIES = 2
+    """Requests for the details of the Worker's work (e.g. BatchGetJobEntity)"""
+
+
+@dataclass(frozen=True)
+class DeadlineRateLimiterState:
+    """A snapshot of a DeadlineRateLimiter"""
+
+    rate: float
+    """The requests per second that are currently allowed"""
+
+    tokens: float
+    """The number of requests that can currently be sent without waiting"""
+
+    waiting: int
+    """The number of requests that are waiting to be sent"""
+
+    throttles: int
+    """The number of requests that the service has throttled"""
+
+    paused_seconds: float
+    """How much longer all requests are paused for, as asked by the service"""
+
+
+class DeadlineRateLimiter:
+    """A token bucket that limits the rate of the Worker's Deadline API requests.
+
+    It is shared by every thread that calls the Deadline API, so that when the service throttles
+    the Worker all of its callers slow down together rather than each retrying on its own. The
+    rate is halved when a request is throttled and increases additively as requests succeed. When
+    the service says how long to wait before retrying, all requests wait that long.
+
+    Requests of lower priority leave tokens in the bucket for requests of higher priority, and do
+    not take a token while a request of higher priority is waiting for one, so that heartbeats are
+    sent on time while the Worker is throttled.
+
+    Parameters
+    ----------
+    max_rate : float
+        The most requests per second to send.
+    min_rate : float
+        The fewest requests per second that throttling can reduce the rate to.
+    """
+
+    _max_rate: float
+    _min_rate: float
+    _rate: float
+    _tokens: float
+    _last_refill: float
+    _paused_until: float
+    _last_decrease: float
+    _throttles: int
+    _waiting: dict[DeadlineRequestPriority, int]
+    _condition: Condition
+
+    def __init__(
+        self,
+        *,
+        max_rate: float = _DEFAULT_MAX_RATE,
+        min_rate: float = _DEFAULT_MIN_RATE,
+    ) -> None:
+        if min_rate <= 0 or max_rate < min_rate:
+            raise ValueError(
+                f"Rate limits must be positive and max_rate ({max_rate}) must be at least min_rate ({min_rate})"
+            )
+        self._max_rate = max_rate
+        self._min_rate = min_rate
+        self._rate = max_rate
+        self._tokens = self._capacity()
+        self._last_refill = monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._throttles = 0
+        self._waiting = {priority: 0 for priority in DeadlineRequestPriority}
+        self._condition = Condition()
+
+    def acquire(
+        self,
+        priority: DeadlineRequestPriority,
+        *,
+        interrupt_event: Optional[Event] = None,
+    ) -> bool:
+        """Waits until a request of the given priority can be sent.
+
+        Parameters
+        ----------
+        priority : DeadlineRequestPriority
+            The priority of the request.
+        interrupt_event : Optional[Event]
+            If given, stop waiting once it is set.
+
+        Returns
+        -------
+        bool
+            True if the request can be sent, False if the interrupt_event was set first.
+        """
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    if interrupt_event is not None and interrupt_event.is_set():
+                        return False
+                    now = monotonic()
+                    self._refill(now)
+                    wait_seconds = self._paused_until - now
+                    if wait_seconds <= 0:
+                        # Leave a token in the bucket for each priority above this one
+                        needed = 1 + priority - self._tokens
+                        if needed <= 0 and not self._higher_priority_waiting(priority):
+                            self._tokens -= 1
+                            return True
+                        wait_seconds = max(needed, 1) / self._rate
+                    if interrupt_event is not None:
+                        wait_seconds = min(wait_seconds, _INTERRUPT_POLL_SECONDS)
+                    self._condition.wait(wait_seconds)
+            finally:
+                self._waiting[priority] -= 1
+                # Let waiters of lower priority re-evaluate now that this one is not waiting
+                self._condition.notify_all()
+
+    def on_success(self) -> None:
+        """Records that a request succeeded, so that the rate recovers from throttling"""
+        with self._condition:
+            if self._rate < self._max_rate:
+                self._rate = min(self._max_rate, self._rate + _RATE_INCREASE_PER_SUCCESS)
+
+    def on_throttle(self, retry_after_seconds: Optional[float] = None) -> None:
+        """Records that the service throttled a request.
+
+        Parameters
+        ----------
+        retry_after_seconds : Optional[float]
+            How long the service asked the Worker to wait before retrying, if it did. No requests
+            are sent until then.
+        """
+        now = monotonic()
+        with self._condition:
+            self._throttles += 1
+            if retry_after_seconds:
+                self._paused_until = max(self._paused_until, now + retry_after_seconds)
+            if now - self._last_decrease >= _RATE_DECREASE_COOLDOWN_SECONDS:
+                self._refill(now)
+                self._rate = max(self._min_rate, self._rate * _RATE_DECREASE_FACTOR)
+                self._tokens = min(self._tokens, 0.0)
+                self._last_decrease = now
+                _logger.info(
+                    "Deadline API requests are throttled. Limiting them to %.2f per second.",
+                    self._rate,
+                )
+
+    def state(self) -> DeadlineRateLimiterState:
+        """Returns a snapshot of the rate limiter, e.g. for metrics"""
+        now = monotonic()
+        with self._condition:
+            self._refill(now)
+            return DeadlineRateLimiterState(
+                rate=self._rate,
+                tokens=self._tokens,
+                waiting=sum(self._waiting.values()),
+                throttles=self._throttles,
+                paused_seconds=max(0.0, self._paused_until - now),
+            )
+
+    def _capacity(self) -> float:
+        # The bucket must be able to hold the tokens that are left for higher priorities
+        return max(float(len(DeadlineRequestPriority)), self._rate * _BURST_SECONDS)
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._last_refill)
+        self._tokens = min(self._capacity(), self._tokens + elapsed * self._rate)
+        self._last_refill = now
+
+    def _higher_priority_waiting(self, priority: DeadlineRequestPriority) -> bool:
+        return any(
+            count for waiting, count in self._waiting.items() if waiting < priority and count
+        )
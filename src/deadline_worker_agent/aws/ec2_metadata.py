@@ -0,0 +1,175 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from threading import Lock, local
+from types import TracebackType
+from typing import Optional, Type
+
+import requests
+
+logger = getLogger(__name__)
+
+IMDS_ENDPOINT = "http://169.254.169.254"
+"""The endpoint of the EC2 instance metadata service (IMDS)"""
+
+
+class Ec2InstanceMetadataClient:
+    """A client for the EC2 instance metadata service (IMDS) that is intended to be polled.
+
+    The client keeps a keep-alive HTTP session for the requests of each thread that uses it, caches
+    the IMDSv2 token until shortly before it expires, and applies strict connect/read timeouts so
+    that a missing or unresponsive IMDS does not stall the caller. It is safe to use from multiple
+    threads: requests.Session is not thread-safe, so threads never share a session.
+
+    See:
+        https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/configuring-instance-metadata-service.html
+    """
+
+    _TOKEN_REFRESH_MARGIN = timedelta(seconds=30)
+    """How long before the token expires that a new token is requested"""
+
+    _endpoint: str
+    _token_ttl: timedelta
+    _timeout: tuple[float, float]
+    _thread_local: local
+    """Holds the "session" (a requests.Session) of each thread that has made a request"""
+    _sessions: list[requests.Session]
+    """The sessions of all threads, so that they can be closed"""
+    _sessions_lock: Lock
+    _token_lock: Lock
+    _token: Optional[str]
+    _token_expiry: Optional[datetime]
+
+    def __init__(
+        self,
+        *,
+        endpoint: str = IMDS_ENDPOINT,
+        token_ttl: timedelta = timedelta(minutes=5),
+        connect_timeout: float = 1.0,
+        read_timeout: float = 1.0,
+    ) -> None:
+        if token_ttl <= self._TOKEN_REFRESH_MARGIN:
+            raise ValueError(
+                f"token_ttl must be greater than {self._TOKEN_REFRESH_MARGIN.total_seconds()} seconds"
+            )
+        self._endpoint = endpoint.rstrip("/")
+        self._token_ttl = token_ttl
+        self._timeout = (connect_timeout, read_timeout)
+        self._thread_local = local()
+        self._sessions = []
+        self._sessions_lock = Lock()
+        self._token_lock = Lock()
+        self._token = None
+        self._token_expiry = None
+
+    def __enter__(self) -> Ec2InstanceMetadataClient:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the underlying HTTP connections"""
+        with self._sessions_lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+
+    def _session(self) -> requests.Session:
+        """Returns the calling thread's HTTP session, creating it on the thread's first request"""
+        session: Optional[requests.Session] = getattr(self._thread_local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._thread_local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def get_token(self) -> str | None:
+        """Returns an IMDSv2 token, requesting a new one from IMDS only if the cached token is
+        missing or about to expire.
+
+        Returns
+        -------
+        str | None
+            None if we're not on EC2 or could not get a token from the metadata service.
+        """
+        with self._token_lock:
+            now = datetime.now(timezone.utc)
+            if (
+                self._token is not None
+                and self._token_expiry is not None
+                and now < self._token_expiry - self._TOKEN_REFRESH_MARGIN
+            ):
+                return self._token
+
+            self._token = None
+            self._token_expiry = None
+            try:
+                response = self._session().put(
+                    f"{self._endpoint}/latest/api/token",
+                    headers={
+                        "X-aws-ec2-metadata-token-ttl-seconds": str(
+                            int(self._token_ttl.total_seconds())
+                        )
+                    },
+                    timeout=self._timeout,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                # Could not connect to the metadata service. Either it's not enabled or we're not
+                # on an EC2 instance.
+                return None
+
+            if response.status_code != 200:
+                return None
+
+            self._token = response.text
+            self._token_expiry = now + self._token_ttl
+            return self._token
+
+    def invalidate_token(self) -> None:
+        """Discards the cached IMDSv2 token so that the next call to get_token() requests a new one"""
+        with self._token_lock:
+            self._token = None
+            self._token_expiry = None
+
+    def get(self, path: str, *, token: str) -> requests.Response | None:
+        """Makes an authenticated GET request for an instance metadata path.
+
+        Parameters
+        ----------
+        path : str
+            The path relative to "/latest/meta-data/" (e.g. "spot/instance-action")
+        token : str
+            An IMDSv2 token returned by get_token()
+
+        Returns
+        -------
+        requests.Response | None
+            The response, or None if the metadata service could not be reached in time.
+        """
+        try:
+            response = self._session().get(
+                f"{self._endpoint}/latest/meta-data/{path}",
+                headers={"X-aws-ec2-metadata-token": token},
+                timeout=self._timeout,
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            # Could not connect to the metadata service. Either it's inactive or we're not
+            # on an EC2 instance.
+            return None
+
+        if response.status_code == 401:
+            # The token is no longer valid (e.g. the instance was stopped and started); get a
+            # fresh one next time.
+            logger.debug("IMDSv2 token rejected, discarding cached token")
+            self.invalidate_token()
+        return response
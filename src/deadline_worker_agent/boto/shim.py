@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Callable, Optional, TYPE_CHECKING, Union
+from typing import Any, Callable, NamedTuple, Optional, TYPE_CHECKING, Union
 from uuid import uuid4
 
 from boto3 import Session as _Session
@@ -31,6 +31,19 @@ if TYPE_CHECKING:
     from .api_models import EntityIdentifier
 
 
+class MappedSessionActions(NamedTuple):
+    """The Session Actions of a Session as mapped from an UpdateWorkerSchedule response"""
+
+    action_ids: tuple[str, ...]
+    """The IDs of the session actions, in order, which are compared before their payloads"""
+
+    session_actions: list[Any]
+    """The session actions of the response that the actions were mapped from"""
+
+    actions: list[EnvironmentAction | TaskRunAction | SyncInputJobAttachmentsAction]
+    """The mapped actions, which are shared by the responses that assign them and are read-only"""
+
+
 class DeadlineClient:
     """
     A shim layer for boto deadline client. This class will check if a method exists on the real
@@ -39,9 +52,12 @@ class DeadlineClient:
     """
 
     _real_client: Any
+    _mapped_session_actions: dict[str, MappedSessionActions]
+    """The session actions mapped from the last UpdateWorkerSchedule response, by Session ID"""
 
     def __init__(self, real_client: Any):
         self._real_client = real_client
+        self._mapped_session_actions = {}
 
     def create_worker(
         self,
@@ -112,7 +128,8 @@ class DeadlineClient:
                     fleetId=fleetId,
                     workerId=workerId,
                     updatedSessionActions=updatedSessionActions,
-                )
+                ),
+                mapped_session_actions=self._mapped_session_actions,
             )
         logger.warning(
             "UpdateWorkerSchedule API missing from service model. Testing with hard-coded response values."
@@ -148,7 +165,20 @@ class DeadlineClient:
 
     # TODO: Remove this once we've changed the API shape everywhere in WA code
     @staticmethod
-    def _parse_update_worker_schedule_response(response: dict) -> UpdateWorkerScheduleResponse:
+    def _parse_update_worker_schedule_response(
+        response: dict,
+        *,
+        mapped_session_actions: dict[str, MappedSessionActions] | None = None,
+    ) -> UpdateWorkerScheduleResponse:
+        """Maps an UpdateWorkerSchedule response to the Worker Agent's model.
+
+        If mapped_session_actions is given, it holds the actions that were mapped for each Session
+        in the previous response, and is updated to hold those of this response. A Session whose
+        assigned actions are unchanged from the previous response is given its previously mapped
+        actions instead of mapping them again. The list and the actions are shared with the
+        previous response, so callers must not modify them.
+        """
+
         # Needed to properly parse into NotRequired field for TypedDict
         def parse_task_run_action(action: dict, action_id: str) -> TaskRunAction:
             mapped_action = TaskRunAction(
@@ -192,18 +222,36 @@ class DeadlineClient:
 
         # Map the new session action structure to our internal model
         mapped_sessions: dict[str, AssignedSession] = {}
+        current_mapped_session_actions: dict[str, MappedSessionActions] = {}
         for session_id, session in response["assignedSessions"].items():
-            mapped_actions: list[
-                EnvironmentAction | TaskRunAction | SyncInputJobAttachmentsAction
-            ] = []
-            for session_action in session["sessionActions"]:
-                assert len(session_action["definition"].items()) == 1
-                (definition,) = session_action["definition"].items()
-                action_name, action = definition
-                assert action_name in SESSION_ACTION_MAP
-                mapped_actions.append(
-                    SESSION_ACTION_MAP[action_name](action, session_action["sessionActionId"])
-                )
+            session_actions = session["sessionActions"]
+            action_ids = tuple(
+                session_action["sessionActionId"] for session_action in session_actions
+            )
+            if (
+                mapped_session_actions is not None
+                and (previous := mapped_session_actions.get(session_id)) is not None
+                and previous.action_ids == action_ids
+                # The IDs rule out most changes. Comparing the payloads as well is much cheaper than
+                # mapping them again, or than hashing them.
+                and previous.session_actions == session_actions
+            ):
+                mapped_actions = previous.actions
+            else:
+                mapped_actions = []
+                for session_action in session_actions:
+                    assert len(session_action["definition"].items()) == 1
+                    (definition,) = session_action["definition"].items()
+                    action_name, action = definition
+                    assert action_name in SESSION_ACTION_MAP
+                    mapped_actions.append(
+                        SESSION_ACTION_MAP[action_name](action, session_action["sessionActionId"])
+                    )
+            current_mapped_session_actions[session_id] = MappedSessionActions(
+                action_ids=action_ids,
+                session_actions=session_actions,
+                actions=mapped_actions,
+            )
 
             mapped_session = AssignedSession(
                 queueId=session["queueId"],
@@ -215,6 +263,11 @@ class DeadlineClient:
 
             mapped_sessions[session_id] = mapped_session
 
+        if mapped_session_actions is not None:
+            # Sessions that are no longer assigned are forgotten
+            mapped_session_actions.clear()
+            mapped_session_actions.update(current_mapped_session_actions)
+
         return UpdateWorkerScheduleResponse(
             assignedSessions=mapped_sessions,
             cancelSessionActions=response["cancelSessionActions"],
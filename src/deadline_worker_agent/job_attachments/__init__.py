@@ -0,0 +1,13 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from .asset_sync import CachingAssetSync
+from .content_cache import JobAttachmentsContentCache
+from .manifest_cache import JobAttachmentsManifestCache
+from .transfer_governor import JobAttachmentsTransferGovernor
+
+__all__ = [
+    "CachingAssetSync",
+    "JobAttachmentsContentCache",
+    "JobAttachmentsManifestCache",
+    "JobAttachmentsTransferGovernor",
+]
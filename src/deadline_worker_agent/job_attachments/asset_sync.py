@@ -0,0 +1,1138 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from copy import copy
+from dataclasses import replace
+from pathlib import Path, PurePosixPath
+from typing import Callable, ContextManager, DefaultDict, Dict, List, Optional, Tuple
+from threading import Event, Lock
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from deadline.job_attachments._aws.aws_clients import get_s3_client
+from deadline.job_attachments._utils import (
+    _get_unique_dest_dir_name,
+    _human_readable_file_size,
+    _join_s3_paths,
+)
+from deadline.job_attachments.asset_manifests import (
+    BaseAssetManifest,
+    BaseManifestPath,
+    HashAlgorithm,
+    hash_file,
+)
+from deadline.job_attachments.asset_sync import AssetSync
+from deadline.job_attachments.download import (
+    _set_fs_group,
+    get_manifest_from_s3,
+    merge_asset_manifests,
+)
+from deadline.job_attachments.exceptions import (
+    AssetSyncCancelledError,
+    VFSExecutableMissingError,
+)
+from deadline.job_attachments.models import (
+    Attachments,
+    JobAttachmentS3Settings,
+    JobAttachmentsFileSystem,
+    ManifestProperties,
+    OutputFile,
+    PathFormat,
+    PathMappingRule,
+)
+from deadline.job_attachments.os_file_permission import (
+    FileSystemPermissionSettings,
+)
+from deadline.job_attachments.progress_tracker import (
+    ProgressReportMetadata,
+    ProgressStatus,
+    SummaryStatistics,
+)
+from deadline.job_attachments.vfs import VFSProcessManager
+
+from .content_cache import JobAttachmentsContentCache
+from .manifest_cache import JobAttachmentsManifestCache
+from .output_journal import OutputChangeJournal, OutputChanges
+from .transfer_governor import JobAttachmentsTransferGovernor, TransferLease
+
+_PREFETCH_DIR_NAME = ".job_attachments_prefetch"
+"""The directory in the session directory that input files are prefetched to"""
+
+_BATCHES_PER_STREAM = 2
+"""The number of batches that governed downloads split each manifest into for each stream that
+the transfer can run, so that a stream whose batch completes early can take another"""
+
+
+class CachingAssetSync(AssetSync):
+    """An AssetSync that syncs session inputs through worker-wide caches.
+
+    Input manifests are looked up in a manifest cache before they are fetched from S3, so that the
+    sessions of a job only fetch and parse each manifest once. When a content cache is provided,
+    input files that are found in it are copied into the session directory instead of being
+    downloaded from S3, and files that are downloaded are added to it for subsequent sessions.
+    Syncing inputs to a virtual file-system is unaffected by the content cache.
+
+    When the output journal is enabled (Linux only), the session's output directories are watched
+    from the first time its outputs are synced, and subsequent syncs only hash and upload the files
+    that the journal recorded instead of walking the output directories.
+
+    When a transfer governor is provided, input files are downloaded in batches by concurrent calls
+    into the library, and the governor sets how many of the calls run at once, sharing the
+    Worker's transfer concurrency between the sessions that are transferring. Outputs are uploaded
+    by a single call, which takes one of the session's share.
+
+    Input files can be prefetched with prefetch_inputs() while the session is busy with earlier
+    actions. They are staged by content in the session directory, and the next sync moves them
+    into place instead of downloading them.
+
+    Some of the methods that this overrides, and some of the helpers that it calls, are private to
+    the library. The library is pinned to a minor version for this reason, and the unit tests check
+    their signatures, and that journaled output files are found as the library finds them, against
+    the installed release.
+
+    Parameters
+    ----------
+    farm_id : str
+        The unique identifier of the farm
+    boto3_session : Optional[boto3.Session]
+        The boto3 session used to access the Job Attachments S3 bucket
+    session_id : Optional[str]
+        The unique identifier of the session, used for logging
+    content_cache : Optional[JobAttachmentsContentCache]
+        The worker-wide content cache, or None to always download input files
+    manifest_cache : Optional[JobAttachmentsManifestCache]
+        The worker-wide manifest cache, or None to always fetch input manifests
+    output_journal : bool
+        Whether to find output files with an OutputChangeJournal rather than by walking the output
+        directories
+    transfer_governor : Optional[JobAttachmentsTransferGovernor]
+        The worker-wide transfer governor, or None to transfer with the library's concurrency
+    """
+
+    _content_cache: Optional[JobAttachmentsContentCache]
+    _manifest_cache: Optional[JobAttachmentsManifestCache]
+    _use_output_journal: bool
+    _output_journal: Optional[OutputChangeJournal]
+    _output_changes: Optional[OutputChanges]
+    """The changes recorded by the output journal for the sync_outputs() call in progress"""
+    _transfer_governor: Optional[JobAttachmentsTransferGovernor]
+
+    def __init__(
+        self,
+        *,
+        farm_id: str,
+        boto3_session: Optional[boto3.Session] = None,
+        session_id: Optional[str] = None,
+        content_cache: Optional[JobAttachmentsContentCache] = None,
+        manifest_cache: Optional[JobAttachmentsManifestCache] = None,
+        output_journal: bool = False,
+        transfer_governor: Optional[JobAttachmentsTransferGovernor] = None,
+    ) -> None:
+        super().__init__(farm_id=farm_id, boto3_session=boto3_session, session_id=session_id)
+        self._content_cache = content_cache
+        self._manifest_cache = manifest_cache
+        self._use_output_journal = output_journal
+        self._output_journal = None
+        self._output_changes = None
+        self._transfer_governor = transfer_governor
+
+    def sync_inputs(
+        self,
+        s3_settings: Optional[JobAttachmentS3Settings],
+        attachments: Optional[Attachments],
+        queue_id: str,
+        job_id: str,
+        session_dir: Path,
+        fs_permission_settings: Optional[FileSystemPermissionSettings] = None,
+        storage_profiles_path_mapping_rules: dict[str, str] = {},
+        step_dependencies: Optional[list[str]] = None,
+        on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+        os_env_vars: Dict[str, str] | None = None,
+    ) -> Tuple[SummaryStatistics, List[Dict[str, str]]]:
+        # The library's attachment_sync_inputs() fetches input manifests through
+        # aggregate_asset_root_manifests() and downloads files through copied_download(), which
+        # are overridden to use the caches. It does not fall back to copying the inputs when the
+        # virtual file-system is missing, nor map the roots of storage profile locations into the
+        # session directory when the fleet has no storage profile, as sync_inputs() does.
+        if attachments is not None:
+            attachments = self._with_sync_inputs_fallbacks(
+                attachments, storage_profiles_path_mapping_rules
+            )
+        return self.attachment_sync_inputs(
+            s3_settings=s3_settings,
+            attachments=attachments,
+            queue_id=queue_id,
+            job_id=job_id,
+            session_dir=session_dir,
+            fs_permission_settings=fs_permission_settings,
+            storage_profiles_path_mapping_rules=storage_profiles_path_mapping_rules,
+            step_dependencies=step_dependencies,
+            on_downloading_files=on_downloading_files,
+            os_env_vars=os_env_vars,
+        )
+
+    def _with_sync_inputs_fallbacks(
+        self,
+        attachments: Attachments,
+        storage_profiles_path_mapping_rules: dict[str, str],
+    ) -> Attachments:
+        """Returns the attachments to sync with attachment_sync_inputs() so that it behaves as
+        sync_inputs() does"""
+        if (
+            attachments.fileSystem == JobAttachmentsFileSystem.VIRTUAL.value
+            and sys.platform != "win32"
+        ):
+            try:
+                VFSProcessManager.find_vfs()
+            except VFSExecutableMissingError:
+                self.logger.error(
+                    f"Virtual File System not found, falling back to {JobAttachmentsFileSystem.COPIED} for JobAttachmentsFileSystem."
+                )
+                attachments = replace(attachments, fileSystem=JobAttachmentsFileSystem.COPIED.value)
+        if not storage_profiles_path_mapping_rules and any(
+            manifest_properties.fileSystemLocationName
+            for manifest_properties in attachments.manifests
+        ):
+            attachments = replace(
+                attachments,
+                manifests=[
+                    replace(manifest_properties, fileSystemLocationName=None)
+                    for manifest_properties in attachments.manifests
+                ],
+            )
+        return attachments
+
+    def aggregate_asset_root_manifests(
+        self,
+        session_dir: Path,
+        s3_settings: JobAttachmentS3Settings,
+        queue_id: str,
+        job_id: str,
+        attachments: Attachments,
+        step_dependencies: Optional[list[str]] = None,
+        dynamic_mapping_rules: dict[str, PathMappingRule] = {},
+        storage_profiles_path_mapping_rules: dict[str, str] = {},
+    ) -> DefaultDict[str, list[BaseAssetManifest]]:
+        # Input manifests are fetched through _get_input_manifest(), and the library aggregates the
+        # output manifests of the step dependencies after them.
+        grouped_manifests_by_root: DefaultDict[str, list[BaseAssetManifest]] = DefaultDict(list)
+        for manifest_properties in attachments.manifests:
+            local_root = AssetSync.get_local_destination(
+                manifest_properties=manifest_properties,
+                dynamic_mapping_rules=dynamic_mapping_rules,
+                storage_profiles_path_mapping_rules=storage_profiles_path_mapping_rules,
+            )
+            if manifest_properties.inputManifestPath:
+                grouped_manifests_by_root[local_root].append(
+                    self._get_input_manifest(
+                        s3_settings=s3_settings, manifest_properties=manifest_properties
+                    )
+                )
+
+        if step_dependencies:
+            step_manifests_by_root = super().aggregate_asset_root_manifests(
+                session_dir=session_dir,
+                s3_settings=s3_settings,
+                queue_id=queue_id,
+                job_id=job_id,
+                attachments=replace(attachments, manifests=[]),
+                step_dependencies=step_dependencies,
+            )
+            for root, manifests in step_manifests_by_root.items():
+                grouped_manifests_by_root[root].extend(manifests)
+
+        return grouped_manifests_by_root
+
+    def prefetch_inputs(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        queue_id: str,
+        job_id: str,
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str] = {},
+        *,
+        cancel: Event,
+    ) -> int:
+        """Downloads the job's input files into a staging directory in the session directory ahead
+        of a later sync_inputs(), which moves them into place instead of downloading them.
+
+        Files are downloaded one at a time with a single connection, outside of the transfer
+        governor, so that the prefetch only uses bandwidth that the session's own transfers leave.
+        Files that already exist in the session or are in the content cache are not downloaded.
+        Inputs of step dependencies are not prefetched, since their outputs may not exist yet.
+
+        Parameters
+        ----------
+        s3_settings : JobAttachmentS3Settings
+            The Job Attachments settings of the job's queue
+        attachments : Attachments
+            The job's attachments
+        queue_id : str
+            The unique identifier of the job's queue
+        job_id : str
+            The unique identifier of the job
+        session_dir : Path
+            The session directory that the inputs will be synced to
+        storage_profiles_path_mapping_rules : dict[str, str]
+            The path mapping rules of the session's storage profiles
+        cancel : Event
+            Set to stop the prefetch
+
+        Returns
+        -------
+        int
+            The number of files that were downloaded
+        """
+        if (
+            attachments.fileSystem == JobAttachmentsFileSystem.VIRTUAL.value
+            and sys.platform != "win32"
+        ):
+            # Inputs on a virtual file-system are fetched on demand
+            return 0
+
+        attachments = self._with_sync_inputs_fallbacks(
+            attachments, storage_profiles_path_mapping_rules
+        )
+        grouped_manifests_by_root = self.aggregate_asset_root_manifests(
+            session_dir=session_dir,
+            s3_settings=s3_settings,
+            queue_id=queue_id,
+            job_id=job_id,
+            attachments=attachments,
+            dynamic_mapping_rules=AssetSync.generate_dynamic_path_mapping(
+                session_dir=session_dir, attachments=attachments
+            ),
+            storage_profiles_path_mapping_rules=storage_profiles_path_mapping_rules,
+        )
+        namespace = JobAttachmentsContentCache.namespace_for(
+            s3_bucket=s3_settings.s3BucketName,
+            cas_prefix=s3_settings.full_cas_prefix(),
+        )
+        staging_dir = session_dir / _PREFETCH_DIR_NAME
+        staging_dir.mkdir(exist_ok=True)
+        s3_client = get_s3_client(session=self.session)
+        transfer_config = TransferConfig(max_concurrency=1, use_threads=False)
+
+        def check_cancel(_: int) -> None:
+            if cancel.is_set():
+                raise _PrefetchCancelled()
+
+        prefetched = 0
+        for local_root, manifests in grouped_manifests_by_root.items():
+            manifest = merge_asset_manifests(manifests)
+            if manifest is None:
+                continue
+            hash_alg = manifest.hashAlg.value
+            for manifest_path in manifest.paths:
+                if cancel.is_set():
+                    return prefetched
+                size: int = manifest_path.size  # type: ignore[attr-defined]
+                staged = _staged_path(staging_dir, manifest_path.hash, hash_alg)
+                if (
+                    staged is None
+                    or staged.exists()
+                    or Path(local_root, manifest_path.path).exists()
+                    or (
+                        self._content_cache is not None
+                        and self._content_cache.contains(
+                            namespace=namespace,
+                            hash=manifest_path.hash,
+                            hash_alg=hash_alg,
+                            size=size,
+                        )
+                    )
+                ):
+                    continue
+
+                # Download to a temporary file so that a partially downloaded file is never staged
+                fd, temp_path = tempfile.mkstemp(dir=staging_dir, prefix=".")
+                os.close(fd)
+                try:
+                    s3_client.download_file(
+                        s3_settings.s3BucketName,
+                        _join_s3_paths(
+                            s3_settings.full_cas_prefix(), f"{manifest_path.hash}.{hash_alg}"
+                        ),
+                        temp_path,
+                        Config=transfer_config,
+                        Callback=check_cancel,
+                    )
+                    if os.stat(temp_path).st_size != size:
+                        self.logger.warning(
+                            f"Prefetched input file {manifest_path.path} does not have the size"
+                            " that its manifest records. Leaving it to be downloaded when the"
+                            " inputs are synced."
+                        )
+                        continue
+                    os.replace(temp_path, staged)
+                except _PrefetchCancelled:
+                    return prefetched
+                finally:
+                    Path(temp_path).unlink(missing_ok=True)
+                prefetched += 1
+
+        return prefetched
+
+    def _get_input_manifest(
+        self,
+        *,
+        s3_settings: JobAttachmentS3Settings,
+        manifest_properties: ManifestProperties,
+    ) -> BaseAssetManifest:
+        assert manifest_properties.inputManifestPath is not None
+        manifest_key = s3_settings.add_root_and_manifest_folder_prefix(
+            manifest_properties.inputManifestPath
+        )
+
+        def fetch() -> BaseAssetManifest:
+            return get_manifest_from_s3(
+                manifest_key=manifest_key,
+                s3_bucket=s3_settings.s3BucketName,
+                session=self.session,
+            )
+
+        if self._manifest_cache is None or not manifest_properties.inputManifestHash:
+            return fetch()
+        return self._manifest_cache.get(
+            s3_bucket=s3_settings.s3BucketName,
+            manifest_key=manifest_key,
+            manifest_hash=manifest_properties.inputManifestHash,
+            fetch=fetch,
+        )
+
+    def copied_download(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        session_dir: Path,
+        fs_permission_settings: Optional[FileSystemPermissionSettings] = None,
+        merged_manifests_by_root: dict[str, BaseAssetManifest] = dict(),
+        on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+    ) -> SummaryStatistics:
+        prefetched: Optional[SummaryStatistics] = None
+        if (session_dir / _PREFETCH_DIR_NAME).is_dir():
+            prefetched, merged_manifests_by_root = self._take_prefetched_inputs(
+                s3_settings=s3_settings,
+                session_dir=session_dir,
+                fs_permission_settings=fs_permission_settings,
+                merged_manifests_by_root=merged_manifests_by_root,
+            )
+            if not merged_manifests_by_root:
+                return prefetched
+            return self._copied_download(
+                s3_settings=s3_settings,
+                session_dir=session_dir,
+                fs_permission_settings=fs_permission_settings,
+                merged_manifests_by_root=merged_manifests_by_root,
+                on_downloading_files=on_downloading_files,
+            ).aggregate(prefetched)
+
+        return self._copied_download(
+            s3_settings=s3_settings,
+            session_dir=session_dir,
+            fs_permission_settings=fs_permission_settings,
+            merged_manifests_by_root=merged_manifests_by_root,
+            on_downloading_files=on_downloading_files,
+        )
+
+    def _copied_download(
+        self,
+        *,
+        s3_settings: JobAttachmentS3Settings,
+        session_dir: Path,
+        fs_permission_settings: Optional[FileSystemPermissionSettings],
+        merged_manifests_by_root: dict[str, BaseAssetManifest],
+        on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]],
+    ) -> SummaryStatistics:
+        if self._content_cache is None:
+            return self._download(
+                s3_settings=s3_settings,
+                session_dir=session_dir,
+                fs_permission_settings=fs_permission_settings,
+                merged_manifests_by_root=merged_manifests_by_root,
+                on_downloading_files=on_downloading_files,
+            )
+        content_cache = self._content_cache
+
+        namespace = JobAttachmentsContentCache.namespace_for(
+            s3_bucket=s3_settings.s3BucketName,
+            cas_prefix=s3_settings.full_cas_prefix(),
+        )
+        start_time = time.perf_counter()
+        cached = SummaryStatistics()
+
+        # Materialize what we can from the cache, and only download the rest
+        manifests_to_download: dict[str, BaseAssetManifest] = {}
+        for local_root, manifest in merged_manifests_by_root.items():
+            materialized_paths: list[str] = []
+            paths_to_download = []
+            for manifest_path in manifest.paths:
+                destination = Path(local_root, manifest_path.path)
+                # Leave files that already exist (e.g. from an earlier sync in this session) or
+                # would land outside of the root to the downloader, which handles those cases.
+                if (
+                    not _is_within(destination, local_root)
+                    or destination.exists()
+                    or not content_cache.materialize(
+                        namespace=namespace,
+                        hash=manifest_path.hash,
+                        hash_alg=manifest.hashAlg.value,
+                        size=manifest_path.size,  # type: ignore[attr-defined]
+                        destination=destination,
+                        mtime=manifest_path.mtime / 1000000,  # type: ignore[attr-defined]
+                    )
+                ):
+                    paths_to_download.append(manifest_path)
+                    continue
+                materialized_paths.append(str(destination))
+                cached.skipped_files += 1
+                cached.skipped_bytes += manifest_path.size  # type: ignore[attr-defined]
+
+            if materialized_paths and fs_permission_settings is not None:
+                _set_fs_group(
+                    file_paths=materialized_paths,
+                    local_root=local_root,
+                    fs_permission_settings=fs_permission_settings,
+                )
+
+            if paths_to_download:
+                manifest_to_download = copy(manifest)
+                manifest_to_download.paths = paths_to_download
+                manifest_to_download.totalSize = sum(  # type: ignore[attr-defined]
+                    manifest_path.size for manifest_path in paths_to_download  # type: ignore[attr-defined]
+                )
+                manifests_to_download[local_root] = manifest_to_download
+
+        cached.total_files = cached.skipped_files
+        cached.total_bytes = cached.skipped_bytes
+        cached.total_time = time.perf_counter() - start_time
+        if cached.skipped_files:
+            self.logger.info(
+                f"Materialized {cached.skipped_files} input file"
+                f"{'' if cached.skipped_files == 1 else 's'} from the Job Attachments cache"
+            )
+
+        if not manifests_to_download:
+            return cached
+
+        # Only files that did not exist before the download can be trusted to hold the content
+        # that the manifest describes. The downloader writes a renamed copy for conflicting paths.
+        new_files = [
+            (local_root, manifest_path)
+            for local_root, manifest in manifests_to_download.items()
+            for manifest_path in manifest.paths
+            if not Path(local_root, manifest_path.path).exists()
+        ]
+        downloaded = self._download(
+            s3_settings=s3_settings,
+            session_dir=session_dir,
+            fs_permission_settings=fs_permission_settings,
+            merged_manifests_by_root=manifests_to_download,
+            on_downloading_files=on_downloading_files,
+        )
+
+        for local_root, manifest_path in new_files:
+            downloaded_file = Path(local_root, manifest_path.path)
+            try:
+                if downloaded_file.stat().st_size != manifest_path.size:  # type: ignore[attr-defined]
+                    continue
+                content_cache.put(
+                    namespace=namespace,
+                    hash=manifest_path.hash,
+                    hash_alg=manifests_to_download[local_root].hashAlg.value,
+                    source=downloaded_file,
+                )
+            except OSError as e:
+                self.logger.warning(
+                    f"Could not add {downloaded_file} to the Job Attachments cache: {e}"
+                )
+
+        return downloaded.aggregate(cached)
+
+    def _take_prefetched_inputs(
+        self,
+        *,
+        s3_settings: JobAttachmentS3Settings,
+        session_dir: Path,
+        fs_permission_settings: Optional[FileSystemPermissionSettings],
+        merged_manifests_by_root: dict[str, BaseAssetManifest],
+    ) -> Tuple[SummaryStatistics, dict[str, BaseAssetManifest]]:
+        """Moves the files that prefetch_inputs() staged into place, and removes the staging
+        directory. Returns the statistics of the files that were moved, and the manifests of the
+        files that are left to materialize or download."""
+        staging_dir = session_dir / _PREFETCH_DIR_NAME
+        namespace = JobAttachmentsContentCache.namespace_for(
+            s3_bucket=s3_settings.s3BucketName,
+            cas_prefix=s3_settings.full_cas_prefix(),
+        )
+        start_time = time.perf_counter()
+        prefetched = SummaryStatistics()
+        remaining_manifests_by_root: dict[str, BaseAssetManifest] = {}
+        # Files that were moved out of the staging directory, by their staged path, so that files
+        # with the same content are copied from them
+        taken: dict[Path, Path] = {}
+        try:
+            for local_root, manifest in merged_manifests_by_root.items():
+                hash_alg = manifest.hashAlg.value
+                taken_paths: list[str] = []
+                remaining_paths = []
+                for manifest_path in manifest.paths:
+                    destination = Path(local_root, manifest_path.path)
+                    staged = _staged_path(staging_dir, manifest_path.hash, hash_alg)
+                    if (
+                        staged is None
+                        or not _is_within(destination, local_root)
+                        or destination.exists()
+                        or not self._take_prefetched_file(
+                            staged=staged,
+                            taken_from=taken.get(staged),
+                            hash=manifest_path.hash,
+                            hash_alg=manifest.hashAlg,
+                            size=manifest_path.size,  # type: ignore[attr-defined]
+                            destination=destination,
+                            mtime=manifest_path.mtime / 1000000,  # type: ignore[attr-defined]
+                        )
+                    ):
+                        remaining_paths.append(manifest_path)
+                        continue
+                    if staged not in taken:
+                        taken[staged] = destination
+                        if self._content_cache is not None:
+                            try:
+                                self._content_cache.put(
+                                    namespace=namespace,
+                                    hash=manifest_path.hash,
+                                    hash_alg=hash_alg,
+                                    source=destination,
+                                )
+                            except OSError as e:
+                                self.logger.warning(
+                                    f"Could not add {destination} to the Job Attachments cache: {e}"
+                                )
+                    taken_paths.append(str(destination))
+                    prefetched.skipped_files += 1
+                    prefetched.skipped_bytes += manifest_path.size  # type: ignore[attr-defined]
+
+                if taken_paths and fs_permission_settings is not None:
+                    _set_fs_group(
+                        file_paths=taken_paths,
+                        local_root=local_root,
+                        fs_permission_settings=fs_permission_settings,
+                    )
+
+                if len(remaining_paths) == len(manifest.paths):
+                    remaining_manifests_by_root[local_root] = manifest
+                elif remaining_paths:
+                    remaining_manifest = copy(manifest)
+                    remaining_manifest.paths = remaining_paths
+                    remaining_manifest.totalSize = sum(  # type: ignore[attr-defined]
+                        manifest_path.size for manifest_path in remaining_paths  # type: ignore[attr-defined]
+                    )
+                    remaining_manifests_by_root[local_root] = remaining_manifest
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        prefetched.total_files = prefetched.skipped_files
+        prefetched.total_bytes = prefetched.skipped_bytes
+        prefetched.total_time = time.perf_counter() - start_time
+        if prefetched.skipped_files:
+            self.logger.info(
+                f"Moved {prefetched.skipped_files} prefetched input file"
+                f"{'' if prefetched.skipped_files == 1 else 's'} into place"
+            )
+        return (prefetched, remaining_manifests_by_root)
+
+    @staticmethod
+    def _take_prefetched_file(
+        *,
+        staged: Path,
+        taken_from: Optional[Path],
+        hash: str,
+        hash_alg: HashAlgorithm,
+        size: int,
+        destination: Path,
+        mtime: float,
+    ) -> bool:
+        """Moves a staged file to its destination, or copies it from the destination that it was
+        already moved to. Returns False if the file was not staged, or if the staged file does not
+        have the content that the manifest records."""
+        source = staged if taken_from is None else taken_from
+        try:
+            if source.stat().st_size != size:
+                return False
+            # A file that was already moved into place was verified when it was moved
+            if taken_from is None and hash_file(str(staged), hash_alg) != hash:
+                return False
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if taken_from is None:
+                os.replace(staged, destination)
+            else:
+                shutil.copyfile(taken_from, destination)
+        except OSError:
+            return False
+        os.utime(destination, (mtime, mtime))
+        return True
+
+    def _download(
+        self,
+        *,
+        s3_settings: JobAttachmentS3Settings,
+        session_dir: Path,
+        fs_permission_settings: Optional[FileSystemPermissionSettings],
+        merged_manifests_by_root: dict[str, BaseAssetManifest],
+        on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]],
+    ) -> SummaryStatistics:
+        """Downloads the files of the manifests from S3, with the concurrency set by the transfer
+        governor if there is one"""
+        if self._transfer_governor is None:
+            return super().copied_download(
+                s3_settings=s3_settings,
+                session_dir=session_dir,
+                fs_permission_settings=fs_permission_settings,
+                merged_manifests_by_root=merged_manifests_by_root,
+                on_downloading_files=on_downloading_files,
+            )
+
+        # The library has no parameter for its download concurrency, so the manifests are split
+        # into batches that are each downloaded by a call to the library, and the number of calls
+        # that run at once follows the governor.
+        with self._transfer_governor.transfer() as lease:
+            batches = _split_manifests(
+                merged_manifests_by_root, lease.max_concurrency * _BATCHES_PER_STREAM
+            )
+            progress = _CombinedDownloadProgress(
+                lease=lease, batches=batches, on_progress=on_downloading_files
+            )
+            # Bound here, since super() cannot be called without arguments in a nested function
+            library_download = super().copied_download
+
+            def download(index: int) -> SummaryStatistics:
+                with lease.slot():
+                    if progress.cancelled:
+                        raise AssetSyncCancelledError("Download of input files was cancelled.")
+                    try:
+                        return library_download(
+                            s3_settings=s3_settings,
+                            session_dir=session_dir,
+                            fs_permission_settings=fs_permission_settings,
+                            merged_manifests_by_root=batches[index],
+                            on_downloading_files=progress.batch_callback(index),
+                        )
+                    finally:
+                        progress.finish_batch(index)
+
+            start_time = time.perf_counter()
+            # Sized for the most calls that the governor lets a transfer run at once
+            with ThreadPoolExecutor(max_workers=lease.max_concurrency) as executor:
+                futures = [executor.submit(download, index) for index in range(len(batches))]
+                try:
+                    summaries = [future.result() for future in as_completed(futures)]
+                except BaseException:
+                    # Stop the other batches, rather than waiting for them to complete
+                    progress.cancel()
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        summary = summaries[0]
+        for other in summaries[1:]:
+            summary.aggregate(other)
+        # The batches ran at the same time, so their times are not added together
+        summary.total_time = time.perf_counter() - start_time
+        summary.transfer_rate = (
+            summary.processed_bytes / summary.total_time if summary.total_time else 0.0
+        )
+        return summary
+
+    def sync_outputs(
+        self,
+        s3_settings: Optional[JobAttachmentS3Settings],
+        attachments: Optional[Attachments],
+        queue_id: str,
+        job_id: str,
+        step_id: str,
+        task_id: str,
+        session_action_id: str,
+        start_time: float,
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str] = {},
+        on_uploading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+    ) -> SummaryStatistics:
+        if s3_settings and attachments and (journal := self._get_output_journal()):
+            # Watch before collecting, so that a newly watched root is walked this time and only
+            # its subsequent changes are taken from the journal.
+            journal.watch(
+                self._get_output_roots(
+                    attachments=attachments,
+                    session_dir=session_dir,
+                    storage_profiles_path_mapping_rules=storage_profiles_path_mapping_rules,
+                )
+            )
+            self._output_changes = journal.collect()
+        transfer: ContextManager[Optional[TransferLease]] = (
+            nullcontext() if self._transfer_governor is None else self._transfer_governor.transfer()
+        )
+        try:
+            with transfer as lease:
+                # The library uploads the outputs with a single call at its own concurrency, which
+                # takes one of the lease's streams.
+                slot: ContextManager[None] = nullcontext() if lease is None else lease.slot()
+                if lease is not None:
+                    on_uploading_files = _recording_transfer_rate(lease, on_uploading_files)
+                with slot:
+                    return super().sync_outputs(
+                        s3_settings=s3_settings,
+                        attachments=attachments,
+                        queue_id=queue_id,
+                        job_id=job_id,
+                        step_id=step_id,
+                        task_id=task_id,
+                        session_action_id=session_action_id,
+                        start_time=start_time,
+                        session_dir=session_dir,
+                        storage_profiles_path_mapping_rules=storage_profiles_path_mapping_rules,
+                        on_uploading_files=on_uploading_files,
+                    )
+        finally:
+            self._output_changes = None
+
+    def cleanup_session(
+        self,
+        session_dir: Path,
+        file_system: JobAttachmentsFileSystem,
+        os_user: Optional[str] = None,
+    ):
+        if self._output_journal is not None:
+            self._output_journal.close()
+            self._output_journal = None
+        shutil.rmtree(session_dir / _PREFETCH_DIR_NAME, ignore_errors=True)
+        super().cleanup_session(session_dir=session_dir, file_system=file_system, os_user=os_user)
+
+    def _get_output_journal(self) -> Optional[OutputChangeJournal]:
+        if self._output_journal is None and self._use_output_journal:
+            try:
+                self._output_journal = OutputChangeJournal()
+            except (NotImplementedError, OSError) as e:
+                self.logger.warning(
+                    f"Output change journal is unavailable, walking output directories instead: {e}"
+                )
+                self._use_output_journal = False
+        return self._output_journal
+
+    def _get_output_roots(
+        self,
+        *,
+        attachments: Attachments,
+        session_dir: Path,
+        storage_profiles_path_mapping_rules: dict[str, str],
+    ) -> list[tuple[Path, Path]]:
+        """Returns the output directories that sync_outputs() looks for files in, each paired with
+        the directory that the output files must resolve within"""
+        output_roots: list[tuple[Path, Path]] = []
+        for manifest_properties in attachments.manifests:
+            session_root = session_dir
+            if (
+                len(storage_profiles_path_mapping_rules) > 0
+                and manifest_properties.fileSystemLocationName
+            ):
+                if manifest_properties.rootPath not in storage_profiles_path_mapping_rules:
+                    # sync_outputs() reports the missing rule
+                    continue
+                local_root = Path(storage_profiles_path_mapping_rules[manifest_properties.rootPath])
+                session_root = local_root
+            else:
+                local_root = session_dir / _get_unique_dest_dir_name(manifest_properties.rootPath)
+
+            for output_dir in manifest_properties.outputRelativeDirectories or []:
+                output_root = local_root / _to_host_path_format(
+                    output_dir, manifest_properties.rootPathFormat
+                )
+                output_roots.append((Path(os.path.normpath(output_root)), session_root))
+        return output_roots
+
+    def _get_output_files(
+        self,
+        manifest_properties: ManifestProperties,
+        s3_settings: JobAttachmentS3Settings,
+        local_root: Path,
+        session_dir: Path,
+    ) -> List[OutputFile]:
+        output_changes = self._output_changes
+        if output_changes is None:
+            return super()._get_output_files(
+                manifest_properties, s3_settings, local_root, session_dir
+            )
+
+        output_files: List[OutputFile] = []
+        for output_dir in manifest_properties.outputRelativeDirectories or []:
+            output_root: Path = local_root / _to_host_path_format(
+                output_dir, manifest_properties.rootPathFormat
+            )
+            changed_files = output_changes.files_under(Path(os.path.normpath(output_root)))
+            if changed_files is None or not output_root.is_dir():
+                # The journal does not have a complete record of this directory, so it is walked
+                output_files.extend(
+                    super()._get_output_files(
+                        replace(manifest_properties, outputRelativeDirectories=[output_dir]),
+                        s3_settings,
+                        local_root,
+                        session_dir,
+                    )
+                )
+                continue
+
+            self.logger.info(
+                f"Output change journal recorded {len(changed_files)} changed"
+                f" file{'' if len(changed_files) == 1 else 's'} in {output_root}"
+            )
+            output_files.extend(
+                self._get_journaled_output_files(
+                    changed_files=changed_files,
+                    output_root=output_root,
+                    s3_settings=s3_settings,
+                    local_root=local_root,
+                    session_dir=session_dir,
+                )
+            )
+
+        return output_files
+
+    def _get_journaled_output_files(
+        self,
+        *,
+        changed_files: list[Path],
+        output_root: Path,
+        s3_settings: JobAttachmentS3Settings,
+        local_root: Path,
+        session_dir: Path,
+    ) -> List[OutputFile]:
+        """Returns the output files for the files that the output journal recorded as changed in an
+        output directory. Each file is checked the same way that AssetSync._get_output_files() checks
+        the files it finds when walking the directory."""
+        output_files: List[OutputFile] = []
+        total_file_size = 0
+        normalized_output_root = Path(os.path.normpath(output_root))
+        for changed_file in changed_files:
+            # Use the same path as walking would, since it is the key of the recorded mtime
+            file_path = output_root / changed_file.relative_to(normalized_output_root)
+            try:
+                file_mtime = file_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                # Recorded by the journal, but removed since
+                continue
+            mtime_when_synced = self.synced_assets_mtime.get(str(file_path), None)
+            if mtime_when_synced:
+                # Modified during this session action, or unchanged since the last sync
+                is_modified = file_mtime > int(mtime_when_synced)
+            else:
+                # Created during this session action
+                self.synced_assets_mtime[str(file_path)] = int(file_mtime)
+                is_modified = True
+
+            # Resolve the real path to prevent time-of-check/time-of-use vulnerability
+            file_real_path = file_path.resolve()
+            if not self._is_file_within_directory(file_real_path, session_dir):
+                self.logger.info(
+                    f"Skipping file '{file_path}' as its resolved path '{file_real_path}' is"
+                    f" outside the session directory '{session_dir}'"
+                )
+                continue
+            if not is_modified or file_real_path.is_dir() or not file_real_path.exists():
+                continue
+
+            file_size = file_real_path.lstat().st_size
+            file_hash = hash_file(str(file_real_path), self.hash_alg)
+            s3_key = f"{file_hash}.{self.hash_alg.value}"
+            if s3_settings.full_cas_prefix():
+                s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
+            total_file_size += file_size
+            output_files.append(
+                OutputFile(
+                    file_size=file_size,
+                    file_hash=file_hash,
+                    rel_path=str(PurePosixPath(*file_path.relative_to(local_root).parts)),
+                    full_path=str(file_real_path),
+                    s3_key=s3_key,
+                    in_s3=self.s3_uploader.file_already_uploaded(s3_settings.s3BucketName, s3_key),
+                    base_dir=str(session_dir),
+                )
+            )
+
+        self.logger.info(
+            f"Found {len(output_files)} file{'' if len(output_files) == 1 else 's'}"
+            f" totaling {_human_readable_file_size(total_file_size)}"
+            f" in output directory: {str(output_root)}"
+        )
+        return output_files
+
+
+def _to_host_path_format(output_dir: str, source_path_format: PathFormat) -> str:
+    """Converts the separators of an output directory to those of the host's path format"""
+    current_path_format = PathFormat.get_host_path_format()
+    if source_path_format != current_path_format:
+        if source_path_format == PathFormat.WINDOWS:
+            output_dir = output_dir.replace("\\", "/")
+        elif source_path_format == PathFormat.POSIX:
+            output_dir = output_dir.replace("/", "\\")
+    return output_dir
+
+
+def _recording_transfer_rate(
+    lease: TransferLease,
+    on_progress: Optional[Callable[[ProgressReportMetadata], bool]],
+) -> Callable[[ProgressReportMetadata], bool]:
+    """Wraps a progress callback so that the transfer rates that it is reported are recorded with
+    the transfer governor"""
+
+    def record_and_report(metadata: ProgressReportMetadata) -> bool:
+        if metadata.status in (
+            ProgressStatus.DOWNLOAD_IN_PROGRESS,
+            ProgressStatus.UPLOAD_IN_PROGRESS,
+        ):
+            lease.record_transfer_rate(metadata.transferRate)
+        return True if on_progress is None else on_progress(metadata)
+
+    return record_and_report
+
+
+def _split_manifests(
+    manifests_by_root: dict[str, BaseAssetManifest], max_batches: int
+) -> list[dict[str, BaseAssetManifest]]:
+    """Splits the files of each manifest into up to max_batches batches of about the same size,
+    which are downloaded separately"""
+    batches: list[dict[str, BaseAssetManifest]] = []
+    for root, manifest in manifests_by_root.items():
+        batch_count = min(len(manifest.paths), max_batches)
+        if batch_count <= 1:
+            batches.append({root: manifest})
+            continue
+        batch_paths: list[list[BaseManifestPath]] = [[] for _ in range(batch_count)]
+        batch_sizes = [0] * batch_count
+        # Placing the largest files first, each on the smallest batch so far, balances the batches
+        for manifest_path in sorted(
+            manifest.paths, key=lambda path: path.size, reverse=True  # type: ignore[attr-defined]
+        ):
+            smallest = batch_sizes.index(min(batch_sizes))
+            batch_paths[smallest].append(manifest_path)
+            batch_sizes[smallest] += manifest_path.size  # type: ignore[attr-defined]
+        for paths, size in zip(batch_paths, batch_sizes):
+            batch = copy(manifest)
+            batch.paths = paths
+            batch.totalSize = size  # type: ignore[attr-defined]
+            batches.append({root: batch})
+    return batches or [dict(manifests_by_root)]
+
+
+class _CombinedDownloadProgress:
+    """Combines the progress reported by the library calls that download the batches of a
+    governed download into the progress of the whole download"""
+
+    _lease: TransferLease
+    _on_progress: Optional[Callable[[ProgressReportMetadata], bool]]
+    _lock: Lock
+    """Held while the progress is updated and reported, since the batches report from the
+    library's download threads"""
+    _batch_bytes: list[int]
+    _completed_bytes: list[float]
+    _rates: list[float]
+    """The latest transfer rate reported by each batch, or zero if it is not downloading"""
+    _total_files: int
+    _cancelled: bool
+
+    def __init__(
+        self,
+        *,
+        lease: TransferLease,
+        batches: list[dict[str, BaseAssetManifest]],
+        on_progress: Optional[Callable[[ProgressReportMetadata], bool]],
+    ) -> None:
+        self._lease = lease
+        self._on_progress = on_progress
+        self._lock = Lock()
+        self._batch_bytes = [
+            sum(manifest.totalSize for manifest in batch.values())  # type: ignore[attr-defined]
+            for batch in batches
+        ]
+        self._completed_bytes = [0.0] * len(batches)
+        self._rates = [0.0] * len(batches)
+        self._total_files = sum(
+            len(manifest.paths) for batch in batches for manifest in batch.values()
+        )
+        self._cancelled = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the download was cancelled, so that the batches should stop"""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def batch_callback(self, index: int) -> Callable[[ProgressReportMetadata], bool]:
+        """Returns the progress callback for the library call that downloads a batch"""
+
+        def report(metadata: ProgressReportMetadata) -> bool:
+            with self._lock:
+                if self._cancelled:
+                    return False
+                self._completed_bytes[index] = self._batch_bytes[index] * metadata.progress / 100
+                self._rates[index] = metadata.transferRate
+                combined = self._combined(metadata.status)
+                if metadata.status == ProgressStatus.DOWNLOAD_IN_PROGRESS:
+                    self._lease.record_transfer_rate(combined.transferRate)
+                if self._on_progress is not None and not self._on_progress(combined):
+                    self._cancelled = True
+                return not self._cancelled
+
+        return report
+
+    def finish_batch(self, index: int) -> None:
+        """Stops counting the transfer rate of a batch whose library call returned"""
+        with self._lock:
+            self._rates[index] = 0.0
+
+    def _combined(self, status: ProgressStatus) -> ProgressReportMetadata:
+        total_bytes = sum(self._batch_bytes)
+        completed_bytes = sum(self._completed_bytes)
+        transfer_rate = sum(self._rates)
+        return ProgressReportMetadata(
+            status=status,
+            progress=round(completed_bytes / total_bytes * 100 if total_bytes > 0 else 0, 1),
+            transferRate=transfer_rate,
+            progressMessage=(
+                f"{status.verb_in_message}"
+                f" {_human_readable_file_size(int(completed_bytes))}"
+                f" / {_human_readable_file_size(total_bytes)}"
+                f" of {self._total_files} file{'' if self._total_files == 1 else 's'}"
+                f" (Transfer rate: {_human_readable_file_size(int(transfer_rate))}/s)"
+            ),
+        )
+
+
+class _PrefetchCancelled(Exception):
+    """Raised from a prefetch's progress callback to stop its download"""
+
+
+def _staged_path(staging_dir: Path, hash: str, hash_alg: str) -> Optional[Path]:
+    """Returns the path that a file with the given content is prefetched to, or None if the hash
+    cannot be used as a file name"""
+    if not (hash.isalnum() and hash_alg.isalnum()):
+        return None
+    return staging_dir / f"{hash}.{hash_alg}"
+
+
+def _is_within(path: Path, root: str) -> bool:
+    abs_root = os.path.abspath(root)
+    try:
+        return os.path.commonpath([os.path.abspath(path), abs_root]) == abs_root
+    except ValueError:
+        # The paths are on different drives
+        return False
@@ -0,0 +1,311 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from hashlib import sha256
+from logging import getLogger
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+import errno
+import os
+import shutil
+import sys
+import tempfile
+
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_file
+
+if sys.platform == "linux":
+    import fcntl
+
+logger = getLogger(__name__)
+
+_FICLONE = 0x40049409
+"""The Linux ioctl request number for cloning (reflinking) a file's extents, from <linux/fs.h>"""
+
+_TEMP_DIR_NAME = ".incoming"
+
+
+class JobAttachmentsContentCache:
+    """A worker-wide, content-addressed cache of Job Attachments input files.
+
+    Files are stored keyed by the hash that the Job Attachments manifest records for them, so
+    identical content is only downloaded once per Worker host regardless of which job, session, or
+    asset root references it. The total size of the cached files is capped; when adding a file
+    would exceed the cap, the least-recently used files are evicted.
+
+    Entries are partitioned by a namespace (the S3 bucket and CAS prefix that the content was
+    downloaded from). A session can only materialize content from the namespace of its own queue's
+    Job Attachments bucket, which it is already permitted to read.
+
+    Cached files are materialized into session directories as independent copies (reflinked where
+    the file-system supports copy-on-write clones) so that a session modifying or changing the
+    ownership of its inputs never affects the cache or other sessions.
+
+    The recency of each entry is persisted in the file's modification time so that the LRU order
+    survives a Worker Agent restart. This class is safe to use from multiple threads.
+
+    Parameters
+    ----------
+    root_dir : Path
+        The directory where the cached files are stored. It is created if it does not exist.
+    max_size_bytes : int
+        The maximum total size of the cached files, in bytes.
+    """
+
+    _root_dir: Path
+    _max_size_bytes: int
+    _lock: Lock
+    _entries: OrderedDict[Path, int]
+    """Cached file paths and their sizes, from least to most recently used"""
+    _size_bytes: int
+
+    def __init__(self, *, root_dir: Path, max_size_bytes: int) -> None:
+        if max_size_bytes <= 0:
+            raise ValueError(f"max_size_bytes must be positive, but got {max_size_bytes}")
+        self._root_dir = root_dir
+        self._max_size_bytes = max_size_bytes
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+
+        self._root_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        shutil.rmtree(self._root_dir / _TEMP_DIR_NAME, ignore_errors=True)
+        (self._root_dir / _TEMP_DIR_NAME).mkdir(mode=0o700)
+        self._load_entries()
+
+    @property
+    def root_dir(self) -> Path:
+        return self._root_dir
+
+    @property
+    def max_size_bytes(self) -> int:
+        return self._max_size_bytes
+
+    @property
+    def size_bytes(self) -> int:
+        """The total size of the files currently in the cache"""
+        with self._lock:
+            return self._size_bytes
+
+    @staticmethod
+    def namespace_for(*, s3_bucket: str, cas_prefix: str) -> str:
+        """Returns the cache namespace for content stored in a Job Attachments CAS
+
+        Parameters
+        ----------
+        s3_bucket : str
+            The Job Attachments S3 bucket name
+        cas_prefix : str
+            The full S3 key prefix of the Job Attachments content-addressed storage
+
+        Returns
+        -------
+        str
+            An opaque namespace identifier that is safe to use as a directory name
+        """
+        return sha256(f"{s3_bucket}/{cas_prefix}".encode("utf-8")).hexdigest()[:32]
+
+    def contains(self, *, namespace: str, hash: str, hash_alg: str, size: int) -> bool:
+        """Returns whether a file is in the cache, without changing its recency
+
+        Parameters
+        ----------
+        namespace : str
+            The cache namespace as returned by namespace_for()
+        hash : str
+            The hash of the file's content
+        hash_alg : str
+            The name of the hash algorithm used to compute the hash
+        size : int
+            The expected size of the file in bytes
+        """
+        entry = self._entry_path(namespace=namespace, hash=hash, hash_alg=hash_alg)
+        with self._lock:
+            return self._entries.get(entry) == size
+
+    def materialize(
+        self,
+        *,
+        namespace: str,
+        hash: str,
+        hash_alg: str,
+        size: int,
+        destination: Path,
+        mtime: Optional[float] = None,
+    ) -> bool:
+        """Materializes a cached file at a destination path, if it is in the cache.
+
+        Parameters
+        ----------
+        namespace : str
+            The cache namespace as returned by namespace_for()
+        hash : str
+            The hash of the file's content
+        hash_alg : str
+            The name of the hash algorithm used to compute the hash
+        size : int
+            The expected size of the file in bytes
+        destination : Path
+            The path to create the file at. Missing parent directories are created.
+        mtime : Optional[float]
+            If provided, the modification time (seconds since the epoch) to set on the file
+
+        Returns
+        -------
+        bool
+            True if the file was materialized from the cache, False on a cache miss
+        """
+        entry = self._entry_path(namespace=namespace, hash=hash, hash_alg=hash_alg)
+        with self._lock:
+            if self._entries.get(entry) != size:
+                return False
+            self._entries.move_to_end(entry)
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            _clone_file(entry, destination)
+            # Persist the recency of the entry for when the cache is loaded again
+            os.utime(entry)
+        except FileNotFoundError:
+            # The entry was evicted (or removed from disk) concurrently
+            with self._lock:
+                self._remove_entry(entry)
+            destination.unlink(missing_ok=True)
+            return False
+
+        if mtime is not None:
+            os.utime(destination, (mtime, mtime))
+        return True
+
+    def put(self, *, namespace: str, hash: str, hash_alg: str, source: Path) -> None:
+        """Adds a copy of a file to the cache, evicting least-recently used files as needed.
+
+        Files that are already cached, or that are larger than the cache itself, are not added.
+        The copy is hashed before it is added, and is not added if its content does not have the
+        given hash, since the source may be a file that a job can modify.
+
+        Parameters
+        ----------
+        namespace : str
+            The cache namespace as returned by namespace_for()
+        hash : str
+            The hash of the file's content
+        hash_alg : str
+            The name of the hash algorithm used to compute the hash
+        source : Path
+            The path of the file to add. The file is copied, not moved.
+        """
+        entry = self._entry_path(namespace=namespace, hash=hash, hash_alg=hash_alg)
+        algorithm = HashAlgorithm(hash_alg)
+        size = source.stat().st_size
+        with self._lock:
+            if entry in self._entries:
+                self._entries.move_to_end(entry)
+                return
+        if size > self._max_size_bytes:
+            return
+
+        # Copy to a temporary file first so that a partially written file is never visible in the
+        # cache, then verify the copy and atomically move it into place.
+        fd, temp_path = tempfile.mkstemp(dir=self._root_dir / _TEMP_DIR_NAME)
+        os.close(fd)
+        try:
+            _clone_file(source, Path(temp_path))
+            size = os.stat(temp_path).st_size
+            if size > self._max_size_bytes or hash_file(temp_path, algorithm) != hash:
+                logger.warning(
+                    "Not adding %s to the Job Attachments cache, since its content does not match"
+                    " the hash %s",
+                    source,
+                    hash,
+                )
+                Path(temp_path).unlink()
+                return
+            entry.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            os.replace(temp_path, entry)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if entry not in self._entries:
+                self._entries[entry] = size
+                self._size_bytes += size
+            self._entries.move_to_end(entry)
+            self._evict()
+
+    def _entry_path(self, *, namespace: str, hash: str, hash_alg: str) -> Path:
+        if not (namespace.isalnum() and hash.isalnum() and hash_alg.isalnum()):
+            raise ValueError(f"Invalid cache key: {namespace}/{hash}.{hash_alg}")
+        return self._root_dir / namespace / hash[:2] / f"{hash}.{hash_alg}"
+
+    def _load_entries(self) -> None:
+        """Indexes the files already in the cache directory, ordered by their last use"""
+        found: list[tuple[float, Path, int]] = []
+        for namespace_dir in self._root_dir.iterdir():
+            if namespace_dir.name == _TEMP_DIR_NAME or not namespace_dir.is_dir():
+                continue
+            for entry in namespace_dir.glob("*/*"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, entry, stat.st_size))
+
+        for _, entry, size in sorted(found, key=lambda item: item[0]):
+            self._entries[entry] = size
+            self._size_bytes += size
+
+        with self._lock:
+            self._evict()
+        logger.info(
+            "Job Attachments cache at %s contains %d files (%d bytes)",
+            self._root_dir,
+            len(self._entries),
+            self._size_bytes,
+        )
+
+    def _evict(self) -> None:
+        """Removes least-recently used entries until the cache is within its size limit. The caller
+        must hold self._lock."""
+        for entry in list(self._entries):
+            if self._size_bytes <= self._max_size_bytes:
+                break
+            try:
+                entry.unlink(missing_ok=True)
+            except OSError as e:
+                # e.g. the file is open on Windows. Keep it in the index so that it is retried on
+                # the next eviction.
+                logger.warning("Could not evict %s from the Job Attachments cache: %s", entry, e)
+                continue
+            self._remove_entry(entry)
+
+    def _remove_entry(self, entry: Path) -> None:
+        """Removes an entry from the index. The caller must hold self._lock."""
+        size = self._entries.pop(entry, None)
+        if size is not None:
+            self._size_bytes -= size
+
+
+def _clone_file(source: Path, destination: Path) -> None:
+    """Copies a file, using a copy-on-write clone (reflink) when the file-system supports it"""
+    if sys.platform == "linux":
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return
+        except FileNotFoundError:
+            raise
+        except OSError as e:
+            if e.errno not in (
+                errno.EOPNOTSUPP,
+                errno.ENOTTY,
+                errno.EXDEV,
+                errno.EINVAL,
+                errno.EPERM,
+                errno.ENOSYS,
+            ):
+                raise
+    shutil.copyfile(source, destination)
@@ -0,0 +1,155 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from copy import copy
+from dataclasses import dataclass
+from logging import getLogger
+from threading import Lock
+from typing import Callable
+
+from deadline.job_attachments.asset_manifests import BaseAssetManifest
+
+logger = getLogger(__name__)
+
+_PATH_OVERHEAD_BYTES = 260
+"""The approximate memory used by a parsed manifest path entry, not counting the characters of its
+path and hash strings"""
+
+
+@dataclass(frozen=True)
+class _ManifestKey:
+    s3_bucket: str
+    manifest_key: str
+    manifest_hash: str
+
+
+class JobAttachmentsManifestCache:
+    """A worker-wide, in-memory cache of parsed Job Attachments input manifests.
+
+    Input manifests are immutable and identified by the hash recorded in the job's attachments, so
+    once fetched and parsed they can be re-used by every subsequent session of the job. The cache is
+    bounded by the approximate memory used by the parsed manifests; the least-recently used
+    manifests are evicted first.
+
+    Entries are keyed by the S3 bucket and key that the manifest was fetched from in addition to
+    its hash, so a session is only ever handed a manifest that its own job references.
+
+    Each caller is handed its own copy of a cached manifest and its path entries, since the Job
+    Attachments library rewrites path entries in place when it maps them to a session's
+    directories. This class is safe to use from multiple threads; concurrent requests for the same
+    manifest share a single fetch.
+
+    Parameters
+    ----------
+    max_size_bytes : int
+        The approximate maximum memory, in bytes, used by the cached manifests.
+    """
+
+    _max_size_bytes: int
+    _lock: Lock
+    _entries: OrderedDict[_ManifestKey, tuple[BaseAssetManifest, int]]
+    """Cached manifests and their approximate sizes, from least to most recently used"""
+    _size_bytes: int
+    _fetch_locks: dict[_ManifestKey, Lock]
+
+    def __init__(self, *, max_size_bytes: int) -> None:
+        if max_size_bytes <= 0:
+            raise ValueError(f"max_size_bytes must be positive, but got {max_size_bytes}")
+        self._max_size_bytes = max_size_bytes
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._fetch_locks = {}
+
+    @property
+    def size_bytes(self) -> int:
+        """The approximate memory used by the cached manifests"""
+        with self._lock:
+            return self._size_bytes
+
+    def get(
+        self,
+        *,
+        s3_bucket: str,
+        manifest_key: str,
+        manifest_hash: str,
+        fetch: Callable[[], BaseAssetManifest],
+    ) -> BaseAssetManifest:
+        """Returns a manifest from the cache, fetching and caching it on a miss.
+
+        Parameters
+        ----------
+        s3_bucket : str
+            The S3 bucket that the manifest is stored in
+        manifest_key : str
+            The S3 key of the manifest
+        manifest_hash : str
+            The hash of the manifest, as recorded in the job's attachments
+        fetch : Callable[[], BaseAssetManifest]
+            Fetches and parses the manifest. Exceptions are propagated to the caller.
+
+        Returns
+        -------
+        BaseAssetManifest
+            A copy of the parsed manifest that the caller is free to modify.
+        """
+        key = _ManifestKey(
+            s3_bucket=s3_bucket, manifest_key=manifest_key, manifest_hash=manifest_hash
+        )
+        with self._lock:
+            if (manifest := self._get_entry(key)) is not None:
+                return _copy_manifest(manifest)
+            fetch_lock = self._fetch_locks.setdefault(key, Lock())
+
+        with fetch_lock:
+            with self._lock:
+                if (manifest := self._get_entry(key)) is not None:
+                    return _copy_manifest(manifest)
+            try:
+                manifest = fetch()
+                size = _estimated_size(manifest)
+                with self._lock:
+                    if size <= self._max_size_bytes:
+                        # Another fetch of the same manifest may have been cached meanwhile, if its
+                        # fetch lock was created after this one was released
+                        if (replaced := self._entries.pop(key, None)) is not None:
+                            self._size_bytes -= replaced[1]
+                        self._entries[key] = (manifest, size)
+                        self._size_bytes += size
+                        self._evict()
+            finally:
+                with self._lock:
+                    self._fetch_locks.pop(key, None)
+            return _copy_manifest(manifest)
+
+    def _get_entry(self, key: _ManifestKey) -> BaseAssetManifest | None:
+        """Returns a cached manifest and marks it as most recently used. The caller must hold
+        self._lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _evict(self) -> None:
+        """Removes least-recently used entries until the cache is within its size limit. The caller
+        must hold self._lock."""
+        while self._size_bytes > self._max_size_bytes:
+            key, (_, size) = self._entries.popitem(last=False)
+            self._size_bytes -= size
+            logger.debug("Evicted manifest %s from the Job Attachments manifest cache", key)
+
+
+def _estimated_size(manifest: BaseAssetManifest) -> int:
+    return sum(
+        _PATH_OVERHEAD_BYTES + len(manifest_path.path) + len(manifest_path.hash)
+        for manifest_path in manifest.paths
+    )
+
+
+def _copy_manifest(manifest: BaseAssetManifest) -> BaseAssetManifest:
+    manifest_copy = copy(manifest)
+    manifest_copy.paths = [copy(manifest_path) for manifest_path in manifest.paths]
+    return manifest_copy
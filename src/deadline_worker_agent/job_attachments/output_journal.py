@@ -0,0 +1,308 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Iterable, Optional
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+
+logger = getLogger(__name__)
+
+# Constants from <sys/inotify.h>
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_CREATE
+    | _IN_CLOSE_WRITE
+    | _IN_ATTRIB
+    | _IN_MOVED_TO
+    | _IN_MOVED_FROM
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+"""The fixed-size part of struct inotify_event: wd, mask, cookie, len"""
+
+_READ_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class OutputChanges:
+    """The files changed under the journal's output roots since the previous collection"""
+
+    tracked_roots: frozenset[Path]
+    """The output roots that were watched without interruption for the whole interval"""
+    files: frozenset[Path]
+
+    def files_under(self, root: Path) -> Optional[list[Path]]:
+        """Returns the changed files under an output root, or None if the root was not tracked for
+        the whole interval and must be walked instead.
+
+        Parameters
+        ----------
+        root : Path
+            The output root
+
+        Returns
+        -------
+        Optional[list[Path]]
+            The sorted paths of the changed files under the root, or None if they are unknown
+        """
+        if root not in self.tracked_roots:
+            return None
+        prefix = os.path.join(str(root), "")
+        return sorted(path for path in self.files if str(path).startswith(prefix))
+
+
+class OutputChangeJournal:
+    """Records the files written under a session's Job Attachments output directories.
+
+    Uses Linux inotify watches so that syncing the outputs of a task only needs to look at the
+    files that were written since the previous sync, instead of walking every output directory.
+
+    The output directories do not need to exist when they are watched. Their nearest existing
+    ancestor, up to a boundary directory (the session directory or the storage profile's mapped
+    root), is watched until they are created. Directories that are created or moved into an
+    output directory are watched as they appear, and the files already in them are recorded.
+
+    When the journal can not account for every change (the kernel's event queue overflowed, a
+    watched directory was moved, or the watch limit was reached), the next collection reports
+    the affected roots as untracked so that the caller falls back to walking them. A root is also
+    untracked for the first collection after it is watched, since the journal has no record of
+    what was written before then.
+
+    This class is only supported on Linux. It is safe to use from multiple threads.
+    """
+
+    _fd: int
+    _lock: Lock
+    _roots: dict[Path, Path]
+    """Output roots being watched, and the boundary directory of each"""
+    _installed: set[Path]
+    """Output roots whose watches were installed successfully"""
+    _tracked: set[Path]
+    """Output roots that have been watched since the previous collection"""
+    _dirs: dict[int, tuple[Path, bool]]
+    """Watched directories by watch descriptor, and whether each is within an output root (as
+    opposed to an ancestor of one)"""
+    _changed: set[Path]
+    _invalid: bool
+
+    def __init__(self) -> None:
+        if sys.platform != "linux":
+            raise NotImplementedError("The output change journal is only supported on Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._wake_r, self._wake_w = os.pipe()
+        self._lock = Lock()
+        self._roots = {}
+        self._installed = set()
+        self._tracked = set()
+        self._dirs = {}
+        self._changed = set()
+        self._invalid = False
+        self._closed = False
+        self._reader = Thread(target=self._read_events, name="OutputChangeJournal", daemon=True)
+        self._reader.start()
+
+    def watch(self, roots: Iterable[tuple[Path, Path]]) -> None:
+        """Starts watching output roots. Roots that are already watched are ignored.
+
+        Parameters
+        ----------
+        roots : Iterable[tuple[Path, Path]]
+            Pairs of output root and its boundary directory. Only the root and the directories
+            between the boundary and the root are watched.
+        """
+        with self._lock:
+            for root, boundary in roots:
+                if root in self._roots:
+                    continue
+                self._roots[root] = boundary
+                if self._install(root, record_files=False):
+                    self._installed.add(root)
+
+    def collect(self) -> OutputChanges:
+        """Returns the files changed since the previous collection and resets the journal.
+
+        Returns
+        -------
+        OutputChanges
+            The changed files, and the output roots for which they are complete
+        """
+        with self._lock:
+            self._drain()
+            if self._invalid:
+                logger.info("Output change journal is incomplete, falling back to a full scan")
+                self._reset()
+                tracked: frozenset[Path] = frozenset()
+            else:
+                tracked = frozenset(self._tracked)
+            changes = OutputChanges(tracked_roots=tracked, files=frozenset(self._changed))
+            self._changed = set()
+            self._tracked = set(self._installed)
+            return changes
+
+    def close(self) -> None:
+        """Removes all watches and stops the journal"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        os.write(self._wake_w, b"\0")
+        self._reader.join()
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+    def _read_events(self) -> None:
+        """Drains events as they arrive, so that the kernel's queue does not overflow and new
+        directories are watched promptly"""
+        while True:
+            select.select([self._fd, self._wake_r], [], [])
+            with self._lock:
+                if self._closed:
+                    return
+                self._drain()
+
+    def _drain(self) -> None:
+        """Reads and handles all queued events. The caller must hold self._lock."""
+        while True:
+            try:
+                buffer = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset : offset + name_len].rstrip(b"\0")
+                offset += name_len
+                self._handle_event(wd, mask, os.fsdecode(name))
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & _IN_Q_OVERFLOW:
+            self._invalid = True
+            return
+        if mask & _IN_IGNORED:
+            # The directory was removed. It is watched again if it is re-created.
+            self._dirs.pop(wd, None)
+            return
+        watched = self._dirs.get(wd)
+        if watched is None:
+            return
+        directory, in_tree = watched
+        if mask & _IN_MOVE_SELF or (mask & _IN_MOVED_FROM and mask & _IN_ISDIR):
+            # The paths of the watched directories below the moved one are no longer known
+            self._invalid = True
+            return
+        if mask & _IN_MOVED_FROM:
+            return
+
+        path = directory / name
+        if not mask & _IN_ISDIR:
+            if in_tree:
+                self._changed.add(path)
+        elif mask & (_IN_CREATE | _IN_MOVED_TO):
+            if in_tree:
+                self._watch_tree(path, record_files=True)
+            else:
+                for root in self._roots:
+                    if path == root or path in root.parents:
+                        self._install(root, record_files=True)
+
+    def _install(self, root: Path, *, record_files: bool) -> bool:
+        """Watches the directories from a root's boundary down to the root, and the root's tree if
+        it exists. The caller must hold self._lock.
+
+        Returns
+        -------
+        bool
+            True if the root is watched, False if it can not be
+        """
+        boundary = self._roots[root]
+        if root != boundary and boundary not in root.parents:
+            logger.warning("Not watching %s since it is outside of %s", root, boundary)
+            return False
+        if not boundary.is_dir():
+            return False
+        directory = boundary
+        try:
+            for part in root.relative_to(boundary).parts:
+                if not directory.is_dir():
+                    # The parent's watch reports when it is created
+                    return True
+                self._add_watch(directory, in_tree=False)
+                directory = directory / part
+            if root.is_dir():
+                self._watch_tree(root, record_files=record_files)
+        except FileNotFoundError:
+            # Removed while being watched. The parent's watch reports when it is re-created.
+            pass
+        except OSError as e:
+            logger.warning("Could not watch output directory %s: %s", root, e)
+            return False
+        return True
+
+    def _watch_tree(self, top: Path, *, record_files: bool) -> None:
+        """Watches a directory and all of its subdirectories. The caller must hold self._lock."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                self._add_watch(directory, in_tree=True)
+                # Scan after the watch is added so that no file created in between is missed
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        elif record_files:
+                            self._changed.add(Path(entry.path))
+            except FileNotFoundError:
+                # Removed before it could be watched
+                continue
+            except OSError as e:
+                if e.errno in (errno.ENOSPC, errno.EMFILE, errno.ENOMEM):
+                    logger.warning("Could not watch output directory %s: %s", directory, e)
+                    self._invalid = True
+                    return
+                raise
+
+    def _add_watch(self, directory: Path, *, in_tree: bool) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(directory))
+        previous = self._dirs.get(wd)
+        self._dirs[wd] = (directory, in_tree or (previous is not None and previous[1]))
+
+    def _reset(self) -> None:
+        """Re-installs all watches from scratch. The caller must hold self._lock."""
+        for wd in list(self._dirs):
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._dirs.clear()
+        # Discard the events of the removed watches
+        self._drain()
+        self._changed.clear()
+        self._invalid = False
+        self._installed = {root for root in self._roots if self._install(root, record_files=False)}
@@ -0,0 +1,288 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from logging import getLogger
+from threading import Condition
+from time import monotonic
+from typing import Iterator, Optional
+
+import psutil
+
+logger = getLogger(__name__)
+
+_DEFAULT_MAX_LEASE_STREAMS = 4
+"""The default for the most streams that a single transfer can run at once"""
+
+_ADJUST_INTERVAL_SECONDS = 5.0
+"""How often the concurrency limit is re-evaluated from the measured throughput"""
+
+_MIN_GAIN = 0.1
+"""The fraction that throughput must increase by for a higher concurrency limit to be kept"""
+
+_HOLD_SECONDS = 60.0
+"""How long the concurrency limit is held after a higher limit did not increase throughput,
+before a higher limit is tried again"""
+
+_LINK_SATURATION = 0.9
+"""The fraction of the network link's speed above which it is considered saturated"""
+
+_RATE_SMOOTHING = 0.3
+"""The weight of each progress report in a transfer's smoothed transfer rate. Progress is reported
+after every few files, so a single report's rate is noisy."""
+
+
+class TransferLease:
+    """A session's share of the Job Attachments transfer streams. Created by
+    JobAttachmentsTransferGovernor.transfer().
+
+    Parameters
+    ----------
+    governor : JobAttachmentsTransferGovernor
+        The governor that the lease is from.
+    """
+
+    _governor: JobAttachmentsTransferGovernor
+    _active: int
+    """The number of this transfer's streams that are running"""
+    _rate: Optional[float]
+    """The smoothed transfer rate, in bytes per second, or None until progress is reported"""
+
+    def __init__(self, governor: JobAttachmentsTransferGovernor) -> None:
+        self._governor = governor
+        self._active = 0
+        self._rate = None
+
+    @property
+    def concurrency(self) -> int:
+        """The number of streams that the transfer can currently run at once"""
+        return self._governor._lease_concurrency()
+
+    @property
+    def max_concurrency(self) -> int:
+        """The most streams that the transfer can ever run at once"""
+        return self._governor._max_lease_concurrency
+
+    @property
+    def rate(self) -> Optional[float]:
+        """The smoothed transfer rate, in bytes per second, or None until progress is reported"""
+        return self._rate
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Waits until the transfer can run another stream, and holds the slot for the stream"""
+        with self._governor._condition:
+            while self._active >= self.concurrency:
+                self._governor._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._governor._condition:
+                self._active -= 1
+                self._governor._condition.notify_all()
+
+    def record_transfer_rate(self, transfer_rate: float) -> None:
+        """Records a progress report's transfer rate.
+
+        Parameters
+        ----------
+        transfer_rate : float
+            The transfer rate since the previous progress report, in bytes per second.
+        """
+        self._governor._record_transfer_rate(self, transfer_rate)
+
+
+class JobAttachmentsTransferGovernor:
+    """Governs the concurrency of the Worker's Job Attachments transfers.
+
+    Transfers are made of streams: calls into the Job Attachments library that each transfer a part
+    of the files with the library's own concurrency. Each session's transfer holds a lease for its
+    duration, and the governor splits a worker-wide limit on the number of running streams evenly
+    between the leases. The limit starts at one stream for each transfer, which is how the library
+    transfers without the governor, and is adjusted by hill-climbing on the aggregate throughput
+    that the transfers report: it is raised a step at a time for as long as that increases
+    throughput, then held, and raised again after a while in case conditions changed.
+    While the host's network link is saturated, as measured by its network counters, the limit is
+    not raised, and a higher limit that saturated it is reverted, since more concurrent streams
+    would only compete for the same bandwidth.
+
+    This class is safe to use from multiple threads.
+
+    Parameters
+    ----------
+    initial_lease_concurrency : int
+        The number of streams that each transfer runs at once before the limit is adjusted.
+    max_lease_concurrency : int
+        The most streams that a single transfer can run at once.
+    max_total_concurrency : Optional[int]
+        The most streams that the Worker runs at once across all transfers. Defaults to twice
+        max_lease_concurrency.
+    link_speed_bytes_per_second : Optional[float]
+        The speed of the host's network link. Defaults to the speed of the fastest network
+        interface that is up, where the operating system reports it.
+    """
+
+    _initial_lease_concurrency: int
+    _max_lease_concurrency: int
+    _max_total_concurrency: int
+    _link_speed: Optional[float]
+    _limit: int
+    _leases: list[TransferLease]
+    _condition: Condition
+    _next_adjustment: float
+    _baseline: Optional[float]
+    """The throughput at the current limit, or None until it is measured"""
+    _probing_from: Optional[int]
+    """The limit before it was raised to probe for more throughput, or None when not probing"""
+    _hold_until: float
+    _last_net_bytes: Optional[tuple[float, int]]
+    """When the host's network counters were last read, and their total bytes then"""
+
+    def __init__(
+        self,
+        *,
+        initial_lease_concurrency: int = 1,
+        max_lease_concurrency: int = _DEFAULT_MAX_LEASE_STREAMS,
+        max_total_concurrency: Optional[int] = None,
+        link_speed_bytes_per_second: Optional[float] = None,
+    ) -> None:
+        if max_total_concurrency is None:
+            max_total_concurrency = 2 * max_lease_concurrency
+        if min(initial_lease_concurrency, max_lease_concurrency, max_total_concurrency) <= 0:
+            raise ValueError(
+                "Concurrency limits must be positive, but got"
+                f" {initial_lease_concurrency}, {max_lease_concurrency} and {max_total_concurrency}"
+            )
+        if link_speed_bytes_per_second is None:
+            link_speed_bytes_per_second = _detect_link_speed()
+        self._max_lease_concurrency = max_lease_concurrency
+        self._max_total_concurrency = max_total_concurrency
+        self._initial_lease_concurrency = min(initial_lease_concurrency, max_lease_concurrency)
+        self._link_speed = link_speed_bytes_per_second
+        self._limit = min(self._initial_lease_concurrency, max_total_concurrency)
+        self._leases = []
+        self._condition = Condition()
+        self._next_adjustment = 0.0
+        self._baseline = None
+        self._probing_from = None
+        self._hold_until = 0.0
+        self._last_net_bytes = None
+
+    @property
+    def limit(self) -> int:
+        """The number of streams that the Worker currently runs at once across all transfers"""
+        with self._condition:
+            return self._limit
+
+    @contextmanager
+    def transfer(self) -> Iterator[TransferLease]:
+        """Holds a lease on the transfer concurrency for the duration of a session's transfer"""
+        lease = TransferLease(self)
+        with self._condition:
+            self._leases.append(lease)
+            # A new transfer never gets less than it would without the governor, as far as the
+            # worker-wide cap allows
+            self._limit = max(
+                self._limit,
+                min(
+                    self._max_total_concurrency, self._initial_lease_concurrency * len(self._leases)
+                ),
+            )
+            self._restart_measurement()
+        try:
+            yield lease
+        finally:
+            with self._condition:
+                self._leases.remove(lease)
+                self._restart_measurement()
+                self._condition.notify_all()
+
+    def _lease_concurrency(self) -> int:
+        with self._condition:
+            share = self._limit // max(1, len(self._leases))
+            return max(1, min(self._max_lease_concurrency, share))
+
+    def _restart_measurement(self) -> None:
+        # The throughput of a different set of transfers is not comparable with the baseline
+        self._baseline = None
+        self._next_adjustment = monotonic() + _ADJUST_INTERVAL_SECONDS
+
+    def _record_transfer_rate(self, lease: TransferLease, transfer_rate: float) -> None:
+        with self._condition:
+            if lease._rate is None:
+                lease._rate = transfer_rate
+            else:
+                lease._rate += _RATE_SMOOTHING * (transfer_rate - lease._rate)
+            now = monotonic()
+            if now >= self._next_adjustment:
+                self._next_adjustment = now + _ADJUST_INTERVAL_SECONDS
+                self._adjust(now)
+
+    def _adjust(self, now: float) -> None:
+        throughput = sum(lease._rate for lease in self._leases if lease._rate is not None)
+        previous_limit = self._limit
+
+        if self._link_saturated(now):
+            if self._probing_from is not None:
+                self._limit = self._probing_from
+                self._probing_from = None
+            self._baseline = None
+            self._hold_until = now + _HOLD_SECONDS
+        elif self._baseline is None:
+            self._baseline = throughput
+        elif self._probing_from is not None:
+            if throughput >= self._baseline * (1 + _MIN_GAIN):
+                self._baseline = throughput
+            else:
+                self._limit = self._probing_from
+                self._baseline = None
+                self._hold_until = now + _HOLD_SECONDS
+            self._probing_from = None
+        elif now >= self._hold_until and self._limit < self._max_total_concurrency:
+            self._probing_from = self._limit
+            self._limit = min(self._max_total_concurrency, self._limit + max(1, self._limit // 2))
+        else:
+            self._baseline = throughput
+
+        if self._limit != previous_limit:
+            logger.info(
+                "Job Attachments transfer concurrency changed from %d to %d (throughput %.1f MB/s)",
+                previous_limit,
+                self._limit,
+                throughput / 1_000_000,
+            )
+            self._condition.notify_all()
+
+    def _link_saturated(self, now: float) -> bool:
+        try:
+            counters = psutil.net_io_counters()
+        except Exception:
+            return False
+        if counters is None:
+            return False
+        net_bytes = counters.bytes_sent + counters.bytes_recv
+        last = self._last_net_bytes
+        self._last_net_bytes = (now, net_bytes)
+        if self._link_speed is None or last is None or now <= last[0]:
+            return False
+        host_throughput = (net_bytes - last[1]) / (now - last[0])
+        return host_throughput >= _LINK_SATURATION * self._link_speed
+
+
+def _detect_link_speed() -> Optional[float]:
+    """Returns the speed, in bytes per second, of the fastest network interface that is up, or
+    None if the operating system does not report it"""
+    try:
+        stats = psutil.net_if_stats()
+    except Exception:
+        return None
+    speeds_mbps = [
+        nic.speed
+        for name, nic in stats.items()
+        if nic.isup and nic.speed > 0 and not name.lower().startswith(("lo", "loopback"))
+    ]
+    if not speeds_mbps:
+        return None
+    return max(speeds_mbps) * 1_000_000 / 8
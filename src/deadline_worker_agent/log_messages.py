@@ -25,10 +25,17 @@ if TYPE_CHECKING:
 
 
 class BaseLogEvent:
+    # A log event is created for every line that is logged, so the events are slotted. Attributes
+    # that are the same for every event of a type are class attributes.
+    __slots__ = ("exc_text",)
+
     ti: Optional[str] = None
     type: Optional[str] = None
     subtype: Optional[str] = None
-    exc_text: Optional[str] = None
+    exc_text: Optional[str]
+
+    def __init__(self) -> None:
+        self.exc_text = None
 
     def desc(self) -> str:
         dd = BaseLogEvent.asdict(self)
@@ -47,9 +54,14 @@ class BaseLogEvent:
         return fmt_str % dd
 
     def asdict(self) -> dict[str, Any]:
-        return {
-            k: getattr(self, k) for k in ("ti", "type", "subtype") if getattr(self, k) is not None
-        }
+        dd: dict[str, Any] = {}
+        if self.ti is not None:
+            dd["ti"] = self.ti
+        if self.type is not None:
+            dd["type"] = self.type
+        if self.subtype is not None:
+            dd["subtype"] = self.subtype
+        return dd
 
     def add_exception_to_dict(self, d: dict[str, Any]) -> dict[str, Any]:
         if self.exc_text:
@@ -70,9 +82,12 @@ class StringLogEvent(BaseLogEvent):
     logger.critical()
     """
 
+    __slots__ = ("msg",)
+
     msg: str
 
     def __init__(self, message: str) -> None:
+        super().__init__()
         self.msg = message
 
     def getMessage(self) -> str:
@@ -84,10 +99,9 @@ class StringLogEvent(BaseLogEvent):
 
 
 class AgentInfoLogEvent(BaseLogEvent):
-    type = "AgentInfo"
+    __slots__ = ()
 
-    def __init__(self) -> None:
-        pass
+    type = "AgentInfo"
 
     def getMessage(self) -> str:
         info = self.asdict()
@@ -136,14 +150,18 @@ class AgentInfoLogEvent(BaseLogEvent):
 
 class MetricsLogEventSubtype(str, Enum):
     SYSTEM = "System"
+    DEADLINE_API = "DeadlineApi"
 
 
 class MetricsLogEvent(BaseLogEvent):
     ti = "📊"
     type = "Metrics"
+    __slots__ = ("subtype", "metrics")
+
     metrics: dict[str, str]
 
     def __init__(self, *, subtype: MetricsLogEventSubtype, metrics: dict[str, str]) -> None:
+        super().__init__()
         self.subtype = subtype.value
         self.metrics = metrics
 
@@ -169,6 +187,12 @@ class WorkerLogEventOp(str, Enum):
 class WorkerLogEvent(BaseLogEvent):
     ti = "💻"
     type = "Worker"
+    __slots__ = ("subtype", "farm_id", "fleet_id", "worker_id", "msg")
+
+    farm_id: str
+    fleet_id: str
+    worker_id: Optional[str]
+    msg: str
 
     def __init__(
         self,
@@ -179,6 +203,7 @@ class WorkerLogEvent(BaseLogEvent):
         worker_id: Optional[str] = None,
         message: str,
     ) -> None:
+        super().__init__()
         self.subtype = op.value
         self.farm_id = farm_id
         self.fleet_id = fleet_id
@@ -211,10 +236,14 @@ class FilesystemLogEventOp(str, Enum):
 class FilesystemLogEvent(BaseLogEvent):
     ti = "💾"
     type = "FileSystem"
+    __slots__ = ("subtype", "filepath", "msg")
+
+    filepath: str
     msg: str
     fmt = "%(message)s [%(filepath)s]"
 
     def __init__(self, *, op: FilesystemLogEventOp, filepath: str | Path, message: str) -> None:
+        super().__init__()
         self.subtype = op.value
         self.filepath = str(filepath)
         self.msg = message
@@ -243,11 +272,13 @@ class AwsCredentialsLogEvent(BaseLogEvent):
 
     ti = "🔑"
     type = "AWSCreds"
+    __slots__ = ("subtype", "resource", "role_arn", "msg", "expiry", "scheduled_time")
+
     resource: str
     msg: str
-    role_arn: Optional[str] = None  # For Queue credentials
-    expiry: Optional[str] = None  # For Query & refresh
-    scheduled_time: Optional[str] = None  # For Refresh
+    role_arn: Optional[str]  # For Queue credentials
+    expiry: Optional[str]  # For Query & refresh
+    scheduled_time: Optional[str]  # For Refresh
 
     def __init__(
         self,
@@ -259,6 +290,7 @@ class AwsCredentialsLogEvent(BaseLogEvent):
         expiry: Optional[str] = None,
         scheduled_time: Optional[str] = None,
     ) -> None:
+        super().__init__()
         self.subtype = op.value
         self.resource = resource
         self.role_arn = role_arn
@@ -296,11 +328,12 @@ class ApiRequestLogEvent(BaseLogEvent):
     ti = "📤"
     type = "API"
     subtype = "Req"
+    __slots__ = ("operation", "request_url", "params", "deadline_resource")
 
     operation: str
     request_url: str
     params: Union[dict[str, Any], str]
-    deadline_resource: Optional[dict[str, str]] = None
+    deadline_resource: Optional[dict[str, str]]
 
     def __init__(
         self,
@@ -310,6 +343,7 @@ class ApiRequestLogEvent(BaseLogEvent):
         params: Union[dict[str, Any], str],
         deadline_resource: Optional[dict[str, str]] = None,
     ) -> None:
+        super().__init__()
         self.operation = operation
         self.request_url = request_url
         self.params = params
@@ -341,13 +375,14 @@ class ApiResponseLogEvent(BaseLogEvent):
     ti = "📥"
     type = "API"
     subtype = "Resp"
+    __slots__ = ("operation", "params", "error", "status_code", "request_id")
 
     operation: str
     status_code: str
     request_id: str
     params: Union[dict[str, Any], str]
     # We might have an error, but we always have parameters.
-    error: Optional[dict[str, str]] = None
+    error: Optional[dict[str, str]]
 
     def __init__(
         self,
@@ -358,6 +393,7 @@ class ApiResponseLogEvent(BaseLogEvent):
         request_id: str,
         error: Optional[dict[str, str]] = None,
     ) -> None:
+        super().__init__()
         self.operation = operation
         self.params = params
         self.error = error
@@ -397,10 +433,23 @@ class SessionLogEventSubtype(str, Enum):
 class SessionLogEvent(BaseLogEvent):
     ti = "🔷"
     type = "Session"
+    __slots__ = (
+        "subtype",
+        "session_id",
+        "queue_id",
+        "job_id",
+        "user",
+        "msg",
+        "action_ids",
+        "log_dest",
+        "queued_action_count",
+    )
+
     queue_id: str
     job_id: str
     session_id: str
     user: Optional[str]
+    msg: str
     action_ids: Optional[list[str]]  # for Add/Cancel
     log_dest: Optional[str]
     queued_action_count: Optional[int]
@@ -418,6 +467,7 @@ class SessionLogEvent(BaseLogEvent):
         log_dest: Optional[str] = None,
         queued_action_count: Optional[int] = None,
     ) -> None:
+        super().__init__()
         self.subtype = subtype.value
         self.session_id = session_id
         self.queue_id = queue_id
@@ -479,6 +529,19 @@ class SessionActionLogKind(str, Enum):
 
 class SessionActionLogEvent(BaseLogEvent):
     type = "Action"
+    __slots__ = (
+        "ti",
+        "subtype",
+        "session_id",
+        "kind",
+        "queue_id",
+        "job_id",
+        "step_id",
+        "task_id",
+        "action_id",
+        "msg",
+        "status",
+    )
 
     queue_id: str
     job_id: str
@@ -504,6 +567,7 @@ class SessionActionLogEvent(BaseLogEvent):
         message: str,
         status: Optional[str] = None,
     ) -> None:
+        super().__init__()
         if subtype in (SessionActionLogEventSubtype.START,):
             self.ti = "🟢"
         elif subtype in (
@@ -680,7 +744,7 @@ class LogRecordStringTranslationFilter(logging.Filter):
                 "level": record.levelname,
             }
             if isinstance(record.msg, BaseLogEvent):
-                structure.update(**record.msg.asdict())
+                structure.update(record.msg.asdict())
             else:
                 structure.update(msg=record.getMessage())
             record.json = json.dumps(structure, ensure_ascii=False)
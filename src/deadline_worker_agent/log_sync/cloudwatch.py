@@ -9,14 +9,24 @@ from contextlib import contextmanager
 from datetime import datetime, timedelta
 from functools import partial
 from logging import Formatter, Handler, Logger, LogRecord
-from threading import Event, Thread
+from operator import attrgetter
+from threading import Condition, Event, Thread, current_thread
 from time import monotonic, sleep
 from types import TracebackType
 from typing import Any, Deque, Generator, NamedTuple, Type
 
+from botocore.exceptions import (
+    ClientError,
+    ConnectionError as BotocoreConnectionError,
+    CredentialRetrievalError,
+    HTTPClientError,
+    NoCredentialsError,
+)
+from botocore.retries.standard import RetryContext
 from typing_extensions import TypedDict
 
 from .loggers import logger as _logger
+from ..boto import NoOverflowExponentialBackoff as Backoff
 from ..log_messages import LogRecordStringTranslationFilter
 
 __all__ = [
@@ -49,11 +59,28 @@ PUT_LOG_EVENTS_CONSTRAINTS = PutLogEventsConstraints(
     max_time_span_in_batch=timedelta(hours=24),
 )
 PUT_LOG_EVENTS_EVENT_PADDING = 26
+_MAX_TIME_SPAN_IN_BATCH_MS = PUT_LOG_EVENTS_CONSTRAINTS.max_time_span_in_batch // timedelta(
+    milliseconds=1
+)
 
 
 class FormattedLogEntry(NamedTuple):
     timestamp: int
     message: str
+    size: int | None = None
+    """The size of the message in bytes when encoded to UTF-8, or None if it is not known"""
+
+
+def _utf8_size(message: str) -> int | None:
+    """Returns the size of a string in bytes when encoded to UTF-8, or None if it can not be
+    encoded. ASCII strings are measured without encoding them."""
+    if message.isascii():
+        return len(message)
+    try:
+        return len(message.encode("utf-8"))
+    except UnicodeEncodeError:
+        # Left for the CloudWatchLogEventPartitioner to report
+        return None
 
 
 class CloudWatchLogEvent(TypedDict):
@@ -62,9 +89,12 @@ class CloudWatchLogEvent(TypedDict):
 
 
 class PartitionedCloudWatchLogEvent(NamedTuple):
-    """A log event that has been processed by the CloudWatchLogEventPartitioner"""
+    """A log event that has been processed by the CloudWatchLogEventPartitioner. It is converted to
+    a CloudWatchLogEvent only when its batch is uploaded, so that a pending event is a single
+    tuple."""
 
-    log_event: CloudWatchLogEvent
+    timestamp: int
+    message: str
     size: int
 
 
@@ -94,10 +124,15 @@ class CloudWatchLogEventBatch:
     min_timestamp_ms: int | None
     max_timestamp_ms: int | None
 
+    _size: int
+    _chronological: bool
+
     def __init__(self) -> None:
         self.log_events = []
         self.min_timestamp_ms = None
         self.max_timestamp_ms = None
+        self._size = 0
+        self._chronological = True
 
     def add(self, processed_log_event: PartitionedCloudWatchLogEvent) -> None:
         """
@@ -112,18 +147,16 @@ class CloudWatchLogEventBatch:
         """
         self._validate_log_event_can_be_added(processed_log_event)
 
-        if (
-            self.min_timestamp_ms is None
-            or processed_log_event.log_event["timestamp"] < self.min_timestamp_ms
-        ):
-            self.min_timestamp_ms = processed_log_event.log_event["timestamp"]
-        if (
-            self.max_timestamp_ms is None
-            or processed_log_event.log_event["timestamp"] > self.max_timestamp_ms
-        ):
-            self.max_timestamp_ms = processed_log_event.log_event["timestamp"]
+        timestamp = processed_log_event.timestamp
+        if self.min_timestamp_ms is None or timestamp < self.min_timestamp_ms:
+            self.min_timestamp_ms = timestamp
+        if self.max_timestamp_ms is None or timestamp > self.max_timestamp_ms:
+            self.max_timestamp_ms = timestamp
+        elif timestamp < self.max_timestamp_ms:
+            self._chronological = False
 
         self.log_events.append(processed_log_event)
+        self._size += processed_log_event.size + PUT_LOG_EVENTS_EVENT_PADDING
 
     def _validate_log_event_can_be_added(self, event: PartitionedCloudWatchLogEvent) -> None:
         """
@@ -149,14 +182,15 @@ class CloudWatchLogEventBatch:
             raise CloudWatchLogEventRejectedException(batch_full=True, reason=None)
 
         now = datetime.now()
+        timestamp_ms = event.timestamp
         # datetime expects timestamp in seconds, convert log event timestamp which is in milliseconds
-        log_event_time = datetime.fromtimestamp(event.log_event["timestamp"] / 1000)
+        log_event_time = datetime.fromtimestamp(timestamp_ms / 1000)
 
         def _log_event_preview() -> CloudWatchLogEvent:
             return CloudWatchLogEvent(
-                timestamp=event.log_event["timestamp"],
+                timestamp=event.timestamp,
                 # Truncate preview message to 100 chars (size chosen arbitrarily)
-                message=f"{event.log_event['message'][0:100]} (truncated)",
+                message=f"{event.message[0:100]} (truncated)",
             )
 
         # Verify log event is not too far in the future
@@ -166,17 +200,17 @@ class CloudWatchLogEventBatch:
                 reason=f"Ignoring log event that is too far in the future (max {PUT_LOG_EVENTS_CONSTRAINTS.max_future_time_delta.total_seconds()}s): {_log_event_preview()}",
             )
 
-        # Verify events in batch do not span more than allowed time span
-        min_datetime = log_event_time
-        if self.min_datetime and self.min_datetime < min_datetime:
-            min_datetime = self.min_datetime
+        # Verify events in batch do not span more than allowed time span. This is compared in
+        # milliseconds to avoid creating datetime objects for every event that is added.
+        min_timestamp_ms = timestamp_ms
+        if self.min_timestamp_ms is not None and self.min_timestamp_ms < min_timestamp_ms:
+            min_timestamp_ms = self.min_timestamp_ms
 
-        max_datetime = log_event_time
-        if self.max_datetime and self.max_datetime > max_datetime:
-            max_datetime = self.max_datetime
+        max_timestamp_ms = timestamp_ms
+        if self.max_timestamp_ms is not None and self.max_timestamp_ms > max_timestamp_ms:
+            max_timestamp_ms = self.max_timestamp_ms
 
-        batch_timespan = max_datetime - min_datetime
-        if batch_timespan > PUT_LOG_EVENTS_CONSTRAINTS.max_time_span_in_batch:
+        if max_timestamp_ms - min_timestamp_ms > _MAX_TIME_SPAN_IN_BATCH_MS:
             raise CloudWatchLogEventRejectedException(
                 batch_full=False,
                 reason=f"Ignoring log event that would exceed the max allowed time span in a batch of {PUT_LOG_EVENTS_CONSTRAINTS.max_time_span_in_batch.total_seconds()}s: {_log_event_preview()}",
@@ -192,7 +226,12 @@ class CloudWatchLogEventBatch:
 
     @property
     def size(self) -> int:
-        return sum(log_event.size + PUT_LOG_EVENTS_EVENT_PADDING for log_event in self.log_events)
+        return self._size
+
+    @property
+    def chronological(self) -> bool:
+        """Whether the log events were added in chronological order"""
+        return self._chronological
 
     @property
     def count(self) -> int:
@@ -230,14 +269,24 @@ class CloudWatchLogEventPartitioner:
     Class that returns partitioned CloudWatch log event records that meet CloudWatch service criteria
     for the maximum size of log events.
     See: https://docs.aws.amazon.com/AmazonCloudWatchLogs/latest/APIReference/API_PutLogEvents.html
+
+    If a packing window is given, consecutive raw log events whose timestamps are within the window
+    of the first are packed into a single newline-separated log event, up to the maximum size of a
+    log event. The packed event has the earliest timestamp of the events it contains.
     """
 
     _partitioned_event_deque: Deque[PartitionedCloudWatchLogEvent]
     _raw_event_deque: Deque[FormattedLogEntry]
+    _packing_window_ms: int | None
 
-    def __init__(self, raw_deque: Deque[FormattedLogEntry]) -> None:
+    def __init__(
+        self,
+        raw_deque: Deque[FormattedLogEntry],
+        packing_window_ms: int | None = None,
+    ) -> None:
         self._raw_event_deque = raw_deque
         self._partitioned_event_deque = deque()
+        self._packing_window_ms = packing_window_ms
 
     def next(self) -> PartitionedCloudWatchLogEvent:
         try:
@@ -253,10 +302,8 @@ class CloudWatchLogEventPartitioner:
                     err_msg = f"Failed to process raw log event: {e}\n\nSkipping event..."
                     self._partitioned_event_deque.appendleft(
                         PartitionedCloudWatchLogEvent(
-                            log_event=CloudWatchLogEvent(
-                                timestamp=e.log_event.timestamp,
-                                message=err_msg,
-                            ),
+                            timestamp=e.log_event.timestamp,
+                            message=err_msg,
                             size=len(err_msg.encode("utf-8")),
                         )
                     )
@@ -282,6 +329,19 @@ class CloudWatchLogEventPartitioner:
         """
         # raises: IndexError - we let this propagate up to indicate that there are no more events
         raw_event = self._raw_event_deque.popleft()
+        if self._packing_window_ms is not None:
+            raw_event = self._pack(raw_event, self._packing_window_ms)
+
+        # Most log events are measured when they are emitted and are well within the max size
+        if (
+            raw_event.size is not None
+            and raw_event.size <= PUT_LOG_EVENTS_CONSTRAINTS.max_log_event_size
+        ):
+            return [
+                PartitionedCloudWatchLogEvent(
+                    timestamp=raw_event.timestamp, message=raw_event.message, size=raw_event.size
+                )
+            ]
 
         # Chunk the string in case we're over the max size of a log event in CloudWatch so we can
         # split up the log event into multiple chunks that fit into that max size.
@@ -299,13 +359,50 @@ class CloudWatchLogEventPartitioner:
             ) from e
 
         return [
-            PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(timestamp=raw_event.timestamp, message=msg),
-                size=size,
-            )
+            PartitionedCloudWatchLogEvent(timestamp=raw_event.timestamp, message=msg, size=size)
             for msg, size in message_chunks
         ]
 
+    def _pack(self, first: FormattedLogEntry, window_ms: int) -> FormattedLogEntry:
+        """
+        Packs the raw log events that follow a raw log event into it, for as long as they are within
+        the packing window of the first event and the packed message fits in a single log event.
+
+        Args:
+            first (FormattedLogEntry): The raw log event that was taken from the queue
+            window_ms (int): The packing window in milliseconds
+
+        Returns:
+            FormattedLogEntry: The packed raw log event
+        """
+        max_size = PUT_LOG_EVENTS_CONSTRAINTS.max_log_event_size
+        if first.size is None or first.size >= max_size:
+            return first
+
+        messages = [first.message]
+        size = first.size
+        timestamp = first.timestamp
+        raw_event_deque = self._raw_event_deque
+        # Only this thread removes events from the deque, so the event that is peeked at is the
+        # one that is removed
+        while raw_event_deque:
+            candidate = raw_event_deque[0]
+            if (
+                candidate.size is None
+                or abs(candidate.timestamp - first.timestamp) > window_ms
+                or size + 1 + candidate.size > max_size
+            ):
+                break
+            raw_event_deque.popleft()
+            messages.append(candidate.message)
+            size += 1 + candidate.size
+            if candidate.timestamp < timestamp:
+                timestamp = candidate.timestamp
+
+        if len(messages) == 1:
+            return first
+        return FormattedLogEntry(timestamp=timestamp, message="\n".join(messages), size=size)
+
     @property
     def has_items(self) -> bool:
         return len(self._partitioned_event_deque) > 0 or len(self._raw_event_deque) > 0
@@ -334,6 +431,9 @@ class CloudWatchLogEventPartitioner:
             size >= 4
         ), f"Chunk size too small ({size}). Must be at least 4 bytes to handle all UTF-8 characters."
 
+        if s.isascii() and len(s) <= size:
+            return [(s, len(s))]
+
         start = 0
         chunks: list[tuple[str, int]] = []
         s_utf8 = s.encode("utf-8")
@@ -361,6 +461,139 @@ class CloudWatchLogEventPartitioner:
         return chunks
 
 
+class CloudWatchOutageDetector:
+    """
+    Detects when CloudWatch Logs can not be reached (e.g. during a service outage, or when the
+    Worker's AWS Credentials have expired) from the PutLogEvents requests of all log streams.
+
+    After OUTAGE_FAILURE_THRESHOLD consecutive requests fail with errors that indicate an outage
+    (connection errors, server errors, throttling and credential errors), whichever stream it may
+    be that sends them, the detector considers CloudWatch Logs to be unavailable. Errors with a
+    single stream's request are not counted. During an outage only one
+    stream at a time sends a request, which probes whether CloudWatch Logs is available again,
+    and the other streams wait for it. The first request that succeeds ends the outage.
+    """
+
+    OUTAGE_FAILURE_THRESHOLD = 3
+    POLL_INTERVAL_SECONDS = 1.0
+
+    _condition: Condition
+    _consecutive_failures: int
+    _in_outage: bool
+    _prober: Thread | None
+
+    def __init__(self) -> None:
+        self._condition = Condition()
+        self._consecutive_failures = 0
+        self._in_outage = False
+        self._prober = None
+
+    @property
+    def in_outage(self) -> bool:
+        """Whether CloudWatch Logs is considered to be unavailable"""
+        return self._in_outage
+
+    def wait_for_turn(self, stop_event: Event) -> None:
+        """
+        Called before sending a PutLogEvents request. During an outage, waits until it ends or until
+        no other stream is probing, in which case the calling stream becomes the prober.
+
+        Args:
+            stop_event (threading.Event): Stop waiting once this is set, so that a stream that is
+                flushing its remaining log events is not held up by the outage.
+        """
+        this_thread = current_thread()
+        with self._condition:
+            while (
+                self._in_outage
+                and self._prober is not None
+                and self._prober is not this_thread
+                and self._prober.is_alive()
+                and not stop_event.is_set()
+            ):
+                self._condition.wait(CloudWatchOutageDetector.POLL_INTERVAL_SECONDS)
+            if self._in_outage and (self._prober is None or not self._prober.is_alive()):
+                self._prober = this_thread
+
+    def record_result(self, *, success: bool) -> None:
+        """
+        Called with the result of a PutLogEvents request.
+
+        Args:
+            success (bool): Whether the request succeeded
+        """
+        with self._condition:
+            if success:
+                self._consecutive_failures = 0
+                self._prober = None
+                if self._in_outage:
+                    self._in_outage = False
+                    _logger.info("CloudWatch Logs is available again. Resuming log uploads.")
+                self._condition.notify_all()
+            else:
+                self._consecutive_failures += 1
+                if (
+                    not self._in_outage
+                    and self._consecutive_failures
+                    >= CloudWatchOutageDetector.OUTAGE_FAILURE_THRESHOLD
+                ):
+                    self._in_outage = True
+                    # The stream that detected the outage probes until it ends. It keeps probing
+                    # after each failure so that the streams do not take turns probing.
+                    self._prober = current_thread()
+                    _logger.warning(
+                        "CloudWatch Logs appears to be unavailable. Pausing log uploads until it can"
+                        " be reached again."
+                    )
+
+    def release(self) -> None:
+        """Called by a stream that stops retrying a PutLogEvents request, so that another stream
+        can probe in its place"""
+        with self._condition:
+            if self._prober is current_thread():
+                self._prober = None
+                self._condition.notify_all()
+
+
+_OUTAGE_DETECTOR = CloudWatchOutageDetector()
+"""The outage detector that is shared by the log streams of the Worker"""
+
+_OUTAGE_ERROR_CODES = frozenset(
+    (
+        # Throttling
+        "Throttling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+        # Expired or invalid credentials
+        "ExpiredToken",
+        "ExpiredTokenException",
+        "InvalidClientTokenId",
+        "UnrecognizedClientException",
+    )
+)
+
+
+def _is_outage_error(error: Exception) -> bool:
+    """
+    Returns whether a PutLogEvents error indicates that CloudWatch Logs can not be reached by any
+    stream, as opposed to an error with the request of a single stream (e.g. an invalid parameter
+    or a deleted log stream).
+    """
+    if isinstance(
+        error,
+        (BotocoreConnectionError, HTTPClientError, NoCredentialsError, CredentialRetrievalError),
+    ):
+        return True
+    if isinstance(error, ClientError):
+        status_code = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        code = error.response.get("Error", {}).get("Code", "")
+        return status_code >= 500 or status_code == 429 or code in _OUTAGE_ERROR_CODES
+    return False
+
+
 class CloudWatchLogStreamThread(Thread):
     """
     A thread that is responsible for reading log events from a queue and publishing them to a
@@ -378,7 +611,9 @@ class CloudWatchLogStreamThread(Thread):
 
     MAX_PUT_LOG_EVENTS_PER_STREAM_SEC = 5
     PUT_LOG_EVENTS_ERROR_DELAY_SECONDS = 1
+    PUT_LOG_EVENTS_ERROR_MAX_DELAY_SECONDS = 60
     PUT_LOG_EVENTS_ERROR_STOPPED_RETRIES = 5
+    PUT_LOG_EVENTS_ERROR_LOG_INTERVAL_SECONDS = 60
 
     _logs_client: Any
     _log_event_partitioner: CloudWatchLogEventPartitioner
@@ -386,6 +621,10 @@ class CloudWatchLogStreamThread(Thread):
     _log_stream_name: str
     _prev_request_times: Deque[float]
     _stop_event: Event
+    _outage_detector: CloudWatchOutageDetector
+    _error_backoff: Backoff
+    _last_error_logged_at: float | None
+    _suppressed_errors: int
 
     def __init__(
         self,
@@ -395,6 +634,8 @@ class CloudWatchLogStreamThread(Thread):
         log_group_name: str,
         log_stream_name: str,
         stop_event: Event,
+        packing_window_ms: int | None = None,
+        outage_detector: CloudWatchOutageDetector | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -412,13 +653,27 @@ class CloudWatchLogStreamThread(Thread):
             stop_event (threading.Event):
                 An event to signal that the thread should flush the remaining logs in the queue
                 and exit
+            packing_window_ms (int | None):
+                If not None, consecutive log events emitted within this many milliseconds of each
+                other are packed into a single CloudWatch log event
+            outage_detector (CloudWatchOutageDetector | None):
+                The outage detector to share with other log streams. Defaults to the one that is
+                shared by all of the Worker's log streams.
         """
         self._logs_client = logs_client
-        self._log_event_partitioner = CloudWatchLogEventPartitioner(raw_deque=log_event_queue)
+        self._log_event_partitioner = CloudWatchLogEventPartitioner(
+            raw_deque=log_event_queue, packing_window_ms=packing_window_ms
+        )
         self._log_group_name = log_group_name
         self._log_stream_name = log_stream_name
         self._stop_event = stop_event
         self._prev_request_times: Deque[float] = deque()
+        self._outage_detector = outage_detector or _OUTAGE_DETECTOR
+        self._error_backoff = Backoff(
+            max_backoff=CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_MAX_DELAY_SECONDS
+        )
+        self._last_error_logged_at = None
+        self._suppressed_errors = 0
 
         super().__init__(*args, **kwargs)
 
@@ -469,10 +724,8 @@ class CloudWatchLogStreamThread(Thread):
                         # Send the rejection reason to the session log
                         self._log_event_partitioner.appendleft(
                             PartitionedCloudWatchLogEvent(
-                                log_event=CloudWatchLogEvent(
-                                    timestamp=log_event.log_event["timestamp"],
-                                    message=e.reason,
-                                ),
+                                timestamp=log_event.timestamp,
+                                message=e.reason,
                                 size=len(e.reason.encode("utf-8")),
                             )
                         )
@@ -485,13 +738,19 @@ class CloudWatchLogStreamThread(Thread):
         # Different threads can log concurrently and the log events in the resulting list ordering
         # can become non-chronological. We must sort the list by timestamp.
         #
-        # Python's sorted() is a stable sort, so the ordering of log events from the same ordering
+        # Python's sort is stable, so the ordering of log events from the same ordering
         # will be preserved. See:
         # https://docs.python.org/3/howto/sorting.html#sort-stability-and-complex-sorts
-        log_events = [processed_log_event.log_event for processed_log_event in batch.log_events]
-        log_events = sorted(log_events, key=lambda log_event: log_event["timestamp"])
+        #
+        # Log events are almost always added in order, in which case sorting is skipped.
+        processed_log_events = batch.log_events
+        if not batch.chronological:
+            processed_log_events.sort(key=attrgetter("timestamp"))
 
-        return log_events
+        return [
+            CloudWatchLogEvent(timestamp=timestamp, message=message)
+            for timestamp, message, _ in processed_log_events
+        ]
 
     def _upload_logs(
         self,
@@ -499,10 +758,15 @@ class CloudWatchLogStreamThread(Thread):
         log_events: list[CloudWatchLogEvent],
     ) -> None:
         """
-        Uploads a batch of logs to the specified CloudWatch log group/stream
+        Uploads a batch of logs to the specified CloudWatch log group/stream.
+
+        Failed uploads are retried with exponential backoff and jitter while the thread is running,
+        and up to PUT_LOG_EVENTS_ERROR_STOPPED_RETRIES times once it has been stopped. Errors are
+        logged at most once every PUT_LOG_EVENTS_ERROR_LOG_INTERVAL_SECONDS while running.
         """
         success = False
         stop_attempts = CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_STOPPED_RETRIES
+        attempt = 0
         put_log_events = partial(
             self._logs_client.put_log_events,
             logGroupName=self._log_group_name,
@@ -512,35 +776,80 @@ class CloudWatchLogStreamThread(Thread):
         self._throttle_put_log_events()
         _logger.debug("Calling PutLogEvents with %d log events", len(log_events))
         while stop_attempts > 0:
+            self._outage_detector.wait_for_turn(self._stop_event)
             try:
                 put_log_events()
             except Exception as e:
-                error_args: list[Any] = []
-
+                if _is_outage_error(e):
+                    self._outage_detector.record_result(success=False)
+                else:
+                    # Only this stream's request failed, so let another stream probe in its place
+                    self._outage_detector.release()
                 if self._stop_event.is_set():
+                    # Flush the remaining log events promptly so that stopping is not held up
                     stop_attempts -= 1
-                    error_args = [
-                        "Error uploading CloudWatch logs (sleeping %ds, %d attempts remaining): %s",
-                        CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS,
+                    delay = float(CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS)
+                    _logger.error(
+                        "Error uploading CloudWatch logs (sleeping %.1fs, %d attempts remaining): %s",
+                        delay,
                         stop_attempts,
                         e,
-                    ]
+                    )
+                    sleep(delay)
                 else:
-                    error_args = [
-                        "Error uploading CloudWatch logs (sleeping %ds): %s",
-                        CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS,
-                        e,
-                    ]
-                _logger.error(*error_args, stack_info=True)
-                sleep(CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS)
+                    delay = self._error_delay(attempt)
+                    attempt += 1
+                    self._log_upload_error(e, delay)
+                    # Wake up early when stopped, to flush with the attempts that remain
+                    self._stop_event.wait(delay)
             else:
+                self._outage_detector.record_result(success=True)
+                if self._suppressed_errors:
+                    _logger.info(
+                        "Uploaded CloudWatch logs after %d more error(s)", self._suppressed_errors
+                    )
+                self._last_error_logged_at = None
+                self._suppressed_errors = 0
                 success = True
                 break
 
         if not success:
             assert self._stop_event.is_set()
+            self._outage_detector.release()
             _logger.error("Unable to upload logs due to task ending")
 
+    def _error_delay(self, attempt: int) -> float:
+        """Returns how long to wait before retrying an upload that has failed attempt + 1 times"""
+        return max(
+            float(CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS),
+            self._error_backoff.delay_amount(RetryContext(attempt)),
+        )
+
+    def _log_upload_error(self, error: Exception, delay: float) -> None:
+        """
+        Logs an upload error, unless one was logged less than PUT_LOG_EVENTS_ERROR_LOG_INTERVAL_SECONDS
+        ago, in which case it is counted and reported with the next error that is logged.
+        """
+        now = monotonic()
+        if (
+            self._last_error_logged_at is not None
+            and now - self._last_error_logged_at
+            < CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_LOG_INTERVAL_SECONDS
+        ):
+            self._suppressed_errors += 1
+            return
+        if self._suppressed_errors:
+            _logger.error(
+                "Error uploading CloudWatch logs (sleeping %.1fs, %d similar errors suppressed): %s",
+                delay,
+                self._suppressed_errors,
+                error,
+            )
+        else:
+            _logger.error("Error uploading CloudWatch logs (sleeping %.1fs): %s", delay, error)
+        self._last_error_logged_at = now
+        self._suppressed_errors = 0
+
     def _throttle_put_log_events(self) -> None:
         """
         Guarantees that only 5 CWL requests are made per second. This method should be called
@@ -596,6 +905,7 @@ class CloudWatchHandler(Handler):
         logs_client: Any,
         log_group_name: str,
         log_stream_name: str,
+        packing_window_ms: int | None = None,
     ) -> None:
         self._log_event_queue = deque()
         self._stop_event = Event()
@@ -605,6 +915,7 @@ class CloudWatchHandler(Handler):
             log_stream_name=log_stream_name,
             log_event_queue=self._log_event_queue,
             stop_event=self._stop_event,
+            packing_window_ms=packing_window_ms,
             daemon=True,
         )
         self._log_stream_thread.start()
@@ -640,10 +951,13 @@ class CloudWatchHandler(Handler):
             # the startedAt/endedAt time that it receives. Our service truncates, rather than rounds, times
             # to microseconds so we do the same here.
             timestamp = int(record.created * 1000)
+            # Measure the message while it is likely still in the CPU cache, so that the
+            # CloudWatchLogStreamThread does not need to encode it again.
             self._log_event_queue.append(
                 FormattedLogEntry(
                     timestamp=timestamp,
                     message=message,
+                    size=_utf8_size(message),
                 )
             )
         except Exception:
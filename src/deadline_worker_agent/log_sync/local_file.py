@@ -0,0 +1,240 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from pathlib import Path
+from queue import Empty, Queue
+from threading import Event, Thread
+from time import monotonic
+from typing import BinaryIO, Optional, Union
+import gzip
+import logging
+import os
+import zlib
+
+logger = logging.getLogger(__name__)
+
+_MAX_QUEUED_RECORDS = 10_000
+"""The maximum number of formatted records buffered for the writer. Logging blocks when the buffer
+is full, so that a slow disk throttles the session rather than growing the agent's memory."""
+
+_DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+_COMPRESSION_LEVEL = 6
+
+_FILE_MODE = 0o600
+
+
+class _Flush:
+    """A request for the writer to flush, which is acknowledged by setting the event"""
+
+    def __init__(self) -> None:
+        self.done = Event()
+
+
+_CLOSE = object()
+
+
+class AsyncRotatingFileHandler(logging.Handler):
+    """A log handler that writes to a file from a background thread, optionally gzip-compressed and
+    rotated when it reaches a maximum size.
+
+    Records are formatted in the thread that emits them and handed to a writer thread through a
+    bounded buffer, so emitting a record never waits on disk I/O unless the buffer is full. The
+    writer flushes the file at a fixed interval, when the handler is flushed, and when it is
+    closed. Compressed files are flushed with a zlib sync flush, so everything up to the last flush
+    can be decompressed even if the agent exits without closing the file.
+
+    When the file reaches the maximum size, it is renamed with a ".1" suffix (before the ".gz"
+    extension of compressed files), previously rotated files are shifted up by one, and files
+    beyond the backup count are removed.
+
+    Parameters
+    ----------
+    filename : Path
+        The path of the log file. Records are appended if it exists.
+    compress : bool
+        Whether to gzip-compress the file
+    max_bytes : Optional[int]
+        The size, in bytes on disk, at which the file is rotated. If None, the file is not rotated.
+    backup_count : int
+        The number of rotated files to keep
+    flush_interval : float
+        The maximum number of seconds that written records are held in memory before being flushed
+        to the file
+    """
+
+    _filename: Path
+    _compress: bool
+    _max_bytes: Optional[int]
+    _backup_count: int
+    _flush_interval: float
+    _queue: Queue[Union[str, _Flush, object]]
+    _raw: Optional[BinaryIO]
+    _stream: Optional[Union[BinaryIO, gzip.GzipFile]]
+    _writer: Thread
+    _closed: bool
+
+    def __init__(
+        self,
+        *,
+        filename: Path,
+        compress: bool = False,
+        max_bytes: Optional[int] = None,
+        backup_count: int = 0,
+        flush_interval: float = _DEFAULT_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        super().__init__()
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, but got {max_bytes}")
+        self._filename = filename
+        self._compress = compress
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._flush_interval = flush_interval
+        self._queue = Queue(maxsize=_MAX_QUEUED_RECORDS)
+        self._raw = None
+        self._stream = None
+        self._closed = False
+        self._write_error_logged = False
+        self._open()
+        self._writer = Thread(
+            target=self._write_records, name=f"AsyncRotatingFileHandler({filename.name})"
+        )
+        self._writer.daemon = True
+        self._writer.start()
+
+    @property
+    def filename(self) -> Path:
+        return self._filename
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Waits until all records emitted so far are written and flushed to the file"""
+        if self._closed or not self._writer.is_alive():
+            return
+        flush = _Flush()
+        self._queue.put(flush)
+        flush.done.wait()
+
+    def close(self) -> None:
+        with self.lock:  # type: ignore[union-attr]
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_CLOSE)
+        self._writer.join()
+        super().close()
+
+    def _write_records(self) -> None:
+        next_flush: Optional[float] = None
+        try:
+            while True:
+                timeout = None if next_flush is None else max(0.0, next_flush - monotonic())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except Empty:
+                    self._flush_stream()
+                    next_flush = None
+                    continue
+
+                if isinstance(item, str):
+                    self._write(item)
+                    if next_flush is None:
+                        next_flush = monotonic() + self._flush_interval
+                elif isinstance(item, _Flush):
+                    self._flush_stream()
+                    next_flush = None
+                    item.done.set()
+                elif item is _CLOSE:
+                    return
+        finally:
+            # Release anyone waiting on a flush, and close the file
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except Empty:
+                    break
+                if isinstance(item, str):
+                    self._write(item)
+                elif isinstance(item, _Flush):
+                    item.done.set()
+            self._close_stream()
+
+    def _write(self, text: str) -> None:
+        try:
+            if self._stream is None:
+                self._open()
+            assert self._stream is not None
+            self._stream.write(text.encode("utf-8"))
+            if self._max_bytes is not None and self._size_on_disk() >= self._max_bytes:
+                self._rotate()
+        except OSError as e:
+            # Don't log every failure of a full or failing disk
+            if not self._write_error_logged:
+                self._write_error_logged = True
+                logger.warning("Could not write to session log file %s: %s", self._filename, e)
+
+    def _size_on_disk(self) -> int:
+        assert self._raw is not None
+        return self._raw.tell()
+
+    def _flush_stream(self) -> None:
+        if self._stream is None:
+            return
+        try:
+            if isinstance(self._stream, gzip.GzipFile):
+                self._stream.flush(zlib_mode=zlib.Z_SYNC_FLUSH)
+            else:
+                self._stream.flush()
+            assert self._raw is not None
+            self._raw.flush()
+        except OSError as e:
+            if not self._write_error_logged:
+                self._write_error_logged = True
+                logger.warning("Could not flush session log file %s: %s", self._filename, e)
+
+    def _open(self) -> None:
+        fd = os.open(self._filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, _FILE_MODE)
+        self._raw = os.fdopen(fd, "ab")
+        if self._compress:
+            self._stream = gzip.GzipFile(
+                filename="", mode="ab", compresslevel=_COMPRESSION_LEVEL, fileobj=self._raw
+            )
+        else:
+            self._stream = self._raw
+
+    def _close_stream(self) -> None:
+        try:
+            if self._stream is not None and self._stream is not self._raw:
+                self._stream.close()
+            if self._raw is not None:
+                self._raw.close()
+        except OSError as e:
+            logger.warning("Could not close session log file %s: %s", self._filename, e)
+        finally:
+            self._stream = None
+            self._raw = None
+
+    def _rotated_filename(self, index: int) -> Path:
+        if self._compress and self._filename.suffix == ".gz":
+            return self._filename.with_suffix(f".{index}.gz")
+        return self._filename.with_name(f"{self._filename.name}.{index}")
+
+    def _rotate(self) -> None:
+        self._close_stream()
+        if self._backup_count > 0:
+            for index in range(self._backup_count - 1, 0, -1):
+                source = self._rotated_filename(index)
+                if source.exists():
+                    os.replace(source, self._rotated_filename(index + 1))
+            os.replace(self._filename, self._rotated_filename(1))
+        else:
+            self._filename.unlink()
+        self._open()
@@ -9,6 +9,7 @@ from typing import Any
 import os
 import psutil
 
+from .aws.deadline.rate_limiter import DeadlineRateLimiter
 from .log_messages import MetricsLogEvent, MetricsLogEventSubtype
 
 module_logger = getLogger(__name__)
@@ -19,15 +20,22 @@ class HostMetricsLogger:
 
     logger: Logger
     interval_s: float
+    deadline_rate_limiter: DeadlineRateLimiter | None
     _timer: Timer | None
     _prev_network: Any | None
 
-    def __init__(self, logger: Logger, interval_s: float) -> None:
+    def __init__(
+        self,
+        logger: Logger,
+        interval_s: float,
+        deadline_rate_limiter: DeadlineRateLimiter | None = None,
+    ) -> None:
         assert interval_s > 0, "interval_s must be a positive number"
         self._timer = None
         self._prev_network = None
         self.logger = logger
         self.interval_s = interval_s
+        self.deadline_rate_limiter = deadline_rate_limiter
 
     def __enter__(self) -> HostMetricsLogger:
         self.log_metrics()
@@ -101,9 +109,28 @@ class HostMetricsLogger:
             }
 
             self.logger.info(MetricsLogEvent(subtype=MetricsLogEventSubtype.SYSTEM, metrics=stats))
+            if self.deadline_rate_limiter is not None:
+                self.log_deadline_rate_limiter_metrics(self.deadline_rate_limiter)
         finally:
             self._set_timer()
 
+    def log_deadline_rate_limiter_metrics(self, deadline_rate_limiter: DeadlineRateLimiter):
+        """
+        Logs the state of the rate limiter of the Worker's Deadline API requests as a
+        space-delimited line of the form: <label> <value> ...
+        """
+        state = deadline_rate_limiter.state()
+        stats = {
+            "requests-per-second-limit": str(round(state.rate, ndigits=2)),
+            "available-requests": str(int(state.tokens)),
+            "waiting-requests": str(state.waiting),
+            "throttled-requests": str(state.throttles),
+            "paused-seconds": str(round(state.paused_seconds, ndigits=1)),
+        }
+        self.logger.info(
+            MetricsLogEvent(subtype=MetricsLogEventSubtype.DEADLINE_API, metrics=stats)
+        )
+
     def _set_timer(self) -> None:
         """
         Sets the timer to log the host metrics at a regular interval.
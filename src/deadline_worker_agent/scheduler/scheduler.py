@@ -12,9 +12,10 @@ from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from functools import partial
+from itertools import chain
 from pathlib import Path
 from threading import Event, RLock, Lock, Timer
-from typing import Callable, Literal, Tuple, Union, cast, Optional, Any
+from typing import Callable, Iterable, Literal, Tuple, Optional, Any
 import json
 import logging
 import os
@@ -30,14 +31,24 @@ from ..aws.deadline import update_worker
 from ..aws_credentials import QueueBoto3Session, AwsCredentialsRefresher
 from ..boto import DeadlineClient, Session as BotoSession
 from ..errors import ServiceShutdown
+from ..job_attachments import (
+    CachingAssetSync,
+    JobAttachmentsContentCache,
+    JobAttachmentsManifestCache,
+    JobAttachmentsTransferGovernor,
+)
 from ..sessions import JobEntities, Session
 from ..sessions.actions import SessionActionDefinition
+from ..sessions.session_cache import SESSION_CACHE_DIR_ENV_VAR, SessionCache
+from ..sessions.session_dir_janitor import SessionDirJanitor
+from ..sessions.session_root_placement import SessionRootPlacer
 from ..sessions.log_config import (
     LogConfiguration,
     LogProvisioningError,
     SessionLogConfigurationParameters,
 )
-from ..sessions.job_entities.job_details import JobRunAsUser
+from ..sessions.job_entities import JobEntityRequestCoalescer
+from ..sessions.job_entities.job_details import JobDetails, JobRunAsUser
 from ..api_models import (
     AssignedSession,
     UpdateWorkerScheduleResponse,
@@ -56,7 +67,9 @@ from ..aws.deadline import (
     update_worker_schedule,
 )
 from .log import LOGGER
+from .session_action_journal import SessionActionUpdateJournal
 from .session_cleanup import SessionUserCleanupManager
+from .session_orchestrator import SessionOrchestrator
 from .session_queue import SessionActionQueue, SessionActionStatus
 from ..startup.config import JobsRunAsUserOverride
 from ..utils import MappingWithCallbacks
@@ -86,6 +99,19 @@ JOB_ATTACHMENTS_LOGGER = logging.getLogger("deadline.job_attachments")
 # API limit on length of "progressMessage" field for session actions in UpdateWorkerSchedule API
 UPDATE_WORKER_SCHEDULE_MAX_MESSAGE_CHARS = 4096
 
+# Upper bounds on the Session Action updates sent in one UpdateWorkerSchedule request. Updates
+# beyond these are sent in the requests that immediately follow.
+UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS = 500
+UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS_BYTES = 512 * 1024
+# Approximate serialized size of an update, not counting its "progressMessage"
+_UPDATED_ACTION_BASE_BYTES = 256
+
+# Upper bound on the number of newly assigned Sessions that are provisioned concurrently
+SESSION_PROVISIONING_MAX_WORKERS = 8
+
+# Approximate upper bound on the memory used to cache parsed Job Attachments input manifests
+JOB_ATTACHMENTS_MANIFEST_CACHE_MAX_SIZE_BYTES = 256 * 1024 * 1024
+
 
 @dataclass(frozen=True)
 class SchedulerSession:
@@ -126,6 +152,47 @@ class QueueAwsCredentials:
     refresher: AwsCredentialsRefresher
 
 
+@dataclass(frozen=True)
+class _ProvisionedSession:
+    """The result of successfully provisioning a newly assigned Session. The scheduler
+    turns this into a SchedulerSession once it starts running the Session."""
+
+    session: Session
+    queue: SessionActionQueue
+    job_entities: JobEntities
+    log_configuration: LogConfiguration
+    queue_credentials: QueueAwsCredentials | None
+
+
+class _SessionProvisioningContext:
+    """State shared between the Sessions that are provisioned in the same
+    UpdateWorkerSchedule cycle.
+
+    Sessions for the same Job only make a single BatchGetJobEntity request for the Job's
+    details; the other Sessions wait for, and share, its result.
+    """
+
+    _lock: Lock
+    _job_details: dict[str, Future[JobDetails]]
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._job_details = {}
+
+    def job_details(self, *, job_id: str, job_entities: JobEntities) -> JobDetails:
+        with self._lock:
+            future = self._job_details.get(job_id)
+            is_owner = future is None
+            if future is None:
+                future = self._job_details[job_id] = Future()
+        if is_owner:
+            try:
+                future.set_result(job_entities.job_details())
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+
 class SessionMap(MappingWithCallbacks[str, SchedulerSession]):
     """
     Singleton mapping of session IDs to sessions.
@@ -166,6 +233,13 @@ class SessionMap(MappingWithCallbacks[str, SchedulerSession]):
             return
         self._session_cleanup_manager.deregister(scheduler_session.session)
 
+    def deregister_session_user(self, scheduler_session: SchedulerSession) -> None:
+        """Deregisters a session from the SessionUserCleanupManager ahead of removing it from
+        the map, stopping the session user's remaining processes if required. Unlike mutating the
+        map, this can be called from any thread.
+        """
+        self._session_cleanup_manager.deregister(scheduler_session.session)
+
     @classmethod
     def get_session_map(cls) -> SessionMap | None:
         return cls.__session_map_instance
@@ -176,28 +250,70 @@ class WorkerScheduler:
 
     _deadline: DeadlineClient
     _sessions: SessionMap
+    # Guards _sessions, _session_reapers, and _assigned_action_ids. They are only changed by the
+    # thread that applies the Worker's assignments (the SessionOrchestrator's thread while run() is
+    # running, and the thread that calls _update_sessions() otherwise), which holds the lock while
+    # changing them. Any other thread must hold the lock while reading them.
+    _sessions_lock: Lock
     _shutdown: Event
     _shutdown_grace: timedelta | None
     _shutdown_fail_message: str | None = None
     _wakeup: Event
+    # Applies the assignments of UpdateWorkerSchedule responses to the Sessions while run() is
+    # running, so that the heartbeat is not held up by orchestration.
+    _session_orchestrator: SessionOrchestrator
     _executor: ThreadPoolExecutor
     _farm_id: str
     _fleet_id: str
     _worker_id: str
     _action_updates_map: dict[str, SessionActionStatus]
+    # The updates in _action_updates_map as they are sent to the service, converted once when
+    # recorded. Completed updates are kept apart so that they are sent first. Guarded by
+    # _action_update_lock.
+    _completed_action_updates: dict[str, UpdatedSessionActionInfo]
+    _progress_action_updates: dict[str, UpdatedSessionActionInfo]
+    # The number of updates that did not fit in the last UpdateWorkerSchedule request
+    _unsent_action_updates: int
     _action_completes: list[SessionActionStatus]
     _action_update_lock: RLock
+    _action_update_journal: SessionActionUpdateJournal | None
+    # Completed Session Action updates that were journaled, but not acknowledged by the service,
+    # before the Worker Agent restarted. Guarded by _action_update_lock.
+    _replayed_action_updates: dict[str, UpdatedSessionActionInfo]
+    # Map from sessionId -> Future of the background teardown of a Session that is no longer
+    # assigned to the Worker. Guarded by _sessions_lock.
+    _session_reapers: dict[str, Future[None]]
+    # Map from sessionId -> IDs of the Session Actions that were last assigned to an existing
+    # Session. Sessions whose assignment is unchanged are skipped when updating their queues.
+    # Guarded by _sessions_lock.
+    _assigned_action_ids: dict[str, tuple[str, ...]]
     _job_run_as_user_override: JobsRunAsUserOverride
     _boto_session: BotoSession
     _worker_persistence_dir: Path
     _worker_logs_dir: Path | None
+    _local_session_logs_compression: bool
+    _local_session_logs_max_bytes: int | None
+    _session_log_packing_window_ms: int | None
+    _session_log_repeated_line_threshold: int | None
     _retain_session_dir: bool
+    _job_attachments_cache: JobAttachmentsContentCache | None
+    _job_attachments_output_journal: bool
+    _job_attachments_prefetch: bool
+    _session_cache: SessionCache | None
+    _session_root_placer: SessionRootPlacer | None
+    _session_dir_janitor: SessionDirJanitor | None
+    _job_attachments_manifest_cache: JobAttachmentsManifestCache
+    _job_attachments_transfer_governor: JobAttachmentsTransferGovernor
+    _job_entity_request_coalescer: JobEntityRequestCoalescer
 
     # Map from queueId -> QueueAwsCredentials.
     _queue_aws_credentials: dict[str, QueueAwsCredentials]
     # Lock that must be grabbed when mutating the _queue_aws_credentials in any way; we have
     # threads, so let's be thread safe.
     _queue_aws_credentials_lock: Lock
+    # Map from queueId:roleArn -> Lock held while creating that Queue's credentials. Lets
+    # Sessions that are provisioned concurrently share a single AssumeQueueRoleForWorker request.
+    _queue_aws_credentials_creation_locks: dict[str, Lock]
 
     def __init__(
         self,
@@ -211,7 +327,18 @@ class WorkerScheduler:
         cleanup_session_user_processes: bool,
         worker_persistence_dir: Path,
         worker_logs_dir: Path | None,
+        local_session_logs_compression: bool = False,
+        local_session_logs_max_bytes: int | None = None,
+        session_log_packing_window_ms: int | None = None,
+        session_log_repeated_line_threshold: int | None = None,
         retain_session_dir: bool = False,
+        job_attachments_cache: JobAttachmentsContentCache | None = None,
+        job_attachments_output_journal: bool = False,
+        job_attachments_prefetch: bool = False,
+        session_cache: SessionCache | None = None,
+        session_root_placer: SessionRootPlacer | None = None,
+        session_dir_janitor: SessionDirJanitor | None = None,
+        session_action_update_journal: SessionActionUpdateJournal | None = None,
         stop: Event | None = None,
     ) -> None:
         """Queue of Worker Sessions and their actions
@@ -227,26 +354,107 @@ class WorkerScheduler:
                 <worker_logs_dir>/<queue_id>/<session_id>.log
 
             If the value is None, then no local session logs will be written.
+        local_session_logs_compression: bool
+            If true, then local session logs are gzip-compressed and written to
+            <session_id>.log.gz by a background thread.
+        local_session_logs_max_bytes: int | None
+            The size at which local session logs are rotated. If the value is None, then they
+            are not rotated.
+        session_log_packing_window_ms: int | None
+            If not None, consecutive session log lines emitted within this many milliseconds of
+            each other are packed into a single CloudWatch log event.
+        session_log_repeated_line_threshold: int | None
+            If not None, runs of similar session log lines are collapsed into periodic summaries
+            after this many lines.
+        job_attachments_cache: JobAttachmentsContentCache | None
+            A worker-wide cache of Job Attachments input files shared by all sessions. If the
+            value is None, then inputs are always downloaded from S3.
+        job_attachments_output_journal: bool
+            If true, then sessions find Job Attachments output files by watching the output
+            directories for changes (Linux only) instead of walking them after each task.
+        job_attachments_prefetch: bool
+            If true, then sessions download the input files of a queued Job Attachments input
+            sync in the background while the actions before it run.
+        session_cache: SessionCache | None
+            A worker-wide directory, with a subdirectory per queue, that is given to sessions to
+            keep artifacts in across sessions. If the value is None, then sessions are not given
+            a cache directory.
+        session_root_placer: SessionRootPlacer | None
+            Chooses the directory that the working directory of each session is created in. If
+            the value is None, then the default directory for the platform is used.
+        session_dir_janitor: SessionDirJanitor | None
+            Deletes the working directories of sessions in the background once they end, and
+            retained working directories that are over their age or size budget. If the value is
+            None, then working directories that are not retained are deleted when the session
+            ends.
+        session_action_update_journal: SessionActionUpdateJournal | None
+            A journal that completed Session Action updates are recorded in until the service
+            acknowledges them. Updates that it holds from before the Worker Agent restarted are
+            sent to the service. If the value is None, then completed updates that have not been
+            acknowledged are lost when the Worker Agent crashes.
         """
         self._deadline = deadline
         self._executor = ThreadPoolExecutor(max_workers=100)
         self._sessions = SessionMap(cleanup_session_user_processes=cleanup_session_user_processes)
+        self._sessions_lock = Lock()
         self._wakeup = Event()
+        self._session_orchestrator = SessionOrchestrator(
+            apply=lambda response: self._update_sessions(response=response),
+            wakeup=self._wakeup,
+        )
         self._shutdown = stop or Event()
         self._farm_id = farm_id
         self._fleet_id = fleet_id
         self._worker_id = worker_id
         self._action_completes = []
         self._action_updates_map = {}
+        self._completed_action_updates = {}
+        self._progress_action_updates = {}
+        self._unsent_action_updates = 0
         self._action_update_lock = RLock()
+        self._action_update_journal = session_action_update_journal
+        self._replayed_action_updates = (
+            session_action_update_journal.replayed_updates
+            if session_action_update_journal is not None
+            else {}
+        )
+        self._assigned_action_ids = {}
+        if self._replayed_action_updates:
+            logger.info(
+                "Reporting %d completed Session Action(s) that were not acknowledged by the service"
+                " before the Worker Agent restarted",
+                len(self._replayed_action_updates),
+            )
+        self._session_reapers = {}
         self._job_run_as_user_override = job_run_as_user_override
         self._shutdown_grace = None
         self._boto_session = boto_session
         self._queue_aws_credentials = dict[str, QueueAwsCredentials]()
         self._queue_aws_credentials_lock = Lock()
+        self._queue_aws_credentials_creation_locks = {}
         self._worker_persistence_dir = worker_persistence_dir
         self._worker_logs_dir = worker_logs_dir
+        self._local_session_logs_compression = local_session_logs_compression
+        self._local_session_logs_max_bytes = local_session_logs_max_bytes
+        self._session_log_packing_window_ms = session_log_packing_window_ms
+        self._session_log_repeated_line_threshold = session_log_repeated_line_threshold
         self._retain_session_dir = retain_session_dir
+        self._job_attachments_cache = job_attachments_cache
+        self._job_attachments_output_journal = job_attachments_output_journal
+        self._job_attachments_prefetch = job_attachments_prefetch
+        self._session_cache = session_cache
+        self._session_root_placer = session_root_placer
+        self._session_dir_janitor = session_dir_janitor
+        self._job_attachments_manifest_cache = JobAttachmentsManifestCache(
+            max_size_bytes=JOB_ATTACHMENTS_MANIFEST_CACHE_MAX_SIZE_BYTES
+        )
+        self._job_attachments_transfer_governor = JobAttachmentsTransferGovernor()
+        self._job_entity_request_coalescer = JobEntityRequestCoalescer(
+            deadline_client=deadline,
+            farm_id=farm_id,
+            fleet_id=fleet_id,
+            worker_id=worker_id,
+        )
         self._windows_credentials_resolver: Optional[WindowsCredentialsResolver]
 
         if os.name == "nt" and not (
@@ -271,7 +479,9 @@ class WorkerScheduler:
 
         The scheduler is responsible for heart-beating which also includes reporting progress and
         status of ongoing active session actions, receiving session action cancelations, and
-        also receiving commands from the service to shutdown.
+        also receiving commands from the service to shutdown. Sessions are created, updated, and
+        deleted on a separate orchestration thread, so that slow orchestration never delays the
+        next heartbeat.
 
         The function returns normally if the WorkerScheduler instance's `stop` method is called from
         another thread and all sessions are able to gracefully shut down.
@@ -284,11 +494,21 @@ class WorkerScheduler:
 
         timeout = WorkerScheduler._INITIAL_POLL_INTERVAL
 
+        if self._session_cache is not None:
+            self._session_cache.start()
+        if self._session_dir_janitor is not None:
+            self._session_dir_janitor.start(active_session_dirs=self._active_session_dirs)
+        self._session_orchestrator.start()
+
         with self._executor:
             try:
                 while not self._shutdown.is_set():
                     self._wakeup.clear()
 
+                    # Raises any exception that stopped the orchestration of Sessions, which is
+                    # as unrecoverable as it was when orchestration ran on this thread
+                    self._session_orchestrator.check()
+
                     # Raises:
                     #  ServiceShutdown - When we are undergoing a service-initiated drain, and
                     # that drain is now complete.
@@ -307,6 +527,9 @@ class WorkerScheduler:
                     if self._windows_credentials_resolver:
                         self._windows_credentials_resolver.prune_cache()
 
+                    if self._unsent_action_updates:
+                        # Send the rest of the Session Action updates straight away
+                        interval = 0
                     logger.debug("interval = %s", interval)
                     timeout = timedelta(seconds=interval)
 
@@ -319,7 +542,15 @@ class WorkerScheduler:
                 raise
             finally:
                 logger.info("Main event loop exited.")
+                # The drain changes the Sessions from this thread
+                self._session_orchestrator.stop()
                 self._drain_scheduler()
+                if self._session_cache is not None:
+                    self._session_cache.stop()
+                if self._session_dir_janitor is not None:
+                    self._session_dir_janitor.stop()
+                if self._action_update_journal is not None:
+                    self._action_update_journal.close()
                 if sys.platform == "win32":
                     if (
                         self._job_run_as_user_override is not None
@@ -394,6 +625,8 @@ class WorkerScheduler:
                 # call to be interruptable; doing so would cause it to immediately
                 # exit and not actually make the API call
                 self._sync(interruptable=False)
+                while self._unsent_action_updates:
+                    self._sync(interruptable=False)
             except DeadlineRequestInterrupted:
                 # Receiving this indicates a logic error. This should never actually happen.
                 raise RuntimeError(
@@ -405,14 +638,23 @@ class WorkerScheduler:
     def _shutdown_sessions(
         self, gracetime: Optional[timedelta], fail_message: Optional[str]
     ) -> list[Future[None]]:
-        return [
+        # Sessions that are already being torn down are not stopped again, but the caller
+        # should still wait for them.
+        with self._sessions_lock:
+            reapers = list(self._session_reapers.values())
+            sessions = [
+                session
+                for session_id, session in self._sessions.items()
+                if session_id not in self._session_reapers
+            ]
+        return reapers + [
             self._executor.submit(
                 session.session.stop,
                 grace_time=gracetime,
                 current_action_result="INTERRUPTED",
                 fail_message=fail_message,
             )
-            for session in self._sessions.values()
+            for session in sessions
         ]
 
     def _sync(self, *, interruptable: bool = True) -> int:
@@ -430,7 +672,7 @@ class WorkerScheduler:
 
         # 1. collect info to be sent in the UpdateWorkerSchedule API request
         #    1.1. finished/in-progress action results
-        updated_actions, commit_completed_actions = self._updated_session_actions()
+        updated_actions, commit_completed_actions, unsent = self._updated_session_actions()
 
         #    1.2. TODO: IP address changes
 
@@ -448,12 +690,42 @@ class WorkerScheduler:
             # then it'll stop retrying and exit.
             request["interrupt_event"] = self._shutdown
 
+        # Make the completed updates durable before the service can acknowledge them
+        if self._action_update_journal is not None:
+            self._action_update_journal.sync()
+
         # Raises: DeadlineRequestInterrupted, DeadlineRequestWorkerNotFoundError,
         # DeadlineRequestWorkerOfflineError, and DeadlineRequestUnrecoverableError
         #  - Let these go to the caller
-        response = update_worker_schedule(**request)
+        try:
+            response = update_worker_schedule(**request)
+        except DeadlineRequestUnrecoverableError:
+            # Updates replayed from before a restart may no longer be accepted by the service (e.g.
+            # because their Session has since ended). Drop them rather than failing every sync.
+            with self._action_update_lock:
+                replayed_ids = [
+                    action_id
+                    for action_id in updated_actions
+                    if action_id in self._replayed_action_updates
+                    and action_id not in self._action_updates_map
+                ]
+            if not replayed_ids:
+                raise
+            logger.warning(
+                "UpdateWorkerSchedule failed with the updates of %d Session Action(s) from before"
+                " the Worker Agent restarted. Retrying without them.",
+                len(replayed_ids),
+            )
+            self._discard_replayed_action_updates(replayed_ids)
+            request["updated_session_actions"] = {
+                action_id: update
+                for action_id, update in updated_actions.items()
+                if action_id not in replayed_ids
+            }
+            response = update_worker_schedule(**request)
 
         commit_completed_actions()
+        self._unsent_action_updates = unsent
 
         # 3. take action based on response
         #    3.1. create new sessions
@@ -461,7 +733,10 @@ class WorkerScheduler:
         #    3.3. cancel actions in existing sessions
         #    3.4. update the queues for existing sessions
         #    3.5. persist the idle and healthy timeouts
-        self._update_sessions(response=response)
+        if self._session_orchestrator.running:
+            self._session_orchestrator.submit(response)
+        else:
+            self._update_sessions(response=response)
 
         if response.get("desiredWorkerStatus", None) == "STOPPED":
             logger.warning("Service requested shutdown initiated")
@@ -517,52 +792,111 @@ class WorkerScheduler:
 
     def _updated_session_actions(
         self,
-    ) -> Tuple[dict[str, UpdatedSessionActionInfo], Callable[[], None]]:
-        # Returns a unique identifier for a session action update.
-        # This is a tuple of the action ID and the completed state or the update time
-        # This is used to only commit deletes from the _action_updates_map that are not newer
-        # than what was sent in the UpdateWorkerSchedule request when calling the commit() function
-        def compute_update_id(
-            session_action_status: SessionActionStatus,
-        ) -> tuple[str, datetime | str]:
-            return (
-                session_action_status.id,
-                cast(
-                    Union[datetime, str],
-                    session_action_status.completed_status or session_action_status.update_time,
-                ),
-            )
+    ) -> Tuple[dict[str, UpdatedSessionActionInfo], Callable[[], None], int]:
+        """Returns the Session Action updates to send in the next UpdateWorkerSchedule request,
+        a function that removes them once the service has received them, and the number of
+        updates that did not fit in the request.
 
-        # The transaction which is a set of update IDs we are trying to commit
-        tx: set[tuple[str, datetime | str]]
+        Completed updates are sent before progress updates, oldest first, up to the number and
+        size of updates that fit in one request.
+        """
+        updated: dict[str, UpdatedSessionActionInfo] = {}
+        # The statuses that were sent. Only these are removed by commit(), so that an update that
+        # is recorded while the request is in-flight is not lost.
+        sent_statuses: dict[str, SessionActionStatus] = {}
+        # Completed updates are final, so they are acknowledged once they have been sent
+        acknowledged_ids: list[str] = []
+        updated_bytes = 0
 
         with self._action_update_lock:
-            updated = {
-                action_id: self._updated_action_to_boto(updated_action)
-                for action_id, updated_action in self._action_updates_map.items()
-            }
-            # Persist the update to the transaction
-            tx = {
-                compute_update_id(session_action_status)
-                for session_action_status in self._action_updates_map.values()
+            replayed = {
+                action_id: replayed_update
+                for action_id, replayed_update in self._replayed_action_updates.items()
+                if action_id not in self._action_updates_map
             }
+            pending = (
+                len(replayed)
+                + len(self._completed_action_updates)
+                + len(self._progress_action_updates)
+            )
+            candidates: Iterable[
+                tuple[str, UpdatedSessionActionInfo, Optional[SessionActionStatus]]
+            ] = chain(
+                ((action_id, update, None) for action_id, update in replayed.items()),
+                (
+                    (action_id, update, self._action_updates_map[action_id])
+                    for action_id, update in self._completed_action_updates.items()
+                ),
+                (
+                    (action_id, update, self._action_updates_map[action_id])
+                    for action_id, update in self._progress_action_updates.items()
+                ),
+            )
+            for action_id, update, status in candidates:
+                update_bytes = _UPDATED_ACTION_BASE_BYTES + len(update.get("progressMessage", ""))
+                if updated and (
+                    len(updated) >= UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS
+                    or updated_bytes + update_bytes
+                    > UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS_BYTES
+                ):
+                    break
+                updated[action_id] = update
+                updated_bytes += update_bytes
+                if status is not None:
+                    sent_statuses[action_id] = status
+                if status is None or status.completed_status:
+                    acknowledged_ids.append(action_id)
+
+        unsent = pending - len(updated)
+        if unsent:
+            logger.info(
+                "Sending %d of %d Session Action update(s). The rest are sent in the following"
+                " request(s).",
+                len(updated),
+                pending,
+            )
 
-        # Return a commit function. This is a closure that maintains a reference to the transaction
-        # Calling this commit() function removes all updates from the _action_updates_map that are
-        # present in the transaction. If there is a more recent action update in the
-        # _action_updates_map that is written while the request is in-flight, it will not be
-        # removed from the map.
+        # Return a commit function. This is a closure that maintains a reference to the sent
+        # statuses. Calling this commit() function removes the sent updates from the
+        # _action_updates_map. If there is a more recent action update in the _action_updates_map
+        # that is written while the request is in-flight, it will not be removed from the map.
         def commit() -> None:
             with self._action_update_lock:
-                action_ids_to_delete = [
-                    session_action_update.id
-                    for session_action_update in self._action_updates_map.values()
-                    if compute_update_id(session_action_update) in tx
-                ]
-                for action_id in action_ids_to_delete:
-                    del self._action_updates_map[action_id]
+                for action_id, sent_status in sent_statuses.items():
+                    if self._action_updates_map.get(action_id) is sent_status:
+                        del self._action_updates_map[action_id]
+                        self._completed_action_updates.pop(action_id, None)
+                        self._progress_action_updates.pop(action_id, None)
+            self._discard_replayed_action_updates(acknowledged_ids)
+
+        return updated, commit, unsent
 
-        return updated, commit
+    def _record_action_updates(
+        self, session_action_statuses: Iterable[SessionActionStatus]
+    ) -> None:
+        """Records updates to Session Actions to be sent to the service, converting them to the
+        form that they are sent in once, and journals the completed ones."""
+        # Called with self._action_update_lock held
+        completed: dict[str, UpdatedSessionActionInfo] = {}
+        for session_action_status in session_action_statuses:
+            action_id = session_action_status.id
+            update = self._updated_action_to_boto(session_action_status)
+            self._action_updates_map[action_id] = session_action_status
+            if session_action_status.completed_status:
+                self._progress_action_updates.pop(action_id, None)
+                self._completed_action_updates[action_id] = completed[action_id] = update
+            else:
+                self._completed_action_updates.pop(action_id, None)
+                self._progress_action_updates[action_id] = update
+        if completed and self._action_update_journal is not None:
+            self._action_update_journal.record(completed)
+
+    def _discard_replayed_action_updates(self, action_ids: list[str]) -> None:
+        with self._action_update_lock:
+            for action_id in action_ids:
+                self._replayed_action_updates.pop(action_id, None)
+        if self._action_update_journal is not None:
+            self._action_update_journal.acknowledge(action_ids)
 
     def _updated_action_to_boto(
         self,
@@ -631,44 +965,86 @@ class WorkerScheduler:
         )
         self._update_session_logging(assigned_sessions=existing_sessions)
 
+    def _active_session_dirs(self) -> list[Path]:
+        """Returns the working directories of the sessions that have not been removed"""
+        with self._sessions_lock:
+            scheduler_sessions = list(self._sessions.values())
+        return [
+            scheduler_session.session.working_directory for scheduler_session in scheduler_sessions
+        ]
+
     def _remove_finished_sessions(
         self,
         *,
         assigned_sessions: dict[str, AssignedSession],
     ) -> None:
-        assigned_session_ids = assigned_sessions.keys()
-        removed_session_ids = self._sessions.keys() - assigned_session_ids
-        for removed_session_id in removed_session_ids:
-            ses = self._sessions[removed_session_id]
-            ses.session.stop(grace_time=timedelta())
-            # Wait until the Session has fully completed before continuing.
-            # Reason: There's a data race here. We *think* that the Session has been
-            #   ended, by virtue of it having been "stopped", but it may actually
-            #   still be running cleanup. We wait until it has fully completed cleanup
-            #   before continuing.
-            # Note: The cleanup should be very fast since the service only removes a Session
-            #   from us once it has acknowledged all updates for all of its SessionActions and
-            #   it has no SessionActions in it.
-            ses.session.wait()
-            del self._sessions[removed_session_id]
+        # Sessions are torn down in the background so that stopping them, and stopping any
+        # leftover session user processes, does not hold up the heartbeat. A Session is only
+        # removed from the SessionMap once its teardown has completed.
+        for session_id, reaper in list(self._session_reapers.items()):
+            if not reaper.done():
+                continue
+            with self._sessions_lock:
+                del self._session_reapers[session_id]
+                ses = self._sessions[session_id]
+                del self._sessions[session_id]
+                self._assigned_action_ids.pop(session_id, None)
+            if self._session_cache is not None:
+                self._session_cache.release(queue_id=ses.session._queue_id)
+            if (reaper_exception := reaper.exception()) is not None:
+                logger.warning(
+                    SessionLogEvent(
+                        subtype=SessionLogEventSubtype.COMPLETE,
+                        queue_id=ses.session._queue_id,
+                        job_id=ses.session._job_id,
+                        session_id=session_id,
+                        message=f"Error cleaning up Session: {reaper_exception}",
+                    )
+                )
             logger.info(
                 SessionLogEvent(
                     subtype=SessionLogEventSubtype.COMPLETE,
                     queue_id=ses.session._queue_id,
                     job_id=ses.session._job_id,
-                    session_id=removed_session_id,
+                    session_id=session_id,
                     message="Session complete.",
                 )
             )
 
+        assigned_session_ids = assigned_sessions.keys()
+        removed_session_ids = (
+            self._sessions.keys() - assigned_session_ids - self._session_reapers.keys()
+        )
+        with self._sessions_lock:
+            for removed_session_id in removed_session_ids:
+                self._session_reapers[removed_session_id] = self._executor.submit(
+                    self._reap_session, self._sessions[removed_session_id]
+                )
+
+    def _reap_session(self, scheduler_session: SchedulerSession) -> None:
+        # Called on a background thread by self._remove_finished_sessions()
+        scheduler_session.session.stop(grace_time=timedelta())
+        # Wait until the Session has fully completed before continuing.
+        # Reason: There's a data race here. We *think* that the Session has been
+        #   ended, by virtue of it having been "stopped", but it may actually
+        #   still be running cleanup. We wait until it has fully completed cleanup
+        #   before continuing.
+        # Note: The cleanup should be very fast since the service only removes a Session
+        #   from us once it has acknowledged all updates for all of its SessionActions and
+        #   it has no SessionActions in it.
+        scheduler_session.session.wait()
+        self._sessions.deregister_session_user(scheduler_session)
+
     def _handle_session_action_update(
         self,
         action_status: SessionActionStatus,
     ) -> None:
         with self._action_update_lock:
-            self._action_updates_map[action_status.id] = action_status
+            self._record_action_updates((action_status,))
 
-            if any(session_entry.session.idle for session_entry in self._sessions.values()):
+            with self._sessions_lock:
+                scheduler_sessions = list(self._sessions.values())
+            if any(session_entry.session.idle for session_entry in scheduler_sessions):
                 self._wakeup.set()
 
     def _fail_all_actions(
@@ -676,13 +1052,15 @@ class WorkerScheduler:
         assigned_session: AssignedSession,
         error_message: str,
     ) -> None:
-        # Called only in self._create_new_sessions() to fail all of the queued SessionActions
+        # Called only in self._provision_session() to fail all of the queued SessionActions
         # if we experience an unrecoverable error during the setup phases of a new Session, but
         # before we've started the Session's actions running
+        # Note: New Sessions are provisioned concurrently, so this may be called from multiple
+        # threads at once.
         actions = assigned_session["sessionActions"]
         now = datetime.now(tz=timezone.utc)
-        self._action_updates_map.update(
-            {
+        with self._action_update_lock:
+            failed_action_statuses = {
                 action["sessionActionId"]: SessionActionStatus(
                     id=action["sessionActionId"],
                     completed_status="FAILED" if action is actions[0] else "NEVER_ATTEMPTED",
@@ -695,7 +1073,7 @@ class WorkerScheduler:
                 )
                 for action in actions
             }
-        )
+            self._record_action_updates(failed_action_statuses.values())
         self._wakeup.set()
 
     @staticmethod
@@ -708,7 +1086,7 @@ class WorkerScheduler:
         job_id: str,
         session_id: str,
     ) -> Optional[SessionUser]:
-        # Called only in self._create_new_sessions() to determine what os_user the Session should
+        # Called only in self._provision_session() to determine what os_user the Session should
         # run as.
         # Raises a ValueError if an impossible situation arises and we need to fail the Session.
         os_user: Optional[SessionUser] = None
@@ -796,367 +1174,465 @@ class WorkerScheduler:
         assigned_sessions: dict[str, AssignedSession],
     ) -> set[str]:
         new_session_ids = assigned_sessions.keys() - self._sessions.keys()
+        if len(new_session_ids) == 0:
+            return new_session_ids
+
+        # Provisioning a Session involves filesystem work and one or more service round-trips
+        # (BatchGetJobEntity, AssumeQueueRoleForWorker). Provision the Sessions assigned in this
+        # cycle concurrently so that a burst of new Sessions does not hold up the heartbeat, but
+        # register them in the SessionMap from this thread.
+        provisioning = _SessionProvisioningContext()
+        with ThreadPoolExecutor(
+            max_workers=min(len(new_session_ids), SESSION_PROVISIONING_MAX_WORKERS),
+            thread_name_prefix="SessionProvisioning",
+        ) as provisioning_executor:
+            provisioning_futures = {
+                session_id: provisioning_executor.submit(
+                    self._provision_session,
+                    session_id=session_id,
+                    session_spec=assigned_sessions[session_id],
+                    provisioning=provisioning,
+                )
+                for session_id in new_session_ids
+            }
 
-        for new_session_id in new_session_ids:
-            session_spec = assigned_sessions[new_session_id]
-            logger.debug(f"session spec: {session_spec}")
-            job_id = session_spec["jobId"]
-            queue_id = session_spec["queueId"]
-
-            logger.info(
-                SessionLogEvent(
-                    subtype=SessionLogEventSubtype.STARTING,
-                    queue_id=queue_id,
-                    job_id=job_id,
-                    session_id=new_session_id,
-                    message="Starting new Session.",
+        provisioning_error: BaseException | None = None
+        for session_id, provisioning_future in provisioning_futures.items():
+            try:
+                provisioned = provisioning_future.result()
+            except Exception as e:
+                # Register everything that we were able to provision before re-raising
+                provisioning_error = provisioning_error or e
+                continue
+            if provisioned is None:
+                # The Session's actions have already been failed
+                continue
+            if self._session_cache is not None:
+                # Released once the Session is removed
+                self._session_cache.acquire(queue_id=assigned_sessions[session_id]["queueId"])
+            scheduler_session = SchedulerSession(
+                future=self._executor.submit(
+                    self._run_session,
+                    session=provisioned.session,
+                    log_config=provisioned.log_configuration,
+                    queue_credentials=provisioned.queue_credentials,
+                ),
+                queue=provisioned.queue,
+                session=provisioned.session,
+                job_entities=provisioned.job_entities,
+                log_configuration=provisioned.log_configuration,
+            )
+            with self._sessions_lock:
+                self._sessions[session_id] = scheduler_session
+                self._assigned_action_ids[session_id] = tuple(
+                    action["sessionActionId"]
+                    for action in assigned_sessions[session_id]["sessionActions"]
                 )
+        if provisioning_error is not None:
+            raise provisioning_error
+        return new_session_ids
+
+    def _provision_session(
+        self,
+        *,
+        session_id: str,
+        session_spec: AssignedSession,
+        provisioning: _SessionProvisioningContext,
+    ) -> _ProvisionedSession | None:
+        """Prepares everything that a newly assigned Session needs in order to run.
+
+        This is called concurrently for each of the Sessions assigned in an UpdateWorkerSchedule
+        cycle. If the Session cannot be started, then its actions are failed and None is returned.
+        """
+        logger.debug(f"session spec: {session_spec}")
+        job_id = session_spec["jobId"]
+        queue_id = session_spec["queueId"]
+
+        logger.info(
+            SessionLogEvent(
+                subtype=SessionLogEventSubtype.STARTING,
+                queue_id=queue_id,
+                job_id=job_id,
+                session_id=session_id,
+                message="Starting new Session.",
             )
+        )
 
-            # Log path
-            session_log_file: Path | None = None
-            if self._worker_logs_dir:
-                queue_log_dir = self._queue_log_dir_path(queue_id=session_spec["queueId"])
-                try:
-                    if os.name == "posix":
-                        queue_log_dir.mkdir(mode=stat.S_IRWXU, exist_ok=True)
-                    else:
-                        make_directory(
-                            dir_path=queue_log_dir,
-                            exist_ok=True,
-                            agent_user_permission=FileSystemPermissionEnum.FULL_CONTROL,
-                        )
-                except OSError as e:
-                    error_msg = (
-                        f"Failed to create local session log directory on worker: {queue_log_dir}"
-                    )
-                    self._fail_all_actions(session_spec, error_message=error_msg)
-                    logger.error(
-                        FilesystemLogEvent(
-                            op=FilesystemLogEventOp.CREATE,
-                            filepath=str(queue_log_dir),
-                            message="Could not create local session log directory: %s" % str(e),
-                        )
-                    )
-                    logger.error(
-                        SessionLogEvent(
-                            subtype=SessionLogEventSubtype.FAILED,
-                            queue_id=queue_id,
-                            job_id=job_id,
-                            session_id=new_session_id,
-                            message="Could not create local session log directory.",
-                        )
+        # Log path
+        session_log_file: Path | None = None
+        if self._worker_logs_dir:
+            queue_log_dir = self._queue_log_dir_path(queue_id=session_spec["queueId"])
+            try:
+                if os.name == "posix":
+                    queue_log_dir.mkdir(mode=stat.S_IRWXU, exist_ok=True)
+                else:
+                    make_directory(
+                        dir_path=queue_log_dir,
+                        exist_ok=True,
+                        agent_user_permission=FileSystemPermissionEnum.FULL_CONTROL,
                     )
-                    continue
-
-                session_log_file = self._session_log_file_path(
-                    session_id=new_session_id, queue_log_dir=queue_log_dir
+            except OSError as e:
+                error_msg = (
+                    f"Failed to create local session log directory on worker: {queue_log_dir}"
                 )
-                try:
-                    if os.name == "posix":
-                        session_log_file.touch(mode=stat.S_IWUSR | stat.S_IRUSR, exist_ok=True)
-                    else:
-                        touch_file(
-                            file_path=session_log_file,
-                            agent_user_permission=FileSystemPermissionEnum.READ_WRITE,
-                        )
-                except OSError as e:
-                    error_msg = (
-                        f"Failed to create local session log file on worker: {session_log_file}"
-                    )
-                    self._fail_all_actions(session_spec, error_message=error_msg)
-                    logger.error(
-                        FilesystemLogEvent(
-                            op=FilesystemLogEventOp.CREATE,
-                            filepath=str(session_log_file),
-                            message="Could not create local session log file: %s" % str(e),
-                        )
-                    )
-                    logger.error(
-                        SessionLogEvent(
-                            subtype=SessionLogEventSubtype.FAILED,
-                            queue_id=queue_id,
-                            job_id=job_id,
-                            session_id=new_session_id,
-                            message="Could not create local session log file.",
-                        )
+                self._fail_all_actions(session_spec, error_message=error_msg)
+                logger.error(
+                    FilesystemLogEvent(
+                        op=FilesystemLogEventOp.CREATE,
+                        filepath=str(queue_log_dir),
+                        message="Could not create local session log directory: %s" % str(e),
                     )
-                    continue
-
-            # TODO: Ideally, this would be before we create the log file and directory locally, but we currently
-            # require the session_log_file to construct the LogConfiguration.
-            try:
-                log_config = LogConfiguration.from_boto(
-                    loggers=[OPENJD_SESSION_LOG, JOB_ATTACHMENTS_LOGGER],
-                    log_configuration=session_spec["logConfiguration"],
-                    session_log_file=session_log_file,
                 )
-            except LogProvisioningError as log_provision_error:
-                self._fail_all_actions(session_spec, str(log_provision_error))
                 logger.error(
                     SessionLogEvent(
                         subtype=SessionLogEventSubtype.FAILED,
                         queue_id=queue_id,
                         job_id=job_id,
-                        session_id=new_session_id,
-                        message=str(log_provision_error),
+                        session_id=session_id,
+                        message="Could not create local session log directory.",
                     )
                 )
-                continue
+                return None
 
-            job_entities = JobEntities(
-                farm_id=self._farm_id,
-                fleet_id=self._fleet_id,
-                worker_id=self._worker_id,
-                job_id=job_id,
-                deadline_client=self._deadline,
-                windows_credentials_resolver=self._windows_credentials_resolver,
-                job_run_as_user_override=self._job_run_as_user_override,
+            session_log_file = self._session_log_file_path(
+                session_id=session_id, queue_log_dir=queue_log_dir
             )
-            # TODO: Would be great to merge Session + SessionActionQueue
-            # and move all job entities calls within the Session thread.
-            # Requires some updates to the code below
             try:
-                job_details = job_entities.job_details()
-
-                # For Windows the WA runs as Administrator so fail jobs that were configured to runAs - WORKER_AGENT_USER as that would provide Admin privileges to the job
-                if (
-                    os.name == "nt"
-                    and self._job_run_as_user_override.job_user is None
-                    and not self._job_run_as_user_override.run_as_agent
-                    and job_details.job_run_as_user
-                    and job_details.job_run_as_user.is_worker_agent_user
-                ):
-                    err_msg = "Job cannot run as WORKER_AGENT_USER. Worker Agent is running with Administrator privileges."
-                    self._fail_all_actions(session_spec, err_msg)
-                    logger.error(
-                        SessionLogEvent(
-                            subtype=SessionLogEventSubtype.FAILED,
-                            queue_id=queue_id,
-                            job_id=job_id,
-                            session_id=new_session_id,
-                            message=err_msg,
-                        )
+                if os.name == "posix":
+                    session_log_file.touch(mode=stat.S_IWUSR | stat.S_IRUSR, exist_ok=True)
+                else:
+                    touch_file(
+                        file_path=session_log_file,
+                        agent_user_permission=FileSystemPermissionEnum.READ_WRITE,
+                    )
+            except OSError as e:
+                error_msg = f"Failed to create local session log file on worker: {session_log_file}"
+                self._fail_all_actions(session_spec, error_message=error_msg)
+                logger.error(
+                    FilesystemLogEvent(
+                        op=FilesystemLogEventOp.CREATE,
+                        filepath=str(session_log_file),
+                        message="Could not create local session log file: %s" % str(e),
+                    )
+                )
+                logger.error(
+                    SessionLogEvent(
+                        subtype=SessionLogEventSubtype.FAILED,
+                        queue_id=queue_id,
+                        job_id=job_id,
+                        session_id=session_id,
+                        message="Could not create local session log file.",
                     )
-                    continue
+                )
+                return None
 
-            except (ValueError, RuntimeError) as error:
-                # Can't even start a session right now if we don't
-                # get valid job_details, so let's fail the actions
-                # in the same way as the log provisioning error
-                self._fail_all_actions(session_spec, str(error))
+        # TODO: Ideally, this would be before we create the log file and directory locally, but we currently
+        # require the session_log_file to construct the LogConfiguration.
+        try:
+            log_config = LogConfiguration.from_boto(
+                loggers=[OPENJD_SESSION_LOG, JOB_ATTACHMENTS_LOGGER],
+                log_configuration=session_spec["logConfiguration"],
+                session_log_file=session_log_file,
+                session_log_file_compression=self._local_session_logs_compression,
+                session_log_file_max_bytes=self._local_session_logs_max_bytes,
+                log_packing_window_ms=self._session_log_packing_window_ms,
+                repeated_line_threshold=self._session_log_repeated_line_threshold,
+            )
+        except LogProvisioningError as log_provision_error:
+            self._fail_all_actions(session_spec, str(log_provision_error))
+            logger.error(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.FAILED,
+                    queue_id=queue_id,
+                    job_id=job_id,
+                    session_id=session_id,
+                    message=str(log_provision_error),
+                )
+            )
+            return None
+
+        job_entities = JobEntities(
+            farm_id=self._farm_id,
+            fleet_id=self._fleet_id,
+            worker_id=self._worker_id,
+            job_id=job_id,
+            deadline_client=self._deadline,
+            windows_credentials_resolver=self._windows_credentials_resolver,
+            job_run_as_user_override=self._job_run_as_user_override,
+            request_coalescer=self._job_entity_request_coalescer,
+        )
+        # TODO: Would be great to merge Session + SessionActionQueue
+        # and move all job entities calls within the Session thread.
+        # Requires some updates to the code below
+        try:
+            job_details = provisioning.job_details(job_id=job_id, job_entities=job_entities)
+
+            # For Windows the WA runs as Administrator so fail jobs that were configured to runAs - WORKER_AGENT_USER as that would provide Admin privileges to the job
+            if (
+                os.name == "nt"
+                and self._job_run_as_user_override.job_user is None
+                and not self._job_run_as_user_override.run_as_agent
+                and job_details.job_run_as_user
+                and job_details.job_run_as_user.is_worker_agent_user
+            ):
+                err_msg = "Job cannot run as WORKER_AGENT_USER. Worker Agent is running with Administrator privileges."
+                self._fail_all_actions(session_spec, err_msg)
                 logger.error(
                     SessionLogEvent(
                         subtype=SessionLogEventSubtype.FAILED,
                         queue_id=queue_id,
                         job_id=job_id,
-                        session_id=new_session_id,
-                        message=str(error),
+                        session_id=session_id,
+                        message=err_msg,
                     )
                 )
-                continue
+                return None
+
+        except (ValueError, RuntimeError) as error:
+            # Can't even start a session right now if we don't
+            # get valid job_details, so let's fail the actions
+            # in the same way as the log provisioning error
+            self._fail_all_actions(session_spec, str(error))
+            logger.error(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.FAILED,
+                    queue_id=queue_id,
+                    job_id=job_id,
+                    session_id=session_id,
+                    message=str(error),
+                )
+            )
+            return None
+
+        queue = SessionActionQueue(
+            queue_id=queue_id,
+            job_id=job_id,
+            session_id=session_id,
+            job_entities=job_entities,
+            action_update_callback=self._handle_session_action_update,
+        )
 
-            queue = SessionActionQueue(
+        queue.replace(actions=session_spec["sessionActions"])
+
+        os_user: Optional[SessionUser] = None
+        try:
+            os_user = self._determine_user_for_session(
+                host_is_posix=os.name == "posix",
+                job_run_as_user=job_details.job_run_as_user,
+                job_run_as_user_override=self._job_run_as_user_override,
                 queue_id=queue_id,
                 job_id=job_id,
-                session_id=new_session_id,
-                job_entities=job_entities,
-                action_update_callback=self._handle_session_action_update,
+                session_id=session_id,
             )
-
-            queue.replace(actions=session_spec["sessionActions"])
-
-            os_user: Optional[SessionUser] = None
-            try:
-                os_user = self._determine_user_for_session(
-                    host_is_posix=os.name == "posix",
-                    job_run_as_user=job_details.job_run_as_user,
-                    job_run_as_user_override=self._job_run_as_user_override,
+        except ValueError as e:
+            message = str(e)
+            self._fail_all_actions(session_spec, message)
+            logger.error(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.USER,
                     queue_id=queue_id,
                     job_id=job_id,
-                    session_id=new_session_id,
+                    session_id=session_id,
+                    message=message,
                 )
-            except ValueError as e:
-                message = str(e)
+            )
+            return None
+
+        queue_credentials: QueueAwsCredentials | None = None
+        asset_sync: AssetSync | None = None
+        if job_details.queue_role_arn:
+            try:
+                queue_credentials = self._get_queue_aws_credentials(
+                    queue_id,
+                    job_details.queue_role_arn,
+                    session_id,
+                    os_user,
+                )
+            except (
+                DeadlineRequestWorkerOfflineError,
+                DeadlineRequestUnrecoverableError,
+                RuntimeError,
+            ) as e:
+                # Terminal error. We need to fail the Session.
+                message = "Error obtaining AWS Credentials for the Queue Role: %s" % str(e)
                 self._fail_all_actions(session_spec, message)
                 logger.error(
                     SessionLogEvent(
-                        subtype=SessionLogEventSubtype.USER,
+                        subtype=SessionLogEventSubtype.AWSCREDS,
                         queue_id=queue_id,
                         job_id=job_id,
-                        session_id=new_session_id,
+                        session_id=session_id,
                         message=message,
                     )
                 )
-                continue
+                return None
 
-            queue_credentials: QueueAwsCredentials | None = None
-            asset_sync: AssetSync | None = None
-            if job_details.queue_role_arn:
-                try:
-                    queue_credentials = self._get_queue_aws_credentials(
-                        queue_id,
-                        job_details.queue_role_arn,
-                        new_session_id,
-                        os_user,
-                    )
-                except (
-                    DeadlineRequestWorkerOfflineError,
-                    DeadlineRequestUnrecoverableError,
-                    RuntimeError,
-                ) as e:
-                    # Terminal error. We need to fail the Session.
-                    message = "Error obtaining AWS Credentials for the Queue Role: %s" % str(e)
-                    self._fail_all_actions(session_spec, message)
-                    logger.error(
-                        SessionLogEvent(
-                            subtype=SessionLogEventSubtype.AWSCREDS,
-                            queue_id=queue_id,
-                            job_id=job_id,
-                            session_id=new_session_id,
-                            message=message,
-                        )
-                    )
-                    continue
-
-                if queue_credentials is not None:
-                    logger.info(
-                        SessionLogEvent(
-                            subtype=SessionLogEventSubtype.AWSCREDS,
-                            queue_id=queue_id,
-                            job_id=job_id,
-                            session_id=new_session_id,
-                            message="AWS Credentials are available.",
-                        )
-                    )
-                else:
-                    logger.warning(
-                        SessionLogEvent(
-                            subtype=SessionLogEventSubtype.AWSCREDS,
-                            queue_id=queue_id,
-                            job_id=job_id,
-                            session_id=new_session_id,
-                            message="AWS Credentials are not available: Failed to obtain credentials.",
-                        )
+            if queue_credentials is not None:
+                logger.info(
+                    SessionLogEvent(
+                        subtype=SessionLogEventSubtype.AWSCREDS,
+                        queue_id=queue_id,
+                        job_id=job_id,
+                        session_id=session_id,
+                        message="AWS Credentials are available.",
                     )
+                )
             else:
                 logger.warning(
                     SessionLogEvent(
                         subtype=SessionLogEventSubtype.AWSCREDS,
                         queue_id=queue_id,
                         job_id=job_id,
-                        session_id=new_session_id,
-                        message="AWS Credentials are not available: Queue has no IAM Role.",
+                        session_id=session_id,
+                        message="AWS Credentials are not available: Failed to obtain credentials.",
                     )
                 )
-
-            if queue_credentials:
-                asset_sync = AssetSync(
-                    farm_id=self._farm_id,
-                    boto3_session=queue_credentials.session,
-                    session_id=new_session_id,
+        else:
+            logger.warning(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.AWSCREDS,
+                    queue_id=queue_id,
+                    job_id=job_id,
+                    session_id=session_id,
+                    message="AWS Credentials are not available: Queue has no IAM Role.",
                 )
+            )
 
-            is_ja_settings_empty = job_details.job_attachment_settings is None or (
-                len(job_details.job_attachment_settings.s3_bucket_name) == 0
-                and len(job_details.job_attachment_settings.root_prefix) == 0
+        if queue_credentials:
+            asset_sync = CachingAssetSync(
+                farm_id=self._farm_id,
+                boto3_session=queue_credentials.session,
+                session_id=session_id,
+                content_cache=self._job_attachments_cache,
+                manifest_cache=self._job_attachments_manifest_cache,
+                output_journal=self._job_attachments_output_journal,
+                transfer_governor=self._job_attachments_transfer_governor,
             )
-            if not is_ja_settings_empty and asset_sync is None:
-                # The Queue is configured to use Job Attachments, but there are no Queue credentials
-                # available. This is a recipe for disaster. Fail the Session quickly to surface the
-                # problem in a clear way.
-                fail_message: str
-                if job_details.queue_role_arn:
-                    fail_message = "Job Attachments are configured on the Queue, but AWS Credentials for the Queue are not available."
-                else:
-                    fail_message = "Misconfiguration. Job Attachments are configured on the Queue, but the Queue has no IAM Role."
-                self._fail_all_actions(session_spec, fail_message)
-                logger.error(
+
+        is_ja_settings_empty = job_details.job_attachment_settings is None or (
+            len(job_details.job_attachment_settings.s3_bucket_name) == 0
+            and len(job_details.job_attachment_settings.root_prefix) == 0
+        )
+        if not is_ja_settings_empty and asset_sync is None:
+            # The Queue is configured to use Job Attachments, but there are no Queue credentials
+            # available. This is a recipe for disaster. Fail the Session quickly to surface the
+            # problem in a clear way.
+            fail_message: str
+            if job_details.queue_role_arn:
+                fail_message = "Job Attachments are configured on the Queue, but AWS Credentials for the Queue are not available."
+            else:
+                fail_message = "Misconfiguration. Job Attachments are configured on the Queue, but the Queue has no IAM Role."
+            self._fail_all_actions(session_spec, fail_message)
+            logger.error(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.FAILED,
+                    queue_id=queue_id,
+                    job_id=job_id,
+                    session_id=session_id,
+                    message=fail_message,
+                )
+            )
+            return None
+
+        env = {
+            "DEADLINE_SESSION_ID": session_id,
+            "DEADLINE_FARM_ID": self._farm_id,
+            "DEADLINE_QUEUE_ID": queue_id,
+            "DEADLINE_JOB_ID": job_id,
+            "DEADLINE_FLEET_ID": self._fleet_id,
+            "DEADLINE_WORKER_ID": self._worker_id,
+        }
+        if self._session_cache is not None:
+            try:
+                env[SESSION_CACHE_DIR_ENV_VAR] = str(
+                    self._session_cache.prepare_queue_dir(queue_id=queue_id, os_user=os_user)
+                )
+            except (OSError, ValueError) as e:
+                # The cache only saves work, so the Session can run without it
+                logger.warning(
                     SessionLogEvent(
-                        subtype=SessionLogEventSubtype.FAILED,
+                        subtype=SessionLogEventSubtype.STARTING,
                         queue_id=queue_id,
                         job_id=job_id,
-                        session_id=new_session_id,
-                        message=fail_message,
+                        session_id=session_id,
+                        message=f"Session cache directory is not available: {e}",
                     )
                 )
-                continue
-
-            env = {
-                "DEADLINE_SESSION_ID": new_session_id,
-                "DEADLINE_FARM_ID": self._farm_id,
-                "DEADLINE_QUEUE_ID": queue_id,
-                "DEADLINE_JOB_ID": job_id,
-                "DEADLINE_FLEET_ID": self._fleet_id,
-                "DEADLINE_WORKER_ID": self._worker_id,
-            }
-            if queue_credentials:
-                env.update(
-                    {
-                        "AWS_PROFILE": queue_credentials.session.credential_process_profile_name,
-                        "AWS_CONFIG_FILE": str(queue_credentials.session.aws_config.path),
-                        "AWS_SHARED_CREDENTIALS_FILE": str(
-                            queue_credentials.session.aws_credentials.path
-                        ),
-                    }
-                )
+        if queue_credentials:
+            env.update(
+                {
+                    "AWS_PROFILE": queue_credentials.session.credential_process_profile_name,
+                    "AWS_CONFIG_FILE": str(queue_credentials.session.aws_config.path),
+                    "AWS_SHARED_CREDENTIALS_FILE": str(
+                        queue_credentials.session.aws_credentials.path
+                    ),
+                }
+            )
 
-            logger.debug("env = \n%s", json.dumps(env, indent=2))
+        logger.debug("env = \n%s", json.dumps(env, indent=2))
+
+        session_root_dir: Path | None = None
+        if self._session_root_placer is not None:
+            session_root_dir = self._session_root_placer.choose()
+
+        session = Session(
+            id=session_id,
+            queue=queue,
+            queue_id=queue_id,
+            job_id=job_id,
+            env=env,
+            asset_sync=asset_sync,
+            job_details=job_details,
+            os_user=os_user,
+            retain_session_dir=self._retain_session_dir,
+            session_root_dir=session_root_dir,
+            session_dir_janitor=self._session_dir_janitor,
+            job_attachments_prefetch=self._job_attachments_prefetch,
+            action_update_callback=self._handle_session_action_update,
+            action_update_lock=self._action_update_lock,
+        )
 
-            session = Session(
-                id=new_session_id,
-                queue=queue,
-                queue_id=queue_id,
-                job_id=job_id,
-                env=env,
-                asset_sync=asset_sync,
-                job_details=job_details,
-                os_user=os_user,
-                retain_session_dir=self._retain_session_dir,
-                action_update_callback=self._handle_session_action_update,
-                action_update_lock=self._action_update_lock,
-            )
+        return _ProvisionedSession(
+            session=session,
+            queue=queue,
+            job_entities=job_entities,
+            log_configuration=log_config,
+            queue_credentials=queue_credentials,
+        )
 
-            def run_session(
-                session: Session, queue_credentials: QueueAwsCredentials | None
-            ) -> None:
-                queue_credentials_context: nullcontext | AwsCredentialsRefresher
-                if queue_credentials is not None:
-                    queue_credentials_context = queue_credentials.refresher
-                else:
-                    queue_credentials_context = nullcontext()
-                with (
-                    log_config.log_session(
-                        queue_id=queue_id,
-                        job_id=job_id,
-                        session_id=new_session_id,
-                        boto_session=self._boto_session,
-                    ),
-                    session,
-                    queue_credentials_context,
-                ):
-                    if isinstance(queue_credentials_context, nullcontext):
-                        session.logger.warning("Session running with no AWS Credentials.")
-                    if session.os_user is not None:
-                        session.logger.info(
-                            "Running Session Actions as user: %s" % session.os_user.user
-                        )
-                    try:
-                        session.run()
-                    except Exception as e:
-                        logger.exception(e)
-                        raise
-                    finally:
-                        self._wakeup.set()
-
-            self._sessions[new_session_id] = SchedulerSession(
-                future=self._executor.submit(run_session, session, queue_credentials),
-                queue=queue,
-                session=session,
-                job_entities=job_entities,
-                log_configuration=log_config,
-            )
-        return new_session_ids
+    def _run_session(
+        self,
+        *,
+        session: Session,
+        log_config: LogConfiguration,
+        queue_credentials: QueueAwsCredentials | None,
+    ) -> None:
+        queue_credentials_context: nullcontext | AwsCredentialsRefresher
+        if queue_credentials is not None:
+            queue_credentials_context = queue_credentials.refresher
+        else:
+            queue_credentials_context = nullcontext()
+        with (
+            log_config.log_session(
+                queue_id=session._queue_id,
+                job_id=session._job_id,
+                session_id=session.id,
+                boto_session=self._boto_session,
+            ),
+            session,
+            queue_credentials_context,
+        ):
+            if isinstance(queue_credentials_context, nullcontext):
+                session.logger.warning("Session running with no AWS Credentials.")
+            if session.os_user is not None:
+                session.logger.info("Running Session Actions as user: %s" % session.os_user.user)
+            try:
+                session.run()
+            except Exception as e:
+                logger.exception(e)
+                raise
+            finally:
+                self._wakeup.set()
 
     def _session_log_file_path(
         self,
@@ -1178,6 +1654,8 @@ class WorkerScheduler:
         Path
             The path to the session log
         """
+        if self._local_session_logs_compression:
+            return queue_log_dir / f"{session_id}.log.gz"
         return queue_log_dir / f"{session_id}.log"
 
     def _queue_log_dir_path(
@@ -1213,6 +1691,10 @@ class WorkerScheduler:
                 return
 
             assigned_queues = set(session["queueId"] for session in assigned_sessions.values())
+            # Sessions that are still being torn down may be using their Queue's credentials
+            assigned_queues.update(
+                self._sessions[session_id].session._queue_id for session_id in self._session_reapers
+            )
             created_manager_keys = set(self._queue_aws_credentials.keys())
             for key in created_manager_keys:
                 queue_id, role_arn = key.split(":", maxsplit=1)
@@ -1220,6 +1702,7 @@ class WorkerScheduler:
                     credentials_dataclass = self._queue_aws_credentials[key]
                     credentials_dataclass.session.cleanup()
                     del self._queue_aws_credentials[key]
+                    self._queue_aws_credentials_creation_locks.pop(key, None)
                     logger.debug(
                         AwsCredentialsLogEvent(
                             op=AwsCredentialsLogEventOp.DELETE,
@@ -1234,54 +1717,62 @@ class WorkerScheduler:
     ) -> Optional[QueueAwsCredentials]:
         """Creates an AWS Credentials Manager for the given Queue if necessary.
         Returns the credentials profile name for the credentials if there is one.
+
+        This may be called concurrently while provisioning Sessions. Callers that need the
+        same Queue credentials wait for a single AssumeQueueRoleForWorker request, while
+        credentials for different Queues are obtained in parallel.
         """
         hash_key = f"{queue_id}:{queue_role_arn}"
         with self._queue_aws_credentials_lock:
-            if self._queue_aws_credentials.get(hash_key) is None:
-                # We don't already have one, so we create it.
-                try:
-                    # Note: Makes a call to AssumeQueueRoleForWorker to fetch the initial
-                    # AWS Credentials.
-                    session = QueueBoto3Session(
-                        deadline_client=self._deadline,
-                        farm_id=self._farm_id,
-                        fleet_id=self._fleet_id,
-                        worker_id=self._worker_id,
-                        queue_id=queue_id,
-                        role_arn=queue_role_arn,
-                        os_user=os_user,
-                        interrupt_event=self._shutdown,
-                        worker_persistence_dir=self._worker_persistence_dir,
-                        region=self._boto_session.region_name,
-                    )
-                except (DeadlineRequestWorkerOfflineError, DeadlineRequestUnrecoverableError):
-                    # These are terminal errors for the Session. We need to fail it, without attempting,
-                    # if we have a terminal error.
-                    # The caller will log a message.
-                    raise
-                except (DeadlineRequestError, DeadlineRequestInterrupted):
-                    # We treat any non-terminal error as recoverable. We simply run the Session with no AWS Credentials,
-                    # but will log to the customer that it's running with no Credentials.
-                    return None
-
-                refresher = AwsCredentialsRefresher(
-                    resource={"resource": queue_id, "role_arn": queue_role_arn},
-                    session=session,
-                    failure_callback=partial(
-                        self._queue_credentials_refresh_failed, hash_key=hash_key
-                    ),
-                )
+            if (existing := self._queue_aws_credentials.get(hash_key)) is not None:
+                return existing
+            creation_lock = self._queue_aws_credentials_creation_locks.setdefault(hash_key, Lock())
 
-                credentials_dataclass = QueueAwsCredentials(session=session, refresher=refresher)
-                self._queue_aws_credentials[hash_key] = credentials_dataclass
-                logger.debug(
-                    f"Created new AWS Credentials for Queue {queue_id} with IAM Role {queue_role_arn}."
+        with creation_lock:
+            with self._queue_aws_credentials_lock:
+                if (existing := self._queue_aws_credentials.get(hash_key)) is not None:
+                    # Created by another Session while we were waiting.
+                    return existing
+
+            # We don't already have one, so we create it.
+            try:
+                # Note: Makes a call to AssumeQueueRoleForWorker to fetch the initial
+                # AWS Credentials.
+                session = QueueBoto3Session(
+                    deadline_client=self._deadline,
+                    farm_id=self._farm_id,
+                    fleet_id=self._fleet_id,
+                    worker_id=self._worker_id,
+                    queue_id=queue_id,
+                    role_arn=queue_role_arn,
+                    os_user=os_user,
+                    interrupt_event=self._shutdown,
+                    worker_persistence_dir=self._worker_persistence_dir,
+                    region=self._boto_session.region_name,
                 )
+            except (DeadlineRequestWorkerOfflineError, DeadlineRequestUnrecoverableError):
+                # These are terminal errors for the Session. We need to fail it, without attempting,
+                # if we have a terminal error.
+                # The caller will log a message.
+                raise
+            except (DeadlineRequestError, DeadlineRequestInterrupted):
+                # We treat any non-terminal error as recoverable. We simply run the Session with no AWS Credentials,
+                # but will log to the customer that it's running with no Credentials.
+                return None
 
-            return self._queue_aws_credentials[hash_key]
+            refresher = AwsCredentialsRefresher(
+                resource={"resource": queue_id, "role_arn": queue_role_arn},
+                session=session,
+                failure_callback=partial(self._queue_credentials_refresh_failed, hash_key=hash_key),
+            )
 
-        # Unreachable, but play it safe.
-        return None
+            credentials_dataclass = QueueAwsCredentials(session=session, refresher=refresher)
+            with self._queue_aws_credentials_lock:
+                self._queue_aws_credentials[hash_key] = credentials_dataclass
+            logger.debug(
+                f"Created new AWS Credentials for Queue {queue_id} with IAM Role {queue_role_arn}."
+            )
+            return credentials_dataclass
 
     def _queue_credentials_refresh_failed(self, exception: Exception, *, hash_key: str) -> None:
         """Called by an AwsCredentialsRefresher instance when it was unable to refresh
@@ -1340,6 +1831,18 @@ class WorkerScheduler:
                 # 2. update the queue actions
                 assigned_session_actions = session_assignment["sessionActions"]
                 if not session_exception:
+                    # The definition of a Session Action does not change once it has been assigned.
+                    # If the same actions are assigned as in the last response, then replacing the
+                    # queue's actions with them changes nothing: the actions that have since been
+                    # dequeued are either running or completed, and canceled actions were removed
+                    # above.
+                    action_ids = tuple(
+                        entry["sessionActionId"] for entry in assigned_session_actions
+                    )
+                    if self._assigned_action_ids.get(session_id) == action_ids:
+                        continue
+                    with self._sessions_lock:
+                        self._assigned_action_ids[session_id] = action_ids
                     assigned_session_actions = [
                         entry
                         for entry in assigned_session_actions
@@ -1352,6 +1855,8 @@ class WorkerScheduler:
                 else:
                     # The thread that normally runs session actions crashed or was stopped through a separate
                     # failure flow (e.g. from an API response that said to stop it).
+                    with self._sessions_lock:
+                        self._assigned_action_ids.pop(session_id, None)
                     self._return_sessionactions_from_stopped_session(
                         assigned_session_actions=assigned_session_actions,
                         failure_message=str(session_exception),
@@ -1434,6 +1939,7 @@ class WorkerScheduler:
         # Note: The service will only respond with TASK_RUN(s) if it never received the
         #  FAILED/INTERRUPTED status for the TASK_RUN.
 
+        failed_action_statuses: list[SessionActionStatus] = []
         for i, action in enumerate(assigned_session_actions):
             session_action_id = action["sessionActionId"]
             if self._action_updates_map.get(session_action_id) is not None:
@@ -1455,18 +1961,21 @@ class WorkerScheduler:
                 # Note: NEVER_ATTEMPED must not be reported with a started/ended time.
                 completed_status = "NEVER_ATTEMPTED"
 
-            self._action_updates_map[action["sessionActionId"]] = SessionActionStatus(
-                id=session_action_id,
-                # FAILED for the first one in the list, NEVER_ATTEMPTED for all of the others.
-                completed_status=completed_status,
-                start_time=start_time,
-                end_time=end_time,
-                status=ActionStatus(
-                    # The 'state' is ignored; we just need this for the fail message.
-                    state=ActionState.FAILED,
-                    fail_message=failure_message,
-                ),
+            failed_action_statuses.append(
+                SessionActionStatus(
+                    id=session_action_id,
+                    # FAILED for the first one in the list, NEVER_ATTEMPTED for all of the others.
+                    completed_status=completed_status,
+                    start_time=start_time,
+                    end_time=end_time,
+                    status=ActionStatus(
+                        # The 'state' is ignored; we just need this for the fail message.
+                        state=ActionState.FAILED,
+                        fail_message=failure_message,
+                    ),
+                )
             )
+        self._record_action_updates(failed_action_statuses)
 
     def _update_session_logging(
         self,
@@ -0,0 +1,222 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import IO, Any, Iterable, Optional, cast
+import json
+import logging
+import os
+
+from ..api_models import UpdatedSessionActionInfo
+
+logger = logging.getLogger(__name__)
+
+SESSION_ACTION_JOURNAL_FILENAME = "session_action_updates.jsonl"
+
+_FILE_MODE = 0o600
+_DATETIME_FIELDS = ("startedAt", "endedAt", "updatedAt")
+_MIN_RECORDS_BEFORE_COMPACTION = 64
+"""The journal is only compacted while updates are pending once it holds more records than this,
+and more than twice the number of pending updates"""
+
+
+class SessionActionUpdateJournal:
+    """An append-only journal of completed Session Action updates that have not yet been
+    acknowledged by the service, so that they survive a crash of the Worker Agent.
+
+    Updates are appended to the file as they are recorded, which makes them durable when the agent
+    process dies. To also make them durable when the host fails, without an fsync for every
+    update, the file is fsynced in a batch by calling sync() before the updates are sent to the
+    service. Acknowledged updates are dropped by rewriting the file with only the pending updates.
+
+    The journal belongs to a single Worker. Updates that were journaled by a different Worker are
+    discarded when it is opened.
+
+    A journal that cannot be read or written is disabled with a warning, since the agent can keep
+    working without it.
+
+    Parameters
+    ----------
+    path : Path
+        The path of the journal file
+    worker_id : str
+        The ID of the Worker that the updates belong to
+    """
+
+    _path: Path
+    _worker_id: str
+    _lock: Lock
+    _file: Optional[IO[str]]
+    _pending: dict[str, UpdatedSessionActionInfo]
+    _replayed: dict[str, UpdatedSessionActionInfo]
+    _records: int
+    _dirty: bool
+
+    def __init__(self, *, path: Path, worker_id: str) -> None:
+        self._path = path
+        self._worker_id = worker_id
+        self._lock = Lock()
+        self._file = None
+        self._pending = {}
+        self._records = 0
+        self._dirty = False
+        try:
+            self._pending = self._load()
+            self._rewrite()
+        except OSError as e:
+            self._disable(e)
+        self._replayed = dict(self._pending)
+
+    @property
+    def replayed_updates(self) -> dict[str, UpdatedSessionActionInfo]:
+        """The updates that were journaled, but not acknowledged, before the journal was opened"""
+        return dict(self._replayed)
+
+    def record(self, updates: dict[str, UpdatedSessionActionInfo]) -> None:
+        """Appends completed Session Action updates to the journal. They are durable across a
+        crash of the agent process once this returns, and across a failure of the host after the
+        next call to sync()."""
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                for action_id, update in updates.items():
+                    self._write({"update": {"id": action_id, "info": _to_json(update)}})
+                    self._pending[action_id] = update
+                self._file.flush()
+                self._dirty = True
+            except OSError as e:
+                self._disable(e)
+
+    def sync(self) -> None:
+        """Flushes the updates recorded since the last sync to disk"""
+        with self._lock:
+            if self._file is None or not self._dirty:
+                return
+            try:
+                os.fsync(self._file.fileno())
+                self._dirty = False
+            except OSError as e:
+                self._disable(e)
+
+    def acknowledge(self, action_ids: Iterable[str]) -> None:
+        """Drops updates that the service has acknowledged from the journal"""
+        with self._lock:
+            acknowledged = [action_id for action_id in action_ids if action_id in self._pending]
+            for action_id in acknowledged:
+                del self._pending[action_id]
+                self._replayed.pop(action_id, None)
+            if self._file is None or not acknowledged:
+                return
+            try:
+                if not self._pending or (
+                    self._records > _MIN_RECORDS_BEFORE_COMPACTION
+                    and self._records > 2 * len(self._pending)
+                ):
+                    self._rewrite()
+                else:
+                    self._write({"ack": acknowledged})
+                    self._file.flush()
+            except OSError as e:
+                self._disable(e)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self) -> dict[str, UpdatedSessionActionInfo]:
+        pending: dict[str, UpdatedSessionActionInfo] = {}
+        try:
+            with self._path.open("r", encoding="utf-8", errors="replace") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return pending
+
+        header, *records = lines or [""]
+        try:
+            journal_worker_id = json.loads(header).get("worker_id")
+        except (AttributeError, ValueError):
+            journal_worker_id = None
+        if journal_worker_id != self._worker_id:
+            logger.info(
+                "Discarding the Session Action update journal %s of Worker %s",
+                self._path,
+                journal_worker_id,
+            )
+            return pending
+
+        for line_number, line in enumerate(records, start=2):
+            try:
+                record = json.loads(line)
+                if "update" in record:
+                    pending[record["update"]["id"]] = _from_json(record["update"]["info"])
+                elif "ack" in record:
+                    for action_id in record["ack"]:
+                        pending.pop(action_id, None)
+            except (KeyError, TypeError, ValueError):
+                # The agent crashed while appending the last record
+                logger.warning(
+                    "Ignoring a corrupt record on line %d of the Session Action update journal %s",
+                    line_number,
+                    self._path,
+                )
+        return pending
+
+    def _rewrite(self) -> None:
+        """Replaces the journal with one that only holds the pending updates"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _FILE_MODE)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"worker_id": self._worker_id}) + "\n")
+            for action_id, update in self._pending.items():
+                file.write(json.dumps({"update": {"id": action_id, "info": _to_json(update)}}))
+                file.write("\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self._path)
+        self._records = len(self._pending)
+        self._dirty = False
+        fd = os.open(self._path, os.O_WRONLY | os.O_APPEND, _FILE_MODE)
+        self._file = os.fdopen(fd, "a", encoding="utf-8")
+
+    def _write(self, record: dict[str, Any]) -> None:
+        assert self._file is not None
+        self._file.write(json.dumps(record) + "\n")
+        self._records += 1
+
+    def _disable(self, error: OSError) -> None:
+        logger.warning(
+            "Could not use the Session Action update journal %s, so completed Session Actions may be"
+            " run again if the Worker Agent crashes: %s",
+            self._path,
+            error,
+        )
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+def _to_json(update: UpdatedSessionActionInfo) -> dict[str, Any]:
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in update.items()
+    }
+
+
+def _from_json(info: dict[str, Any]) -> UpdatedSessionActionInfo:
+    update = dict(info)
+    for key in _DATETIME_FIELDS:
+        if key in update:
+            update[key] = datetime.fromisoformat(update[key])
+    return cast(UpdatedSessionActionInfo, update)
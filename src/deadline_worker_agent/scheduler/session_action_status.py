@@ -1,9 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from __future__ import annotations
-from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from openjd.sessions import ActionStatus
 
@@ -11,8 +10,11 @@ if TYPE_CHECKING:
     from ..api_models import CompletedActionStatus
 
 
-@dataclass(frozen=True)
-class SessionActionStatus:
+class SessionActionStatus(NamedTuple):
+    """An update to a SessionAction that is held until it is sent to the service. A status is
+    created for every update that a running action reports, so it is a tuple rather than an object
+    with an attribute dictionary."""
+
     id: str
     update_time: datetime | None = None
     status: ActionStatus | None = None
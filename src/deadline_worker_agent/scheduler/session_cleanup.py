@@ -5,7 +5,7 @@ from __future__ import annotations
 import subprocess
 import os
 import getpass
-from threading import Lock
+from threading import Event, Lock
 
 from openjd.sessions import SessionUser, PosixSessionUser, WindowsSessionUser
 from .log import LOGGER
@@ -28,6 +28,9 @@ class SessionUserCleanupManager:
     _user_session_map: dict[str, dict[str, Session]]
     """Map of session user to a map of session IDs and sessions using that user"""
 
+    _user_cleanups: dict[str, Event]
+    """Map of session user to an event that is set once the cleanup of that user's processes is done"""
+
     _cleanup_session_user_processes: bool
 
     def __init__(
@@ -36,21 +39,36 @@ class SessionUserCleanupManager:
     ) -> None:
         self._user_session_map_lock = Lock()
         self._user_session_map = {}
+        self._user_cleanups = {}
         self._cleanup_session_user_processes = cleanup_session_user_processes
 
     def register(self, session: Session):
         if session.os_user is None:
             return
 
-        with self._user_session_map_lock:
-            user_name = session.os_user.user
-            session_dict = self._user_session_map.get(user_name, None)
-            if session_dict is None:
-                session_dict = {}
-                self._user_session_map[user_name] = session_dict
-            session_dict[session.id] = session
+        user_name = session.os_user.user
+        while True:
+            with self._user_session_map_lock:
+                cleanup_done = self._user_cleanups.get(user_name, None)
+                if cleanup_done is None or cleanup_done.is_set():
+                    self._user_cleanups.pop(user_name, None)
+                    session_dict = self._user_session_map.get(user_name, None)
+                    if session_dict is None:
+                        session_dict = {}
+                        self._user_session_map[user_name] = session_dict
+                    session_dict[session.id] = session
+                    return
+            # The user's remaining processes are being stopped. Wait for that to finish so
+            # that the cleanup does not stop processes belonging to the new session.
+            cleanup_done.wait()
 
     def deregister(self, session: Session):
+        """Deregisters a session. If it was the last session using its session user, then any
+        remaining processes running as that user are stopped.
+
+        The processes are stopped without holding the lock so that deregistering sessions
+        with other users is not blocked. This is safe to call from any thread.
+        """
         if session.os_user is None:
             return
 
@@ -64,9 +82,17 @@ class SessionUserCleanupManager:
             if registered_session is None:
                 return
 
-            if len(session_dict) == 0:
-                self._cleanup_session_user(session.os_user)
-                self._user_session_map.pop(user_name, None)
+            if len(session_dict) != 0:
+                return
+
+            self._user_session_map.pop(user_name, None)
+            cleanup_done = Event()
+            self._user_cleanups[user_name] = cleanup_done
+
+        try:
+            self._cleanup_session_user(session.os_user)
+        finally:
+            cleanup_done.set()
 
     @property
     def registered_sessions(self):
@@ -0,0 +1,180 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from threading import Condition, Event, Thread
+from time import monotonic
+from typing import Callable, Optional
+
+from ..api_models import UpdateWorkerScheduleResponse
+from .log import LOGGER
+
+logger = LOGGER
+
+_MAX_ASSIGNMENT_AGE_SECONDS = 60.0
+"""Assignments that have waited longer than this to be applied are not applied. The latest
+assignments are requested from the service instead."""
+
+
+class SessionOrchestrator:
+    """Applies the Worker's assignments, as given in UpdateWorkerSchedule responses, to its
+    Sessions on a dedicated thread.
+
+    Creating, updating, and removing Sessions can be slow (e.g. when it needs to resolve a job
+    user or fetch queue credentials). The thread that sends UpdateWorkerSchedule requests hands
+    each response to the orchestrator and carries on, so that the Worker keeps heart-beating on
+    schedule however long orchestration takes.
+
+    Each response holds every Session that is assigned to the Worker, so only the latest response
+    that has not been applied is kept and the Sessions are never more than one response behind the
+    service. The Session Actions to cancel are only given in one response, so those of a response
+    that is replaced before it is applied are carried over to the response that replaces it.
+
+    A response that has waited for longer than _MAX_ASSIGNMENT_AGE_SECONDS (because applying the
+    previous one was slow) is not applied. Instead, the orchestrator sets wakeup so that the latest
+    assignments are requested straight away, and applies the response to that request.
+
+    Parameters
+    ----------
+    apply : Callable[[UpdateWorkerScheduleResponse], None]
+        Applies a response's assignments to the Sessions. It is only ever called from one thread
+        at a time.
+    wakeup : Event
+        Set when orchestration fails or a response is too old to be applied, so that the thread
+        that sends UpdateWorkerSchedule requests calls check() and sends its next request without
+        waiting.
+    """
+
+    _apply: Callable[[UpdateWorkerScheduleResponse], None]
+    _wakeup: Event
+    _condition: Condition
+    _pending: Optional[UpdateWorkerScheduleResponse]
+    """The latest response that has not been applied"""
+    _pending_received: float
+    """When the latest of the responses merged into _pending was received"""
+    _refetching: bool
+    """Whether _pending is too old to be applied and is waiting to be replaced by a new response"""
+    _stopping: bool
+    _error: Optional[Exception]
+    _thread: Optional[Thread]
+
+    def __init__(
+        self,
+        *,
+        apply: Callable[[UpdateWorkerScheduleResponse], None],
+        wakeup: Event,
+    ) -> None:
+        self._apply = apply
+        self._wakeup = wakeup
+        self._condition = Condition()
+        self._pending = None
+        self._pending_received = 0.0
+        self._refetching = False
+        self._stopping = False
+        self._error = None
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        """Whether responses are applied on the orchestration thread"""
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Starts applying responses on the orchestration thread"""
+        if self._thread is not None:
+            return
+        with self._condition:
+            self._stopping = False
+            self._error = None
+        self._thread = Thread(target=self._run, name="SessionOrchestrator")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Applies the pending response, if any and unless it is too old, and stops the
+        orchestration thread. Returns once the thread has stopped, so that the caller can then
+        change the Sessions itself."""
+        thread = self._thread
+        if thread is None:
+            return
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        thread.join()
+        self._thread = None
+
+    def submit(self, response: UpdateWorkerScheduleResponse) -> None:
+        """Hands a response to the orchestration thread to be applied.
+
+        Parameters
+        ----------
+        response : UpdateWorkerScheduleResponse
+            The response to apply. It replaces any response that has not been applied yet.
+        """
+        with self._condition:
+            if self._pending is not None:
+                response = _merge_responses(self._pending, response)
+            self._pending = response
+            self._pending_received = monotonic()
+            self._refetching = False
+            self._condition.notify_all()
+
+    def check(self) -> None:
+        """Raises the exception that stopped the orchestration thread, if any"""
+        with self._condition:
+            error = self._error
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while (self._pending is None or self._refetching) and not self._stopping:
+                    self._condition.wait()
+                if self._pending is None or self._refetching:
+                    return
+                waited = monotonic() - self._pending_received
+                if waited > _MAX_ASSIGNMENT_AGE_SECONDS:
+                    # The response is kept so that its Session Actions to cancel are carried over
+                    # to the response that replaces it
+                    self._refetching = True
+                    logger.warning(
+                        "Requesting the Worker's assigned Sessions again, because they were"
+                        " received %.1f seconds ago while applying the previous assignment.",
+                        waited,
+                    )
+                    self._wakeup.set()
+                    continue
+                response = self._pending
+                self._pending = None
+            try:
+                self._apply(response)
+            except Exception as e:
+                with self._condition:
+                    self._error = e
+                    self._pending = None
+                    stopping = self._stopping
+                if stopping:
+                    # Nothing calls check() once the orchestrator is stopping
+                    logger.exception("Failed to apply the Worker's assigned Sessions: %s", e)
+                self._wakeup.set()
+                return
+
+
+def _merge_responses(
+    replaced: UpdateWorkerScheduleResponse, response: UpdateWorkerScheduleResponse
+) -> UpdateWorkerScheduleResponse:
+    """Returns a response with the assignments of a response and the Session Actions to cancel of
+    both it and the response that it replaces"""
+    cancel_session_actions = {
+        session_id: list(action_ids)
+        for session_id, action_ids in replaced["cancelSessionActions"].items()
+    }
+    for session_id, action_ids in response["cancelSessionActions"].items():
+        merged_action_ids = cancel_session_actions.setdefault(session_id, [])
+        merged_action_ids.extend(
+            action_id for action_id in action_ids if action_id not in merged_action_ids
+        )
+    merged = response.copy()
+    merged["cancelSessionActions"] = cancel_session_actions
+    return merged
@@ -99,6 +99,9 @@ class SessionActionQueue:
         | SyncInputJobAttachmentsQueueEntry
         | SyncInputJobAttachmentsStepDependenciesQueueEntry,
     ]
+    _removed_action_ids: set[str]
+    """The actions that have been dequeued or canceled. They are never queued again, even by a
+    response that was received before the service learned that they completed."""
     _action_update_callback: Callable[[SessionActionStatus], None]
     _job_entities: JobEntities
     _queue_id: str
@@ -116,6 +119,7 @@ class SessionActionQueue:
     ) -> None:
         self._action_update_callback = action_update_callback
         self._actions_by_id = {}
+        self._removed_action_ids = set()
         self._actions = []
         self._job_entities = job_entities
         self._queue_id = queue_id
@@ -178,6 +182,24 @@ class SessionActionQueue:
 
         return all_action_identifiers
 
+    def job_attachments_sync_position(self) -> int | None:
+        """Returns the position in the queue of the first SYNC_INPUT_JOB_ATTACHMENTS action that
+        syncs the job's inputs (rather than a step's dependencies), or None if there is none
+
+        Returns
+        -------
+        int | None
+            The number of actions that are queued before the action, or None if there is none
+        """
+        for position, action in enumerate(self._actions):
+            action_definition = action.definition
+            if (
+                action_definition["actionType"] == "SYNC_INPUT_JOB_ATTACHMENTS"
+                and "stepId" not in action_definition
+            ):
+                return position
+        return None
+
     def _cancel(
         self,
         *,
@@ -198,6 +220,7 @@ class SessionActionQueue:
         """
         action: SessionActionQueueEntry
         action = self._actions_by_id.pop(id)
+        self._removed_action_ids.add(id)
 
         self._actions.remove(action)
         action.cancel.set()
@@ -275,7 +298,8 @@ class SessionActionQueue:
             | SyncInputJobAttachmentsActionApiModel
         ],
     ) -> None:
-        """Update the queue's actions"""
+        """Update the queue's actions. Actions that have already been dequeued or canceled are
+        not queued again."""
         queue_entries: list[
             TaskRunQueueEntry
             | EnvironmentQueueEntry
@@ -288,6 +312,9 @@ class SessionActionQueue:
         for action in actions:
             action_type = action["actionType"]
             action_id = action["sessionActionId"]
+            if action_id in self._removed_action_ids:
+                logger.debug("Action %s already dequeued", action_id)
+                continue
             logger.debug("Processing action: %s", action_id)
             cancel_event = Event()
 
@@ -493,4 +520,5 @@ class SessionActionQueue:
                 )
             del self._actions[0]
             del self._actions_by_id[action_id]
+            self._removed_action_ids.add(action_id)
         return next_action
@@ -1,11 +1,12 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 import logging
-from typing import Any, Optional, TypedDict, Union
+from functools import lru_cache
+from typing import Any, Callable, Literal, Optional, TypedDict, Union
+import hashlib
 import json
 import datetime
 import re
-from threading import Lock
 
 from .log_messages import ApiRequestLogEvent, ApiResponseLogEvent
 
@@ -197,33 +198,87 @@ _IGNORE_LIST = [r"cloudwatch-logs:.*", r"s3:.*"]
 LOGGING_IGNORE_MATCHER = re.compile("^(" + "|".join(_IGNORE_LIST) + ")$")
 
 
-def _get_loggable_parameters(
-    body: dict[str, Any], allowable_keys: AllowableBodyKeysT
-) -> dict[str, Any]:
-    to_be_logged = dict[str, Any]()
-    if body is None:  # Handle the None case
+_REDACTED = "*REDACTED*"
+_DUPLICATE_RESPONSE = "(Duplicate removed, see previous response)"
+_UNCHANGED_REQUEST = "(Unchanged since last request)"
+
+# A compiled allow-list: returns the loggable parts of a request or response body
+RedactionPlan = Callable[[Optional[dict[str, Any]]], dict[str, Any]]
+
+
+def _compile_redaction_plan(allowable_keys: AllowableBodyKeysT) -> RedactionPlan:
+    """Compiles an allow-list of body keys into a function that returns the loggable parts of a
+    body, with the rules of each key resolved up front rather than on every call.
+
+    A key that is allowed is logged as-is (datetimes as strings), a key that is not allowed is
+    logged as "*REDACTED*", and the allow-list of a nested dictionary is applied to dictionary
+    values and to every element of list values."""
+    # A rule is True to log the value, False to redact it, or the plan for a nested dictionary
+    rules: dict[str, Union[bool, RedactionPlan]] = {
+        key: _compile_redaction_plan(allowable) if isinstance(allowable, dict) else bool(allowable)
+        for key, allowable in allowable_keys.items()
+        if key != "*"
+    }
+    wildcard: Union[bool, RedactionPlan] = False
+    if "*" in allowable_keys:
+        wildcard_allowable = allowable_keys["*"]
+        wildcard = (
+            _compile_redaction_plan(wildcard_allowable)
+            if isinstance(wildcard_allowable, dict)
+            else bool(wildcard_allowable)
+        )
+    get_rule = rules.get
+
+    def redact(body: Optional[dict[str, Any]]) -> dict[str, Any]:
+        to_be_logged = dict[str, Any]()
+        if body is None:  # Handle the None case
+            return to_be_logged
+        for k, v in body.items():
+            rule = get_rule(k, wildcard)
+            if rule is True:
+                to_be_logged[k] = str(v) if isinstance(v, datetime.datetime) else v
+            elif rule is False:
+                to_be_logged[k] = _REDACTED
+            elif isinstance(v, dict):
+                to_be_logged[k] = rule(v)
+            elif isinstance(v, list):
+                to_be_logged[k] = [rule(vv) for vv in v]
         return to_be_logged
-    for k, v in body.items():
-        if k not in allowable_keys:
-            if "*" not in allowable_keys:
-                to_be_logged[k] = "*REDACTED*"
-                continue
-            allow_key = "*"
-        else:
-            allow_key = k
-        allowable = allowable_keys[allow_key]
-        if isinstance(v, datetime.datetime):
-            v = str(v)
-        if isinstance(allowable, bool):
-            if allowable:
-                to_be_logged[k] = v
-            else:
-                to_be_logged[k] = "*REDACTED*"
-        elif isinstance(v, dict):
-            to_be_logged[k] = _get_loggable_parameters(v, allowable)
-        elif isinstance(v, list):
-            to_be_logged[k] = [_get_loggable_parameters(vv, allowable) for vv in v]
-    return to_be_logged
+
+    return redact
+
+
+@lru_cache(maxsize=None)
+def _redaction_plan(
+    operation_name: str, body_key: Literal["req_log_body", "res_log_body"]
+) -> RedactionPlan:
+    """Returns the cached redaction plan of the request ("req_log_body") or response
+    ("res_log_body") body of an operation in LOGGING_ALLOW_LIST"""
+    allow_list = LOGGING_ALLOW_LIST[operation_name]
+    return _compile_redaction_plan(allow_list.get(body_key, dict()))
+
+
+@lru_cache(maxsize=256)
+def _operation_name(event_name: str) -> Optional[str]:
+    """Returns the operation name of a boto event, or None if the operation is not logged"""
+    # event name is of the form `before_call.{service}.{operation}`
+    operation_name = event_name.split(".", 1)[1].replace(".", ":")
+    if LOGGING_IGNORE_MATCHER.match(operation_name):
+        return None
+    return operation_name
+
+
+def _digest(*parts: Union[bytes, str]) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.digest()
+
+
+def _json_digest(value: Any) -> bytes:
+    """Returns a digest of a JSON-like value that does not depend on the order of dict keys"""
+    return _digest(json.dumps(value, sort_keys=True, default=str))
 
 
 _deadline_resource_patterns = (
@@ -245,96 +300,36 @@ _DEADLINE_RESOURCE_MATCHER = re.compile(_DEADLINE_RESOURCE_REGEX)
 
 
 class PreviousRequestRecord:
-    # This is for deduplicating log entries; primarily aimed at
-    # deadline:UpdateWorkerSchedule, but it could include any API in future
-    # if desired. However, it should only be used for APIs that cannot be
-    # queried concurrently; that, basically, means that the API must only be
-    # queried within the Agent's main thread/event-loop.
+    # This is for deduplicating log entries of the operations in LOGGING_ALLOW_LIST, such as the
+    # deadline:UpdateWorkerSchedule heartbeat that usually repeats its previous request and
+    # response.
+    #
+    # Only a digest of the last request and of the last response of each operation is kept, so
+    # the memory used does not depend on the size of the requests and responses. Digests are of
+    # the raw request/response where available, so that a repeat is detected without parsing or
+    # redacting it, and of the redacted parameters otherwise.
+    #
+    # Digests are swapped without a lock. When the same operation is called concurrently, a race
+    # can only cause a repeated entry to be logged again, or an entry to be logged as a duplicate
+    # of an identical entry that was logged concurrently.
     #
     # The structure's contents are:
     # {
-    #    <api-name>: {
-    #       "request": {
-    #          <request parameters>
-    #          For deadline, this is the request 'params' and
-    #          deadline-resource (farm/fleet/queue/etc) merged together
-    #          into one dictionary.
-    #       },
-    #       "response": {
-    #          <response parameters>
-    #       }
-    #    },
+    #    (<api-name>, "request" | "response"): <digest>,
     #   ...
     # }
-    _api_parameters: dict[str, dict[str, Any]]
-
-    # The API operation names that are subject to filtering
-    _allowlist: set[str] = {
-        "deadline:UpdateWorkerSchedule",
-    }
-
-    _lock: Lock
+    _digests: dict[tuple[str, str], bytes]
 
     def __init__(self) -> None:
-        self._api_parameters = dict()
-        self._lock = Lock()
-
-    def record_request(
-        self,
-        *,
-        operation_name: str,
-        params: dict[str, Any],
-        resource: Optional[dict[str, str]] = None,
-    ) -> None:
-        if operation_name not in self._allowlist:
-            return
-        with self._lock:
-            if operation_name not in self._api_parameters:
-                self._api_parameters[operation_name] = dict(request=None)
-            self._api_parameters[operation_name]["request"] = dict(**params)
-            if resource:
-                self._api_parameters[operation_name]["request"].update(**resource)
-
-    def record_response(self, *, operation_name: str, params: dict[str, Any]) -> None:
-        if operation_name not in self._allowlist:
-            return
-        with self._lock:
-            if operation_name not in self._api_parameters:
-                self._api_parameters[operation_name] = dict(response=None)
-            self._api_parameters[operation_name]["response"] = dict(**params)
-
-    def filter_request(
-        self,
-        *,
-        operation_name: str,
-        params: dict[str, Any],
-        resource: Optional[dict[str, str]] = None,
-    ) -> bool:
-        # Return true if and only if the request should be suppressed from the log.
-        # i.e. That it exactly matches the previous request made.
-        if operation_name not in self._allowlist:
-            return False
-        with self._lock:
-            if operation_name not in self._api_parameters:
-                return False
-            if "request" not in self._api_parameters[operation_name]:
-                return False
-            curr_req = dict(**params)
-            if resource:
-                curr_req.update(**resource)
-            return curr_req == self._api_parameters[operation_name]["request"]
-
-    def filter_response(self, *, operation_name: str, params: dict[str, Any]) -> bool:
-        # Return true if and only if the request should be suppressed from the log.
-        # i.e. That it exactly matches the previous request made.
-        if operation_name not in self._allowlist:
-            return False
-        with self._lock:
-            if operation_name not in self._api_parameters:
-                return False
-            if "response" not in self._api_parameters[operation_name]:
-                return False
-            return params == self._api_parameters[operation_name]["response"]
+        self._digests = dict()
+
+    def is_repeat(self, *, operation_name: str, kind: str, digest: bytes) -> bool:
+        # Record the request/response, and return true if and only if it matches the previous
+        # one, in which case it should be suppressed from the log.
+        key = (operation_name, kind)
+        previous = self._digests.get(key)
+        self._digests[key] = digest
+        return previous == digest
 
 
 API_RECORD = PreviousRequestRecord()
@@ -371,10 +366,31 @@ def log_before_call(event_name, params, **kwargs) -> None:
     #   }
     # }
     try:
-        operation_name = event_name.split(".", 1)[1].replace(".", ":")
-        if LOGGING_IGNORE_MATCHER.match(operation_name):
+        operation_name = _operation_name(event_name)
+        if operation_name is None:
             return
         body = params["body"]
+        # Shorten a request that exactly matches the previous request of the operation
+        if operation_name in LOGGING_ALLOW_LIST and API_RECORD.is_repeat(
+            operation_name=operation_name,
+            kind="request",
+            digest=_digest(
+                params.get("url") or "",
+                body if isinstance(body, (bytes, str)) else json.dumps(body, sort_keys=True),
+            ),
+        ):
+            log.info(
+                ApiRequestLogEvent(
+                    operation=operation_name,
+                    request_url=(
+                        params.get("url")
+                        if LOGGING_ALLOW_LIST[operation_name].get("log_request_url", True)
+                        else _REDACTED
+                    ),
+                    params=_UNCHANGED_REQUEST,
+                )
+            )
+            return
         if isinstance(body, bytes):
             if body == b"":
                 body = None
@@ -388,11 +404,10 @@ def log_before_call(event_name, params, **kwargs) -> None:
             allow_list = LOGGING_ALLOW_LIST[operation_name]
             if allow_list.get("log_request_url", True):
                 url = params.get("url")
-            allowable_response_fields = allow_list.get("req_log_body", dict())
-            loggable_params = _get_loggable_parameters(body, allowable_response_fields)
+            loggable_params = _redaction_plan(operation_name, "req_log_body")(body)
         else:
-            loggable_params = "*REDACTED*"
-            url = "*REDACTED*"
+            loggable_params = _REDACTED
+            url = _REDACTED
         log_statement = {
             "operation": operation_name,
             "request_url": url,
@@ -400,17 +415,7 @@ def log_before_call(event_name, params, **kwargs) -> None:
         }  # noqa
         if operation_name.startswith("deadline"):
             log_statement["deadline_resource"] = _extract_deadline_resource_info(params["url"])
-        if not API_RECORD.filter_request(
-            operation_name=operation_name,
-            params=body,
-            resource=log_statement.get("deadline_resource"),
-        ):
-            log.info(ApiRequestLogEvent(**log_statement))
-            API_RECORD.record_request(
-                operation_name=operation_name,
-                params=body,
-                resource=log_statement.get("deadline_resource"),
-            )
+        log.info(ApiRequestLogEvent(**log_statement))
     except Exception:
         log.exception(f"Error Logging Boto Request with name {event_name}!")
 
@@ -479,36 +484,48 @@ def log_after_call(event_name, parsed, **kwargs) -> None:
     #     "resourceType": "worker"
     # }
     try:
-        operation_name = event_name.split(".", 1)[1].replace(".", ":")
-        if LOGGING_IGNORE_MATCHER.match(operation_name):
+        operation_name = _operation_name(event_name)
+        if operation_name is None:
             return
         loggable_params: Union[dict[str, Any], str] = dict()
-        if "Error" in parsed:
+        # Errors are never deduplicated
+        deduplicated = "Error" not in parsed and operation_name in LOGGING_ALLOW_LIST
+        # The raw HTTP body, when available, is much cheaper to digest than the parsed response, and
+        # a repeat is detected without redacting it
+        raw_body = getattr(kwargs.get("http_response"), "content", None)
+        if not isinstance(raw_body, bytes):
+            raw_body = None
+        if (
+            deduplicated
+            and raw_body is not None
+            and API_RECORD.is_repeat(
+                operation_name=operation_name, kind="response", digest=_digest(raw_body)
+            )
+        ):
+            # If it's not an Error and it matches the previous response, then we just filter out the response parameters
+            loggable_params = _DUPLICATE_RESPONSE
+        elif "Error" in parsed:
             loggable_params = dict(parsed)
             del loggable_params["Error"]
         else:
             if operation_name in LOGGING_ALLOW_LIST:
-                allow_list = LOGGING_ALLOW_LIST[operation_name]
-                allowable_response_fields = allow_list.get("res_log_body", dict())
-                loggable_params = _get_loggable_parameters(parsed, allowable_response_fields)
+                loggable_params = _redaction_plan(operation_name, "res_log_body")(parsed)
             else:
-                loggable_params = "*REDACTED*"
+                loggable_params = _REDACTED
         # We don't want metadata to show up at all as params, so delete it from the result
         if isinstance(loggable_params, dict):
             del loggable_params["ResponseMetadata"]
 
-        if "Error" not in parsed and API_RECORD.filter_response(
-            operation_name=operation_name,
-            params=loggable_params if isinstance(loggable_params, dict) else dict(),
-        ):
-            # If it's not an Error and it matches the previous response, then we just filter out the response parameters
-            loggable_params = "(Duplicate removed, see previous response)"
-        elif "Error" not in parsed:
-            # If it's not an error, then update the record of the last recorded response
-            API_RECORD.record_response(
-                operation_name=operation_name,
-                params=loggable_params if isinstance(loggable_params, dict) else dict(),
-            )
+            if (
+                deduplicated
+                and raw_body is None
+                and API_RECORD.is_repeat(
+                    operation_name=operation_name,
+                    kind="response",
+                    digest=_json_digest(loggable_params),
+                )
+            ):
+                loggable_params = _DUPLICATE_RESPONSE
 
         log_statement = {
             "operation": operation_name,
@@ -2,7 +2,7 @@
 
 from .environment_details import EnvironmentDetails
 from .job_attachment_details import JobAttachmentDetails
-from .job_entities import JobEntities
+from .job_entities import JobEntities, JobEntityRequestCoalescer
 from .step_details import StepDetails
 from .job_details import JobAttachmentSettings, JobDetails
 
@@ -13,5 +13,6 @@ __all__ = [
     "JobAttachmentSettings",
     "JobDetails",
     "JobEntities",
+    "JobEntityRequestCoalescer",
     "StepDetails",
 ]
@@ -1,11 +1,11 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass
-from itertools import islice
 from logging import getLogger
-from threading import Event, Thread
-from typing import Any, Iterator, Iterable, TYPE_CHECKING, TypeVar, Union, cast, Optional
+from threading import Condition
+from typing import Any, Iterable, TYPE_CHECKING, TypeVar, Union, cast, Optional
 import sys
 
 from ...api_models import (
@@ -75,21 +75,255 @@ class EntityRecord:
     error: BaseEntityErrorFields | None = None
 
 
-def _batched(iterable, n) -> Iterator[tuple]:
-    """Batch data into tuples of length n. The last batch may be shorter."""
-    # batched('ABCDEFG', 5) --> ABC DEF G
-    if n < 1:
-        raise ValueError("n must be at least one")
-    it = iter(iterable)
-    while batch := tuple(islice(it, n)):
-        yield batch
+class JobEntityRequestCoalescer:
+    """Coalesces the BatchGetJobEntity requests of concurrent callers.
+
+    Identifiers requested concurrently (e.g. by several sessions of a job that start at the same
+    time) are merged into as few BatchGetJobEntity requests as the API's maximum batch size allows.
+    An identifier that is already requested or in flight is not requested again; its callers wait
+    for the result of the existing request instead. Entities that are left out of the response to a
+    merged request (e.g. with a MaxPayloadSizeExceeded error) are requested again in smaller
+    batches, down to on their own.
+
+    No thread is started. While a request is in flight, identifiers requested by other callers are
+    queued, and one of the waiting callers makes the next request with everything queued by then.
+
+    Only in-flight requests are shared. Callers are responsible for caching the results.
+
+    Parameters
+    ----------
+    deadline_client : DeadlineClient
+        The Deadline client used to make the BatchGetJobEntity requests
+    farm_id : str
+        The unique identifier of the worker's farm
+    fleet_id : str
+        The unique identifier of the worker's fleet
+    worker_id : str
+        The unique identifier of the worker
+    """
+
+    _deadline_client: DeadlineClient
+    _farm_id: str
+    _fleet_id: str
+    _worker_id: str
+    _max_entities_per_request: int | None
+    _cond: Condition
+    _queue: deque[_PendingEntity]
+    """Pending entities that are not yet requested, in the order they were requested"""
+    _pending: dict[tuple[str, ...], _PendingEntity]
+    """Pending entities that are queued or in flight, by their key"""
+    _requesting: bool
+    """Whether a caller is currently making a request"""
+
+    def __init__(
+        self,
+        *,
+        deadline_client: DeadlineClient,
+        farm_id: str,
+        fleet_id: str,
+        worker_id: str,
+    ) -> None:
+        self._deadline_client = deadline_client
+        self._farm_id = farm_id
+        self._fleet_id = fleet_id
+        self._worker_id = worker_id
+        self._max_entities_per_request = None
+        self._cond = Condition()
+        self._queue = deque()
+        self._pending = {}
+        self._requesting = False
+
+    def request(self, entity_identifiers: Iterable[EntityIdentifier]) -> list[EntityRecord]:
+        """Requests entities, waiting for requests made on behalf of other callers if needed.
+
+        Parameters
+        ----------
+        entity_identifiers : Iterable[EntityIdentifier]
+            The identifiers of the entities to request
+
+        Raises
+        ------
+        Exception:
+            Any unexpected error raised while making a request that included one of the entities
+
+        Returns
+        -------
+        list[EntityRecord]
+            A record for each identifier, in order. The record has neither data nor an error if
+            the entity could not be obtained (e.g. the request failed in an unrecoverable way, or
+            the entity did not fit in a response even when it was requested on its own).
+        """
+        with self._cond:
+            pending_entities: list[_PendingEntity] = []
+            for identifier in entity_identifiers:
+                key = _coalescing_key(identifier)
+                if (pending := self._pending.get(key)) is None:
+                    pending = _PendingEntity(record=EntityRecord(identifier=identifier))
+                    self._pending[key] = pending
+                    self._queue.append(pending)
+                pending_entities.append(pending)
+
+            while not all(pending.done for pending in pending_entities):
+                if self._requesting:
+                    self._cond.wait()
+                else:
+                    self._request_next_batch()
+
+        for pending in pending_entities:
+            if pending.exception is not None:
+                raise pending.exception
+        return [pending.record for pending in pending_entities]
+
+    def _get_max_entities_per_request(self) -> int:
+        """Introspects the service model and returns the maximum allowed entities that can be
+        requested in a single BatchGetJobEntity API request
+
+        Returns
+        -------
+        int:
+            The maximum allowed entities that can be requested in a single BatchGetJobEntity API
+            request
+        """
+        if self._max_entities_per_request is None:
+            service_model = self._deadline_client._real_client._service_model
+            operation_model = service_model.operation_model("BatchGetJobEntity")
+            identifiers_request_field = operation_model.input_shape.members["identifiers"]
+            self._max_entities_per_request = identifiers_request_field.metadata["max"]
+        return self._max_entities_per_request
+
+    def _request_next_batch(self) -> None:
+        """Makes a BatchGetJobEntity request for the next batch of queued entities. The caller must
+        hold self._cond, which is released while the request is in flight."""
+        max_entities = self._get_max_entities_per_request()
+        batch = [self._queue.popleft() for _ in range(min(max_entities, len(self._queue)))]
+        self._requesting = True
+        self._cond.release()
+        try:
+            remaining = batch
+            while len(remaining) > 1:
+                # A merged batch may not fit in the response. Entities that were left out are
+                # requested again, together for as long as that makes progress and on their own
+                # otherwise, as each caller would have requested them without coalescing.
+                unresolved = self._make_request(remaining)
+                if len(unresolved) < len(remaining):
+                    remaining = unresolved
+                else:
+                    for pending in unresolved:
+                        self._make_request([pending])
+                    remaining = []
+            if remaining:
+                self._make_request(remaining)
+        except Exception as e:
+            for pending in batch:
+                pending.exception = e
+        finally:
+            self._cond.acquire()
+            self._requesting = False
+            for pending in batch:
+                pending.done = True
+                self._pending.pop(_coalescing_key(pending.record.identifier), None)
+            self._cond.notify_all()
+
+    def _make_request(self, batch: list[_PendingEntity]) -> list[_PendingEntity]:
+        """Makes a BatchGetJobEntity request and records its results. Returns the entities that
+        were neither returned nor failed by the response (e.g. because they did not fit in it), or
+        an empty list if the request failed in an unrecoverable way."""
+        pending_by_key = {_coalescing_key(pending.record.identifier): pending for pending in batch}
+        try:
+            response = batch_get_job_entity(
+                deadline_client=self._deadline_client,
+                farm_id=self._farm_id,
+                fleet_id=self._fleet_id,
+                worker_id=self._worker_id,
+                identifiers=[pending.record.identifier for pending in batch],
+            )
+        except (DeadlineRequestWorkerNotFound, DeadlineRequestUnrecoverableError):
+            # Technically, the API log reports this information, but we'll log anyways just to
+            # draw attention to it.
+            logger.error("Errors from BatchGetJobEntity! See API log event for details.")
+            return []
+            # Remaining responses: AccessDenied, InternalServerErrorException, ValidationException
+            # May be some race-ish conditions with the scheduler. Others may be recoverable, some not
+            # ie. malformed entities
+
+        # save each successful entity response in its EntityRecord
+        for entity in response["entities"]:
+            # entity is a dict that is a tagged union, so one of:
+            #    { "environmentDetails":   ... }
+            #    { "jobAttachmentDetails": ... }
+            #    { "jobDetails":           ... }
+            #    { "stepDetails":          ... }
+            entity_items = list(entity.items())
+            if len(entity_items) != 1:
+                # Only happens if there's a service bug.
+                raise ValueError(
+                    f"Expected a single key in entity, but got {', '.join(entity.keys())}"
+                )
+            entity_item = entity_items[0]
+            entity_data = cast(dict[str, Any], entity_item[1])
+            if (pending := pending_by_key.get(_coalescing_key(entity))) is not None:
+                pending.record.data = entity_data
+
+        for failed_entity in response["errors"]:
+            # failed_entity is a dict that is a tagged union, so one of:
+            #    { "environmentDetails":   ... }
+            #    { "jobAttachmentDetails": ... }
+            #    { "jobDetails":           ... }
+            #    { "stepDetails":          ... }
+            failed_entity_values = cast(list[BaseEntityErrorFields], list(failed_entity.values()))
+            # Assert only fails if there's a service bug.
+            assert (
+                len(failed_entity_values) == 1
+            ), f"Entity errors should contain a single key, but got {failed_entity.keys()}"
+
+            failed_entity_value = failed_entity_values[0]
+            if failed_entity_value["code"] == "MaxPayloadSizeExceeded":
+                # The entity is requested again in a smaller batch
+                continue
+            # InternalServerException, ValidationException, ResourceNotFoundException,
+
+            if (pending := pending_by_key.get(_coalescing_key(failed_entity))) is not None:
+                pending.record.error = failed_entity_value
+            logger.error("Errors from BatchGetJobEntity! See API log event for details.")
+
+        return [
+            pending
+            for pending in batch
+            if pending.record.data is None and pending.record.error is None
+        ]
+
+
+@dataclass
+class _PendingEntity:
+    record: EntityRecord
+    done: bool = False
+    exception: Exception | None = None
+
+
+def _coalescing_key(entity: EntityIdentifier | EntityDetails | EntityError) -> tuple[str, ...]:
+    """Returns a key that identifies an entity across jobs, from its identifier or its details or
+    error in a BatchGetJobEntity response"""
+    ((entity_type, fields),) = entity.items()
+    fields = cast(dict[str, Any], fields)
+    if entity_type == JobEntityType.ENVIRONMENT_DETAILS.value:
+        return (entity_type, fields["jobId"], fields["environmentId"])
+    elif entity_type == JobEntityType.STEP_DETAILS.value:
+        return (entity_type, fields["jobId"], fields["stepId"])
+    elif entity_type in (
+        JobEntityType.JOB_DETAILS.value,
+        JobEntityType.JOB_ATTACHMENT_DETAILS.value,
+    ):
+        return (entity_type, fields["jobId"])
+    else:
+        raise ValueError(f'Unexpected entity type "{entity_type}"')
 
 
 class JobEntities:
     """Class for accessing job details from Deadline.
 
     Internally, this class makes BatchGetJobEntity Deadline API requests and caches the results
-    in-memory for future access.
+    in-memory for future access. Requests are made through a JobEntityRequestCoalescer, which may
+    be shared with the JobEntities of other sessions so that their concurrent requests are merged.
     """
 
     _deadline_client: DeadlineClient
@@ -98,8 +332,7 @@ class JobEntities:
     _worker_id: str
     _job_id: str
     _entity_record_map: dict[str, EntityRecord]
-    _thread: Thread
-    _stop: Event
+    _request_coalescer: JobEntityRequestCoalescer
 
     def __init__(
         self,
@@ -111,6 +344,7 @@ class JobEntities:
         deadline_client: DeadlineClient,
         windows_credentials_resolver: Optional[WindowsCredentialsResolver],
         job_run_as_user_override: Optional[JobsRunAsUserOverride],
+        request_coalescer: Optional[JobEntityRequestCoalescer] = None,
     ) -> None:
         self._job_id = job_id
         self._farm_id = farm_id
@@ -120,6 +354,12 @@ class JobEntities:
         self._windows_credentials_resolver = windows_credentials_resolver
         self._entity_record_map = {}
         self._job_run_as_user_override = job_run_as_user_override
+        self._request_coalescer = request_coalescer or JobEntityRequestCoalescer(
+            deadline_client=deadline_client,
+            farm_id=farm_id,
+            fleet_id=fleet_id,
+            worker_id=worker_id,
+        )
 
     def request(self, *, identifier: EntityIdentifier) -> dict[str, Any]:
         """Given an identifier, grab the associated data from the
@@ -191,21 +431,6 @@ class JobEntities:
         else:
             raise ValueError(f'Unexpected entity type "{entity_type}"')
 
-    def _get_max_entities_per_batch_get_job_entity_request(self) -> int:
-        """Introspects the service model and returns the maximum allowed entities that can be
-        requested in a single BatchGetJobEntity API request
-
-        Returns
-        -------
-        int:
-            The maximum allowed entities that can be requested in a single BatchGetJobEntity API
-            request
-        """
-        service_model = self._deadline_client._real_client._service_model
-        operation_model = service_model.operation_model("BatchGetJobEntity")
-        identifiers_request_field = operation_model.input_shape.members["identifiers"]
-        return identifiers_request_field.metadata["max"]
-
     def _create_entity_records(self, entity_identifiers: Iterable[EntityIdentifier]):
         """Helper func to create the entity records when caching
         multiple identifiers at once"""
@@ -215,72 +440,13 @@ class JobEntities:
                 self._entity_record_map[entity_key] = EntityRecord(identifier=identifier)
 
     def cache_entities(self, entity_identifiers: list[EntityIdentifier]):
-        # Determine how many entities can be requested in a single BatchGetJobEntities API call
-        max_entities = self._get_max_entities_per_batch_get_job_entity_request()
-        for batched_identifiers in _batched(entity_identifiers, max_entities):
-            self._create_entity_records(batched_identifiers)
-
-            try:
-                response = batch_get_job_entity(
-                    deadline_client=self._deadline_client,
-                    farm_id=self._farm_id,
-                    fleet_id=self._fleet_id,
-                    worker_id=self._worker_id,
-                    identifiers=[identifier for identifier in batched_identifiers],
-                )
-            except (DeadlineRequestWorkerNotFound, DeadlineRequestUnrecoverableError):
-                # Technically, the API log reports this information, but we'll log anyways just to
-                # draw attention to it.
-                logger.error("Errors from BatchGetJobEntity! See API log event for details.")
-                continue
-                # Remaining responses: AccessDenied, InternalServerErrorException, ValidationException
-                # May be some race-ish conditions with the scheduler. Others may be recoverable, some not
-                # ie. malformed entities
-
-            # save each successful entity response in its EntityRecord
-            for entity in response["entities"]:
-                # entity is a dict that is a tagged union, so one of:
-                #    { "environmentDetails":   ... }
-                #    { "jobAttachmentDetails": ... }
-                #    { "jobDetails":           ... }
-                #    { "stepDetails":          ... }
-                entity_items = list(entity.items())
-                if len(entity_items) != 1:
-                    # Only happens if there's a service bug.
-                    raise ValueError(
-                        f"Expected a single key in entity, but got {', '.join(entity.keys())}"
-                    )
-                entity_item = entity_items[0]
-                entity_data = cast(dict[str, Any], entity_item[1])
-                entity_key = self._entity_key(entity)
-
-                entity_record = self._entity_record_map[entity_key]
-                entity_record.data = entity_data
-
-            for failed_entity in response["errors"]:
-                # failed_entity is a dict that is a tagged union, so one of:
-                #    { "environmentDetails":   ... }
-                #    { "jobAttachmentDetails": ... }
-                #    { "jobDetails":           ... }
-                #    { "stepDetails":          ... }
-                failed_entity_values = cast(
-                    list[BaseEntityErrorFields], list(failed_entity.values())
-                )
-                # Assert only fails if there's a service bug.
-                assert (
-                    len(failed_entity_values) == 1
-                ), f"Entity errors should contain a single key, but got {failed_entity.keys()}"
-
-                failed_entity_value = failed_entity_values[0]
-                if failed_entity_value["code"] == "MaxPayloadSizeExceeded":
-                    # ignore MaxPayloadSizeExceeded, only matters for batch caching
-                    continue
-                # InternalServerException, ValidationException, ResourceNotFoundException,
-
-                failed_entity_key = self._entity_key(failed_entity)
-                entity_record = self._entity_record_map[failed_entity_key]
-                entity_record.error = failed_entity_value
-                logger.error("Errors from BatchGetJobEntity! See API log event for details.")
+        self._create_entity_records(entity_identifiers)
+        for record in self._request_coalescer.request(entity_identifiers):
+            entity_record = self._entity_record_map[self._entity_key(record.identifier)]
+            if record.data is not None:
+                entity_record.data = record.data
+            if record.error is not None:
+                entity_record.error = record.error
 
     def job_attachment_details(self) -> JobAttachmentDetails:
         """Returns a future for the job attachment details.
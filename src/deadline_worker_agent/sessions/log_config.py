@@ -6,8 +6,10 @@ from dataclasses import dataclass, field
 from datetime import timedelta
 from enum import Enum
 from pathlib import Path
+from threading import RLock
 from typing import ContextManager, Generator
 import logging
+import re
 
 from ..log_sync.cloudwatch import (
     LOG_CONFIG_OPTION_GROUP_NAME_KEY,
@@ -19,6 +21,7 @@ from ..boto import (
     OTHER_BOTOCORE_CONFIG,
 )
 from ..log_sync.cloudwatch import CloudWatchHandler
+from ..log_sync.local_file import AsyncRotatingFileHandler
 from ..log_messages import SessionLogEvent, SessionLogEventSubtype
 
 
@@ -28,6 +31,17 @@ logger = logging.getLogger(__name__)
 # The logging format string used to format session logs being written to the local file-system
 SESSION_LOCAL_LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
 
+# The number of rotated local session log files that are kept for each session
+SESSION_LOCAL_LOG_BACKUP_COUNT = 5
+
+# The interval at which a run of suppressed similar session log lines is summarized
+REPEATED_LINE_SUMMARY_INTERVAL = timedelta(seconds=10)
+
+_NUMBER_RE = re.compile(r"\d+")
+# Whitespace, and the characters that progress bars and spinners are drawn with
+_FILLER_RE = re.compile(r"[\s=#*>.|/\\_~-]+")
+_SUPPRESSOR_RECORD_ATTR = "_deadline_repeated_line_suppressor"
+
 
 class LogDriver(Enum):
     """A log driver represents a destination type for logs. Each LogDriver has independent logic
@@ -113,6 +127,129 @@ class SessionLogFilter(logging.Filter):
         )
 
 
+def _line_template(message: str) -> str:
+    """Returns a template of a log line that is the same for lines that only differ by numbers,
+    spinner characters, or the length of progress bars"""
+    return _FILLER_RE.sub(" ", _NUMBER_RE.sub("0", message))
+
+
+class RepeatedLineSuppressor(logging.Filter):
+    """A filter that collapses runs of similar session log lines, such as progress updates, into
+    periodic summaries.
+
+    Consecutive lines that only differ by numbers, spinner characters, or the length of progress bars
+    are considered similar. The first lines of a run, up to the threshold, are passed through. The
+    rest of the run is suppressed, except for one line per summary interval that is passed through
+    after a summary of the lines suppressed before it. When the run ends, the suppressed lines are
+    summarized and the last one is passed through, so that the final state of the progress is kept.
+
+    Only the current run is tracked, so the state is bounded regardless of the number of lines. The
+    summary and the last suppressed line are emitted to the handler that the filter is attached to,
+    so each handler needs its own instance. Intervals are measured between the creation times of the
+    records, so that instances attached to different handlers make the same decisions.
+
+    Parameters
+    ----------
+    handler : logging.Handler
+        The handler that the filter is attached to
+    threshold : int
+        The number of similar lines in a run that are passed through before suppressing the rest
+    summary_interval : timedelta
+        The interval at which a run of suppressed lines is summarized
+    """
+
+    _handler: logging.Handler
+    _threshold: int
+    _summary_interval_seconds: float
+    _lock: RLock
+    _template: str | None
+    _run_length: int
+    _last_suppressed: logging.LogRecord | None
+    _suppressed_count: int
+    _last_summary_created: float
+
+    def __init__(
+        self,
+        *,
+        handler: logging.Handler,
+        threshold: int,
+        summary_interval: timedelta = REPEATED_LINE_SUMMARY_INTERVAL,
+    ) -> None:
+        super().__init__()
+        if threshold < 1:
+            raise ValueError(f"threshold must be at least 1, but got {threshold}")
+        self._handler = handler
+        self._threshold = threshold
+        self._summary_interval_seconds = summary_interval.total_seconds()
+        self._lock = RLock()
+        self._template = None
+        self._run_length = 0
+        self._last_suppressed = None
+        self._suppressed_count = 0
+        self._last_summary_created = 0.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, _SUPPRESSOR_RECORD_ATTR, None) is self:
+            # A summary or suppressed line emitted by this filter
+            return True
+        template = _line_template(record.getMessage())
+        with self._lock:
+            if template != self._template:
+                self._end_run()
+                self._template = template
+                self._run_length = 1
+                self._last_summary_created = record.created
+                return True
+
+            self._run_length += 1
+            if self._run_length <= self._threshold:
+                return True
+
+            if record.created - self._last_summary_created >= self._summary_interval_seconds:
+                self._emit_summary(like=record)
+                self._last_summary_created = record.created
+                return True
+
+            self._suppressed_count += 1
+            self._last_suppressed = record
+            return False
+
+    def flush(self) -> None:
+        """Summarizes the current run of suppressed lines, if any, and passes through the last
+        suppressed line"""
+        with self._lock:
+            self._end_run()
+            self._template = None
+            self._run_length = 0
+
+    def _end_run(self) -> None:
+        """The caller must hold self._lock"""
+        if (last := self._last_suppressed) is None:
+            return
+        self._suppressed_count -= 1
+        self._emit_summary(like=last)
+        self._handler.handle(self._copy(last))
+
+    def _emit_summary(self, *, like: logging.LogRecord) -> None:
+        """Emits a summary of the suppressed lines, if any. The caller must hold self._lock."""
+        count = self._suppressed_count
+        self._suppressed_count = 0
+        self._last_suppressed = None
+        if count > 0:
+            summary = self._copy(like)
+            summary.msg = f"... {count:,} similar lines suppressed"
+            summary.args = None
+            summary.exc_info = None
+            summary.exc_text = None
+            summary.stack_info = None
+            self._handler.handle(summary)
+
+    def _copy(self, record: logging.LogRecord) -> logging.LogRecord:
+        copy = logging.makeLogRecord(record.__dict__)
+        setattr(copy, _SUPPRESSOR_RECORD_ATTR, self)
+        return copy
+
+
 @dataclass
 class LogConfiguration:
     """The session's log configuration
@@ -129,6 +266,16 @@ class LogConfiguration:
         responsiveness/interactiveness of reading logs with costs and API request throughput.
     log_driver: LogDriver
         The log driver for the session.
+    session_log_file_compression : bool
+        Whether the local session log file is gzip-compressed
+    session_log_file_max_bytes : int | None
+        The size at which the local session log file is rotated, or None to never rotate it
+    log_packing_window_ms : int | None
+        If not None, consecutive log lines emitted within this many milliseconds of each other are
+        packed into a single event by the log driver
+    repeated_line_threshold : int | None
+        If not None, runs of similar log lines are collapsed into periodic summaries after this
+        many lines
     """
 
     loggers: list[logging.Logger]
@@ -137,6 +284,10 @@ class LogConfiguration:
     parameters: SessionLogConfigurationParameters = field(compare=False)
     log_driver: LogDriver = LogDriver.AWSLOGS
     log_provisioning_error: LogProvisioningError | None = None
+    session_log_file_compression: bool = False
+    session_log_file_max_bytes: int | None = None
+    log_packing_window_ms: int | None = None
+    repeated_line_threshold: int | None = None
 
     @classmethod
     def from_boto(
@@ -145,6 +296,10 @@ class LogConfiguration:
         loggers: list[logging.Logger],
         log_configuration: BotoSessionLogConfiguration,
         session_log_file: Path | None,
+        session_log_file_compression: bool = False,
+        session_log_file_max_bytes: int | None = None,
+        log_packing_window_ms: int | None = None,
+        repeated_line_threshold: int | None = None,
     ) -> LogConfiguration:
         """
         Parameters
@@ -155,6 +310,16 @@ class LogConfiguration:
             The log configuration as returned for a session in the UpdateWorkerSchedule response
         session_log_file : Path
             Path to the log file for the session
+        session_log_file_compression : bool
+            Whether the local session log file is gzip-compressed
+        session_log_file_max_bytes : int | None
+            The size at which the local session log file is rotated, or None to never rotate it
+        log_packing_window_ms : int | None
+            If not None, consecutive log lines emitted within this many milliseconds of each other
+            are packed into a single event by the log driver
+        repeated_line_threshold : int | None
+            If not None, runs of similar log lines are collapsed into periodic summaries after this
+            many lines
 
         Returns
         -------
@@ -184,6 +349,10 @@ class LogConfiguration:
             options=log_configuration["options"].copy(),
             parameters=SessionLogConfigurationParameters.from_boto(log_configuration["parameters"]),
             session_log_file=session_log_file,
+            session_log_file_compression=session_log_file_compression,
+            session_log_file_max_bytes=session_log_file_max_bytes,
+            log_packing_window_ms=log_packing_window_ms,
+            repeated_line_threshold=repeated_line_threshold,
         )
 
     def create_remote_handler(
@@ -205,10 +374,23 @@ class LogConfiguration:
             log_group_name=log_group,
             log_stream_name=log_stream,
             logs_client=boto_session.client("logs", config=OTHER_BOTOCORE_CONFIG),
+            packing_window_ms=self.log_packing_window_ms,
         )
 
-    def create_local_file_handler(self) -> logging.FileHandler:
+    def create_local_file_handler(self) -> logging.Handler:
+        """Creates a log handler that writes the session log to the local file-system.
+
+        Compressed or rotated session logs are written by a background thread, so that sessions
+        are not slowed down by the disk. Otherwise, they are written by a plain file handler.
+        """
         assert self.session_log_file is not None
+        if self.session_log_file_compression or self.session_log_file_max_bytes is not None:
+            return AsyncRotatingFileHandler(
+                filename=self.session_log_file,
+                compress=self.session_log_file_compression,
+                max_bytes=self.session_log_file_max_bytes,
+                backup_count=SESSION_LOCAL_LOG_BACKUP_COUNT,
+            )
         return logging.FileHandler(filename=self.session_log_file)
 
     def update(
@@ -253,6 +435,18 @@ class LogConfiguration:
             ctx_mgr = nullcontext()
 
         log_filter = SessionLogFilter(session_id=session_id)
+        suppressors: list[tuple[logging.Handler, RepeatedLineSuppressor]] = []
+        if self.repeated_line_threshold is not None:
+            for handler in (remote_handler, local_file_handler):
+                if handler is not None:
+                    suppressors.append(
+                        (
+                            handler,
+                            RepeatedLineSuppressor(
+                                handler=handler, threshold=self.repeated_line_threshold
+                            ),
+                        )
+                    )
 
         with (
             ctx_mgr,
@@ -263,6 +457,9 @@ class LogConfiguration:
                 local_file_handler.addFilter(log_filter)
             remote_handler.setFormatter(logging.Formatter(LOG_DRIVER_FMT_STRINGS[self.log_driver]))
             remote_handler.addFilter(log_filter)
+            # Added after the session filter, so that only this session's lines are considered
+            for handler, suppressor in suppressors:
+                handler.addFilter(suppressor)
             for log in self.loggers:
                 log.addHandler(remote_handler)
                 if local_file_handler:
@@ -293,6 +490,9 @@ class LogConfiguration:
             try:
                 yield remote_handler
             finally:
+                for handler, suppressor in suppressors:
+                    suppressor.flush()
+                    handler.removeFilter(suppressor)
                 for log in self.loggers:
                     log.removeHandler(remote_handler)
                     if local_file_handler:
@@ -9,7 +9,7 @@ from datetime import datetime, timedelta, timezone
 from functools import partial
 from logging import getLogger, LoggerAdapter
 from pathlib import Path
-from threading import Event, RLock
+from threading import Event, RLock, Thread
 from time import monotonic, sleep
 from types import TracebackType
 from typing import (
@@ -67,6 +67,7 @@ from deadline.job_attachments.os_file_permission import (
 )
 from deadline.job_attachments.progress_tracker import ProgressReportMetadata, SummaryStatistics
 
+from ..job_attachments import CachingAssetSync
 from ..aws.deadline import (
     record_success_fail_telemetry_event,
     record_sync_inputs_fail_telemetry_event,
@@ -75,6 +76,7 @@ from ..aws.deadline import (
 )
 from ..scheduler.session_action_status import SessionActionStatus
 from ..sessions.errors import SessionActionError
+from .session_dir_janitor import SessionDirJanitor
 from ..log_messages import (
     SessionLogEvent,
     SessionLogEventSubtype,
@@ -164,8 +166,12 @@ class Session:
     _queue_id: str
     _job_id: str
     _retain_session_dir: bool = False
+    _session_dir_janitor: SessionDirJanitor | None = None
     _job_details: JobDetails
     _job_attachment_details: JobAttachmentDetails | None = None
+    _job_attachments_prefetch: bool = False
+    _prefetch_thread: Thread | None = None
+    _prefetch_cancel: Event
 
     # Event that is set only when this Session is not running at all
     # i.e. it has exited, or never started, its main run loop/logic.
@@ -184,6 +190,9 @@ class Session:
         asset_sync: Optional[AssetSync],
         os_user: SessionUser | None,
         retain_session_dir: bool = False,
+        session_root_dir: Path | None = None,
+        session_dir_janitor: SessionDirJanitor | None = None,
+        job_attachments_prefetch: bool = False,
         job_details: JobDetails,
         action_update_callback: Callable[[SessionActionStatus], None],
         action_update_lock: RLock,
@@ -197,6 +206,11 @@ class Session:
         self._job_id = job_id
         self._os_user = os_user
         self._retain_session_dir = retain_session_dir
+        if os.name == "posix":
+            # The janitor deletes the working directory in the background, as the job user
+            self._session_dir_janitor = session_dir_janitor
+        self._job_attachments_prefetch = job_attachments_prefetch
+        self._prefetch_cancel = Event()
         self._job_details = job_details
         self._report_action_update = action_update_callback
         self._env = env
@@ -205,15 +219,15 @@ class Session:
         def openjd_session_action_callback(session_id: str, action_status: ActionStatus) -> None:
             self.update_action(action_status)
 
-        session_root_directory: Optional[Path] = None
-        if os.name == "posix":
+        session_root_directory: Optional[Path] = session_root_dir
+        if session_root_directory is None and os.name == "posix":
             session_root_directory = DEFAULT_POSIX_OPENJD_SESSION_DIR
 
         self._session = OPENJDSession(
             session_id=self._id,
             job_parameter_values=self._job_details.parameters,
             path_mapping_rules=self._job_details.path_mapping_rules,
-            retain_working_dir=self._retain_session_dir,
+            retain_working_dir=self._retain_session_dir or self._session_dir_janitor is not None,
             user=self._os_user,
             callback=openjd_session_action_callback,
             os_env_vars=self._env,
@@ -241,6 +255,11 @@ class Session:
         """The session user"""
         return self._os_user
 
+    @property
+    def working_directory(self) -> Path:
+        """The working directory of the Open Job Description session"""
+        return self._session.working_directory
+
     def _warm_job_entities_cache(self) -> None:
         """Attempts to cache the job entities response for all
         actions in the SessionActionQueue within the Session thread.
@@ -287,6 +306,7 @@ class Session:
         This code will loop until Session.stop() is called from another thread.
         """
         self._warm_job_entities_cache()
+        self._start_input_prefetch()
 
         self._stopped_running.clear()
 
@@ -434,6 +454,7 @@ class Session:
                     logger.info("%s successful", desc)
                 cur_time = monotonic()
         finally:
+            self._stop_input_prefetch()
             if self._asset_sync is not None and self._job_attachment_details is not None:
                 # Perform any cleanup the job attachments system needs to do
                 self._asset_sync.cleanup_session(
@@ -443,6 +464,13 @@ class Session:
                 )
             # Clean-up the Open Job Description session
             self._session.cleanup()
+            if self._session_dir_janitor is not None and not self._retain_session_dir:
+                self.logger.info(
+                    f"Deleting working directory: {str(self._session.working_directory)}"
+                )
+                self._session_dir_janitor.discard(
+                    self._session.working_directory, os_user=self._os_user
+                )
 
     def replace_assigned_actions(
         self,
@@ -490,6 +518,7 @@ class Session:
         self._queue.replace(
             actions=(action for action in actions if action["sessionActionId"] != running_action_id)
         )
+        self._start_input_prefetch()
 
     def cancel_actions(
         self,
@@ -817,6 +846,125 @@ class Session:
         progress and status message are passed in by Job Attachments."""
         return True
 
+    def _job_attachments_inputs(
+        self,
+        *,
+        job_attachment_details: JobAttachmentDetails,
+        step_dependencies: list[str] | None = None,
+    ) -> Tuple[JobAttachmentS3Settings, Attachments, dict[str, str]]:
+        """Returns the S3 settings, attachments, and storage profile path mapping rules that the
+        job's inputs are synced with"""
+        job_attachment_settings = self._job_details.job_attachment_settings
+        assert job_attachment_settings is not None
+        assert job_attachment_settings.s3_bucket_name is not None
+        assert job_attachment_settings.root_prefix is not None
+
+        s3_settings = JobAttachmentS3Settings(
+            s3BucketName=job_attachment_settings.s3_bucket_name,
+            rootPrefix=job_attachment_settings.root_prefix,
+        )
+
+        manifest_properties_list: list[ManifestProperties] = []
+        if not step_dependencies:
+            for manifest_properties in job_attachment_details.manifests:
+                manifest_properties_list.append(
+                    ManifestProperties(
+                        rootPath=manifest_properties.root_path,
+                        fileSystemLocationName=manifest_properties.file_system_location_name,
+                        rootPathFormat=PathFormat(manifest_properties.root_path_format),
+                        inputManifestPath=manifest_properties.input_manifest_path,
+                        inputManifestHash=manifest_properties.input_manifest_hash,
+                        outputRelativeDirectories=manifest_properties.output_relative_directories,
+                    )
+                )
+
+        attachments = Attachments(
+            manifests=manifest_properties_list,
+            fileSystem=job_attachment_details.job_attachments_file_system,
+        )
+
+        storage_profiles_path_mapping_rules_dict: dict[str, str] = {
+            str(rule.source_path): str(rule.destination_path)
+            for rule in self._job_details.path_mapping_rules
+        }
+
+        return (s3_settings, attachments, storage_profiles_path_mapping_rules_dict)
+
+    def _start_input_prefetch(self) -> None:
+        """Starts prefetching the job's input files in the background, if enabled and the
+        session has work to do before it syncs them.
+
+        The prefetch starts at most once per session, and only while the job's
+        SYNC_INPUT_JOB_ATTACHMENTS action is queued behind other actions.
+        """
+        if (
+            not self._job_attachments_prefetch
+            or self._prefetch_thread is not None
+            or not isinstance(self._asset_sync, CachingAssetSync)
+            or self._job_attachment_details is not None
+            or not self._job_details.job_attachment_settings
+        ):
+            return
+        position = self._queue.job_attachments_sync_position()
+        if position is None or (position == 0 and self._current_action is None):
+            # The inputs are synced next, so there is nothing to overlap the prefetch with
+            return
+
+        self._prefetch_thread = Thread(
+            target=self._prefetch_inputs,
+            args=(self._asset_sync,),
+            name=f"JobAttachmentsPrefetch-{self._id}",
+            daemon=True,
+        )
+        self._prefetch_thread.start()
+
+    def _prefetch_inputs(self, asset_sync: CachingAssetSync) -> None:
+        try:
+            s3_settings, attachments, storage_profiles_path_mapping_rules = (
+                self._job_attachments_inputs(
+                    job_attachment_details=self._queue._job_entities.job_attachment_details(),
+                )
+            )
+            prefetched = asset_sync.prefetch_inputs(
+                s3_settings=s3_settings,
+                attachments=attachments,
+                queue_id=self._queue_id,
+                job_id=self._job_id,
+                session_dir=self._session.working_directory,
+                storage_profiles_path_mapping_rules=storage_profiles_path_mapping_rules,
+                cancel=self._prefetch_cancel,
+            )
+        except Exception as e:
+            # The inputs are downloaded when they are synced
+            logger.info(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.INFO,
+                    queue_id=self._queue_id,
+                    job_id=self._job_id,
+                    session_id=self.id,
+                    message=f"Did not prefetch Job Attachments input files: {e}",
+                )
+            )
+        else:
+            logger.info(
+                SessionLogEvent(
+                    subtype=SessionLogEventSubtype.INFO,
+                    queue_id=self._queue_id,
+                    job_id=self._job_id,
+                    session_id=self.id,
+                    message=f"Prefetched {prefetched} Job Attachments input file(s)",
+                )
+            )
+
+    def _stop_input_prefetch(self) -> None:
+        """Stops the prefetch of the job's input files, if it is running, and waits for it"""
+        self._prefetch_cancel.set()
+        if self._prefetch_thread is not None:
+            # Not bounded by a timeout, since the sync moves and removes the prefetched files
+            # once the prefetch stops. The prefetch stops at its next progress report now that it
+            # is cancelled.
+            self._prefetch_thread.join()
+
     @record_success_fail_telemetry_event()  # type: ignore
     def sync_asset_inputs(
         self,
@@ -872,9 +1020,12 @@ class Session:
             )
             return not cancel.is_set()
 
-        if not (job_attachment_settings := self._job_details.job_attachment_settings):
+        if not self._job_details.job_attachment_settings:
             raise RuntimeError("Job attachment settings were not contained in JOB_DETAILS entity")
 
+        # The prefetch must not write to the session directory while the inputs are synced
+        self._stop_input_prefetch()
+
         if job_attachment_details:
             self._job_attachment_details = job_attachment_details
 
@@ -884,38 +1035,13 @@ class Session:
                 "Job attachments must be synchronized before downloading Step dependencies."
             )
 
-        assert job_attachment_settings.s3_bucket_name is not None
-        assert job_attachment_settings.root_prefix is not None
-
-        s3_settings = JobAttachmentS3Settings(
-            s3BucketName=job_attachment_settings.s3_bucket_name,
-            rootPrefix=job_attachment_settings.root_prefix,
-        )
-
-        manifest_properties_list: list[ManifestProperties] = []
-        if not step_dependencies:
-            for manifest_properties in self._job_attachment_details.manifests:
-                manifest_properties_list.append(
-                    ManifestProperties(
-                        rootPath=manifest_properties.root_path,
-                        fileSystemLocationName=manifest_properties.file_system_location_name,
-                        rootPathFormat=PathFormat(manifest_properties.root_path_format),
-                        inputManifestPath=manifest_properties.input_manifest_path,
-                        inputManifestHash=manifest_properties.input_manifest_hash,
-                        outputRelativeDirectories=manifest_properties.output_relative_directories,
-                    )
-                )
-
-        attachments = Attachments(
-            manifests=manifest_properties_list,
-            fileSystem=self._job_attachment_details.job_attachments_file_system,
+        s3_settings, attachments, storage_profiles_path_mapping_rules_dict = (
+            self._job_attachments_inputs(
+                job_attachment_details=self._job_attachment_details,
+                step_dependencies=step_dependencies,
+            )
         )
 
-        storage_profiles_path_mapping_rules_dict: dict[str, str] = {
-            str(rule.source_path): str(rule.destination_path)
-            for rule in self._job_details.path_mapping_rules
-        }
-
         fs_permission_settings: Optional[FileSystemPermissionSettings] = None
         if self._os_user is not None:
             if os.name == "posix":
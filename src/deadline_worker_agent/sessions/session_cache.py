@@ -0,0 +1,349 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from collections import Counter
+from logging import getLogger
+from pathlib import Path
+from subprocess import DEVNULL, SubprocessError, run
+from threading import Event, Lock, Thread
+from typing import NamedTuple, Optional
+import os
+import re
+import shutil
+import stat
+import uuid
+
+from openjd.sessions import PosixSessionUser, SessionUser
+
+from ..file_system_operations import FileSystemPermissionEnum, make_directory
+from ..log_messages import FilesystemLogEvent, FilesystemLogEventOp
+
+logger = getLogger(__name__)
+
+SESSION_CACHE_DIR_ENV_VAR = "DEADLINE_SESSION_CACHE_DIR"
+"""The environment variable that holds the path of a Session's cache directory"""
+
+_EVICTION_INTERVAL_SECONDS = 300.0
+_EVICTED_PREFIX = ".evicted-"
+_REMOVE_TIMEOUT_SECONDS = 600.0
+_QUEUE_ID_PATTERN = re.compile(r"queue-[a-zA-Z0-9]+")
+
+
+class _CacheEntry(NamedTuple):
+    path: Path
+    queue_id: str
+    size_bytes: int
+    last_used: float
+
+
+class SessionCache:
+    """A worker-wide directory that Sessions can keep artifacts in across Sessions.
+
+    Each Queue has its own subdirectory, which is given to the Sessions of that Queue in the
+    DEADLINE_SESSION_CACHE_DIR environment variable. Environment scripts can keep the results of
+    expensive work there (for example, package installs or unpacked plugins) and re-use them in
+    later Sessions of the same Queue. Queues do not share a directory, since their jobs may run as
+    different users and should not be able to see each other's files.
+
+    The cache is made up of the top-level entries (files or directories) of the Queue directories.
+    The total size of the entries is capped. A background thread periodically evicts the least
+    recently used entries, as given by the access and modification times of their contents, until
+    the cache is within its size. Entries of a Queue are never evicted while a Session of that
+    Queue is running, since its actions may be using them.
+
+    Parameters
+    ----------
+    root_dir : Path
+        The directory where the Queue directories are created. It is created if it does not exist.
+    max_size_bytes : int
+        The maximum total size of the cache's entries, in bytes.
+    """
+
+    _root_dir: Path
+    _max_size_bytes: int
+    _lock: Lock
+    _queues_in_use: Counter[str]
+    """The number of running Sessions of each Queue"""
+    _queue_users: dict[str, Optional[SessionUser]]
+    """The user that the Sessions of each Queue were last run as"""
+    _stop: Event
+    _thread: Optional[Thread]
+
+    def __init__(self, *, root_dir: Path, max_size_bytes: int) -> None:
+        if max_size_bytes <= 0:
+            raise ValueError(f"max_size_bytes must be positive, but got {max_size_bytes}")
+        self._root_dir = root_dir
+        self._max_size_bytes = max_size_bytes
+        self._lock = Lock()
+        self._queues_in_use = Counter()
+        self._queue_users = {}
+        self._stop = Event()
+        self._thread = None
+
+        if os.name == "posix":
+            # Job users must be able to traverse the root to reach their Queue's directory, but
+            # not list the other Queues
+            self._root_dir.mkdir(parents=True, exist_ok=True, mode=0o711)
+            os.chmod(self._root_dir, 0o711)
+        else:
+            make_directory(
+                dir_path=self._root_dir,
+                exist_ok=True,
+                parents=True,
+                agent_user_permission=FileSystemPermissionEnum.FULL_CONTROL,
+            )
+
+    @property
+    def root_dir(self) -> Path:
+        return self._root_dir
+
+    @property
+    def max_size_bytes(self) -> int:
+        return self._max_size_bytes
+
+    def prepare_queue_dir(self, *, queue_id: str, os_user: Optional[SessionUser]) -> Path:
+        """Creates the cache directory of a Queue, if it does not exist, and gives the job user
+        access to it.
+
+        Parameters
+        ----------
+        queue_id : str
+            The ID of the Queue
+        os_user : Optional[SessionUser]
+            The user that the Queue's Session runs as, or None if it runs as the agent's user
+
+        Returns
+        -------
+        Path
+            The cache directory of the Queue
+
+        Raises
+        ------
+        OSError
+            If the directory could not be created or its permissions could not be set
+        """
+        queue_dir = self._queue_dir(queue_id)
+        try:
+            if os.name == "posix":
+                if isinstance(os_user, PosixSessionUser) and not os_user.is_process_user():
+                    # The job user's group owns the directory and everything created in it, so
+                    # that the agent, which is a member of the group, can evict entries
+                    queue_dir.mkdir(mode=0o2770, exist_ok=True)
+                    os.chmod(queue_dir, 0o2770)
+                    shutil.chown(queue_dir, group=os_user.group)
+                else:
+                    queue_dir.mkdir(mode=0o700, exist_ok=True)
+            else:
+                make_directory(
+                    dir_path=queue_dir,
+                    exist_ok=True,
+                    permitted_user=os_user,
+                    user_permission=(
+                        FileSystemPermissionEnum.FULL_CONTROL if os_user is not None else None
+                    ),
+                    agent_user_permission=FileSystemPermissionEnum.FULL_CONTROL,
+                )
+        except OSError as e:
+            logger.warning(
+                FilesystemLogEvent(
+                    op=FilesystemLogEventOp.CREATE,
+                    filepath=str(queue_dir),
+                    message=f"Failed to create session cache directory: {e}",
+                )
+            )
+            raise
+        with self._lock:
+            self._queue_users[queue_id] = os_user
+        return queue_dir
+
+    def acquire(self, *, queue_id: str) -> None:
+        """Marks a Queue's cache directory as in use by a running Session. Its entries are not
+        evicted until each acquire() is matched by a release()."""
+        with self._lock:
+            self._queues_in_use[queue_id] += 1
+
+    def release(self, *, queue_id: str) -> None:
+        """Marks that a Session which acquired a Queue's cache directory has ended"""
+        with self._lock:
+            self._queues_in_use[queue_id] -= 1
+            if self._queues_in_use[queue_id] <= 0:
+                del self._queues_in_use[queue_id]
+
+    def start(self) -> None:
+        """Starts evicting entries in a background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._evict_periodically, name="SessionCacheEviction")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background eviction. An eviction that is in progress is not interrupted."""
+        self._stop.set()
+        self._thread = None
+
+    def evict(self) -> int:
+        """Removes the least recently used entries of Queues that have no running Sessions until
+        the total size of the cache is within its maximum size.
+
+        Returns
+        -------
+        int
+            The number of bytes that were evicted
+        """
+        entries = self._entries()
+        size_bytes = sum(entry.size_bytes for entry in entries)
+        evicted_bytes = 0
+        # Entries whose removal did not complete, such as when the agent stopped, go first
+        entries.sort(
+            key=lambda entry: (not entry.path.name.startswith(_EVICTED_PREFIX), entry.last_used)
+        )
+        for entry in entries:
+            if size_bytes <= self._max_size_bytes and not entry.path.name.startswith(
+                _EVICTED_PREFIX
+            ):
+                break
+            evicted = self._evict_entry(entry)
+            if evicted is not None:
+                size_bytes -= entry.size_bytes
+                evicted_bytes += entry.size_bytes
+                self._remove(evicted, os_user=self._queue_users.get(entry.queue_id))
+        if size_bytes > self._max_size_bytes:
+            logger.warning(
+                "The session cache (%d bytes) is larger than its maximum size (%d bytes), but the"
+                " remaining entries are in use by running Sessions.",
+                size_bytes,
+                self._max_size_bytes,
+            )
+        return evicted_bytes
+
+    def _queue_dir(self, queue_id: str) -> Path:
+        if not _QUEUE_ID_PATTERN.fullmatch(queue_id):
+            raise ValueError(f"Invalid queue ID: {queue_id}")
+        return self._root_dir / queue_id
+
+    def _evict_periodically(self) -> None:
+        while not self._stop.wait(_EVICTION_INTERVAL_SECONDS):
+            try:
+                self.evict()
+            except Exception as e:
+                logger.warning("Failed to evict entries from the session cache: %s", e)
+
+    def _entries(self) -> list[_CacheEntry]:
+        entries: list[_CacheEntry] = []
+        try:
+            queue_dirs = [path for path in self._root_dir.iterdir() if path.is_dir()]
+        except OSError as e:
+            logger.warning("Failed to list the session cache: %s", e)
+            return entries
+        for queue_dir in queue_dirs:
+            try:
+                paths = list(queue_dir.iterdir())
+            except OSError as e:
+                logger.warning("Failed to list the session cache of %s: %s", queue_dir.name, e)
+                continue
+            for path in paths:
+                size_bytes, last_used = _usage(path)
+                entries.append(
+                    _CacheEntry(
+                        path=path,
+                        queue_id=queue_dir.name,
+                        size_bytes=size_bytes,
+                        last_used=last_used,
+                    )
+                )
+        return entries
+
+    def _evict_entry(self, entry: _CacheEntry) -> Optional[Path]:
+        """Moves an entry out of the way, unless its Queue is in use. Returns the moved path."""
+        if entry.path.name.startswith(_EVICTED_PREFIX):
+            return entry.path
+        evicted = entry.path.with_name(f"{_EVICTED_PREFIX}{uuid.uuid4().hex}")
+        with self._lock:
+            if entry.queue_id in self._queues_in_use:
+                return None
+            try:
+                # Renaming within the Queue directory only needs write access to that directory,
+                # and is immediate, so that a Session starting meanwhile never sees a partial entry
+                entry.path.rename(evicted)
+            except OSError as e:
+                logger.warning(
+                    FilesystemLogEvent(
+                        op=FilesystemLogEventOp.DELETE,
+                        filepath=str(entry.path),
+                        message=f"Failed to evict session cache entry: {e}",
+                    )
+                )
+                return None
+        logger.info(
+            FilesystemLogEvent(
+                op=FilesystemLogEventOp.DELETE,
+                filepath=str(entry.path),
+                message=f"Evicting session cache entry ({entry.size_bytes} bytes).",
+            )
+        )
+        return evicted
+
+    def _remove(self, path: Path, *, os_user: Optional[SessionUser]) -> None:
+        if isinstance(os_user, PosixSessionUser) and not os_user.is_process_user():
+            # The job user owns the files that it created, so it is the one that can remove them
+            try:
+                run(
+                    ["sudo", "-u", os_user.user, "-i", "rm", "-rf", str(path)],
+                    stdin=DEVNULL,
+                    stdout=DEVNULL,
+                    stderr=DEVNULL,
+                    timeout=_REMOVE_TIMEOUT_SECONDS,
+                )
+            except (OSError, SubprocessError) as e:
+                logger.debug("Failed to remove %s as %s: %s", path, os_user.user, e)
+        try:
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path)
+            else:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(
+                FilesystemLogEvent(
+                    op=FilesystemLogEventOp.DELETE,
+                    filepath=str(path),
+                    message=f"Failed to remove evicted session cache entry: {e}",
+                )
+            )
+
+
+def _usage(path: Path) -> tuple[int, float]:
+    """Returns the size of the files in a file or directory tree and the time it was last used.
+
+    The last use is the latest access or modification time of the files, or modification time of
+    the directories. The access times of directories are not considered, since listing them to
+    find their contents updates them. File systems that are mounted with relatime only update the
+    access time of a file once a day unless it is modified, so the modification time is considered
+    as well.
+    """
+    try:
+        st = path.lstat()
+    except OSError:
+        return 0, 0.0
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size, max(st.st_atime, st.st_mtime)
+
+    size_bytes = 0
+    last_used = st.st_mtime
+    # Contents that the agent can not read are not counted
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in dirnames:
+            try:
+                last_used = max(last_used, os.lstat(os.path.join(dirpath, name)).st_mtime)
+            except OSError:
+                continue
+        for name in filenames:
+            try:
+                st = os.lstat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            size_bytes += st.st_size
+            last_used = max(last_used, st.st_atime, st.st_mtime)
+    return size_bytes, last_used
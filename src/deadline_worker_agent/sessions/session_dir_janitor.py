@@ -0,0 +1,377 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from collections import deque
+from logging import getLogger
+from pathlib import Path
+from subprocess import DEVNULL, SubprocessError, run
+from threading import Event, Lock, Thread
+from typing import Callable, Iterable, NamedTuple, Optional
+import os
+import shutil
+import stat
+import time
+
+from openjd.sessions import PosixSessionUser, SessionUser
+
+from ..log_messages import FilesystemLogEvent, FilesystemLogEventOp
+
+logger = getLogger(__name__)
+
+_COLLECT_INTERVAL_SECONDS = 600.0
+_DELETING_PREFIX = ".deleting-"
+_SESSION_DIR_PREFIX = "session-"
+_MIN_AGE_SECONDS = 600.0
+"""Retained directories younger than this are never deleted. The working directory of a Session
+is created while the Session is provisioned, which is before the scheduler knows about it."""
+_REMOVE_TIMEOUT_SECONDS = 3600.0
+_REMOVE_BATCH_SIZE = 1000
+"""The number of files and directories that are deleted between pauses"""
+_REMOVE_PAUSE_SECONDS = 0.05
+
+
+class _RetainedDir(NamedTuple):
+    path: Path
+    size_bytes: int
+    last_modified: float
+
+
+class SessionDirJanitor:
+    """Deletes the working directories of Sessions in the background.
+
+    When a Session ends and its working directory is not retained, the directory is renamed
+    within its parent directory, which is immediate, and deleted by a background thread. This
+    keeps the end of the Session from waiting on the deletion of large directory trees.
+
+    Working directories that are retained can be given a budget: a maximum age, a maximum total
+    size, or both. The background thread periodically deletes the oldest retained directories
+    that are over the budget. Directories of Sessions that are running, as given by the function
+    passed to start(), are never deleted.
+
+    Deletion is throttled so that it does not starve the running Sessions of disk IO. On POSIX,
+    files that were created by a job user are deleted as that user through sudo.
+
+    This class is safe to use from multiple threads.
+
+    Parameters
+    ----------
+    root_dirs : list[Path]
+        The directories that Session working directories are created in. Directories that
+        Sessions are discarded from or are running in are added to these.
+    max_age_seconds : Optional[float]
+        Retained directories that were last modified longer ago than this are deleted. If None,
+        then retained directories are not deleted because of their age.
+    max_size_bytes : Optional[int]
+        The oldest retained directories are deleted until their total size is within this. If
+        None, then the total size of retained directories is not limited.
+    """
+
+    _root_dirs: dict[Path, None]
+    """The directories that are searched for retained and partially deleted directories"""
+    _max_age_seconds: Optional[float]
+    _max_size_bytes: Optional[int]
+    _lock: Lock
+    _discarded: deque[tuple[Path, Optional[str]]]
+    """The directories waiting to be deleted, and the user that they should be deleted as"""
+    _active_session_dirs: Callable[[], Iterable[Path]]
+    _wake: Event
+    _stop: Event
+    _thread: Optional[Thread]
+
+    def __init__(
+        self,
+        *,
+        root_dirs: list[Path],
+        max_age_seconds: Optional[float] = None,
+        max_size_bytes: Optional[int] = None,
+    ) -> None:
+        if max_age_seconds is not None and max_age_seconds <= 0:
+            raise ValueError(f"max_age_seconds must be positive, but got {max_age_seconds}")
+        if max_size_bytes is not None and max_size_bytes <= 0:
+            raise ValueError(f"max_size_bytes must be positive, but got {max_size_bytes}")
+        self._root_dirs = dict.fromkeys(root_dirs)
+        self._max_age_seconds = max_age_seconds
+        self._max_size_bytes = max_size_bytes
+        self._lock = Lock()
+        self._discarded = deque()
+        self._active_session_dirs = lambda: ()
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = None
+
+    @property
+    def root_dirs(self) -> list[Path]:
+        with self._lock:
+            return list(self._root_dirs)
+
+    def discard(self, working_dir: Path, *, os_user: Optional[SessionUser]) -> None:
+        """Deletes the working directory of a Session that has ended, in the background.
+
+        If the directory can not be moved out of the way, then it is deleted before returning.
+
+        Parameters
+        ----------
+        working_dir : Path
+            The working directory of the Session
+        os_user : Optional[SessionUser]
+            The user that the Session ran as, or None if it ran as the agent's user
+        """
+        user = _job_user_name(os_user)
+        discarded = working_dir.with_name(f"{_DELETING_PREFIX}{working_dir.name}")
+        try:
+            working_dir.rename(discarded)
+        except OSError as e:
+            logger.warning(
+                FilesystemLogEvent(
+                    op=FilesystemLogEventOp.DELETE,
+                    filepath=str(working_dir),
+                    message=f"Failed to move session directory for deletion in the background: {e}",
+                )
+            )
+            self._remove(working_dir, users=[user] if user else [], throttle=False)
+            return
+        with self._lock:
+            self._root_dirs.setdefault(working_dir.parent)
+            self._discarded.append((discarded, user))
+        self._wake.set()
+
+    def start(self, *, active_session_dirs: Callable[[], Iterable[Path]]) -> None:
+        """Starts deleting directories in a background thread.
+
+        Parameters
+        ----------
+        active_session_dirs : Callable[[], Iterable[Path]]
+            Returns the working directories of the Sessions that are running
+        """
+        if self._thread is not None:
+            return
+        self._active_session_dirs = active_session_dirs
+        self._stop.clear()
+        self._thread = Thread(target=self._collect_periodically, name="SessionDirJanitor")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background deletion. Directories that have not been completely deleted are
+        deleted the next time that it is started."""
+        self._stop.set()
+        self._wake.set()
+        self._thread = None
+
+    def collect(self) -> int:
+        """Deletes the discarded directories, any partially deleted directories, and the oldest
+        retained directories that are over the budget.
+
+        Returns
+        -------
+        int
+            The number of directories that were deleted
+        """
+        deleted = self._remove_discarded()
+        for root_dir in self.root_dirs:
+            for path in _list_dir(root_dir):
+                if path.name.startswith(_DELETING_PREFIX) and not self._stop.is_set():
+                    # Left over from a deletion that did not complete, such as when the agent stopped
+                    self._remove(path, users=_owner_names(path))
+                    deleted += 1
+        if self._max_age_seconds is not None or self._max_size_bytes is not None:
+            deleted += self._enforce_budget()
+        return deleted
+
+    def _collect_periodically(self) -> None:
+        next_collect = 0.0
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() >= next_collect:
+                    self.collect()
+                    next_collect = time.monotonic() + _COLLECT_INTERVAL_SECONDS
+                else:
+                    self._remove_discarded()
+            except Exception as e:
+                logger.warning("Failed to delete session directories: %s", e)
+            self._wake.wait(max(0.0, next_collect - time.monotonic()))
+            self._wake.clear()
+
+    def _remove_discarded(self) -> int:
+        deleted = 0
+        while not self._stop.is_set():
+            with self._lock:
+                if not self._discarded:
+                    break
+                path, user = self._discarded.popleft()
+            self._remove(path, users=[user] if user else [])
+            deleted += 1
+        return deleted
+
+    def _enforce_budget(self) -> int:
+        active_dirs = set(self._active_session_dirs())
+        with self._lock:
+            for active_dir in active_dirs:
+                self._root_dirs.setdefault(active_dir.parent)
+        now = time.time()
+        retained = sorted(
+            (
+                retained_dir
+                for retained_dir in self._retained_dirs(active_dirs)
+                if retained_dir.last_modified < now - _MIN_AGE_SECONDS
+            ),
+            key=lambda retained_dir: retained_dir.last_modified,
+        )
+        size_bytes = sum(retained_dir.size_bytes for retained_dir in retained)
+        deleted = 0
+        for retained_dir in retained:
+            too_old = (
+                self._max_age_seconds is not None
+                and retained_dir.last_modified < now - self._max_age_seconds
+            )
+            too_large = self._max_size_bytes is not None and size_bytes > self._max_size_bytes
+            if not (too_old or too_large) or self._stop.is_set():
+                # The remaining directories are newer
+                break
+            if retained_dir.path in set(self._active_session_dirs()):
+                continue
+            discarded = retained_dir.path.with_name(f"{_DELETING_PREFIX}{retained_dir.path.name}")
+            try:
+                retained_dir.path.rename(discarded)
+            except OSError as e:
+                logger.warning(
+                    FilesystemLogEvent(
+                        op=FilesystemLogEventOp.DELETE,
+                        filepath=str(retained_dir.path),
+                        message=f"Failed to delete retained session directory: {e}",
+                    )
+                )
+                continue
+            logger.info(
+                FilesystemLogEvent(
+                    op=FilesystemLogEventOp.DELETE,
+                    filepath=str(retained_dir.path),
+                    message=f"Deleting retained session directory ({retained_dir.size_bytes} bytes).",
+                )
+            )
+            self._remove(discarded, users=_owner_names(discarded))
+            size_bytes -= retained_dir.size_bytes
+            deleted += 1
+        if self._max_size_bytes is not None and size_bytes > self._max_size_bytes:
+            logger.warning(
+                "The retained session directories (%d bytes) are larger than their maximum size"
+                " (%d bytes), but the remaining directories are in use or too recent to delete.",
+                size_bytes,
+                self._max_size_bytes,
+            )
+        return deleted
+
+    def _retained_dirs(self, active_dirs: set[Path]) -> list[_RetainedDir]:
+        retained: list[_RetainedDir] = []
+        for root_dir in self.root_dirs:
+            for path in _list_dir(root_dir):
+                if not path.name.startswith(_SESSION_DIR_PREFIX) or path in active_dirs:
+                    continue
+                try:
+                    st = path.lstat()
+                except OSError:
+                    continue
+                if stat.S_ISDIR(st.st_mode):
+                    retained.append(
+                        _RetainedDir(
+                            path=path, size_bytes=_size_bytes(path), last_modified=st.st_mtime
+                        )
+                    )
+        return retained
+
+    def _remove(self, path: Path, *, users: Iterable[str], throttle: bool = True) -> None:
+        for user in users:
+            # The job user owns the files that it created, so it is the one that can remove them
+            command = ["rm", "-rf", str(path)]
+            if throttle and shutil.which("ionice"):
+                # Only use the disk when no other process is
+                command = ["ionice", "-c", "3", *command]
+            try:
+                run(
+                    ["sudo", "-u", user, "-i", *command],
+                    stdin=DEVNULL,
+                    stdout=DEVNULL,
+                    stderr=DEVNULL,
+                    timeout=_REMOVE_TIMEOUT_SECONDS,
+                )
+            except (OSError, SubprocessError) as e:
+                logger.debug("Failed to remove %s as %s: %s", path, user, e)
+        try:
+            if not path.is_dir() or path.is_symlink():
+                path.unlink(missing_ok=True)
+                return
+            removed = 0
+            for dirpath, dirnames, filenames in os.walk(path, topdown=False):
+                for name in filenames:
+                    os.unlink(os.path.join(dirpath, name))
+                for name in dirnames:
+                    dir_path = os.path.join(dirpath, name)
+                    if os.path.islink(dir_path):
+                        os.unlink(dir_path)
+                    else:
+                        os.rmdir(dir_path)
+                removed += len(filenames) + len(dirnames)
+                if throttle and removed >= _REMOVE_BATCH_SIZE:
+                    if self._stop.wait(_REMOVE_PAUSE_SECONDS):
+                        # It is deleted the next time that the janitor is started
+                        return
+                    removed = 0
+            path.rmdir()
+        except OSError as e:
+            logger.warning(
+                FilesystemLogEvent(
+                    op=FilesystemLogEventOp.DELETE,
+                    filepath=str(path),
+                    message=f"Failed to delete session directory: {e}",
+                )
+            )
+
+
+def _job_user_name(os_user: Optional[SessionUser]) -> Optional[str]:
+    if isinstance(os_user, PosixSessionUser) and not os_user.is_process_user():
+        return os_user.user
+    return None
+
+
+def _owner_names(path: Path) -> list[str]:
+    """Returns the names of the users other than the agent's user that own the top-level
+    contents of a directory (POSIX only)"""
+    if os.name != "posix":
+        return []
+    import pwd
+
+    uids = set()
+    for child in _list_dir(path):
+        try:
+            uids.add(child.lstat().st_uid)
+        except OSError:
+            continue
+    uids.discard(os.geteuid())
+    names = []
+    for uid in sorted(uids):
+        try:
+            names.append(pwd.getpwuid(uid).pw_name)
+        except KeyError:
+            continue
+    return names
+
+
+def _list_dir(path: Path) -> list[Path]:
+    try:
+        return list(path.iterdir())
+    except OSError:
+        return []
+
+
+def _size_bytes(path: Path) -> int:
+    """Returns the size of the files in a directory tree. Contents that the agent can not read
+    are not counted."""
+    size_bytes = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                size_bytes += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return size_bytes
@@ -0,0 +1,150 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from enum import Enum
+from functools import partial
+from logging import getLogger
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Optional
+import os
+import shutil
+import sys
+import time
+
+import psutil
+
+logger = getLogger(__name__)
+
+
+class SessionRootPlacementPolicy(str, Enum):
+    """How the directory that a Session's working directory is created in is chosen"""
+
+    MOST_FREE_SPACE = "most-free-space"
+    """The directory on the file-system with the most free space"""
+    LEAST_IO_LOAD = "least-io-load"
+    """The directory on the block device that has read and written the fewest bytes recently"""
+    ROUND_ROBIN = "round-robin"
+    """Each of the directories in turn"""
+
+
+class SessionRootPlacer:
+    """Chooses which of several directories (for example, scratch volumes on different devices)
+    the working directory of each new Session is created in.
+
+    Directories that do not exist when a Session is placed, such as a volume that is not mounted,
+    are skipped. Directories that are equally good candidates are chosen in turn, so that Sessions
+    that are placed at the same time are spread across them.
+
+    This class is safe to use from multiple threads.
+
+    Parameters
+    ----------
+    root_dirs : list[Path]
+        The directories to place Sessions in, in order of preference
+    policy : SessionRootPlacementPolicy
+        How to choose between the directories
+    """
+
+    _policy: SessionRootPlacementPolicy
+    _lock: Lock
+    _order: list[Path]
+    """The directories, from least to most recently chosen"""
+    _io_samples: dict[str, tuple[float, int]]
+    """The time and total bytes read and written of each block device when it was last sampled"""
+
+    def __init__(self, *, root_dirs: list[Path], policy: SessionRootPlacementPolicy) -> None:
+        if not root_dirs:
+            raise ValueError("At least one session root directory is required")
+        self._policy = policy
+        self._lock = Lock()
+        self._order = list(dict.fromkeys(root_dirs))
+        self._io_samples = {}
+
+    @property
+    def root_dirs(self) -> list[Path]:
+        return list(self._order)
+
+    @property
+    def policy(self) -> SessionRootPlacementPolicy:
+        return self._policy
+
+    def choose(self) -> Optional[Path]:
+        """Chooses the directory to create the working directory of a new Session in.
+
+        Returns
+        -------
+        Optional[Path]
+            The chosen directory, or None if none of the directories exist
+        """
+        with self._lock:
+            candidates = [root_dir for root_dir in self._order if root_dir.is_dir()]
+            if not candidates:
+                logger.warning(
+                    "None of the session root directories exist: %s",
+                    ", ".join(str(root_dir) for root_dir in self._order),
+                )
+                return None
+
+            key: Optional[Callable[[Path], float]] = None
+            if self._policy == SessionRootPlacementPolicy.MOST_FREE_SPACE:
+                key = _negative_free_bytes
+            elif self._policy == SessionRootPlacementPolicy.LEAST_IO_LOAD:
+                io_rates = self._io_rates()
+                if io_rates is not None:
+                    key = partial(_io_rate, io_rates)
+                else:
+                    # The IO counters of the block devices are not available on this host
+                    key = _negative_free_bytes
+            # min() returns the first of equal candidates, which is the least recently chosen
+            chosen = min(candidates, key=key) if key is not None else candidates[0]
+            self._order.remove(chosen)
+            self._order.append(chosen)
+            return chosen
+
+    def _io_rates(self) -> Optional[dict[str, float]]:
+        """Returns the bytes per second that each block device read and wrote since the last
+        placement, or None if they are not available"""
+        if sys.platform != "linux":
+            return None
+        try:
+            counters = psutil.disk_io_counters(perdisk=True, nowrap=True)
+        except Exception as e:
+            logger.debug("Failed to get disk IO counters: %s", e)
+            return None
+        if not counters:
+            return None
+        now = time.monotonic()
+        rates: dict[str, float] = {}
+        for device, device_counters in counters.items():
+            total_bytes = device_counters.read_bytes + device_counters.write_bytes
+            previous = self._io_samples.get(device)
+            if previous is not None and now > previous[0]:
+                rates[device] = (total_bytes - previous[1]) / (now - previous[0])
+            self._io_samples[device] = (now, total_bytes)
+        return rates
+
+
+def _io_rate(io_rates: dict[str, float], root_dir: Path) -> float:
+    return io_rates.get(_device_name(root_dir) or "", 0.0)
+
+
+def _negative_free_bytes(root_dir: Path) -> float:
+    try:
+        return -shutil.disk_usage(root_dir).free
+    except OSError:
+        return 0.0
+
+
+def _device_name(root_dir: Path) -> Optional[str]:
+    """Returns the name of the block device that a directory is on (Linux only), as used by
+    psutil.disk_io_counters()"""
+    try:
+        st_dev = os.stat(root_dir).st_dev
+        # e.g. /sys/dev/block/259:1 -> ../../devices/.../nvme0n1/nvme0n1p1
+        return os.path.basename(
+            os.path.realpath(f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}")
+        )
+    except OSError:
+        return None
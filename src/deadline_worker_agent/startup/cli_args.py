@@ -21,11 +21,27 @@ class ParsedCommandLineArguments(Namespace):
     disallow_instance_profile: bool | None = None
     logs_dir: Path | None = None
     local_session_logs: bool | None = None
+    local_session_logs_compression: bool | None = None
+    local_session_logs_max_size_mb: float | None = None
+    session_log_packing_window_ms: int | None = None
+    session_log_repeated_line_threshold: int | None = None
     persistence_dir: Path | None = None
     retain_session_dir: bool | None = None
+    retain_session_dir_max_age_hours: float | None = None
+    retain_session_dir_max_size_gb: float | None = None
     host_metrics_logging: bool | None = None
     host_metrics_logging_interval_seconds: float | None = None
     structured_logs: bool | None = None
+    job_attachments_cache: bool | None = None
+    job_attachments_cache_dir: Path | None = None
+    job_attachments_cache_max_size_gb: float | None = None
+    job_attachments_output_journal: bool | None = None
+    job_attachments_prefetch: bool | None = None
+    session_cache: bool | None = None
+    session_cache_dir: Path | None = None
+    session_cache_max_size_gb: float | None = None
+    session_root_dirs: list[Path] | None = None
+    session_root_placement: str | None = None
 
 
 def get_argument_parser() -> ArgumentParser:
@@ -100,6 +116,32 @@ def get_argument_parser() -> ArgumentParser:
         const=False,
         default=None,
     )
+    parser.add_argument(
+        "--local-session-logs-compression",
+        help="Compress local session logs with gzip and write them from a background thread.",
+        dest="local_session_logs_compression",
+        action="store_const",
+        const=True,
+        default=None,
+    )
+    parser.add_argument(
+        "--local-session-logs-max-size-mb",
+        help="The size in megabytes at which local session logs are rotated. By default, they are not rotated.",
+        default=None,
+        type=float,
+    )
+    parser.add_argument(
+        "--session-log-packing-window-ms",
+        help="Pack consecutive session log lines emitted within this many milliseconds of each other into a single CloudWatch log event. By default, every line is sent as its own log event.",
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "--session-log-repeated-line-threshold",
+        help="Collapse runs of similar session log lines, such as progress updates, into periodic summaries after this many lines. By default, every line is kept.",
+        default=None,
+        type=int,
+    )
     parser.add_argument(
         "--persistence-dir",
         help="Overrides the directory where the Worker Agent persists files across restarts.",
@@ -144,6 +186,18 @@ def get_argument_parser() -> ArgumentParser:
         const=True,
         default=None,
     )
+    parser.add_argument(
+        "--retain-session-dir-max-age-hours",
+        help="Delete retained session directories that were last modified longer ago than this many hours.",
+        default=None,
+        type=float,
+    )
+    parser.add_argument(
+        "--retain-session-dir-max-size-gb",
+        help="Delete the oldest retained session directories until their total size is within this many gigabytes.",
+        default=None,
+        type=float,
+    )
     parser.add_argument(
         "--structured-logs",
         help="Enable structured logging for the Agent's stdout and local file logs.",
@@ -152,4 +206,74 @@ def get_argument_parser() -> ArgumentParser:
         const=True,
         default=None,
     )
+    parser.add_argument(
+        "--job-attachments-cache",
+        help="Cache Job Attachments input files on the host and re-use them in subsequent sessions.",
+        dest="job_attachments_cache",
+        action="store_const",
+        const=True,
+        default=None,
+    )
+    parser.add_argument(
+        "--job-attachments-cache-dir",
+        help="Overrides the directory of the Job Attachments cache.",
+        default=None,
+        type=Path,
+    )
+    parser.add_argument(
+        "--job-attachments-cache-max-size-gb",
+        help="The maximum total size of the Job Attachments cache in gigabytes.",
+        default=None,
+        type=float,
+    )
+    parser.add_argument(
+        "--job-attachments-output-journal",
+        help="Find Job Attachments output files by watching the output directories for changes instead of walking them after each task (Linux only).",
+        dest="job_attachments_output_journal",
+        action="store_const",
+        const=True,
+        default=None,
+    )
+    parser.add_argument(
+        "--job-attachments-prefetch",
+        help="Download the Job Attachments inputs of a session in the background while the actions queued before syncing them run.",
+        dest="job_attachments_prefetch",
+        action="store_const",
+        const=True,
+        default=None,
+    )
+    parser.add_argument(
+        "--session-cache",
+        help="Give sessions a per-queue directory on the host, in the DEADLINE_SESSION_CACHE_DIR environment variable, that persists across sessions.",
+        dest="session_cache",
+        action="store_const",
+        const=True,
+        default=None,
+    )
+    parser.add_argument(
+        "--session-cache-dir",
+        help="Overrides the directory of the session cache.",
+        default=None,
+        type=Path,
+    )
+    parser.add_argument(
+        "--session-cache-max-size-gb",
+        help="The maximum total size of the session cache in gigabytes.",
+        default=None,
+        type=float,
+    )
+    parser.add_argument(
+        "--session-root-dir",
+        help="A directory to create the working directories of sessions in, such as a scratch volume. Specify more than once to spread sessions across directories.",
+        dest="session_root_dirs",
+        action="append",
+        default=None,
+        type=Path,
+    )
+    parser.add_argument(
+        "--session-root-placement",
+        help="How the directory for each session is chosen when there is more than one --session-root-dir.",
+        choices=("most-free-space", "least-io-load", "round-robin"),
+        default=None,
+    )
     return parser
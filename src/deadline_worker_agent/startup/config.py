@@ -48,6 +48,8 @@ class JobsRunAsUserOverride:
 # Worker Nodes.
 DEFAULT_WORKER_CREDENTIALS_RELDIR = "credentials"
 DEFAULT_WORKER_STATE_FILE = "worker.json"
+DEFAULT_JOB_ATTACHMENTS_CACHE_RELDIR = "job_attachments_cache"
+DEFAULT_SESSION_CACHE_RELDIR = "session_cache"
 
 
 class Configuration:
@@ -79,14 +81,44 @@ class Configuration:
     """Path to the directory where the Worker Agent writes its logs."""
     local_session_logs: bool
     """Whether to write session logs to the local filesystem"""
+    local_session_logs_compression: bool
+    """Whether local session logs are gzip-compressed"""
+    local_session_logs_max_size_mb: Optional[float]
+    """The size in megabytes at which local session logs are rotated, or None to never rotate them"""
+    session_log_packing_window_ms: Optional[int]
+    """The window in milliseconds within which session log lines are packed into one CloudWatch log
+    event, or None to send every line as its own log event"""
+    session_log_repeated_line_threshold: Optional[int]
+    """The number of similar session log lines in a run after which the rest of the run is collapsed
+    into periodic summaries, or None to keep every line"""
     host_metrics_logging: bool
     """Whether host metrics logging is enabled"""
     host_metrics_logging_interval_seconds: float
     """The interval in seconds between host metrics logs"""
     retain_session_dir: bool
     """Whether to retain the OpenJD's session directory on completion"""
+    retain_session_dir_max_age_hours: Optional[float]
+    """The age in hours after which retained session directories are deleted, or None to keep them"""
+    retain_session_dir_max_size_gb: Optional[float]
+    """The maximum total size of retained session directories in gigabytes, or None for no limit"""
     structured_logs: bool
     """Whether or not the Worker Agent logs are structured logs."""
+    job_attachments_cache_dir: Optional[Path]
+    """Path to the directory of the Job Attachments cache, or None if the cache is disabled."""
+    job_attachments_cache_max_size_gb: float
+    """The maximum total size of the Job Attachments cache in gigabytes."""
+    job_attachments_output_journal: bool
+    """Whether Job Attachments output files are found by watching the output directories."""
+    job_attachments_prefetch: bool
+    """Whether queued Job Attachments input syncs are downloaded ahead of time."""
+    session_cache_dir: Optional[Path]
+    """Path to the directory of the session cache, or None if the cache is disabled."""
+    session_cache_max_size_gb: float
+    """The maximum total size of the session cache in gigabytes."""
+    session_root_dirs: list[Path]
+    """The directories that session working directories are created in, or empty for the default."""
+    session_root_placement: str
+    """How the directory for each session is chosen from session_root_dirs."""
 
     # Used to optimize the memory allocation and attribute lookup speed. Tells python to not create a dict
     # for the attributes.
@@ -105,10 +137,24 @@ class Configuration:
         "worker_state_file",
         "worker_logs_dir",
         "local_session_logs",
+        "local_session_logs_compression",
+        "local_session_logs_max_size_mb",
+        "session_log_packing_window_ms",
+        "session_log_repeated_line_threshold",
         "host_metrics_logging",
         "host_metrics_logging_interval_seconds",
         "retain_session_dir",
+        "retain_session_dir_max_age_hours",
+        "retain_session_dir_max_size_gb",
         "structured_logs",
+        "job_attachments_cache_dir",
+        "job_attachments_cache_max_size_gb",
+        "job_attachments_output_journal",
+        "job_attachments_prefetch",
+        "session_cache_dir",
+        "session_cache_max_size_gb",
+        "session_root_dirs",
+        "session_root_placement",
     )
 
     def __init__(
@@ -146,6 +192,22 @@ class Configuration:
             settings_kwargs["worker_persistence_dir"] = parsed_cli_args.persistence_dir.absolute()
         if parsed_cli_args.local_session_logs is not None:
             settings_kwargs["local_session_logs"] = parsed_cli_args.local_session_logs
+        if parsed_cli_args.local_session_logs_compression is not None:
+            settings_kwargs["local_session_logs_compression"] = (
+                parsed_cli_args.local_session_logs_compression
+            )
+        if parsed_cli_args.local_session_logs_max_size_mb is not None:
+            settings_kwargs["local_session_logs_max_size_mb"] = (
+                parsed_cli_args.local_session_logs_max_size_mb
+            )
+        if parsed_cli_args.session_log_packing_window_ms is not None:
+            settings_kwargs["session_log_packing_window_ms"] = (
+                parsed_cli_args.session_log_packing_window_ms
+            )
+        if parsed_cli_args.session_log_repeated_line_threshold is not None:
+            settings_kwargs["session_log_repeated_line_threshold"] = (
+                parsed_cli_args.session_log_repeated_line_threshold
+            )
         if parsed_cli_args.host_metrics_logging is not None:
             settings_kwargs["host_metrics_logging"] = parsed_cli_args.host_metrics_logging
         if parsed_cli_args.host_metrics_logging_interval_seconds is not None:
@@ -154,8 +216,45 @@ class Configuration:
             )
         if parsed_cli_args.retain_session_dir is not None:
             settings_kwargs["retain_session_dir"] = parsed_cli_args.retain_session_dir
+        if parsed_cli_args.retain_session_dir_max_age_hours is not None:
+            settings_kwargs["retain_session_dir_max_age_hours"] = (
+                parsed_cli_args.retain_session_dir_max_age_hours
+            )
+        if parsed_cli_args.retain_session_dir_max_size_gb is not None:
+            settings_kwargs["retain_session_dir_max_size_gb"] = (
+                parsed_cli_args.retain_session_dir_max_size_gb
+            )
         if parsed_cli_args.structured_logs is not None:
             settings_kwargs["structured_logs"] = parsed_cli_args.structured_logs
+        if parsed_cli_args.job_attachments_cache is not None:
+            settings_kwargs["job_attachments_cache"] = parsed_cli_args.job_attachments_cache
+        if parsed_cli_args.job_attachments_cache_dir is not None:
+            settings_kwargs["job_attachments_cache_dir"] = (
+                parsed_cli_args.job_attachments_cache_dir.absolute()
+            )
+        if parsed_cli_args.job_attachments_cache_max_size_gb is not None:
+            settings_kwargs["job_attachments_cache_max_size_gb"] = (
+                parsed_cli_args.job_attachments_cache_max_size_gb
+            )
+        if parsed_cli_args.job_attachments_output_journal is not None:
+            settings_kwargs["job_attachments_output_journal"] = (
+                parsed_cli_args.job_attachments_output_journal
+            )
+        if parsed_cli_args.job_attachments_prefetch is not None:
+            settings_kwargs["job_attachments_prefetch"] = parsed_cli_args.job_attachments_prefetch
+        if parsed_cli_args.session_cache is not None:
+            settings_kwargs["session_cache"] = parsed_cli_args.session_cache
+        if parsed_cli_args.session_cache_dir is not None:
+            settings_kwargs["session_cache_dir"] = parsed_cli_args.session_cache_dir.absolute()
+        if parsed_cli_args.session_cache_max_size_gb is not None:
+            settings_kwargs["session_cache_max_size_gb"] = parsed_cli_args.session_cache_max_size_gb
+        if parsed_cli_args.session_root_dirs is not None:
+            settings_kwargs["session_root_dirs"] = [
+                session_root_dir.absolute()
+                for session_root_dir in parsed_cli_args.session_root_dirs
+            ]
+        if parsed_cli_args.session_root_placement is not None:
+            settings_kwargs["session_root_placement"] = parsed_cli_args.session_root_placement
 
         settings = WorkerSettings(**settings_kwargs)
 
@@ -203,10 +302,34 @@ class Configuration:
         self.capabilities = settings.capabilities
         self.worker_logs_dir = settings.worker_logs_dir
         self.local_session_logs = settings.local_session_logs
+        self.local_session_logs_compression = settings.local_session_logs_compression
+        self.local_session_logs_max_size_mb = settings.local_session_logs_max_size_mb
+        self.session_log_packing_window_ms = settings.session_log_packing_window_ms
+        self.session_log_repeated_line_threshold = settings.session_log_repeated_line_threshold
         self.host_metrics_logging = settings.host_metrics_logging
         self.host_metrics_logging_interval_seconds = settings.host_metrics_logging_interval_seconds
         self.retain_session_dir = settings.retain_session_dir
+        self.retain_session_dir_max_age_hours = settings.retain_session_dir_max_age_hours
+        self.retain_session_dir_max_size_gb = settings.retain_session_dir_max_size_gb
         self.structured_logs = settings.structured_logs
+        if settings.job_attachments_cache:
+            self.job_attachments_cache_dir = settings.job_attachments_cache_dir or (
+                self.worker_persistence_dir / DEFAULT_JOB_ATTACHMENTS_CACHE_RELDIR
+            )
+        else:
+            self.job_attachments_cache_dir = None
+        self.job_attachments_cache_max_size_gb = settings.job_attachments_cache_max_size_gb
+        self.job_attachments_output_journal = settings.job_attachments_output_journal
+        self.job_attachments_prefetch = settings.job_attachments_prefetch
+        if settings.session_cache:
+            self.session_cache_dir = settings.session_cache_dir or (
+                self.worker_persistence_dir / DEFAULT_SESSION_CACHE_RELDIR
+            )
+        else:
+            self.session_cache_dir = None
+        self.session_cache_max_size_gb = settings.session_cache_max_size_gb
+        self.session_root_dirs = list(settings.session_root_dirs or [])
+        self.session_root_placement = settings.session_root_placement
 
         self._validate()
 
@@ -238,6 +361,56 @@ class Configuration:
                 f"Host metrics logging interval must be a positive number, but got: {repr(self.host_metrics_logging_interval_seconds)}"
             )
 
+        if (
+            self.local_session_logs_max_size_mb is not None
+            and self.local_session_logs_max_size_mb <= 0
+        ):
+            raise ConfigurationError(
+                f"Local session logs maximum size must be a positive number, but got: {repr(self.local_session_logs_max_size_mb)}"
+            )
+
+        if (
+            self.session_log_packing_window_ms is not None
+            and self.session_log_packing_window_ms <= 0
+        ):
+            raise ConfigurationError(
+                f"Session log packing window must be a positive number, but got: {repr(self.session_log_packing_window_ms)}"
+            )
+
+        if (
+            self.session_log_repeated_line_threshold is not None
+            and self.session_log_repeated_line_threshold <= 0
+        ):
+            raise ConfigurationError(
+                f"Session log repeated line threshold must be a positive number, but got: {repr(self.session_log_repeated_line_threshold)}"
+            )
+
+        if self.job_attachments_cache_max_size_gb <= 0:
+            raise ConfigurationError(
+                f"Job Attachments cache maximum size must be a positive number, but got: {repr(self.job_attachments_cache_max_size_gb)}"
+            )
+
+        if self.session_cache_max_size_gb <= 0:
+            raise ConfigurationError(
+                f"Session cache maximum size must be a positive number, but got: {repr(self.session_cache_max_size_gb)}"
+            )
+
+        if (
+            self.retain_session_dir_max_age_hours is not None
+            and self.retain_session_dir_max_age_hours <= 0
+        ):
+            raise ConfigurationError(
+                f"Retained session directory maximum age must be a positive number, but got: {repr(self.retain_session_dir_max_age_hours)}"
+            )
+
+        if (
+            self.retain_session_dir_max_size_gb is not None
+            and self.retain_session_dir_max_size_gb <= 0
+        ):
+            raise ConfigurationError(
+                f"Retained session directory maximum size must be a positive number, but got: {repr(self.retain_session_dir_max_size_gb)}"
+            )
+
     def log(self, logger: Optional[_logging.Logger] = None, level: int = _logging.DEBUG) -> None:
         """Emit logs that represent the effective Configuration.
 
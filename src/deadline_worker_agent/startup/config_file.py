@@ -30,6 +30,18 @@ class WorkerConfigSection(BaseModel):
     fleet_id: Optional[str] = Field(regex=r"^fleet-[a-z0-9]{32}$", default=None)
     cleanup_session_user_processes: bool = True
     worker_persistence_dir: Optional[Path] = None
+    job_attachments_cache: Optional[bool] = None
+    job_attachments_cache_dir: Optional[Path] = None
+    job_attachments_cache_max_size_gb: Optional[float] = None
+    job_attachments_output_journal: Optional[bool] = None
+    job_attachments_prefetch: Optional[bool] = None
+    session_cache: Optional[bool] = None
+    session_cache_dir: Optional[Path] = None
+    session_cache_max_size_gb: Optional[float] = None
+    session_root_dirs: Optional[list[Path]] = Field(min_items=1, default=None)
+    session_root_placement: Optional[str] = Field(
+        regex=r"^(most-free-space|least-io-load|round-robin)$", default=None
+    )
 
 
 class AwsConfigSection(BaseModel):
@@ -41,6 +53,10 @@ class LoggingConfigSection(BaseModel):
     verbose: Optional[bool] = None
     worker_logs_dir: Optional[Path] = None
     local_session_logs: Optional[bool] = None
+    local_session_logs_compression: Optional[bool] = None
+    local_session_logs_max_size_mb: Optional[float] = None
+    session_log_packing_window_ms: Optional[int] = None
+    session_log_repeated_line_threshold: Optional[int] = None
     host_metrics_logging: Optional[bool] = None
     host_metrics_logging_interval_seconds: Optional[float] = None
     structured_logs: Optional[bool] = None
@@ -53,6 +69,8 @@ class OsConfigSection(BaseModel):
     )
     shutdown_on_stop: Optional[bool] = None
     retain_session_dir: Optional[bool] = None
+    retain_session_dir_max_age_hours: Optional[float] = None
+    retain_session_dir_max_size_gb: Optional[float] = None
     windows_job_user: Optional[StrictStr] = Field(regex=r"^.{1,512}$")  # defer validation to OS.
 
     @root_validator(pre=True)
@@ -119,6 +137,30 @@ class ConfigFile(BaseModel):
             output_settings["fleet_id"] = self.worker.fleet_id
         if self.worker.worker_persistence_dir is not None:
             output_settings["worker_persistence_dir"] = self.worker.worker_persistence_dir
+        if self.worker.job_attachments_cache is not None:
+            output_settings["job_attachments_cache"] = self.worker.job_attachments_cache
+        if self.worker.job_attachments_cache_dir is not None:
+            output_settings["job_attachments_cache_dir"] = self.worker.job_attachments_cache_dir
+        if self.worker.job_attachments_cache_max_size_gb is not None:
+            output_settings["job_attachments_cache_max_size_gb"] = (
+                self.worker.job_attachments_cache_max_size_gb
+            )
+        if self.worker.job_attachments_output_journal is not None:
+            output_settings["job_attachments_output_journal"] = (
+                self.worker.job_attachments_output_journal
+            )
+        if self.worker.job_attachments_prefetch is not None:
+            output_settings["job_attachments_prefetch"] = self.worker.job_attachments_prefetch
+        if self.worker.session_cache is not None:
+            output_settings["session_cache"] = self.worker.session_cache
+        if self.worker.session_cache_dir is not None:
+            output_settings["session_cache_dir"] = self.worker.session_cache_dir
+        if self.worker.session_cache_max_size_gb is not None:
+            output_settings["session_cache_max_size_gb"] = self.worker.session_cache_max_size_gb
+        if self.worker.session_root_dirs is not None:
+            output_settings["session_root_dirs"] = self.worker.session_root_dirs
+        if self.worker.session_root_placement is not None:
+            output_settings["session_root_placement"] = self.worker.session_root_placement
         if self.aws.profile is not None:
             output_settings["profile"] = self.aws.profile
         if self.aws.allow_ec2_instance_profile is not None:
@@ -129,6 +171,22 @@ class ConfigFile(BaseModel):
             output_settings["worker_logs_dir"] = self.logging.worker_logs_dir
         if self.logging.local_session_logs is not None:
             output_settings["local_session_logs"] = self.logging.local_session_logs
+        if self.logging.local_session_logs_compression is not None:
+            output_settings["local_session_logs_compression"] = (
+                self.logging.local_session_logs_compression
+            )
+        if self.logging.local_session_logs_max_size_mb is not None:
+            output_settings["local_session_logs_max_size_mb"] = (
+                self.logging.local_session_logs_max_size_mb
+            )
+        if self.logging.session_log_packing_window_ms is not None:
+            output_settings["session_log_packing_window_ms"] = (
+                self.logging.session_log_packing_window_ms
+            )
+        if self.logging.session_log_repeated_line_threshold is not None:
+            output_settings["session_log_repeated_line_threshold"] = (
+                self.logging.session_log_repeated_line_threshold
+            )
         if self.logging.host_metrics_logging is not None:
             output_settings["host_metrics_logging"] = self.logging.host_metrics_logging
         if self.logging.host_metrics_logging_interval_seconds is not None:
@@ -147,6 +205,14 @@ class ConfigFile(BaseModel):
             output_settings["windows_job_user"] = self.os.windows_job_user
         if self.os.retain_session_dir is not None:
             output_settings["retain_session_dir"] = self.os.retain_session_dir
+        if self.os.retain_session_dir_max_age_hours is not None:
+            output_settings["retain_session_dir_max_age_hours"] = (
+                self.os.retain_session_dir_max_age_hours
+            )
+        if self.os.retain_session_dir_max_size_gb is not None:
+            output_settings["retain_session_dir_max_size_gb"] = (
+                self.os.retain_session_dir_max_size_gb
+            )
         if self.capabilities is not None:
             output_settings["capabilities"] = self.capabilities
 
@@ -18,8 +18,17 @@ from pathlib import Path
 from ..api_models import WorkerStatus
 from ..boto import DEADLINE_BOTOCORE_CONFIG, OTHER_BOTOCORE_CONFIG, DeadlineClient
 from ..errors import ServiceShutdown
+from ..job_attachments import JobAttachmentsContentCache
 from ..log_sync.cloudwatch import stream_cloudwatch_logs
 from ..log_sync.loggers import ROOT_LOGGER, logger as log_sync_logger
+from ..scheduler.session_action_journal import (
+    SESSION_ACTION_JOURNAL_FILENAME,
+    SessionActionUpdateJournal,
+)
+from ..sessions.session import DEFAULT_POSIX_OPENJD_SESSION_DIR
+from ..sessions.session_cache import SessionCache
+from ..sessions.session_dir_janitor import SessionDirJanitor
+from ..sessions.session_root_placement import SessionRootPlacementPolicy, SessionRootPlacer
 from ..worker import Worker
 from .bootstrap import bootstrap_worker
 from .capabilities import detect_system_capabilities
@@ -157,6 +166,53 @@ def entrypoint(cli_args: Optional[list[str]] = None, *, stop: Optional[Event] =
             # logs that we forward to CloudWatch.
             _log_agent_info()
 
+            job_attachments_cache: JobAttachmentsContentCache | None = None
+            if config.job_attachments_cache_dir is not None:
+                job_attachments_cache = JobAttachmentsContentCache(
+                    root_dir=config.job_attachments_cache_dir,
+                    max_size_bytes=int(config.job_attachments_cache_max_size_gb * 1000**3),
+                )
+
+            session_cache: SessionCache | None = None
+            if config.session_cache_dir is not None:
+                session_cache = SessionCache(
+                    root_dir=config.session_cache_dir,
+                    max_size_bytes=int(config.session_cache_max_size_gb * 1000**3),
+                )
+
+            session_root_placer: SessionRootPlacer | None = None
+            if config.session_root_dirs:
+                session_root_placer = SessionRootPlacer(
+                    root_dirs=config.session_root_dirs,
+                    policy=SessionRootPlacementPolicy(config.session_root_placement),
+                )
+
+            session_dir_janitor = SessionDirJanitor(
+                root_dirs=(
+                    config.session_root_dirs
+                    or ([DEFAULT_POSIX_OPENJD_SESSION_DIR] if os.name == "posix" else [])
+                ),
+                max_age_seconds=(
+                    config.retain_session_dir_max_age_hours * 60 * 60
+                    if config.retain_session_dir_max_age_hours is not None
+                    else None
+                ),
+                max_size_bytes=(
+                    int(config.retain_session_dir_max_size_gb * 1000**3)
+                    if config.retain_session_dir_max_size_gb is not None
+                    else None
+                ),
+            )
+
+            session_action_update_journal = SessionActionUpdateJournal(
+                path=config.worker_persistence_dir / SESSION_ACTION_JOURNAL_FILENAME,
+                worker_id=worker_id,
+            )
+
+            local_session_logs_max_bytes: int | None = None
+            if config.local_session_logs_max_size_mb is not None:
+                local_session_logs_max_bytes = int(config.local_session_logs_max_size_mb * 1000**2)
+
             worker_sessions = Worker(
                 farm_id=config.farm_id,
                 fleet_id=config.fleet_id,
@@ -170,8 +226,19 @@ def entrypoint(cli_args: Optional[list[str]] = None, *, stop: Optional[Event] =
                 worker_persistence_dir=config.worker_persistence_dir,
                 worker_logs_dir=config.worker_logs_dir if config.local_session_logs else None,
                 host_metrics_logging=config.host_metrics_logging,
+                local_session_logs_compression=config.local_session_logs_compression,
+                local_session_logs_max_bytes=local_session_logs_max_bytes,
+                session_log_packing_window_ms=config.session_log_packing_window_ms,
+                session_log_repeated_line_threshold=config.session_log_repeated_line_threshold,
                 host_metrics_logging_interval_seconds=config.host_metrics_logging_interval_seconds,
                 retain_session_dir=config.retain_session_dir,
+                job_attachments_cache=job_attachments_cache,
+                job_attachments_output_journal=config.job_attachments_output_journal,
+                job_attachments_prefetch=config.job_attachments_prefetch,
+                session_cache=session_cache,
+                session_root_placer=session_root_placer,
+                session_dir_janitor=session_dir_janitor,
+                session_action_update_journal=session_action_update_journal,
                 stop=stop,
             )
             try:
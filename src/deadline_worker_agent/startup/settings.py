@@ -75,14 +75,62 @@ class WorkerSettings(BaseSettings):
         The path to the directory where the Worker Agent persists its state.
     local_session_logs : bool
         Whether to write session logs to the local filesystem
+    local_session_logs_compression : bool
+        If true, then local session logs are gzip-compressed and written by a background thread.
+    local_session_logs_max_size_mb : Optional[float]
+        The size in megabytes at which local session logs are rotated. If None, then local session
+        logs are not rotated.
+    session_log_packing_window_ms : Optional[int]
+        If set, consecutive session log lines emitted within this many milliseconds of each other
+        are packed into a single CloudWatch log event. If None, then every line is sent as its own
+        log event.
+    session_log_repeated_line_threshold : Optional[int]
+        If set, runs of consecutive session log lines that only differ by numbers, spinner
+        characters, or the length of progress bars are passed through up to this many lines, and
+        the rest of each run is collapsed into periodic summaries. If None, then every line is kept.
     host_metrics_logging : bool
         Whether to log host metrics
     host_metrics_logging_interval_seconds : float
         The interval between host metrics log messages
     retain_session_dir : bool
         If true, then the OpenJD's session directory will not be removed after the job is finished.
+    retain_session_dir_max_age_hours : Optional[float]
+        If set, retained session directories that were last modified longer ago than this many
+        hours are deleted in the background. If None, then they are kept regardless of their age.
+    retain_session_dir_max_size_gb : Optional[float]
+        If set, the oldest retained session directories are deleted in the background until their
+        total size is within this many gigabytes. If None, then their total size is not limited.
     structured_logs: bool
         If true, then the Worker Agent's logs are structured.
+    job_attachments_cache : bool
+        If true, then Job Attachments input files are cached on the Worker host and re-used by
+        subsequent sessions.
+    job_attachments_cache_dir : Optional[Path]
+        The directory for the Job Attachments cache. Defaults to a subdirectory of the worker
+        persistence directory.
+    job_attachments_cache_max_size_gb : float
+        The maximum total size of the Job Attachments cache in gigabytes.
+    job_attachments_output_journal : bool
+        If true, then Job Attachments output files are found by watching the output directories
+        for changes (Linux only) rather than by walking the output directories after each task.
+    job_attachments_prefetch : bool
+        If true, then the input files of a Session's queued Job Attachments input sync are
+        downloaded in the background while the actions before it run.
+    session_cache : bool
+        If true, then sessions are given a per-queue directory on the Worker host, that persists
+        across sessions, in the DEADLINE_SESSION_CACHE_DIR environment variable.
+    session_cache_dir : Optional[Path]
+        The directory for the session cache. Defaults to a subdirectory of the worker persistence
+        directory.
+    session_cache_max_size_gb : float
+        The maximum total size of the session cache in gigabytes.
+    session_root_dirs : Optional[list[Path]]
+        The directories that the working directories of sessions are created in, for example
+        scratch volumes on different devices. Defaults to a single directory chosen by the
+        platform.
+    session_root_placement : str
+        How the directory for each session is chosen from session_root_dirs. One of
+        "most-free-space", "least-io-load" or "round-robin".
     """
 
     farm_id: str = Field(regex=r"^farm-[a-z0-9]{32}$")
@@ -112,10 +160,28 @@ class WorkerSettings(BaseSettings):
         else DEFAULT_POSIX_WORKER_PERSISTENCE_DIR
     )
     local_session_logs: bool = True
+    local_session_logs_compression: bool = False
+    local_session_logs_max_size_mb: Optional[float] = None
+    session_log_packing_window_ms: Optional[int] = None
+    session_log_repeated_line_threshold: Optional[int] = None
     host_metrics_logging: bool = True
     host_metrics_logging_interval_seconds: float = 60
     retain_session_dir: bool = False
+    retain_session_dir_max_age_hours: Optional[float] = None
+    retain_session_dir_max_size_gb: Optional[float] = None
     structured_logs: bool = False
+    job_attachments_cache: bool = False
+    job_attachments_cache_dir: Optional[Path] = None
+    job_attachments_cache_max_size_gb: float = 50
+    job_attachments_output_journal: bool = False
+    job_attachments_prefetch: bool = False
+    session_cache: bool = False
+    session_cache_dir: Optional[Path] = None
+    session_cache_max_size_gb: float = 50
+    session_root_dirs: Optional[list[Path]] = Field(min_items=1, default=None)
+    session_root_placement: str = Field(
+        regex=r"^(most-free-space|least-io-load|round-robin)$", default="most-free-space"
+    )
 
     class Config:
         fields = {
@@ -138,12 +204,44 @@ class WorkerSettings(BaseSettings):
             "worker_logs_dir": {"env": "DEADLINE_WORKER_LOGS_DIR"},
             "worker_persistence_dir": {"env": "DEADLINE_WORKER_PERSISTENCE_DIR"},
             "local_session_logs": {"env": "DEADLINE_WORKER_LOCAL_SESSION_LOGS"},
+            "local_session_logs_compression": {
+                "env": "DEADLINE_WORKER_LOCAL_SESSION_LOGS_COMPRESSION"
+            },
+            "local_session_logs_max_size_mb": {
+                "env": "DEADLINE_WORKER_LOCAL_SESSION_LOGS_MAX_SIZE_MB"
+            },
+            "session_log_packing_window_ms": {
+                "env": "DEADLINE_WORKER_SESSION_LOG_PACKING_WINDOW_MS"
+            },
+            "session_log_repeated_line_threshold": {
+                "env": "DEADLINE_WORKER_SESSION_LOG_REPEATED_LINE_THRESHOLD"
+            },
             "host_metrics_logging": {"env": "DEADLINE_WORKER_HOST_METRICS_LOGGING"},
             "host_metrics_logging_interval_seconds": {
                 "env": "DEADLINE_WORKER_HOST_METRICS_LOGGING_INTERVAL_SECONDS"
             },
             "retain_session_dir": {"env": "DEADLINE_WORKER_RETAIN_SESSION_DIR"},
+            "retain_session_dir_max_age_hours": {
+                "env": "DEADLINE_WORKER_RETAIN_SESSION_DIR_MAX_AGE_HOURS"
+            },
+            "retain_session_dir_max_size_gb": {
+                "env": "DEADLINE_WORKER_RETAIN_SESSION_DIR_MAX_SIZE_GB"
+            },
             "structured_logs": {"env": "DEADLINE_WORKER_STRUCTURED_LOGS"},
+            "job_attachments_cache": {"env": "DEADLINE_WORKER_JOB_ATTACHMENTS_CACHE"},
+            "job_attachments_cache_dir": {"env": "DEADLINE_WORKER_JOB_ATTACHMENTS_CACHE_DIR"},
+            "job_attachments_cache_max_size_gb": {
+                "env": "DEADLINE_WORKER_JOB_ATTACHMENTS_CACHE_MAX_SIZE_GB"
+            },
+            "job_attachments_output_journal": {
+                "env": "DEADLINE_WORKER_JOB_ATTACHMENTS_OUTPUT_JOURNAL"
+            },
+            "job_attachments_prefetch": {"env": "DEADLINE_WORKER_JOB_ATTACHMENTS_PREFETCH"},
+            "session_cache": {"env": "DEADLINE_WORKER_SESSION_CACHE"},
+            "session_cache_dir": {"env": "DEADLINE_WORKER_SESSION_CACHE_DIR"},
+            "session_cache_max_size_gb": {"env": "DEADLINE_WORKER_SESSION_CACHE_MAX_SIZE_GB"},
+            "session_root_dirs": {"env": "DEADLINE_WORKER_SESSION_ROOT_DIRS"},
+            "session_root_placement": {"env": "DEADLINE_WORKER_SESSION_ROOT_PLACEMENT"},
         }
 
         @classmethod
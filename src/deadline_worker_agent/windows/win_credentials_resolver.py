@@ -9,6 +9,7 @@ import json
 import os
 from datetime import datetime, timedelta, timezone
 from logging import getLogger
+from threading import RLock
 from typing import Dict
 
 from botocore.client import BaseClient
@@ -46,6 +47,8 @@ class WindowsCredentialsResolver:
             raise RuntimeError("Windows credentials resolver can only be used on Windows")
         self._boto_session = boto_session
         self._user_cache: Dict[str, _WindowsCredentialsCacheEntry] = {}
+        # Sessions are provisioned concurrently, so guard the cache and the logons.
+        self._lock = RLock()
 
     def _get_secrets_manager_client(self) -> BaseClient:
         secrets_manager_client = self._boto_session.client(
@@ -101,11 +104,12 @@ class WindowsCredentialsResolver:
 
         # Filter out entries that haven't been accessed in the last CACHE_EXPIRATION hours
         now = datetime.now(tz=timezone.utc)
-        self._user_cache = {
-            key: value
-            for key, value in self._user_cache.items()
-            if now - value.last_accessed < self.CACHE_EXPIRATION
-        }
+        with self._lock:
+            self._user_cache = {
+                key: value
+                for key, value in self._user_cache.items()
+                if now - value.last_accessed < self.CACHE_EXPIRATION
+            }
 
     def clear(self):
         """Clears all users from the cache and cleans up any open resources"""
@@ -138,6 +142,10 @@ class WindowsCredentialsResolver:
             return f"{user_name}_{password_arn}"
 
     def get_windows_session_user(self, user: str, passwordArn: str) -> WindowsSessionUser:
+        with self._lock:
+            return self._get_windows_session_user(user, passwordArn)
+
+    def _get_windows_session_user(self, user: str, passwordArn: str) -> WindowsSessionUser:
         # Raises ValueError on problems so that the scheduler can cleanly fail the associated jobs
         # Any failure here should be cached so that we wait self.RETRY_AFTER minutes before fetching
         # again
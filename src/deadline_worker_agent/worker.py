@@ -17,13 +17,19 @@ from typing import Any, NamedTuple, cast
 from pathlib import Path
 
 import boto3
-import requests
 
+from .aws.deadline import get_deadline_rate_limiter
+from .aws.ec2_metadata import Ec2InstanceMetadataClient
 from .boto import DeadlineClient
 from .errors import ServiceShutdown
+from .job_attachments import JobAttachmentsContentCache
 from .metrics import HostMetricsLogger
 from .scheduler import WorkerScheduler
+from .scheduler.session_action_journal import SessionActionUpdateJournal
 from .sessions import Session
+from .sessions.session_cache import SessionCache
+from .sessions.session_dir_janitor import SessionDirJanitor
+from .sessions.session_root_placement import SessionRootPlacer
 from .startup.config import JobsRunAsUserOverride
 from .aws_credentials import WorkerBoto3Session, AwsCredentialsRefresher
 from .log_messages import AwsCredentialsLogEvent, AwsCredentialsLogEventOp
@@ -73,6 +79,7 @@ class Worker:
     _worker_persistence_dir: Path
     _host_metrics_logger: HostMetricsLogger | None = None
     _retain_session_dir: bool
+    _imds: Ec2InstanceMetadataClient
 
     def __init__(
         self,
@@ -89,8 +96,19 @@ class Worker:
         worker_persistence_dir: Path,
         worker_logs_dir: Path | None,
         host_metrics_logging: bool,
+        local_session_logs_compression: bool = False,
+        local_session_logs_max_bytes: int | None = None,
+        session_log_packing_window_ms: int | None = None,
+        session_log_repeated_line_threshold: int | None = None,
         host_metrics_logging_interval_seconds: float | None = None,
         retain_session_dir: bool = False,
+        job_attachments_cache: JobAttachmentsContentCache | None = None,
+        job_attachments_output_journal: bool = False,
+        job_attachments_prefetch: bool = False,
+        session_cache: SessionCache | None = None,
+        session_root_placer: SessionRootPlacer | None = None,
+        session_dir_janitor: SessionDirJanitor | None = None,
+        session_action_update_journal: SessionActionUpdateJournal | None = None,
         stop: Event | None = None,
     ) -> None:
         self._deadline_client = deadline_client
@@ -110,20 +128,34 @@ class Worker:
             cleanup_session_user_processes=cleanup_session_user_processes,
             worker_persistence_dir=worker_persistence_dir,
             worker_logs_dir=worker_logs_dir,
+            local_session_logs_compression=local_session_logs_compression,
+            local_session_logs_max_bytes=local_session_logs_max_bytes,
+            session_log_packing_window_ms=session_log_packing_window_ms,
+            session_log_repeated_line_threshold=session_log_repeated_line_threshold,
             retain_session_dir=retain_session_dir,
+            job_attachments_cache=job_attachments_cache,
+            job_attachments_output_journal=job_attachments_output_journal,
+            job_attachments_prefetch=job_attachments_prefetch,
+            session_cache=session_cache,
+            session_root_placer=session_root_placer,
+            session_dir_janitor=session_dir_janitor,
+            session_action_update_journal=session_action_update_journal,
             stop=stop,
         )
         self._stop = stop or Event()
         self._boto_session = boto_session
         self._worker_persistence_dir = worker_persistence_dir
         self._retain_session_dir = retain_session_dir
+        self._imds = Ec2InstanceMetadataClient()
 
         if host_metrics_logging:
             assert (
                 host_metrics_logging_interval_seconds is not None
             ), "host_metrics_logging_interval_seconds is required if host metrics logging is enabled"
             self._host_metrics_logger = HostMetricsLogger(
-                logger=logger, interval_s=host_metrics_logging_interval_seconds
+                logger=logger,
+                interval_s=host_metrics_logging_interval_seconds,
+                deadline_rate_limiter=get_deadline_rate_limiter(),
             )
 
         if os.name == "posix":
@@ -208,6 +240,7 @@ class Worker:
                 failure_callback=self._aws_credentials_refresh_failure,
             ),
             self._host_metrics_logger or nullcontext(),
+            self._imds,
         ):
             scheduler_future = self._executor.submit(self._scheduler.run)
             futures: list[Future[Any]] = [
@@ -335,65 +368,61 @@ class Worker:
             occurs and a human-friendly message describing the shutdown reason.
         """
         monitor_ec2_shutdown_rate = Worker._EC2_SHUTDOWN_MONITOR_RATE.total_seconds()
-        while not self._stop.wait(timeout=monitor_ec2_shutdown_rate):
-            if not (imdsv2_token := self._get_ec2_metadata_imdsv2_token()):
-                # Not on EC2 or IMDSv2 is inactive.
-                logger.info(
-                    "IMDS unavailable - unable to monitor for spot interruption or ASG life-cycle "
-                    "changes"
-                )
-                continue
+        # The spot interruption and ASG life-cycle checks are independent, so make them
+        # concurrently to keep the detection latency to a single IMDS round-trip.
+        with ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="Ec2ShutdownMonitor"
+        ) as query_executor:
+            while not self._stop.wait(timeout=monitor_ec2_shutdown_rate):
+                if not (imdsv2_token := self._get_ec2_metadata_imdsv2_token()):
+                    # Not on EC2 or IMDSv2 is inactive.
+                    logger.info(
+                        "IMDS unavailable - unable to monitor for spot interruption or ASG life-cycle "
+                        "changes"
+                    )
+                    continue
 
-            # Check for spot interruption or shutdown
-            if (
-                spot_shutdown_grace := self._get_spot_instance_shutdown_action_timeout(
-                    imdsv2_token=imdsv2_token
-                )
-            ) is not None:
-                logger.info("Spot interruption detected. Termination in %s", spot_shutdown_grace)
-                return WorkerShutdown(
-                    grace_time=spot_shutdown_grace,
-                    fail_message="The Worker received an EC2 spot interruption",
+                spot_shutdown_grace_future = query_executor.submit(
+                    self._get_spot_instance_shutdown_action_timeout, imdsv2_token=imdsv2_token
                 )
-            elif self._is_asg_terminated(imdsv2_token=imdsv2_token):
-                logger.info(
-                    "Auto-scaling life-cycle change event detected. Termination in %s",
-                    Worker._ASG_LIFECYCLE_SHUTDOWN_GRACE,
-                )
-                return WorkerShutdown(
-                    grace_time=Worker._ASG_LIFECYCLE_SHUTDOWN_GRACE,
-                    fail_message="The Worker received an auto-scaling life-cycle change event",
+                is_asg_terminated_future = query_executor.submit(
+                    self._is_asg_terminated, imdsv2_token=imdsv2_token
                 )
 
+                # Check for spot interruption or shutdown
+                if (spot_shutdown_grace := spot_shutdown_grace_future.result()) is not None:
+                    logger.info(
+                        "Spot interruption detected. Termination in %s", spot_shutdown_grace
+                    )
+                    return WorkerShutdown(
+                        grace_time=spot_shutdown_grace,
+                        fail_message="The Worker received an EC2 spot interruption",
+                    )
+                elif is_asg_terminated_future.result():
+                    logger.info(
+                        "Auto-scaling life-cycle change event detected. Termination in %s",
+                        Worker._ASG_LIFECYCLE_SHUTDOWN_GRACE,
+                    )
+                    return WorkerShutdown(
+                        grace_time=Worker._ASG_LIFECYCLE_SHUTDOWN_GRACE,
+                        fail_message="The Worker received an auto-scaling life-cycle change event",
+                    )
+
         logger.debug("EC2 shutdown monitoring thread exited")
 
         return None
 
     def _get_ec2_metadata_imdsv2_token(self) -> str | None:
-        """Query the EC2 Metadata service to obtain an IMDSv2 token to use in further queries to the
-        service.
+        """Obtain an IMDSv2 token to use in further queries to the EC2 Metadata service. The token
+        is cached and only requested from the service when it is about to expire.
 
         Returns
         -------
         str | None
             None if we're not on EC2 or could not get a token from the metadata service. A token
-            with a 10 second TTL otherwise.
+            otherwise.
         """
-        # See:
-        #  https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/configuring-instance-metadata-service.html
-        try:
-            response = requests.put(
-                "http://169.254.169.254/latest/api/token",
-                headers={"X-aws-ec2-metadata-token-ttl-seconds": "10"},
-            )
-        except requests.ConnectionError:
-            # Could not connect to the metadata service. Either it's not enabled or we're not
-            # on an EC2 instance.
-            return None
-
-        if response.status_code == 200:
-            return response.text
-        return None
+        return self._imds.get_token()
 
     def _get_spot_instance_shutdown_action_timeout(self, *, imdsv2_token: str) -> timedelta | None:
         """Query the EC2 instance metadata service to check whether or not this instance is being
@@ -412,12 +441,8 @@ class Worker:
         """
 
         # See: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/spot-instance-termination-notices.html#instance-action-metadata # noqa: E501
-        try:
-            response = requests.get(
-                "http://169.254.169.254/latest/meta-data/spot/instance-action",
-                headers={"X-aws-ec2-metadata-token": imdsv2_token},
-            )
-        except requests.ConnectionError:
+        response = self._imds.get("spot/instance-action", token=imdsv2_token)
+        if response is None:
             # Could not connect to the metadata service. Either it's inactive or we're not
             # on an EC2 instance.
             return None
@@ -463,12 +488,8 @@ class Worker:
         # Return number of seconds until shutdown, if we're getting shut-down
 
         # See: https://docs.aws.amazon.com/autoscaling/ec2/userguide/retrieving-target-lifecycle-state-through-imds.html # noqa: E501
-        try:
-            response = requests.get(
-                "http://169.254.169.254/latest/meta-data/autoscaling/target-lifecycle-state",
-                headers={"X-aws-ec2-metadata-token": imdsv2_token},
-            )
-        except requests.ConnectionError:
+        response = self._imds.get("autoscaling/target-lifecycle-state", token=imdsv2_token)
+        if response is None:
             return False
 
         if response.status_code == 200:
@@ -0,0 +1,20 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from deadline_worker_agent.aws.deadline.rate_limiter import DeadlineRateLimiter
+import deadline_worker_agent.aws.deadline as deadline_mod
+
+
+@pytest.fixture(autouse=True)
+def mock_rate_limiter() -> Generator[MagicMock, None, None]:
+    """The shared rate limiter really waits, so the API wrappers are tested without it"""
+    rate_limiter = MagicMock(spec=DeadlineRateLimiter)
+    rate_limiter.acquire.return_value = True
+    with patch.object(deadline_mod, "_rate_limiter", rate_limiter):
+        yield rate_limiter
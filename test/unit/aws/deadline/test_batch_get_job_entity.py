@@ -11,6 +11,7 @@ from deadline_worker_agent.aws.deadline import (
     batch_get_job_entity,
 )
 
+from deadline_worker_agent.aws.deadline.rate_limiter import DeadlineRequestPriority
 import deadline_worker_agent.aws.deadline as deadline_mod
 from deadline_worker_agent.api_models import BatchGetJobEntityResponse, EntityIdentifier
 
@@ -228,3 +229,29 @@ def test_raises_not_found(
     # THEN
     assert exc_context.value.inner_exc is exception
     sleep_mock.assert_not_called()
+
+
+def test_is_lower_priority_than_heartbeats(
+    client: MagicMock,
+    farm_id: str,
+    fleet_id: str,
+    worker_id: str,
+    mock_rate_limiter: MagicMock,
+) -> None:
+    # GIVEN
+    client.batch_get_job_entity.return_value = SAMPLE_RESPONSE
+
+    # WHEN
+    batch_get_job_entity(
+        deadline_client=client,
+        farm_id=farm_id,
+        fleet_id=fleet_id,
+        worker_id=worker_id,
+        identifiers=SAMPLE_IDENTITIES,
+    )
+
+    # THEN
+    mock_rate_limiter.acquire.assert_called_once_with(
+        DeadlineRequestPriority.JOB_ENTITIES, interrupt_event=None
+    )
+    assert DeadlineRequestPriority.JOB_ENTITIES > DeadlineRequestPriority.WORKER_STATUS
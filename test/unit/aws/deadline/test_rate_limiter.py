@@ -0,0 +1,187 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from threading import Event
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from deadline_worker_agent.aws.deadline.rate_limiter import (
+    DeadlineRateLimiter,
+    DeadlineRequestPriority,
+)
+import deadline_worker_agent.aws.deadline.rate_limiter as rate_limiter_mod
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float | None = None) -> None:
+        assert seconds is not None
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> Generator[FakeClock, None, None]:
+    clock = FakeClock()
+    with patch.object(rate_limiter_mod, "monotonic", clock):
+        yield clock
+
+
+@pytest.fixture
+def rate_limiter(clock: FakeClock) -> Generator[DeadlineRateLimiter, None, None]:
+    rate_limiter = DeadlineRateLimiter(max_rate=4, min_rate=0.5)
+    # Waiting for a token advances the fake clock instead of blocking
+    with patch.object(rate_limiter._condition, "wait", side_effect=clock.advance) as wait_mock:
+        rate_limiter.wait_mock = wait_mock  # type: ignore[attr-defined]
+        yield rate_limiter
+
+
+class TestDeadlineRateLimiter:
+    @pytest.mark.parametrize(
+        argnames=("max_rate", "min_rate"),
+        argvalues=((1, 0), (1, 2), (-1, -2)),
+    )
+    def test_rates_must_be_valid(self, max_rate: float, min_rate: float) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            DeadlineRateLimiter(max_rate=max_rate, min_rate=min_rate)
+
+    def test_allows_burst(self, rate_limiter: DeadlineRateLimiter, clock: FakeClock) -> None:
+        # WHEN
+        for _ in range(4):
+            assert rate_limiter.acquire(DeadlineRequestPriority.WORKER_STATUS)
+
+        # THEN
+        assert clock.now == 1000.0
+        assert rate_limiter.state().tokens == 0
+
+    def test_limits_rate(self, rate_limiter: DeadlineRateLimiter, clock: FakeClock) -> None:
+        # GIVEN
+        for _ in range(4):
+            rate_limiter.acquire(DeadlineRequestPriority.WORKER_STATUS)
+
+        # WHEN
+        for _ in range(4):
+            assert rate_limiter.acquire(DeadlineRequestPriority.WORKER_STATUS)
+
+        # THEN
+        assert clock.now == pytest.approx(1001.0)
+
+    def test_lower_priority_leaves_tokens(
+        self, rate_limiter: DeadlineRateLimiter, clock: FakeClock
+    ) -> None:
+        # GIVEN
+        for _ in range(2):
+            rate_limiter.acquire(DeadlineRequestPriority.JOB_ENTITIES)
+
+        # WHEN
+        rate_limiter.acquire(DeadlineRequestPriority.JOB_ENTITIES)
+
+        # THEN
+        # Two tokens are left for requests of higher priority...
+        assert clock.now == pytest.approx(1000.25)
+
+        # WHEN
+        clock_before = clock.now
+        rate_limiter.acquire(DeadlineRequestPriority.WORKER_STATUS)
+        rate_limiter.acquire(DeadlineRequestPriority.WORKER_STATUS)
+
+        # THEN
+        # ...which they take without waiting
+        assert clock.now == clock_before
+
+    def test_throttle_decreases_rate(self, rate_limiter: DeadlineRateLimiter) -> None:
+        # WHEN
+        rate_limiter.on_throttle()
+        # Throttles of requests that were in-flight at the same time only count once
+        rate_limiter.on_throttle()
+
+        # THEN
+        state = rate_limiter.state()
+        assert state.rate == 2
+        assert state.tokens == 0
+        assert state.throttles == 2
+
+    def test_rate_does_not_decrease_below_min(
+        self, rate_limiter: DeadlineRateLimiter, clock: FakeClock
+    ) -> None:
+        # WHEN
+        for _ in range(10):
+            rate_limiter.on_throttle()
+            clock.advance(rate_limiter_mod._RATE_DECREASE_COOLDOWN_SECONDS)
+
+        # THEN
+        assert rate_limiter.state().rate == 0.5
+
+    def test_success_increases_rate(self, rate_limiter: DeadlineRateLimiter) -> None:
+        # GIVEN
+        rate_limiter.on_throttle()
+
+        # WHEN
+        for _ in range(5):
+            rate_limiter.on_success()
+
+        # THEN
+        assert rate_limiter.state().rate == pytest.approx(2.5)
+
+        # WHEN
+        for _ in range(100):
+            rate_limiter.on_success()
+
+        # THEN
+        assert rate_limiter.state().rate == 4
+
+    def test_retry_after_pauses_all_requests(
+        self, rate_limiter: DeadlineRateLimiter, clock: FakeClock
+    ) -> None:
+        # GIVEN
+        rate_limiter.on_throttle(retry_after_seconds=30)
+        assert rate_limiter.state().paused_seconds == 30
+
+        # WHEN
+        rate_limiter.acquire(DeadlineRequestPriority.WORKER_STATUS)
+
+        # THEN
+        assert clock.now >= 1030.0
+        assert rate_limiter.state().paused_seconds == 0
+
+    def test_interrupted(self, rate_limiter: DeadlineRateLimiter) -> None:
+        # GIVEN
+        interrupt_event = Event()
+        rate_limiter.on_throttle(retry_after_seconds=30)
+        rate_limiter.wait_mock.side_effect = lambda seconds: interrupt_event.set()  # type: ignore[attr-defined]
+
+        # WHEN
+        acquired = rate_limiter.acquire(
+            DeadlineRequestPriority.CREDENTIALS, interrupt_event=interrupt_event
+        )
+
+        # THEN
+        assert not acquired
+        rate_limiter.wait_mock.assert_called_once_with(rate_limiter_mod._INTERRUPT_POLL_SECONDS)  # type: ignore[attr-defined]
+        assert rate_limiter.state().waiting == 0
+
+    def test_waits_for_higher_priority(self, rate_limiter: DeadlineRateLimiter) -> None:
+        # GIVEN
+        rate_limiter._waiting[DeadlineRequestPriority.WORKER_STATUS] = 1
+        waits = MagicMock()
+
+        def release_heartbeat(seconds: float) -> None:
+            waits(seconds)
+            rate_limiter._waiting[DeadlineRequestPriority.WORKER_STATUS] = 0
+
+        rate_limiter.wait_mock.side_effect = release_heartbeat  # type: ignore[attr-defined]
+
+        # WHEN
+        assert rate_limiter.acquire(DeadlineRequestPriority.JOB_ENTITIES)
+
+        # THEN
+        waits.assert_called_once()
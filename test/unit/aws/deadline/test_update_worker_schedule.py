@@ -14,6 +14,7 @@ from deadline_worker_agent.aws.deadline import (
     DeadlineRequestWorkerNotFound,
     DeadlineRequestWorkerOfflineError,
 )
+from deadline_worker_agent.aws.deadline.rate_limiter import DeadlineRequestPriority
 import deadline_worker_agent.aws.deadline as deadline_mod
 
 
@@ -110,6 +111,75 @@ def test_can_interrupt(
     sleep_mock.assert_not_called()
 
 
+def test_shares_rate_limiter(
+    client: MagicMock,
+    farm_id: str,
+    fleet_id: str,
+    worker_id: str,
+    sleep_mock: MagicMock,
+    mock_rate_limiter: MagicMock,
+) -> None:
+    # A test that update_worker_schedule() waits for the Worker's shared rate limiter before each
+    # request, at the priority of heartbeats, and tells it when the service throttles.
+
+    # GIVEN
+    event = MagicMock()
+    event.is_set.return_value = False
+    client.update_worker_schedule.side_effect = [
+        ClientError(
+            {
+                "Error": {"Code": "ThrottlingException", "Message": "A message"},
+                "retryAfterSeconds": 30,
+            },
+            "UpdateWorkerSchedule",
+        ),
+        SAMPLE_UPDATE_WORKER_SCHEDULE_RESPONSE,
+    ]
+
+    # WHEN
+    update_worker_schedule(
+        deadline_client=client,
+        farm_id=farm_id,
+        fleet_id=fleet_id,
+        worker_id=worker_id,
+        interrupt_event=event,
+    )
+
+    # THEN
+    assert mock_rate_limiter.acquire.call_count == 2
+    mock_rate_limiter.acquire.assert_called_with(
+        DeadlineRequestPriority.WORKER_STATUS, interrupt_event=event
+    )
+    mock_rate_limiter.on_throttle.assert_called_once_with(30)
+    mock_rate_limiter.on_success.assert_called_once_with()
+
+
+def test_interrupted_while_rate_limited(
+    client: MagicMock,
+    farm_id: str,
+    fleet_id: str,
+    worker_id: str,
+    mock_rate_limiter: MagicMock,
+) -> None:
+    # GIVEN
+    event = MagicMock()
+    event.is_set.return_value = False
+    mock_rate_limiter.acquire.return_value = False
+
+    # WHEN
+    with pytest.raises(DeadlineRequestInterrupted):
+        update_worker_schedule(
+            deadline_client=client,
+            farm_id=farm_id,
+            fleet_id=fleet_id,
+            worker_id=worker_id,
+            interrupt_event=event,
+        )
+
+    # THEN
+    client.update_worker_schedule.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "exception,min_retry",
     [
@@ -0,0 +1,244 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Barrier, Lock, Thread
+from typing import Generator, Optional
+import socket
+import time
+
+import pytest
+
+from deadline_worker_agent.aws.ec2_metadata import Ec2InstanceMetadataClient
+
+
+class FakeImds:
+    """A local HTTP server that mimics the IMDSv2 endpoints used by the Worker Agent"""
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.tokens_issued = 0
+        self.token_ttls: list[str] = []
+        self.valid_tokens: set[str] = set()
+        self.client_ports: set[int] = set()
+        self.metadata: dict[str, str] = {}
+        self.response_delay: Optional[float] = None
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+            def _respond(self, status: int, body: str = "") -> None:
+                if fake.response_delay is not None:
+                    time.sleep(fake.response_delay)
+                encoded = body.encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_PUT(self) -> None:
+                with fake.lock:
+                    fake.client_ports.add(self.client_address[1])
+                    if self.path != "/latest/api/token":
+                        self._respond(404)
+                        return
+                    fake.tokens_issued += 1
+                    token = f"token-{fake.tokens_issued}"
+                    fake.valid_tokens.add(token)
+                    fake.token_ttls.append(self.headers["X-aws-ec2-metadata-token-ttl-seconds"])
+                self._respond(200, token)
+
+            def do_GET(self) -> None:
+                with fake.lock:
+                    fake.client_ports.add(self.client_address[1])
+                    token_valid = self.headers["X-aws-ec2-metadata-token"] in fake.valid_tokens
+                    body = fake.metadata.get(self.path.removeprefix("/latest/meta-data/"))
+                if not token_valid:
+                    self._respond(401)
+                elif body is None:
+                    self._respond(404)
+                else:
+                    self._respond(200, body)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.endpoint = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> FakeImds:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_imds() -> Generator[FakeImds, None, None]:
+    with FakeImds() as fake_imds:
+        yield fake_imds
+
+
+@pytest.fixture
+def client(fake_imds: FakeImds) -> Generator[Ec2InstanceMetadataClient, None, None]:
+    with Ec2InstanceMetadataClient(
+        endpoint=fake_imds.endpoint,
+        connect_timeout=1,
+        read_timeout=1,
+    ) as client:
+        yield client
+
+
+class TestGetToken:
+    def test_caches_token(self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds) -> None:
+        # WHEN
+        tokens = [client.get_token() for _ in range(5)]
+
+        # THEN
+        assert tokens == ["token-1"] * 5
+        assert fake_imds.tokens_issued == 1
+        assert fake_imds.token_ttls == ["300"]
+
+    def test_refreshes_token_near_expiry(
+        self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds
+    ) -> None:
+        # GIVEN
+        assert client.get_token() == "token-1"
+        client._token_expiry = datetime.now(timezone.utc) + timedelta(seconds=10)
+
+        # WHEN
+        token = client.get_token()
+
+        # THEN
+        assert token == "token-2"
+        assert fake_imds.tokens_issued == 2
+
+    def test_imds_unreachable(self) -> None:
+        # GIVEN
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            unused_port = sock.getsockname()[1]
+        client = Ec2InstanceMetadataClient(endpoint=f"http://127.0.0.1:{unused_port}")
+
+        # WHEN
+        token = client.get_token()
+
+        # THEN
+        assert token is None
+
+    def test_ttl_must_exceed_refresh_margin(self) -> None:
+        with pytest.raises(ValueError):
+            Ec2InstanceMetadataClient(token_ttl=timedelta(seconds=10))
+
+
+class TestGet:
+    def test_get_metadata(self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds) -> None:
+        # GIVEN
+        fake_imds.metadata["autoscaling/target-lifecycle-state"] = "InService"
+        token = client.get_token()
+        assert token is not None
+
+        # WHEN
+        response = client.get("autoscaling/target-lifecycle-state", token=token)
+
+        # THEN
+        assert response is not None
+        assert response.status_code == 200
+        assert response.text == "InService"
+
+    def test_reuses_connection(
+        self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds
+    ) -> None:
+        # GIVEN
+        fake_imds.metadata["spot/instance-action"] = "{}"
+
+        # WHEN
+        for _ in range(10):
+            token = client.get_token()
+            assert token is not None
+            client.get("spot/instance-action", token=token)
+
+        # THEN
+        assert len(fake_imds.client_ports) == 1
+
+    def test_concurrent_queries(
+        self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds
+    ) -> None:
+        # GIVEN
+        fake_imds.metadata["spot/instance-action"] = "{}"
+        fake_imds.metadata["autoscaling/target-lifecycle-state"] = "Terminated"
+        token = client.get_token()
+        assert token is not None
+
+        # WHEN
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            spot = executor.submit(client.get, "spot/instance-action", token=token)
+            asg = executor.submit(client.get, "autoscaling/target-lifecycle-state", token=token)
+            spot_response = spot.result()
+            asg_response = asg.result()
+
+        # THEN
+        assert spot_response is not None and spot_response.text == "{}"
+        assert asg_response is not None and asg_response.text == "Terminated"
+
+    def test_threads_do_not_share_sessions(
+        self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds
+    ) -> None:
+        # GIVEN
+        fake_imds.metadata["spot/instance-action"] = "{}"
+        token = client.get_token()
+        assert token is not None
+        barrier = Barrier(2)
+
+        def query() -> None:
+            # Make sure that both threads of the pool make a request
+            barrier.wait(timeout=5)
+            client.get("spot/instance-action", token=token)
+
+        # WHEN
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for future in [executor.submit(query) for _ in range(2)]:
+                future.result()
+
+        # THEN
+        # One session for the token request on this thread, and one for each thread of the pool
+        assert len(client._sessions) == 3
+        assert len({id(session) for session in client._sessions}) == 3
+
+    def test_rejected_token_is_discarded(
+        self, client: Ec2InstanceMetadataClient, fake_imds: FakeImds
+    ) -> None:
+        # GIVEN
+        fake_imds.metadata["spot/instance-action"] = "{}"
+        token = client.get_token()
+        fake_imds.valid_tokens.clear()
+
+        # WHEN
+        response = client.get("spot/instance-action", token=str(token))
+
+        # THEN
+        assert response is not None
+        assert response.status_code == 401
+        assert client.get_token() == "token-2"
+
+    def test_read_timeout(self, fake_imds: FakeImds) -> None:
+        # GIVEN
+        fake_imds.metadata["spot/instance-action"] = "{}"
+        client = Ec2InstanceMetadataClient(endpoint=fake_imds.endpoint, read_timeout=0.1)
+        token = client.get_token()
+        assert token is not None
+        fake_imds.response_delay = 0.5
+
+        # WHEN
+        response = client.get("spot/instance-action", token=token)
+
+        # THEN
+        assert response is None
@@ -0,0 +1,112 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import MagicMock
+
+from deadline_worker_agent.boto.shim import DeadlineClient
+
+
+def _response(*action_ids: str, session_id: str = "session-1") -> dict[str, Any]:
+    return {
+        "assignedSessions": {
+            session_id: {
+                "queueId": "queue-1",
+                "jobId": "job-1",
+                "sessionActions": [
+                    {
+                        "sessionActionId": action_id,
+                        "definition": {"taskRun": {"stepId": "step-1", "taskId": action_id}},
+                    }
+                    for action_id in action_ids
+                ],
+            },
+        },
+        "cancelSessionActions": {},
+        "updateIntervalSeconds": 15,
+    }
+
+
+class TestUpdateWorkerSchedule:
+    def test_maps_session_actions(self) -> None:
+        # GIVEN
+        real_client = MagicMock()
+        real_client.update_worker_schedule.return_value = _response("action-1")
+        client = DeadlineClient(real_client)
+
+        # WHEN
+        response = client.update_worker_schedule(farmId="farm-1", fleetId="fleet-1", workerId="w")
+
+        # THEN
+        assert response["assignedSessions"]["session-1"]["sessionActions"] == [
+            {
+                "sessionActionId": "action-1",
+                "actionType": "TASK_RUN",
+                "stepId": "step-1",
+                "taskId": "action-1",
+            }
+        ]
+
+    def test_reuses_actions_of_unchanged_session(self) -> None:
+        # GIVEN
+        real_client = MagicMock()
+        real_client.update_worker_schedule.side_effect = [
+            _response("action-1", "action-2"),
+            _response("action-1", "action-2"),
+            _response("action-2", "action-3"),
+        ]
+        client = DeadlineClient(real_client)
+
+        # WHEN
+        first, second, changed = (
+            client.update_worker_schedule(farmId="farm-1", fleetId="fleet-1", workerId="w")[
+                "assignedSessions"
+            ]["session-1"]["sessionActions"]
+            for _ in range(3)
+        )
+
+        # THEN
+        # The actions are shared with the previous response rather than mapped or copied again
+        assert second is first
+        assert [action["sessionActionId"] for action in changed] == ["action-2", "action-3"]
+
+    def test_remaps_actions_whose_payload_changed(self) -> None:
+        # GIVEN
+        changed = _response("action-1")
+        changed["assignedSessions"]["session-1"]["sessionActions"][0]["definition"] = {
+            "taskRun": {"stepId": "step-2", "taskId": "action-1"}
+        }
+        real_client = MagicMock()
+        real_client.update_worker_schedule.side_effect = [_response("action-1"), changed]
+        client = DeadlineClient(real_client)
+        client.update_worker_schedule(farmId="farm-1", fleetId="fleet-1", workerId="w")
+
+        # WHEN
+        response = client.update_worker_schedule(farmId="farm-1", fleetId="fleet-1", workerId="w")
+
+        # THEN
+        assert response["assignedSessions"]["session-1"]["sessionActions"] == [
+            {
+                "sessionActionId": "action-1",
+                "actionType": "TASK_RUN",
+                "stepId": "step-2",
+                "taskId": "action-1",
+            }
+        ]
+
+    def test_forgets_sessions_that_are_no_longer_assigned(self) -> None:
+        # GIVEN
+        real_client = MagicMock()
+        real_client.update_worker_schedule.side_effect = [
+            _response("action-1"),
+            _response("action-1", session_id="session-2"),
+        ]
+        client = DeadlineClient(real_client)
+
+        # WHEN
+        for _ in range(2):
+            client.update_worker_schedule(farmId="farm-1", fleetId="fleet-1", workerId="w")
+
+        # THEN
+        assert list(client._mapped_session_actions) == ["session-2"]
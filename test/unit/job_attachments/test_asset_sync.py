@@ -0,0 +1,1401 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the AssetSync that syncs inputs through the Job Attachments content cache"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from threading import Event
+from typing import Callable, Generator
+from unittest.mock import ANY, MagicMock, patch
+import inspect
+import os
+import sys
+
+import pytest
+from deadline.job_attachments.asset_manifests import BaseAssetManifest
+from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+from deadline.job_attachments.asset_sync import AssetSync
+import deadline.job_attachments.asset_sync as library_asset_sync_mod
+from deadline.job_attachments.exceptions import (
+    AssetSyncCancelledError,
+    AssetSyncError,
+    JobAttachmentsS3ClientError,
+    VFSExecutableMissingError,
+)
+from deadline.job_attachments.models import (
+    Attachments,
+    JobAttachmentS3Settings,
+    JobAttachmentsFileSystem,
+    ManifestProperties,
+    PathFormat,
+)
+from deadline.job_attachments.os_file_permission import PosixFileSystemPermissionSettings
+from deadline.job_attachments.progress_tracker import (
+    ProgressReportMetadata,
+    ProgressStatus,
+    SummaryStatistics,
+)
+
+from deadline_worker_agent.job_attachments import asset_sync as asset_sync_mod
+from deadline_worker_agent.job_attachments import content_cache as content_cache_mod
+from deadline_worker_agent.job_attachments import (
+    CachingAssetSync,
+    JobAttachmentsContentCache,
+    JobAttachmentsManifestCache,
+    JobAttachmentsTransferGovernor,
+)
+
+FILES = {
+    "a.txt": b"aaa",
+    "dir/b.txt": b"bbbb",
+}
+
+
+@pytest.fixture
+def s3_settings() -> JobAttachmentS3Settings:
+    return JobAttachmentS3Settings(s3BucketName="bucket", rootPrefix="root")
+
+
+@pytest.fixture
+def content_cache(tmp_path: Path) -> JobAttachmentsContentCache:
+    return JobAttachmentsContentCache(root_dir=tmp_path / "cache", max_size_bytes=1000)
+
+
+@pytest.fixture
+def asset_sync(content_cache: JobAttachmentsContentCache) -> CachingAssetSync:
+    return CachingAssetSync(
+        farm_id="farm-1",
+        boto3_session=MagicMock(),
+        session_id="session-1",
+        content_cache=content_cache,
+    )
+
+
+@pytest.fixture
+def manifest() -> AssetManifest:
+    return AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPath(path=path, hash=f"hash{i}", size=len(content), mtime=1_000_000_000_000)
+            for i, (path, content) in enumerate(FILES.items())
+        ],
+        total_size=sum(len(content) for content in FILES.values()),
+    )
+
+
+@pytest.fixture
+def downloaded_manifests() -> list[dict[str, BaseAssetManifest]]:
+    return []
+
+
+@pytest.fixture(autouse=True)
+def mock_download(
+    downloaded_manifests: list[dict[str, BaseAssetManifest]],
+) -> Generator[MagicMock, None, None]:
+    """Replaces the S3 download with writing the expected file contents"""
+
+    def download(*, merged_manifests_by_root: dict[str, BaseAssetManifest], **kwargs):
+        downloaded_manifests.append(merged_manifests_by_root)
+        stats = SummaryStatistics()
+        for root, manifest in merged_manifests_by_root.items():
+            for manifest_path in manifest.paths:
+                destination = Path(root, manifest_path.path)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                destination.write_bytes(FILES[manifest_path.path])
+                stats.processed_files += 1
+                stats.processed_bytes += manifest_path.size  # type: ignore[attr-defined]
+        stats.total_files = stats.processed_files
+        stats.total_bytes = stats.processed_bytes
+        return stats
+
+    with patch.object(AssetSync, "copied_download", side_effect=download) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_hash_file() -> Generator[MagicMock, None, None]:
+    """Hashes the expected file contents to the hashes that the manifest records"""
+    hashes = {content: f"hash{i}" for i, content in enumerate(FILES.values())}
+
+    def hash_file(file_path: str, hash_alg: HashAlgorithm) -> str:
+        return hashes.get(Path(file_path).read_bytes(), "otherhash")
+
+    with (
+        patch.object(asset_sync_mod, "hash_file", side_effect=hash_file) as mock,
+        patch.object(content_cache_mod, "hash_file", new=mock),
+    ):
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_set_fs_group() -> Generator[MagicMock, None, None]:
+    with patch.object(asset_sync_mod, "_set_fs_group") as mock:
+        yield mock
+
+
+class TestCopiedDownload:
+    def test_first_session_downloads_and_populates_cache(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        content_cache: JobAttachmentsContentCache,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        root = str(tmp_path / "session1" / "assetroot")
+
+        # WHEN
+        stats = asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path / "session1",
+            merged_manifests_by_root={root: manifest},
+        )
+
+        # THEN
+        assert len(downloaded_manifests) == 1
+        assert [p.path for p in downloaded_manifests[0][root].paths] == list(FILES)
+        assert stats.processed_files == 2
+        assert stats.skipped_files == 0
+        assert content_cache.size_bytes == 7
+
+    def test_modified_download_is_not_cached(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        content_cache: JobAttachmentsContentCache,
+        mock_download: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        root = str(tmp_path / "session1" / "assetroot")
+        download = mock_download.side_effect
+
+        def download_and_modify(**kwargs) -> SummaryStatistics:
+            stats = download(**kwargs)
+            # The job changes a downloaded file before it is added to the cache
+            Path(root, "a.txt").write_bytes(b"xxx")
+            return stats
+
+        mock_download.side_effect = download_and_modify
+
+        # WHEN
+        asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path / "session1",
+            merged_manifests_by_root={root: manifest},
+        )
+
+        # THEN
+        assert content_cache.size_bytes == len(FILES["dir/b.txt"])
+        assert not content_cache.contains(
+            namespace=JobAttachmentsContentCache.namespace_for(
+                s3_bucket="bucket", cas_prefix=s3_settings.full_cas_prefix()
+            ),
+            hash="hash0",
+            hash_alg="xxh128",
+            size=len(FILES["a.txt"]),
+        )
+
+    def test_second_session_materializes_from_cache(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        mock_set_fs_group: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path / "session1",
+            merged_manifests_by_root={str(tmp_path / "session1" / "assetroot"): manifest},
+        )
+        downloaded_manifests.clear()
+        root = str(tmp_path / "session2" / "assetroot")
+        fs_permission_settings = MagicMock()
+
+        # WHEN
+        stats = asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path / "session2",
+            fs_permission_settings=fs_permission_settings,
+            merged_manifests_by_root={root: manifest},
+        )
+
+        # THEN
+        assert downloaded_manifests == []
+        for path, content in FILES.items():
+            assert Path(root, path).read_bytes() == content
+            assert os.stat(Path(root, path)).st_mtime == 1_000_000
+        assert stats.total_files == 2
+        assert stats.skipped_files == 2
+        assert stats.skipped_bytes == 7
+        mock_set_fs_group.assert_called_once_with(
+            file_paths=[str(Path(root, path)) for path in FILES],
+            local_root=root,
+            fs_permission_settings=fs_permission_settings,
+        )
+
+    def test_partial_hit_downloads_only_missing_files(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        content_cache: JobAttachmentsContentCache,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        source = tmp_path / "source"
+        source.write_bytes(FILES["a.txt"])
+        content_cache.put(
+            namespace=JobAttachmentsContentCache.namespace_for(
+                s3_bucket=s3_settings.s3BucketName, cas_prefix=s3_settings.full_cas_prefix()
+            ),
+            hash="hash0",
+            hash_alg="xxh128",
+            source=source,
+        )
+        root = str(tmp_path / "session" / "assetroot")
+
+        # WHEN
+        stats = asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path / "session",
+            merged_manifests_by_root={root: manifest},
+        )
+
+        # THEN
+        assert len(downloaded_manifests) == 1
+        downloaded = downloaded_manifests[0][root]
+        assert [p.path for p in downloaded.paths] == ["dir/b.txt"]
+        assert downloaded.totalSize == 4  # type: ignore[attr-defined]
+        assert manifest.totalSize == 7
+        assert stats.total_files == 2
+        assert stats.processed_files == 1
+        assert stats.skipped_files == 1
+
+    def test_existing_files_are_left_to_downloader(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        content_cache: JobAttachmentsContentCache,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        root = tmp_path / "session" / "assetroot"
+        (root / "dir").mkdir(parents=True)
+        (root / "dir" / "b.txt").write_bytes(b"from an earlier sync")
+
+        # WHEN
+        asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path / "session",
+            merged_manifests_by_root={str(root): manifest},
+        )
+
+        # THEN
+        assert [p.path for p in downloaded_manifests[0][str(root)].paths] == list(FILES)
+        # Only the file that did not exist before the download is trusted for the cache
+        assert content_cache.size_bytes == 3
+
+
+class TestCopiedDownloadWithoutContentCache:
+    def test_downloads_everything(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        mock_download: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        asset_sync = CachingAssetSync(farm_id="farm-1", boto3_session=MagicMock())
+        merged_manifests_by_root: dict[str, BaseAssetManifest] = {str(tmp_path): manifest}
+
+        # WHEN
+        asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path,
+            merged_manifests_by_root=merged_manifests_by_root,
+        )
+
+        # THEN
+        mock_download.assert_called_once_with(
+            s3_settings=s3_settings,
+            session_dir=tmp_path,
+            fs_permission_settings=None,
+            merged_manifests_by_root=merged_manifests_by_root,
+            on_downloading_files=None,
+        )
+
+
+class TestSyncInputs:
+    @pytest.fixture
+    def manifest_cache(self) -> JobAttachmentsManifestCache:
+        return JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+
+    @pytest.fixture
+    def asset_sync(
+        self,
+        content_cache: JobAttachmentsContentCache,
+        manifest_cache: JobAttachmentsManifestCache,
+    ) -> CachingAssetSync:
+        return CachingAssetSync(
+            farm_id="farm-1",
+            boto3_session=MagicMock(),
+            session_id="session-1",
+            content_cache=content_cache,
+            manifest_cache=manifest_cache,
+        )
+
+    @pytest.fixture(autouse=True)
+    def mock_get_manifest_from_s3(
+        self, manifest: AssetManifest
+    ) -> Generator[MagicMock, None, None]:
+        with patch.object(asset_sync_mod, "get_manifest_from_s3", return_value=manifest) as mock:
+            yield mock
+
+    @pytest.fixture(autouse=True)
+    def mock_ensure_disk_capacity(self) -> Generator[MagicMock, None, None]:
+        with patch.object(AssetSync, "_ensure_disk_capacity") as mock:
+            yield mock
+
+    def _attachments(self, **kwargs) -> Attachments:
+        manifest_properties = {
+            "rootPath": "/mnt/projects/shot1",
+            "rootPathFormat": PathFormat.POSIX,
+            "inputManifestPath": "farm-1/queue-1/Inputs/abc/manifest_input",
+            "inputManifestHash": "manifesthash",
+            **kwargs,
+        }
+        return Attachments(
+            manifests=[ManifestProperties(**manifest_properties)],  # type: ignore[arg-type]
+            fileSystem=JobAttachmentsFileSystem.COPIED.value,
+        )
+
+    def test_downloads_into_session_dir(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        mock_get_manifest_from_s3: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # WHEN
+        stats, path_mapping_rules = asset_sync.sync_inputs(
+            s3_settings=s3_settings,
+            attachments=self._attachments(),
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=tmp_path,
+        )
+
+        # THEN
+        mock_get_manifest_from_s3.assert_called_once_with(
+            manifest_key="root/Manifests/farm-1/queue-1/Inputs/abc/manifest_input",
+            s3_bucket="bucket",
+            session=asset_sync.session,
+        )
+        assert len(path_mapping_rules) == 1
+        local_root = path_mapping_rules[0]["destination_path"]
+        assert path_mapping_rules == [
+            {
+                "source_path_format": "posix",
+                "source_path": "/mnt/projects/shot1",
+                "destination_path": local_root,
+            }
+        ]
+        assert Path(local_root).parent == tmp_path
+        assert list(downloaded_manifests[0]) == [local_root]
+        assert stats.processed_files == 2
+
+    def test_reuses_cached_manifest(
+        self,
+        asset_sync: CachingAssetSync,
+        manifest_cache: JobAttachmentsManifestCache,
+        content_cache: JobAttachmentsContentCache,
+        s3_settings: JobAttachmentS3Settings,
+        mock_get_manifest_from_s3: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        other_session = CachingAssetSync(
+            farm_id="farm-1",
+            boto3_session=MagicMock(),
+            session_id="session-2",
+            content_cache=content_cache,
+            manifest_cache=manifest_cache,
+        )
+        asset_sync.sync_inputs(
+            s3_settings=s3_settings,
+            attachments=self._attachments(),
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=tmp_path / "session1",
+        )
+
+        # WHEN
+        stats, _ = other_session.sync_inputs(
+            s3_settings=s3_settings,
+            attachments=self._attachments(),
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=tmp_path / "session2",
+        )
+
+        # THEN
+        mock_get_manifest_from_s3.assert_called_once()
+        assert stats.skipped_files == 2
+
+    def test_manifest_without_hash_is_not_cached(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        mock_get_manifest_from_s3: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # WHEN
+        for session in ("session1", "session2"):
+            asset_sync.sync_inputs(
+                s3_settings=s3_settings,
+                attachments=self._attachments(inputManifestHash=None),
+                queue_id="queue-1",
+                job_id="job-1",
+                session_dir=tmp_path / session,
+            )
+
+        # THEN
+        assert mock_get_manifest_from_s3.call_count == 2
+
+    def test_storage_profile_path_mapping(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # WHEN
+        _, path_mapping_rules = asset_sync.sync_inputs(
+            s3_settings=s3_settings,
+            attachments=self._attachments(fileSystemLocationName="Projects"),
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=tmp_path,
+            storage_profiles_path_mapping_rules={"/mnt/projects/shot1": str(tmp_path / "shot1")},
+        )
+
+        # THEN
+        assert path_mapping_rules == []
+        assert list(downloaded_manifests[0]) == [str(tmp_path / "shot1")]
+
+    def test_storage_profile_without_mapping_rules_uses_session_dir(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # WHEN
+        _, path_mapping_rules = asset_sync.sync_inputs(
+            s3_settings=s3_settings,
+            attachments=self._attachments(fileSystemLocationName="Projects"),
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=tmp_path,
+        )
+
+        # THEN
+        assert len(path_mapping_rules) == 1
+        assert list(downloaded_manifests[0]) == [path_mapping_rules[0]["destination_path"]]
+
+    def test_missing_storage_profile_mapping_rule(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        tmp_path: Path,
+    ) -> None:
+        with pytest.raises(AssetSyncError):
+            asset_sync.sync_inputs(
+                s3_settings=s3_settings,
+                attachments=self._attachments(fileSystemLocationName="Projects"),
+                queue_id="queue-1",
+                job_id="job-1",
+                session_dir=tmp_path,
+                storage_profiles_path_mapping_rules={"/other": "/local/other"},
+            )
+
+    def test_step_dependencies(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        with patch.object(
+            library_asset_sync_mod,
+            "get_output_manifests_by_asset_root",
+            return_value={"/mnt/projects/shot1": [manifest]},
+        ) as mock_get_output_manifests:
+            # WHEN
+            asset_sync.sync_inputs(
+                s3_settings=s3_settings,
+                attachments=Attachments(manifests=[]),
+                queue_id="queue-1",
+                job_id="job-1",
+                session_dir=tmp_path,
+                step_dependencies=["step-1"],
+            )
+
+        # THEN
+        mock_get_output_manifests.assert_called_once_with(
+            s3_settings,
+            "farm-1",
+            "queue-1",
+            "job-1",
+            step_id="step-1",
+            session=asset_sync.session,
+        )
+        (local_root,) = downloaded_manifests[0]
+        assert Path(local_root).parent == tmp_path
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Virtual file-system is POSIX-only")
+    def test_virtual_falls_back_to_copied(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        attachments = self._attachments()
+        attachments.fileSystem = JobAttachmentsFileSystem.VIRTUAL.value
+        fs_permission_settings = PosixFileSystemPermissionSettings(
+            os_user="job-user", os_group="job-group", dir_mode=0o20, file_mode=0o20
+        )
+
+        with (
+            patch.object(
+                asset_sync_mod.VFSProcessManager,
+                "find_vfs",
+                side_effect=VFSExecutableMissingError(),
+            ),
+            patch.object(library_asset_sync_mod, "mount_vfs_from_manifests") as mock_mount_vfs,
+        ):
+            # WHEN
+            asset_sync.sync_inputs(
+                s3_settings=s3_settings,
+                attachments=attachments,
+                queue_id="queue-1",
+                job_id="job-1",
+                session_dir=tmp_path,
+                fs_permission_settings=fs_permission_settings,
+                os_env_vars={"AWS_PROFILE": "queue-profile"},
+            )
+
+        # THEN
+        mock_mount_vfs.assert_not_called()
+        assert len(downloaded_manifests) == 1
+
+    @pytest.mark.parametrize(
+        argnames=("s3_settings", "attachments"),
+        argvalues=(
+            pytest.param(None, Attachments(manifests=[]), id="no-settings"),
+            pytest.param(
+                JobAttachmentS3Settings(s3BucketName="bucket", rootPrefix="root"),
+                None,
+                id="no-attachments",
+            ),
+        ),
+    )
+    def test_nothing_to_sync(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings | None,
+        attachments: Attachments | None,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # WHEN
+        result = asset_sync.sync_inputs(
+            s3_settings=s3_settings,
+            attachments=attachments,
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=tmp_path,
+        )
+
+        # THEN
+        assert result == (SummaryStatistics(), [])
+        assert downloaded_manifests == []
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="The output change journal is Linux-only")
+class TestSyncOutputsWithOutputJournal:
+    @pytest.fixture
+    def session_dir(self, tmp_path: Path) -> Path:
+        session_dir = tmp_path / "session"
+        session_dir.mkdir()
+        return session_dir
+
+    @pytest.fixture
+    def asset_sync(self) -> Generator[CachingAssetSync, None, None]:
+        asset_sync = CachingAssetSync(
+            farm_id="farm-1",
+            boto3_session=MagicMock(),
+            session_id="session-1",
+            output_journal=True,
+        )
+        asset_sync.s3_uploader = MagicMock()
+        asset_sync.s3_uploader.file_already_uploaded.return_value = False
+        yield asset_sync
+        asset_sync.cleanup_session(session_dir=Path(), file_system=JobAttachmentsFileSystem.COPIED)
+
+    @pytest.fixture(autouse=True)
+    def mock_upload_output_manifest(self) -> Generator[MagicMock, None, None]:
+        with patch.object(AssetSync, "_upload_output_manifest_to_s3") as mock:
+            yield mock
+
+    @pytest.fixture(autouse=True)
+    def mock_upload_output_files(self) -> Generator[MagicMock, None, None]:
+        with patch.object(
+            AssetSync, "_upload_output_files_to_s3", return_value=SummaryStatistics()
+        ) as mock:
+            yield mock
+
+    @pytest.fixture
+    def attachments(self) -> Attachments:
+        return Attachments(
+            manifests=[
+                ManifestProperties(
+                    rootPath="/mnt/projects/shot1",
+                    rootPathFormat=PathFormat.POSIX,
+                    outputRelativeDirectories=["renders"],
+                )
+            ],
+            fileSystem=JobAttachmentsFileSystem.COPIED.value,
+        )
+
+    def _sync_outputs(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        session_dir: Path,
+    ) -> None:
+        asset_sync.sync_outputs(
+            s3_settings=s3_settings,
+            attachments=attachments,
+            queue_id="queue-1",
+            job_id="job-1",
+            step_id="step-1",
+            task_id="task-1",
+            session_action_id="sessionaction-1",
+            start_time=0,
+            session_dir=session_dir,
+        )
+
+    @staticmethod
+    def _uploaded_paths(mock_upload_output_files: MagicMock) -> list[str]:
+        output_files = mock_upload_output_files.call_args.args[1]
+        return sorted(output_file.rel_path for output_file in output_files)
+
+    def test_uploads_only_journaled_files(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        session_dir: Path,
+        mock_upload_output_files: MagicMock,
+    ) -> None:
+        # GIVEN
+        output_root = session_dir / asset_sync_mod._get_unique_dest_dir_name("/mnt/projects/shot1")
+        output_root = output_root / "renders"
+        output_root.mkdir(parents=True)
+        (output_root / "frame1.exr").write_bytes(b"1")
+        self._sync_outputs(asset_sync, s3_settings, attachments, session_dir)
+        assert self._uploaded_paths(mock_upload_output_files) == ["renders/frame1.exr"]
+        (output_root / "frame2.exr").write_bytes(b"2")
+
+        # WHEN
+        with patch.object(Path, "glob") as mock_glob:
+            self._sync_outputs(asset_sync, s3_settings, attachments, session_dir)
+
+        # THEN
+        mock_glob.assert_not_called()
+        assert self._uploaded_paths(mock_upload_output_files) == ["renders/frame2.exr"]
+
+    def test_walks_when_journal_is_incomplete(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        session_dir: Path,
+        mock_upload_output_files: MagicMock,
+    ) -> None:
+        # GIVEN
+        output_root = session_dir / asset_sync_mod._get_unique_dest_dir_name("/mnt/projects/shot1")
+        output_root = output_root / "renders"
+        output_root.mkdir(parents=True)
+        self._sync_outputs(asset_sync, s3_settings, attachments, session_dir)
+        (output_root / "frame1.exr").write_bytes(b"1")
+        assert asset_sync._output_journal is not None
+        asset_sync._output_journal._invalid = True
+
+        # WHEN
+        with patch.object(
+            AssetSync,
+            "_get_output_files",
+            autospec=True,
+            side_effect=AssetSync._get_output_files,
+        ) as mock_get_output_files:
+            self._sync_outputs(asset_sync, s3_settings, attachments, session_dir)
+
+        # THEN
+        mock_get_output_files.assert_called_once()
+        assert mock_get_output_files.call_args.args[1].outputRelativeDirectories == ["renders"]
+        assert self._uploaded_paths(mock_upload_output_files) == ["renders/frame1.exr"]
+
+    def test_journal_unavailable(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        session_dir: Path,
+        mock_upload_output_files: MagicMock,
+    ) -> None:
+        # GIVEN
+        output_root = session_dir / asset_sync_mod._get_unique_dest_dir_name("/mnt/projects/shot1")
+        output_root = output_root / "renders"
+        output_root.mkdir(parents=True)
+        (output_root / "frame1.exr").write_bytes(b"1")
+
+        # WHEN
+        with patch.object(
+            asset_sync_mod, "OutputChangeJournal", side_effect=OSError("Too many open files")
+        ):
+            self._sync_outputs(asset_sync, s3_settings, attachments, session_dir)
+
+        # THEN
+        assert asset_sync._output_journal is None
+        assert self._uploaded_paths(mock_upload_output_files) == ["renders/frame1.exr"]
+
+
+class TestGovernedTransfers:
+    @pytest.fixture
+    def governor(self) -> JobAttachmentsTransferGovernor:
+        return JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=2,
+            max_lease_concurrency=2,
+            max_total_concurrency=2,
+            link_speed_bytes_per_second=None,
+        )
+
+    @pytest.fixture
+    def asset_sync(self, governor: JobAttachmentsTransferGovernor) -> CachingAssetSync:
+        return CachingAssetSync(
+            farm_id="farm-1", boto3_session=MagicMock(), transfer_governor=governor
+        )
+
+    def test_downloads_batches_with_governed_concurrency(
+        self,
+        asset_sync: CachingAssetSync,
+        governor: JobAttachmentsTransferGovernor,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        mock_download: MagicMock,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        download = mock_download.side_effect
+        active_streams: list[int] = []
+
+        def download_batch(**kwargs) -> SummaryStatistics:
+            active_streams.append(governor._leases[0]._active)
+            return download(**kwargs)
+
+        mock_download.side_effect = download_batch
+
+        # WHEN
+        stats = asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=tmp_path,
+            merged_manifests_by_root={str(tmp_path): manifest},
+        )
+
+        # THEN
+        # Each file is a batch of its own, downloaded by a call to the library in a lease slot
+        assert sorted(
+            manifest_path.path
+            for batch in downloaded_manifests
+            for manifest_path in batch[str(tmp_path)].paths
+        ) == sorted(FILES)
+        assert len(downloaded_manifests) == 2
+        assert all(0 < active <= 2 for active in active_streams)
+        assert stats.processed_files == 2
+        assert stats.processed_bytes == sum(len(content) for content in FILES.values())
+        assert (tmp_path / "dir" / "b.txt").read_bytes() == b"bbbb"
+        assert governor._leases == []
+
+    def test_combines_batch_progress(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        mock_download: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=1,
+            max_lease_concurrency=1,
+            link_speed_bytes_per_second=None,
+        )
+        asset_sync = CachingAssetSync(
+            farm_id="farm-1", boto3_session=MagicMock(), transfer_governor=governor
+        )
+        download = mock_download.side_effect
+        rates = iter([1000.0, 500.0])
+
+        def download_batch(*, on_downloading_files, **kwargs) -> SummaryStatistics:
+            on_downloading_files(
+                ProgressReportMetadata(
+                    status=ProgressStatus.DOWNLOAD_IN_PROGRESS,
+                    progress=100.0,
+                    transferRate=next(rates),
+                    progressMessage="",
+                )
+            )
+            return download(**kwargs)
+
+        mock_download.side_effect = download_batch
+        on_downloading_files = MagicMock(return_value=True)
+
+        with patch.object(governor, "_record_transfer_rate") as mock_record:
+            # WHEN
+            asset_sync.copied_download(
+                s3_settings=s3_settings,
+                session_dir=tmp_path,
+                merged_manifests_by_root={str(tmp_path): manifest},
+                on_downloading_files=on_downloading_files,
+            )
+
+        # THEN
+        # The larger file is downloaded first, and a batch's rate stops counting once it is done
+        assert [c.args[0].progress for c in on_downloading_files.call_args_list] == [57.1, 100.0]
+        assert [c.args[0].transferRate for c in on_downloading_files.call_args_list] == [
+            1000.0,
+            500.0,
+        ]
+        assert on_downloading_files.call_args.args[0].progressMessage == (
+            "Downloaded 7.0 B / 7.0 B of 2 files (Transfer rate: 500.0 B/s)"
+        )
+        assert [c.args[1] for c in mock_record.call_args_list] == [1000.0, 500.0]
+
+    def test_cancel_stops_other_batches(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        mock_download: MagicMock,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=1,
+            max_lease_concurrency=1,
+            link_speed_bytes_per_second=None,
+        )
+        asset_sync = CachingAssetSync(
+            farm_id="farm-1", boto3_session=MagicMock(), transfer_governor=governor
+        )
+        download = mock_download.side_effect
+
+        def download_batch(*, on_downloading_files, **kwargs) -> SummaryStatistics:
+            stats = download(**kwargs)
+            progress = ProgressReportMetadata(
+                status=ProgressStatus.DOWNLOAD_IN_PROGRESS,
+                progress=50.0,
+                transferRate=1000.0,
+                progressMessage="",
+            )
+            if not on_downloading_files(progress):
+                raise AssetSyncCancelledError("cancelled", stats)
+            return stats
+
+        mock_download.side_effect = download_batch
+
+        # THEN
+        with pytest.raises(AssetSyncCancelledError):
+            # WHEN
+            asset_sync.copied_download(
+                s3_settings=s3_settings,
+                session_dir=tmp_path,
+                merged_manifests_by_root={str(tmp_path): manifest},
+                on_downloading_files=MagicMock(return_value=False),
+            )
+
+        # THEN
+        assert len(downloaded_manifests) == 1
+        assert governor._leases == []
+
+    def test_download_error_is_raised(
+        self,
+        asset_sync: CachingAssetSync,
+        governor: JobAttachmentsTransferGovernor,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        mock_download: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        error = JobAttachmentsS3ClientError(
+            action="downloading file", status_code=404, bucket_name="bucket", key_or_prefix="key"
+        )
+        mock_download.side_effect = error
+
+        # THEN
+        with pytest.raises(JobAttachmentsS3ClientError) as raise_ctx:
+            # WHEN
+            asset_sync.copied_download(
+                s3_settings=s3_settings,
+                session_dir=tmp_path,
+                merged_manifests_by_root={str(tmp_path): manifest},
+            )
+
+        # THEN
+        assert raise_ctx.value is error
+        assert governor._leases == []
+
+    def test_splits_manifest_into_balanced_batches(self) -> None:
+        # GIVEN
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=[
+                ManifestPath(path=f"{size}.txt", hash=f"hash{size}", size=size, mtime=0)
+                for size in (1, 5, 2, 4, 3)
+            ],
+            total_size=15,
+        )
+
+        # WHEN
+        batches = asset_sync_mod._split_manifests({"/root": manifest}, 2)
+
+        # THEN
+        assert [
+            [manifest_path.path for manifest_path in batch["/root"].paths] for batch in batches
+        ] == [["5.txt", "2.txt", "1.txt"], ["4.txt", "3.txt"]]
+        assert [batch["/root"].totalSize for batch in batches] == [8, 7]  # type: ignore[attr-defined]
+        assert len(manifest.paths) == 5
+
+    def test_uploads_with_governed_concurrency(
+        self,
+        asset_sync: CachingAssetSync,
+        governor: JobAttachmentsTransferGovernor,
+        s3_settings: JobAttachmentS3Settings,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        active_streams: list[int] = []
+        progress = ProgressReportMetadata(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            progress=50.0,
+            transferRate=1000.0,
+            progressMessage="",
+        )
+
+        def sync_outputs(*, on_uploading_files, **kwargs) -> SummaryStatistics:
+            # The other session's lease was taken first
+            active_streams.append(governor._leases[1]._active)
+            on_uploading_files(progress)
+            return SummaryStatistics()
+
+        on_uploading_files = MagicMock(return_value=True)
+
+        with (
+            patch.object(AssetSync, "sync_outputs", side_effect=sync_outputs),
+            patch.object(governor, "_record_transfer_rate") as mock_record,
+            governor.transfer(),
+        ):
+            # WHEN
+            asset_sync.sync_outputs(
+                s3_settings=s3_settings,
+                attachments=None,
+                queue_id="queue-1",
+                job_id="job-1",
+                step_id="step-1",
+                task_id="task-1",
+                session_action_id="sessionaction-1",
+                start_time=0,
+                session_dir=tmp_path,
+                on_uploading_files=on_uploading_files,
+            )
+
+        # THEN
+        # The library uploads with a single call, which takes one of the lease's streams
+        assert active_streams == [1]
+        mock_record.assert_called_once_with(ANY, 1000.0)
+        on_uploading_files.assert_called_once_with(progress)
+
+
+class TestPrefetchInputs:
+    @pytest.fixture(autouse=True)
+    def mock_get_manifest_from_s3(
+        self, manifest: AssetManifest
+    ) -> Generator[MagicMock, None, None]:
+        with patch.object(asset_sync_mod, "get_manifest_from_s3", return_value=manifest) as mock:
+            yield mock
+
+    @pytest.fixture
+    def cancel(self) -> Event:
+        return Event()
+
+    @pytest.fixture
+    def s3_client(self) -> MagicMock:
+        """An S3 client that downloads the expected file contents by their hash"""
+        contents = {f"hash{i}.xxh128": content for i, content in enumerate(FILES.values())}
+
+        def download_file(Bucket: str, Key: str, Filename: str, Config, Callback) -> None:
+            content = contents[Key.rsplit("/", 1)[-1]]
+            Callback(len(content))
+            Path(Filename).write_bytes(content)
+
+        return MagicMock(**{"download_file.side_effect": download_file})
+
+    @pytest.fixture(autouse=True)
+    def mock_get_s3_client(self, s3_client: MagicMock) -> Generator[MagicMock, None, None]:
+        with patch.object(asset_sync_mod, "get_s3_client", return_value=s3_client) as mock:
+            yield mock
+
+    @pytest.fixture
+    def attachments(self) -> Attachments:
+        return Attachments(
+            manifests=[
+                ManifestProperties(
+                    rootPath="/mnt/projects/shot1",
+                    rootPathFormat=PathFormat.POSIX,
+                    inputManifestPath="farm-1/queue-1/Inputs/abc/manifest_input",
+                    inputManifestHash="manifesthash",
+                )
+            ],
+            fileSystem=JobAttachmentsFileSystem.COPIED.value,
+        )
+
+    def _prefetch(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        session_dir: Path,
+        cancel: Event,
+    ) -> int:
+        return asset_sync.prefetch_inputs(
+            s3_settings=s3_settings,
+            attachments=attachments,
+            queue_id="queue-1",
+            job_id="job-1",
+            session_dir=session_dir,
+            cancel=cancel,
+        )
+
+    def test_sync_moves_prefetched_files_into_place(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        manifest: AssetManifest,
+        content_cache: JobAttachmentsContentCache,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        s3_client: MagicMock,
+        cancel: Event,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        session_dir = tmp_path / "session1"
+        session_dir.mkdir()
+
+        # WHEN
+        prefetched = self._prefetch(asset_sync, s3_settings, attachments, session_dir, cancel)
+
+        # THEN
+        assert prefetched == len(FILES)
+        assert s3_client.download_file.call_count == len(FILES)
+        s3_client.download_file.assert_any_call(
+            "bucket",
+            "root/Data/hash0.xxh128",
+            ANY,
+            Config=ANY,
+            Callback=ANY,
+        )
+        staging_dir = session_dir / asset_sync_mod._PREFETCH_DIR_NAME
+        assert sorted(p.name for p in staging_dir.iterdir()) == ["hash0.xxh128", "hash1.xxh128"]
+
+        # WHEN
+        root = str(session_dir / "assetroot")
+        stats = asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=session_dir,
+            merged_manifests_by_root={root: manifest},
+        )
+
+        # THEN
+        assert downloaded_manifests == []
+        for path, content in FILES.items():
+            assert Path(root, path).read_bytes() == content
+            assert Path(root, path).stat().st_mtime == 1_000_000
+        assert not staging_dir.exists()
+        assert stats.skipped_files == len(FILES)
+        assert content_cache.size_bytes == sum(len(content) for content in FILES.values())
+
+    def test_skips_existing_and_cached_files(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        content_cache: JobAttachmentsContentCache,
+        s3_client: MagicMock,
+        cancel: Event,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        session_dir = tmp_path / "session1"
+        session_dir.mkdir()
+        source = tmp_path / "a.txt"
+        source.write_bytes(FILES["a.txt"])
+        content_cache.put(
+            namespace=JobAttachmentsContentCache.namespace_for(
+                s3_bucket="bucket", cas_prefix=s3_settings.full_cas_prefix()
+            ),
+            hash="hash0",
+            hash_alg="xxh128",
+            source=source,
+        )
+        local_root = session_dir / asset_sync_mod._get_unique_dest_dir_name("/mnt/projects/shot1")
+        Path(local_root, "dir").mkdir(parents=True)
+        Path(local_root, "dir", "b.txt").write_bytes(FILES["dir/b.txt"])
+
+        # WHEN
+        prefetched = self._prefetch(asset_sync, s3_settings, attachments, session_dir, cancel)
+
+        # THEN
+        assert prefetched == 0
+        s3_client.download_file.assert_not_called()
+
+    def test_cancel(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        s3_client: MagicMock,
+        cancel: Event,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        session_dir = tmp_path / "session1"
+        session_dir.mkdir()
+        download_file = s3_client.download_file.side_effect
+
+        def cancel_during_download(*args, **kwargs) -> None:
+            cancel.set()
+            download_file(*args, **kwargs)
+
+        s3_client.download_file.side_effect = cancel_during_download
+
+        # WHEN
+        prefetched = self._prefetch(asset_sync, s3_settings, attachments, session_dir, cancel)
+
+        # THEN
+        assert prefetched == 0
+        s3_client.download_file.assert_called_once()
+        assert list((session_dir / asset_sync_mod._PREFETCH_DIR_NAME).iterdir()) == []
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Virtual file-system is not on Windows")
+    def test_virtual_file_system_is_not_prefetched(
+        self,
+        asset_sync: CachingAssetSync,
+        s3_settings: JobAttachmentS3Settings,
+        attachments: Attachments,
+        s3_client: MagicMock,
+        cancel: Event,
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        attachments.fileSystem = JobAttachmentsFileSystem.VIRTUAL.value
+
+        # WHEN
+        prefetched = self._prefetch(asset_sync, s3_settings, attachments, tmp_path, cancel)
+
+        # THEN
+        assert prefetched == 0
+        s3_client.download_file.assert_not_called()
+
+    @pytest.mark.parametrize(
+        argnames="staged_content",
+        argvalues=(
+            pytest.param(b"b", id="size-differs"),
+            pytest.param(b"xxxx", id="content-differs"),
+        ),
+    )
+    def test_downloads_files_that_were_not_prefetched(
+        self,
+        staged_content: bytes,
+        s3_settings: JobAttachmentS3Settings,
+        manifest: AssetManifest,
+        downloaded_manifests: list[dict[str, BaseAssetManifest]],
+        tmp_path: Path,
+    ) -> None:
+        # GIVEN
+        asset_sync = CachingAssetSync(farm_id="farm-1", boto3_session=MagicMock())
+        session_dir = tmp_path / "session1"
+        staging_dir = session_dir / asset_sync_mod._PREFETCH_DIR_NAME
+        staging_dir.mkdir(parents=True)
+        (staging_dir / "hash0.xxh128").write_bytes(FILES["a.txt"])
+        # A staged file that does not have the size or hash that the manifest records is not used
+        (staging_dir / "hash1.xxh128").write_bytes(staged_content)
+        root = str(session_dir / "assetroot")
+
+        # WHEN
+        stats = asset_sync.copied_download(
+            s3_settings=s3_settings,
+            session_dir=session_dir,
+            merged_manifests_by_root={root: manifest},
+        )
+
+        # THEN
+        assert len(downloaded_manifests) == 1
+        assert [p.path for p in downloaded_manifests[0][root].paths] == ["dir/b.txt"]
+        for path, content in FILES.items():
+            assert Path(root, path).read_bytes() == content
+        assert not staging_dir.exists()
+        assert stats.skipped_files == 1
+        assert stats.processed_files == 1
+
+
+class TestLibraryInterface:
+    """CachingAssetSync overrides methods of the library's AssetSync and calls some of its private
+    helpers. These tests fail when a release of the library changes any of them, so that the
+    subclass is updated along with the library version that it is pinned to."""
+
+    @pytest.mark.parametrize(
+        ("name", "library_signature"),
+        [
+            # Collected before any of the library's methods are patched
+            pytest.param(name, inspect.signature(getattr(AssetSync, name)), id=name)
+            for name, value in vars(CachingAssetSync).items()
+            if inspect.isfunction(value) and name != "__init__" and hasattr(AssetSync, name)
+        ],
+    )
+    def test_overrides_match_library(self, name: str, library_signature: inspect.Signature) -> None:
+        assert inspect.signature(getattr(CachingAssetSync, name)) == library_signature
+
+    @pytest.mark.parametrize(
+        ("function", "expected_parameters"),
+        [
+            pytest.param(
+                AssetSync.__init__,
+                [
+                    "self",
+                    "farm_id",
+                    "boto3_session",
+                    "manifest_version",
+                    "deadline_endpoint_url",
+                    "session_id",
+                ],
+                id="AssetSync.__init__",
+            ),
+            pytest.param(
+                AssetSync._is_file_within_directory,
+                ["self", "file_path", "directory_path"],
+                id="AssetSync._is_file_within_directory",
+            ),
+            pytest.param(asset_sync_mod.get_s3_client, ["session"], id="get_s3_client"),
+            pytest.param(
+                asset_sync_mod._get_unique_dest_dir_name,
+                ["source_root"],
+                id="_get_unique_dest_dir_name",
+            ),
+            pytest.param(
+                asset_sync_mod._human_readable_file_size,
+                ["size_in_bytes"],
+                id="_human_readable_file_size",
+            ),
+            pytest.param(asset_sync_mod._join_s3_paths, ["root", "args"], id="_join_s3_paths"),
+            pytest.param(
+                asset_sync_mod._set_fs_group,
+                ["file_paths", "local_root", "fs_permission_settings"],
+                id="_set_fs_group",
+            ),
+        ],
+    )
+    def test_library_signatures(self, function: Callable, expected_parameters: list[str]) -> None:
+        assert list(inspect.signature(function).parameters) == expected_parameters
+
+    def test_journaled_output_files_match_walked_output_files(
+        self,
+        s3_settings: JobAttachmentS3Settings,
+        mock_hash_file: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        """Tests that the output files found from the output journal's changed files are the ones
+        that the library's AssetSync._get_output_files() finds by walking the output directory"""
+        # GIVEN
+        session_dir = tmp_path / "session"
+        local_root = session_dir / "assetroot"
+        output_root = local_root / "renders"
+        (output_root / "dir").mkdir(parents=True)
+        (output_root / "a.txt").write_bytes(FILES["a.txt"])
+        (output_root / "dir" / "b.txt").write_bytes(FILES["dir/b.txt"])
+        manifest_properties = ManifestProperties(
+            rootPath="/mnt/projects/shot1",
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=["renders"],
+        )
+        walking = CachingAssetSync(farm_id="farm-1", boto3_session=MagicMock())
+        journaled = CachingAssetSync(farm_id="farm-1", boto3_session=MagicMock())
+        for asset_sync in (walking, journaled):
+            asset_sync.s3_uploader = MagicMock()
+            asset_sync.s3_uploader.file_already_uploaded.return_value = False
+
+        def sync() -> tuple[list, list]:
+            with patch.object(library_asset_sync_mod, "hash_file", new=mock_hash_file):
+                walked = AssetSync._get_output_files(
+                    walking, manifest_properties, s3_settings, local_root, session_dir
+                )
+            found = journaled._get_journaled_output_files(
+                changed_files=[output_root / "a.txt", output_root / "dir" / "b.txt"],
+                output_root=output_root,
+                s3_settings=s3_settings,
+                local_root=local_root,
+                session_dir=session_dir,
+            )
+            return (
+                sorted(walked, key=lambda f: f.rel_path),
+                sorted(found, key=lambda f: f.rel_path),
+            )
+
+        # WHEN
+        first_walked, first_found = sync()
+        (output_root / "a.txt").write_bytes(b"changed")
+        os.utime(output_root / "a.txt", ns=(2**62, 2**62))
+        second_walked, second_found = sync()
+
+        # THEN
+        assert len(first_walked) == 2
+        assert first_found == first_walked
+        assert [f.rel_path for f in second_walked] == ["renders/a.txt"]
+        assert second_found == second_walked
+        # Walking also records the mtime of directories, which are never output files
+        assert journaled.synced_assets_mtime == {
+            path: mtime
+            for path, mtime in walking.synced_assets_mtime.items()
+            if Path(path).is_file()
+        }
@@ -0,0 +1,348 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the worker-wide Job Attachments content cache"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Generator
+from unittest.mock import MagicMock, patch
+import os
+
+import pytest
+
+from deadline_worker_agent.job_attachments import content_cache as content_cache_mod
+from deadline_worker_agent.job_attachments.content_cache import JobAttachmentsContentCache
+
+NAMESPACE = JobAttachmentsContentCache.namespace_for(s3_bucket="bucket", cas_prefix="root/Data")
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def cache(cache_dir: Path) -> JobAttachmentsContentCache:
+    return JobAttachmentsContentCache(root_dir=cache_dir, max_size_bytes=10)
+
+
+@pytest.fixture(autouse=True)
+def mock_hash_file() -> Generator[MagicMock, None, None]:
+    """Hashes each test file to its content, which the tests use as the file's hash"""
+    with patch.object(
+        content_cache_mod, "hash_file", side_effect=lambda path, alg: Path(path).read_text()
+    ) as mock:
+        yield mock
+
+
+def _write(path: Path, content: bytes) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+class TestMaterialize:
+    def test_miss(self, cache: JobAttachmentsContentCache, tmp_path: Path) -> None:
+        # WHEN
+        hit = cache.materialize(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            size=3,
+            destination=tmp_path / "session" / "a.txt",
+        )
+
+        # THEN
+        assert not hit
+        assert not (tmp_path / "session" / "a.txt").exists()
+
+    def test_hit(self, cache: JobAttachmentsContentCache, tmp_path: Path) -> None:
+        # GIVEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"abc"),
+        )
+        destination = tmp_path / "session" / "dir" / "a.txt"
+
+        # WHEN
+        hit = cache.materialize(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            size=3,
+            destination=destination,
+            mtime=1234.0,
+        )
+
+        # THEN
+        assert hit
+        assert destination.read_bytes() == b"abc"
+        assert os.stat(destination).st_mtime == 1234.0
+
+    def test_materialized_file_is_independent_copy(
+        self, cache: JobAttachmentsContentCache, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"abc"),
+        )
+        first = tmp_path / "first"
+        second = tmp_path / "second"
+        cache.materialize(
+            namespace=NAMESPACE, hash="abc", hash_alg="xxh128", size=3, destination=first
+        )
+
+        # WHEN
+        first.write_bytes(b"modified")
+
+        # THEN
+        assert cache.materialize(
+            namespace=NAMESPACE, hash="abc", hash_alg="xxh128", size=3, destination=second
+        )
+        assert second.read_bytes() == b"abc"
+
+    def test_namespaces_are_isolated(
+        self, cache: JobAttachmentsContentCache, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"abc"),
+        )
+        other_namespace = JobAttachmentsContentCache.namespace_for(
+            s3_bucket="other-bucket", cas_prefix="root/Data"
+        )
+
+        # THEN
+        assert not cache.materialize(
+            namespace=other_namespace,
+            hash="abc",
+            hash_alg="xxh128",
+            size=3,
+            destination=tmp_path / "a.txt",
+        )
+
+    def test_size_mismatch_is_miss(self, cache: JobAttachmentsContentCache, tmp_path: Path) -> None:
+        # GIVEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"abc"),
+        )
+
+        # THEN
+        assert not cache.materialize(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            size=4,
+            destination=tmp_path / "a.txt",
+        )
+
+    def test_entry_removed_from_disk(
+        self, cache: JobAttachmentsContentCache, cache_dir: Path, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"abc"),
+        )
+        (cache_dir / NAMESPACE / "ab" / "abc.xxh128").unlink()
+
+        # WHEN
+        hit = cache.materialize(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            size=3,
+            destination=tmp_path / "a.txt",
+        )
+
+        # THEN
+        assert not hit
+        assert not (tmp_path / "a.txt").exists()
+        assert cache.size_bytes == 0
+
+    @pytest.mark.parametrize(
+        argnames=("namespace", "hash", "hash_alg"),
+        argvalues=(
+            pytest.param("..", "abc", "xxh128", id="namespace"),
+            pytest.param(NAMESPACE, "../abc", "xxh128", id="hash"),
+            pytest.param(NAMESPACE, "abc", "x/y", id="hash_alg"),
+        ),
+    )
+    def test_rejects_invalid_keys(
+        self,
+        cache: JobAttachmentsContentCache,
+        tmp_path: Path,
+        namespace: str,
+        hash: str,
+        hash_alg: str,
+    ) -> None:
+        with pytest.raises(ValueError):
+            cache.materialize(
+                namespace=namespace,
+                hash=hash,
+                hash_alg=hash_alg,
+                size=3,
+                destination=tmp_path / "a.txt",
+            )
+
+
+class TestContains:
+    def test_contains(self, cache: JobAttachmentsContentCache, tmp_path: Path) -> None:
+        # GIVEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"abc"),
+        )
+
+        # THEN
+        assert cache.contains(namespace=NAMESPACE, hash="abc", hash_alg="xxh128", size=3)
+        assert not cache.contains(namespace=NAMESPACE, hash="abc", hash_alg="xxh128", size=4)
+        assert not cache.contains(namespace=NAMESPACE, hash="def", hash_alg="xxh128", size=3)
+
+
+class TestPut:
+    def test_evicts_least_recently_used(
+        self, cache: JobAttachmentsContentCache, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        for hash in ("aaaa", "bbbb"):
+            cache.put(
+                namespace=NAMESPACE,
+                hash=hash,
+                hash_alg="xxh128",
+                source=_write(tmp_path / hash, hash.encode()),
+            )
+        # Use "aaaa" so that "bbbb" becomes the least-recently used entry
+        assert cache.materialize(
+            namespace=NAMESPACE, hash="aaaa", hash_alg="xxh128", size=4, destination=tmp_path / "a"
+        )
+
+        # WHEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="cccc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "cccc", b"cccc"),
+        )
+
+        # THEN
+        assert cache.size_bytes == 8
+        hits = {
+            hash: cache.materialize(
+                namespace=NAMESPACE,
+                hash=hash,
+                hash_alg="xxh128",
+                size=4,
+                destination=tmp_path / "out" / hash,
+            )
+            for hash in ("aaaa", "bbbb", "cccc")
+        }
+        assert hits == {"aaaa": True, "bbbb": False, "cccc": True}
+
+    def test_skips_files_larger_than_cache(
+        self, cache: JobAttachmentsContentCache, tmp_path: Path
+    ) -> None:
+        # WHEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"x" * 11),
+        )
+
+        # THEN
+        assert cache.size_bytes == 0
+
+    def test_put_existing_entry(self, cache: JobAttachmentsContentCache, tmp_path: Path) -> None:
+        # GIVEN
+        source = _write(tmp_path / "source", b"abc")
+        cache.put(namespace=NAMESPACE, hash="abc", hash_alg="xxh128", source=source)
+
+        # WHEN
+        cache.put(namespace=NAMESPACE, hash="abc", hash_alg="xxh128", source=source)
+
+        # THEN
+        assert cache.size_bytes == 3
+
+    def test_skips_files_that_do_not_match_hash(
+        self, cache: JobAttachmentsContentCache, cache_dir: Path, tmp_path: Path
+    ) -> None:
+        # WHEN
+        cache.put(
+            namespace=NAMESPACE,
+            hash="abc",
+            hash_alg="xxh128",
+            source=_write(tmp_path / "source", b"xyz"),
+        )
+
+        # THEN
+        assert cache.size_bytes == 0
+        assert not (cache_dir / NAMESPACE / "ab" / "abc.xxh128").exists()
+        assert list((cache_dir / ".incoming").iterdir()) == []
+
+    def test_concurrent_puts(self, cache_dir: Path, tmp_path: Path) -> None:
+        # GIVEN
+        cache = JobAttachmentsContentCache(root_dir=cache_dir, max_size_bytes=1000)
+        sources = [_write(tmp_path / f"source{i}", b"abc") for i in range(8)]
+
+        # WHEN
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [
+                executor.submit(
+                    cache.put, namespace=NAMESPACE, hash="abc", hash_alg="xxh128", source=source
+                )
+                for source in sources
+            ]:
+                future.result()
+
+        # THEN
+        assert cache.size_bytes == 3
+        assert list((cache_dir / ".incoming").iterdir()) == []
+
+
+class TestInit:
+    def test_loads_existing_entries_in_lru_order(self, cache_dir: Path, tmp_path: Path) -> None:
+        # GIVEN
+        cache = JobAttachmentsContentCache(root_dir=cache_dir, max_size_bytes=100)
+        for hash in ("aaaa", "bbbb"):
+            cache.put(
+                namespace=NAMESPACE,
+                hash=hash,
+                hash_alg="xxh128",
+                source=_write(tmp_path / hash, hash.encode()),
+            )
+        os.utime(cache_dir / NAMESPACE / "aa" / "aaaa.xxh128", (200, 200))
+        os.utime(cache_dir / NAMESPACE / "bb" / "bbbb.xxh128", (100, 100))
+        _write(cache_dir / ".incoming" / "partial", b"12")
+
+        # WHEN
+        reloaded = JobAttachmentsContentCache(root_dir=cache_dir, max_size_bytes=4)
+
+        # THEN
+        assert reloaded.size_bytes == 4
+        assert reloaded.materialize(
+            namespace=NAMESPACE, hash="aaaa", hash_alg="xxh128", size=4, destination=tmp_path / "a"
+        )
+        assert not (cache_dir / NAMESPACE / "bb" / "bbbb.xxh128").exists()
+        assert list((cache_dir / ".incoming").iterdir()) == []
+
+    def test_max_size_must_be_positive(self, cache_dir: Path) -> None:
+        with pytest.raises(ValueError):
+            JobAttachmentsContentCache(root_dir=cache_dir, max_size_bytes=0)
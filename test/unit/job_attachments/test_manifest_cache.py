@@ -0,0 +1,186 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the worker-wide Job Attachments manifest cache"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest.mock import MagicMock
+
+import pytest
+from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+
+from deadline_worker_agent.job_attachments.manifest_cache import (
+    JobAttachmentsManifestCache,
+    _estimated_size,
+)
+
+
+def _manifest(num_paths: int = 1) -> AssetManifest:
+    return AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPath(path=f"file{i}.txt", hash=f"{i:032x}", size=1, mtime=1)
+            for i in range(num_paths)
+        ],
+        total_size=num_paths,
+    )
+
+
+def _get(cache: JobAttachmentsManifestCache, fetch: MagicMock, key: str = "key", hash="hash"):
+    return cache.get(s3_bucket="bucket", manifest_key=key, manifest_hash=hash, fetch=fetch)
+
+
+class TestGet:
+    def test_fetches_once(self) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+        manifest = _manifest()
+        fetch = MagicMock(return_value=manifest)
+
+        # WHEN
+        results = [_get(cache, fetch) for _ in range(3)]
+
+        # THEN
+        assert results == [manifest] * 3
+        fetch.assert_called_once_with()
+        assert cache.size_bytes == _estimated_size(manifest)
+
+    def test_returns_copies(self) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+        fetch = MagicMock(return_value=_manifest())
+        first = _get(cache, fetch)
+
+        # WHEN
+        first.paths[0].path = "mapped/file0.txt"
+        first.paths.append(ManifestPath(path="extra.txt", hash="0" * 32, size=1, mtime=1))
+
+        # THEN
+        second = _get(cache, fetch)
+        assert second is not first
+        assert [manifest_path.path for manifest_path in second.paths] == ["file0.txt"]
+        fetch.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        argnames=("key", "hash"),
+        argvalues=(
+            pytest.param("other-key", "hash", id="key"),
+            pytest.param("key", "other-hash", id="hash"),
+        ),
+    )
+    def test_keyed_by_location_and_hash(self, key: str, hash: str) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+        fetch = MagicMock(side_effect=[_manifest(), _manifest()])
+        _get(cache, fetch)
+
+        # WHEN
+        _get(cache, fetch, key=key, hash=hash)
+
+        # THEN
+        assert fetch.call_count == 2
+
+    def test_evicts_least_recently_used(self) -> None:
+        # GIVEN
+        manifest_size = _estimated_size(_manifest())
+        cache = JobAttachmentsManifestCache(max_size_bytes=2 * manifest_size)
+        fetch = MagicMock(side_effect=lambda: _manifest())
+        _get(cache, fetch, key="a")
+        _get(cache, fetch, key="b")
+        _get(cache, fetch, key="a")  # "b" is now the least-recently used
+
+        # WHEN
+        _get(cache, fetch, key="c")
+
+        # THEN
+        assert cache.size_bytes == 2 * manifest_size
+        fetch.reset_mock()
+        _get(cache, fetch, key="a")
+        _get(cache, fetch, key="c")
+        fetch.assert_not_called()
+        _get(cache, fetch, key="b")
+        fetch.assert_called_once()
+
+    def test_does_not_cache_oversized_manifest(self) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1)
+        fetch = MagicMock(side_effect=lambda: _manifest())
+
+        # WHEN
+        _get(cache, fetch)
+        _get(cache, fetch)
+
+        # THEN
+        assert fetch.call_count == 2
+        assert cache.size_bytes == 0
+
+    def test_fetch_error_is_not_cached(self) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+        manifest = _manifest()
+        fetch = MagicMock(side_effect=[RuntimeError("throttled"), manifest])
+
+        # WHEN
+        with pytest.raises(RuntimeError):
+            _get(cache, fetch)
+        result = _get(cache, fetch)
+
+        # THEN
+        assert result == manifest
+        assert fetch.call_count == 2
+
+    def test_concurrent_requests_share_fetch(self) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+        manifest = _manifest()
+        fetch_started = Event()
+        release_fetch = Event()
+
+        def fetch() -> AssetManifest:
+            fetch_started.set()
+            release_fetch.wait()
+            return manifest
+
+        fetch_mock = MagicMock(side_effect=fetch)
+
+        # WHEN
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(_get, cache, fetch_mock)
+            fetch_started.wait()
+            others = [executor.submit(_get, cache, fetch_mock) for _ in range(3)]
+            release_fetch.set()
+            results = [first.result()] + [future.result() for future in others]
+
+        # THEN
+        assert results == [manifest] * 4
+        fetch_mock.assert_called_once()
+
+    def test_replaced_entry_is_counted_once(self) -> None:
+        # GIVEN
+        cache = JobAttachmentsManifestCache(max_size_bytes=1_000_000)
+        manifest = _manifest()
+
+        def fetch() -> AssetManifest:
+            if fetch_mock.call_count == 1:
+                # Another caller gets a fetch lock of its own and caches the manifest while this
+                # fetch is in progress
+                cache._fetch_locks.clear()
+                _get(cache, fetch_mock)
+            return manifest
+
+        fetch_mock = MagicMock(side_effect=fetch)
+
+        # WHEN
+        _get(cache, fetch_mock)
+
+        # THEN
+        assert fetch_mock.call_count == 2
+        assert cache.size_bytes == _estimated_size(manifest)
+
+
+def test_max_size_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        JobAttachmentsManifestCache(max_size_bytes=0)
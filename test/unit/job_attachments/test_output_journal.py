@@ -0,0 +1,214 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the inotify-backed Job Attachments output change journal"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Generator
+import os
+import sys
+
+import pytest
+
+from deadline_worker_agent.job_attachments.output_journal import (
+    _IN_Q_OVERFLOW,
+    OutputChangeJournal,
+    OutputChanges,
+)
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="inotify is Linux-only")
+
+
+@pytest.fixture
+def session_dir(tmp_path: Path) -> Path:
+    return tmp_path / "session"
+
+
+@pytest.fixture
+def output_root(session_dir: Path) -> Path:
+    return session_dir / "assetroot-abc" / "renders"
+
+
+@pytest.fixture
+def journal(session_dir: Path, output_root: Path) -> Generator[OutputChangeJournal, None, None]:
+    session_dir.mkdir()
+    journal = OutputChangeJournal()
+    journal.watch([(output_root, session_dir)])
+    # The first collection after watching a root never tracks it
+    assert journal.collect().files_under(output_root) is None
+    yield journal
+    journal.close()
+
+
+def _write(path: Path, content: bytes = b"frame") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+class TestCollect:
+    def test_records_files_in_created_output_root(
+        self, journal: OutputChangeJournal, output_root: Path
+    ) -> None:
+        # GIVEN
+        frames = [_write(output_root / f"frame{i}.exr") for i in range(3)]
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) == frames
+
+    def test_records_only_files_changed_since_previous_collection(
+        self, journal: OutputChangeJournal, output_root: Path
+    ) -> None:
+        # GIVEN
+        _write(output_root / "frame1.exr")
+        unchanged = _write(output_root / "frame2.exr")
+        journal.collect()
+        new_frame = _write(output_root / "frame3.exr")
+        modified_frame = _write(output_root / "frame1.exr", b"rewritten")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        changed_files = changes.files_under(output_root)
+        assert changed_files == sorted([new_frame, modified_frame])
+        assert unchanged not in changed_files
+
+    def test_records_files_in_new_subdirectories(
+        self, journal: OutputChangeJournal, output_root: Path
+    ) -> None:
+        # GIVEN
+        output_root.mkdir(parents=True)
+        journal.collect()
+        frame = _write(output_root / "beauty" / "deep" / "frame1.exr")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) == [frame]
+
+    def test_records_directory_moved_into_output_root(
+        self, journal: OutputChangeJournal, output_root: Path, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        output_root.mkdir(parents=True)
+        journal.collect()
+        _write(tmp_path / "staging" / "frame1.exr")
+        os.rename(tmp_path / "staging", output_root / "staged")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) == [output_root / "staged" / "frame1.exr"]
+
+    def test_ignores_files_outside_output_root(
+        self, journal: OutputChangeJournal, output_root: Path, session_dir: Path
+    ) -> None:
+        # GIVEN
+        _write(session_dir / "assetroot-abc" / "input.txt")
+        _write(session_dir / "scratch.txt")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) == []
+
+    def test_recreated_output_root(self, journal: OutputChangeJournal, output_root: Path) -> None:
+        # GIVEN
+        _write(output_root / "frame1.exr").unlink()
+        output_root.rmdir()
+        journal.collect()
+        frame = _write(output_root / "frame2.exr")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) == [frame]
+
+    def test_moved_directory_falls_back_to_walk(
+        self, journal: OutputChangeJournal, output_root: Path
+    ) -> None:
+        # GIVEN
+        _write(output_root / "a" / "frame1.exr")
+        journal.collect()
+        os.rename(output_root / "a", output_root / "b")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) is None
+        # The journal is re-installed and tracks the root again afterwards
+        frame = _write(output_root / "b" / "frame2.exr")
+        assert journal.collect().files_under(output_root) == [frame]
+
+    def test_overflow_falls_back_to_walk(
+        self, journal: OutputChangeJournal, output_root: Path
+    ) -> None:
+        # GIVEN
+        _write(output_root / "frame1.exr")
+        with journal._lock:
+            journal._handle_event(-1, _IN_Q_OVERFLOW, "")
+
+        # WHEN
+        changes = journal.collect()
+
+        # THEN
+        assert changes.files_under(output_root) is None
+        assert journal.collect().files_under(output_root) == []
+
+    def test_boundary_missing(self, tmp_path: Path) -> None:
+        # GIVEN
+        output_root = tmp_path / "missing" / "renders"
+        journal = OutputChangeJournal()
+        try:
+            journal.watch([(output_root, tmp_path / "missing")])
+            journal.collect()
+            _write(output_root / "frame1.exr")
+
+            # WHEN
+            changes = journal.collect()
+        finally:
+            journal.close()
+
+        # THEN
+        assert changes.files_under(output_root) is None
+
+    def test_root_outside_boundary(self, tmp_path: Path, session_dir: Path) -> None:
+        # GIVEN
+        session_dir.mkdir()
+        output_root = tmp_path / "elsewhere"
+        journal = OutputChangeJournal()
+        try:
+            journal.watch([(output_root, session_dir)])
+            journal.collect()
+
+            # WHEN
+            changes = journal.collect()
+        finally:
+            journal.close()
+
+        # THEN
+        assert changes.files_under(output_root) is None
+
+
+def test_files_under_only_matches_whole_path_components() -> None:
+    # GIVEN
+    changes = OutputChanges(
+        tracked_roots=frozenset([Path("/session/out")]),
+        files=frozenset([Path("/session/out/frame.exr"), Path("/session/output/frame.exr")]),
+    )
+
+    # WHEN
+    files = changes.files_under(Path("/session/out"))
+
+    # THEN
+    assert files == [Path("/session/out/frame.exr")]
@@ -0,0 +1,267 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from threading import Event, Thread
+from typing import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from deadline_worker_agent.job_attachments import JobAttachmentsTransferGovernor
+import deadline_worker_agent.job_attachments.transfer_governor as governor_mod
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Generator[Clock, None, None]:
+    clock = Clock()
+    with patch.object(governor_mod, "monotonic", clock):
+        yield clock
+
+
+@pytest.fixture
+def net_bytes() -> Generator[list[int], None, None]:
+    """The total bytes that the host's network counters report"""
+    net_bytes = [0]
+
+    def net_io_counters() -> MagicMock:
+        return MagicMock(bytes_sent=net_bytes[0], bytes_recv=0)
+
+    with (
+        patch.object(governor_mod.psutil, "net_io_counters", side_effect=net_io_counters),
+        patch.object(governor_mod, "_RATE_SMOOTHING", 1.0),
+    ):
+        yield net_bytes
+
+
+class TestJobAttachmentsTransferGovernor:
+    @pytest.mark.parametrize(
+        argnames=("initial_lease_concurrency", "max_lease_concurrency", "max_total_concurrency"),
+        argvalues=((0, 4, 4), (1, 0, 4), (1, 4, 0), (1, -1, None)),
+    )
+    def test_limits_must_be_positive(
+        self,
+        initial_lease_concurrency: int,
+        max_lease_concurrency: int,
+        max_total_concurrency: int | None,
+    ) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            JobAttachmentsTransferGovernor(
+                initial_lease_concurrency=initial_lease_concurrency,
+                max_lease_concurrency=max_lease_concurrency,
+                max_total_concurrency=max_total_concurrency,
+            )
+
+    def test_defaults_to_one_stream_per_transfer(self) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(link_speed_bytes_per_second=None)
+
+        # WHEN
+        with governor.transfer() as lease:
+            # THEN
+            # A transfer starts out like the library's single call, and can grow to the default cap
+            assert lease.concurrency == 1
+            assert lease.max_concurrency == governor_mod._DEFAULT_MAX_LEASE_STREAMS
+
+    def test_splits_limit_between_leases(self) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=2,
+            max_lease_concurrency=4,
+            max_total_concurrency=6,
+            link_speed_bytes_per_second=None,
+        )
+
+        # WHEN
+        with governor.transfer() as first:
+            # THEN
+            assert governor.limit == 2
+            assert first.concurrency == 2
+
+            # WHEN
+            with governor.transfer() as second:
+                # THEN
+                # The limit is raised so that each transfer gets the initial concurrency
+                assert governor.limit == 4
+                assert first.concurrency == 2
+                assert second.concurrency == 2
+
+                # WHEN
+                with governor.transfer(), governor.transfer() as fourth:
+                    # THEN
+                    # The limit is capped, but every transfer can transfer at least one file
+                    assert governor.limit == 6
+                    assert fourth.concurrency == 1
+
+            # THEN
+            # The remaining transfer gets the whole limit, up to the most that it can use
+            assert first.concurrency == 4
+
+    def test_slot_waits_for_concurrency(self) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=1, max_lease_concurrency=1, link_speed_bytes_per_second=None
+        )
+        entered = Event()
+
+        def transfer_file() -> None:
+            with lease.slot():
+                entered.set()
+
+        with governor.transfer() as lease:
+            with lease.slot():
+                thread = Thread(target=transfer_file)
+                thread.start()
+
+                # THEN
+                assert not entered.wait(timeout=0.2)
+
+            # WHEN
+            thread.join(timeout=5)
+
+        # THEN
+        assert entered.is_set()
+
+    def test_raises_limit_while_throughput_increases(
+        self, clock: Clock, net_bytes: list[int]
+    ) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=4,
+            max_lease_concurrency=16,
+            max_total_concurrency=16,
+            link_speed_bytes_per_second=None,
+        )
+
+        with governor.transfer() as lease:
+            limits = []
+            for rate in (100, 100, 150, 150, 160):
+                # WHEN
+                clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+                lease.record_transfer_rate(rate)
+                limits.append(governor.limit)
+
+        # THEN
+        # Measure, probe a higher limit, keep it as throughput increased, probe again, and revert
+        # as throughput did not increase enough
+        assert limits == [4, 6, 6, 9, 6]
+
+        # WHEN
+        with governor.transfer() as lease:
+            clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+            lease.record_transfer_rate(100)
+            clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+            lease.record_transfer_rate(100)
+
+            # THEN
+            # The limit is held for a while before it is probed again
+            assert governor.limit == 6
+
+            # WHEN
+            clock.now += governor_mod._HOLD_SECONDS
+            lease.record_transfer_rate(100)
+
+            # THEN
+            assert governor.limit == 9
+
+    def test_does_not_raise_limit_when_link_is_saturated(
+        self, clock: Clock, net_bytes: list[int]
+    ) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=4,
+            max_lease_concurrency=16,
+            max_total_concurrency=16,
+            link_speed_bytes_per_second=100,
+        )
+
+        with governor.transfer() as lease:
+            for _ in range(5):
+                # WHEN
+                clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+                net_bytes[0] += int(100 * governor_mod._ADJUST_INTERVAL_SECONDS)
+                lease.record_transfer_rate(100)
+
+                # THEN
+                assert governor.limit == 4
+
+    def test_reverts_limit_that_saturates_link(self, clock: Clock, net_bytes: list[int]) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=4,
+            max_lease_concurrency=16,
+            max_total_concurrency=16,
+            link_speed_bytes_per_second=100,
+        )
+
+        with governor.transfer() as lease:
+            for _ in range(2):
+                clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+                net_bytes[0] += 10
+                lease.record_transfer_rate(10)
+            assert governor.limit == 6
+
+            # WHEN
+            clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+            net_bytes[0] += int(100 * governor_mod._ADJUST_INTERVAL_SECONDS)
+            lease.record_transfer_rate(100)
+
+        # THEN
+        assert governor.limit == 4
+
+    def test_limit_is_capped(self, clock: Clock, net_bytes: list[int]) -> None:
+        # GIVEN
+        governor = JobAttachmentsTransferGovernor(
+            initial_lease_concurrency=4,
+            max_lease_concurrency=4,
+            max_total_concurrency=5,
+            link_speed_bytes_per_second=None,
+        )
+
+        with governor.transfer() as lease:
+            for rate in (100, 200, 400, 800):
+                # WHEN
+                clock.now += governor_mod._ADJUST_INTERVAL_SECONDS
+                lease.record_transfer_rate(rate)
+
+            # THEN
+            assert governor.limit == 5
+            # A single transfer is still limited to the library's connection pool
+            assert lease.concurrency == 4
+
+    def test_detects_link_speed(self) -> None:
+        # GIVEN
+        stats = {
+            "lo": MagicMock(isup=True, speed=0),
+            "eth0": MagicMock(isup=True, speed=1000),
+            "eth1": MagicMock(isup=False, speed=10000),
+        }
+
+        with patch.object(governor_mod.psutil, "net_if_stats", return_value=stats):
+            # WHEN
+            governor = JobAttachmentsTransferGovernor(
+                initial_lease_concurrency=1, max_lease_concurrency=1
+            )
+
+        # THEN
+        assert governor._link_speed == 125_000_000
+
+    def test_link_speed_unknown(self) -> None:
+        with patch.object(governor_mod.psutil, "net_if_stats", side_effect=OSError("denied")):
+            # WHEN
+            governor = JobAttachmentsTransferGovernor(
+                initial_lease_concurrency=1, max_lease_concurrency=1
+            )
+
+        # THEN
+        assert governor._link_speed is None
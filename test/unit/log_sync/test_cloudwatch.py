@@ -5,10 +5,11 @@ import os
 from collections import deque
 from datetime import datetime, timedelta
 from logging import INFO, Formatter, LogRecord
-from threading import Event
+from threading import Event, Thread
 from typing import Any, Generator, Optional
 from unittest.mock import MagicMock, PropertyMock, call, patch
 
+from botocore.exceptions import ClientError, EndpointConnectionError, NoCredentialsError
 from pytest import fixture, mark, param, raises
 
 import deadline_worker_agent.log_sync.cloudwatch as module
@@ -20,6 +21,7 @@ from deadline_worker_agent.log_sync.cloudwatch import (
     CloudWatchLogEventPartitioner,
     CloudWatchLogEventRejectedException,
     CloudWatchLogStreamThread,
+    CloudWatchOutageDetector,
     FormattedLogEntry,
     PartitionedCloudWatchLogEvent,
     stream_cloudwatch_logs,
@@ -27,6 +29,14 @@ from deadline_worker_agent.log_sync.cloudwatch import (
 from deadline_worker_agent.log_messages import LogRecordStringTranslationFilter
 
 
+class _AnyDelay:
+    def __eq__(self, other: Any) -> bool:
+        return 1 <= other <= CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_MAX_DELAY_SECONDS
+
+
+ANY_DELAY = _AnyDelay()
+
+
 @fixture
 def mock_module_logger() -> Generator[MagicMock, None, None]:
     """Patches deadline_worker_agent.log_sync.cloudwatch.logger.logger with a mock object"""
@@ -52,7 +62,8 @@ class TestCloudWatchLogEventBatch:
     @fixture
     def event(self, now: datetime) -> PartitionedCloudWatchLogEvent:
         return PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(timestamp=int(now.timestamp() * 1000), message="abc"),
+            timestamp=int(now.timestamp() * 1000),
+            message="abc",
             size=len("abc".encode("utf-8")),
         )
 
@@ -67,18 +78,16 @@ class TestCloudWatchLogEventBatch:
         batch.add(event)
 
         # THEN
-        assert batch.min_timestamp_ms == event.log_event["timestamp"]
-        assert batch.max_timestamp_ms == event.log_event["timestamp"]
+        assert batch.min_timestamp_ms == event.timestamp
+        assert batch.max_timestamp_ms == event.timestamp
         assert len(batch.log_events) == 1
         assert event in batch.log_events
 
     def test_add_oldest(self, event: PartitionedCloudWatchLogEvent, batch: CloudWatchLogEventBatch):
         # GIVEN
         older_event = PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(
-                timestamp=event.log_event["timestamp"] - 1,
-                message="older",
-            ),
+            timestamp=event.timestamp - 1,
+            message="older",
             size=5,
         )
         batch.add(event)
@@ -87,17 +96,15 @@ class TestCloudWatchLogEventBatch:
         batch.add(older_event)
 
         # THEN
-        assert batch.min_timestamp_ms == older_event.log_event["timestamp"]
-        assert batch.max_timestamp_ms == event.log_event["timestamp"]
+        assert batch.min_timestamp_ms == older_event.timestamp
+        assert batch.max_timestamp_ms == event.timestamp
         assert older_event in batch.log_events
 
     def test_add_newest(self, event: PartitionedCloudWatchLogEvent, batch: CloudWatchLogEventBatch):
         # GIVEN
         newer_event = PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(
-                timestamp=event.log_event["timestamp"] + 1,
-                message="newer",
-            ),
+            timestamp=event.timestamp + 1,
+            message="newer",
             size=5,
         )
         batch.add(event)
@@ -106,8 +113,8 @@ class TestCloudWatchLogEventBatch:
         batch.add(newer_event)
 
         # THEN
-        assert batch.min_timestamp_ms == event.log_event["timestamp"]
-        assert batch.max_timestamp_ms == newer_event.log_event["timestamp"]
+        assert batch.min_timestamp_ms == event.timestamp
+        assert batch.max_timestamp_ms == newer_event.timestamp
         assert newer_event in batch.log_events
 
     def test_add_in_between(
@@ -115,17 +122,13 @@ class TestCloudWatchLogEventBatch:
     ):
         # GIVEN
         newer_event = PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(
-                timestamp=event.log_event["timestamp"] + 10,
-                message="newer",
-            ),
+            timestamp=event.timestamp + 10,
+            message="newer",
             size=5,
         )
         middle_event = PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(
-                timestamp=event.log_event["timestamp"] + 5,
-                message="middle",
-            ),
+            timestamp=event.timestamp + 5,
+            message="middle",
             size=6,
         )
         batch.add(event)
@@ -135,8 +138,8 @@ class TestCloudWatchLogEventBatch:
         batch.add(middle_event)
 
         # THEN
-        assert batch.min_timestamp_ms == event.log_event["timestamp"]
-        assert batch.max_timestamp_ms == newer_event.log_event["timestamp"]
+        assert batch.min_timestamp_ms == event.timestamp
+        assert batch.max_timestamp_ms == newer_event.timestamp
         assert middle_event in batch.log_events
 
     def test_size_includes_padding(
@@ -146,10 +149,8 @@ class TestCloudWatchLogEventBatch:
         expected_padding = 26
         message = "this is a message"
         other_event = PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(
-                timestamp=event.log_event["timestamp"],
-                message=message,
-            ),
+            timestamp=event.timestamp,
+            message=message,
             size=len(message.encode("utf-8")),
         )
         batch.add(event)
@@ -162,6 +163,42 @@ class TestCloudWatchLogEventBatch:
         # THEN
         assert actual_size == expected_size
 
+    def test_chronological(
+        self, event: PartitionedCloudWatchLogEvent, batch: CloudWatchLogEventBatch
+    ):
+        # GIVEN
+        same_time_event = event._replace(message="same time")
+        newer_event = PartitionedCloudWatchLogEvent(
+            timestamp=event.timestamp + 1,
+            message="newer",
+            size=5,
+        )
+
+        # WHEN
+        batch.add(event)
+        batch.add(same_time_event)
+        batch.add(newer_event)
+
+        # THEN
+        assert batch.chronological is True
+
+    def test_not_chronological(
+        self, event: PartitionedCloudWatchLogEvent, batch: CloudWatchLogEventBatch
+    ):
+        # GIVEN
+        older_event = PartitionedCloudWatchLogEvent(
+            timestamp=event.timestamp - 1,
+            message="older",
+            size=5,
+        )
+        batch.add(event)
+
+        # WHEN
+        batch.add(older_event)
+
+        # THEN
+        assert batch.chronological is False
+
     class TestValidateLogEventCanBeAdded:
         @patch.object(module, "datetime", wraps=datetime)
         def test_valid_log_event(
@@ -172,9 +209,8 @@ class TestCloudWatchLogEventBatch:
             now = datetime(2000, 1, 1)
             datetime_mock.now.return_value = now
             event = PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(
-                    message="abc", timestamp=(int(now.timestamp()) * 1000)
-                ),
+                message="abc",
+                timestamp=(int(now.timestamp()) * 1000),
                 size=3,
             )
             batch = CloudWatchLogEventBatch()
@@ -222,7 +258,8 @@ class TestCloudWatchLogEventBatch:
         ):
             # GIVEN
             event = PartitionedCloudWatchLogEvent(
-                log_event=MagicMock(),
+                timestamp=MagicMock(),
+                message=MagicMock(),
                 size=event_size,
             )
             with patch.object(
@@ -241,16 +278,14 @@ class TestCloudWatchLogEventBatch:
         def test_too_far_future(self, now: datetime):
             # GIVEN
             event = PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(
-                    message="abc",
-                    timestamp=int(
-                        (
-                            now
-                            + module.PUT_LOG_EVENTS_CONSTRAINTS.max_future_time_delta
-                            + timedelta(seconds=1)
-                        ).timestamp()
-                        * 1000  # Multiply by 1000 since CW expects milliseconds
-                    ),
+                message="abc",
+                timestamp=int(
+                    (
+                        now
+                        + module.PUT_LOG_EVENTS_CONSTRAINTS.max_future_time_delta
+                        + timedelta(seconds=1)
+                    ).timestamp()
+                    * 1000  # Multiply by 1000 since CW expects milliseconds
                 ),
                 size=3,
             )
@@ -297,11 +332,9 @@ class TestCloudWatchLogEventBatch:
             batch.min_timestamp_ms = int(batch_min_datetime.timestamp())
             batch.max_timestamp_ms = int(batch_max_datetime.timestamp())
             event = PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(
-                    message="abc",
-                    # Multiply by 1000 since CW expects milliseconds
-                    timestamp=int(event_time.timestamp()) * 1000,
-                ),
+                message="abc",
+                # Multiply by 1000 since CW expects milliseconds
+                timestamp=int(event_time.timestamp()) * 1000,
                 size=3,
             )
             datetime_mock.now.return_value = event_time
@@ -322,16 +355,14 @@ class TestCloudWatchLogEventBatch:
             # GIVEN
             batch = CloudWatchLogEventBatch()
             event = PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(
-                    message="abc",
-                    timestamp=int(
-                        (
-                            now
-                            - module.PUT_LOG_EVENTS_CONSTRAINTS.max_past_time_delta
-                            - timedelta(seconds=1)
-                        ).timestamp()
-                        * 1000  # Multiply by 1000 since CW expects milliseconds
-                    ),
+                message="abc",
+                timestamp=int(
+                    (
+                        now
+                        - module.PUT_LOG_EVENTS_CONSTRAINTS.max_past_time_delta
+                        - timedelta(seconds=1)
+                    ).timestamp()
+                    * 1000  # Multiply by 1000 since CW expects milliseconds
                 ),
                 size=3,
             )
@@ -353,10 +384,8 @@ class TestCloudWatchLogEventPartitioner:
     @fixture
     def event(self) -> PartitionedCloudWatchLogEvent:
         return PartitionedCloudWatchLogEvent(
-            log_event=CloudWatchLogEvent(
-                message="abc",
-                timestamp=123,
-            ),
+            message="abc",
+            timestamp=123,
             size=3,
         )
 
@@ -399,7 +428,8 @@ class TestCloudWatchLogEventPartitioner:
             # GIVEN
             event_processor = CloudWatchLogEventPartitioner(raw_deque=deque())
             second_event = PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(message="def", timestamp=345),
+                message="def",
+                timestamp=345,
                 size=3,
             )
             process_raw_event_mock.return_value = [
@@ -440,10 +470,8 @@ class TestCloudWatchLogEventPartitioner:
             # THEN
             assert result == [
                 PartitionedCloudWatchLogEvent(
-                    log_event=CloudWatchLogEvent(
-                        timestamp=raw_event.timestamp,
-                        message=raw_event.message,
-                    ),
+                    timestamp=raw_event.timestamp,
+                    message=raw_event.message,
                     size=3,
                 )
             ]
@@ -453,6 +481,29 @@ class TestCloudWatchLogEventPartitioner:
                 module.PUT_LOG_EVENTS_CONSTRAINTS.max_log_event_size,
             )
 
+        def test_process_raw_event_with_known_size(
+            self,
+            deque_mock: MagicMock,
+            chunk_string_mock: MagicMock,
+        ):
+            # GIVEN
+            raw_event = FormattedLogEntry(111, "aaa", 3)
+            deque_mock.popleft.return_value = raw_event
+            event_processor = CloudWatchLogEventPartitioner(raw_deque=deque_mock)
+
+            # WHEN
+            result = event_processor._partition_raw_event()
+
+            # THEN
+            assert result == [
+                PartitionedCloudWatchLogEvent(
+                    timestamp=111,
+                    message="aaa",
+                    size=3,
+                )
+            ]
+            chunk_string_mock.assert_not_called()
+
         def test_process_raw_event_over_size_constraint(
             self,
             deque_mock: MagicMock,
@@ -470,7 +521,8 @@ class TestCloudWatchLogEventPartitioner:
                 ),
             ]
             chunk_string_mock.return_value = chunks
-            raw_event = FormattedLogEntry(111, "".join(msg for msg, _ in chunks))
+            message = "".join(msg for msg, _ in chunks)
+            raw_event = FormattedLogEntry(111, message, len(message))
             deque_mock.popleft.return_value = raw_event
             event_processor = CloudWatchLogEventPartitioner(raw_deque=deque_mock)
 
@@ -480,7 +532,8 @@ class TestCloudWatchLogEventPartitioner:
             # THEN
             assert result == [
                 PartitionedCloudWatchLogEvent(
-                    log_event=CloudWatchLogEvent(timestamp=raw_event.timestamp, message=msg),
+                    timestamp=raw_event.timestamp,
+                    message=msg,
                     size=size,
                 )
                 for msg, size in chunks
@@ -491,6 +544,90 @@ class TestCloudWatchLogEventPartitioner:
                 module.PUT_LOG_EVENTS_CONSTRAINTS.max_log_event_size,
             )
 
+    class TestPacking:
+        @staticmethod
+        def _entry(timestamp: int, message: str) -> FormattedLogEntry:
+            return FormattedLogEntry(timestamp, message, len(message.encode("utf-8")))
+
+        def test_packs_events_within_window(self):
+            # GIVEN
+            raw_deque = deque(
+                [
+                    self._entry(1000, "a"),
+                    self._entry(1050, "b"),
+                    self._entry(1100, "c"),
+                    self._entry(1101, "d"),
+                ]
+            )
+            partitioner = CloudWatchLogEventPartitioner(raw_deque=raw_deque, packing_window_ms=100)
+
+            # WHEN
+            first = partitioner.next()
+            second = partitioner.next()
+
+            # THEN
+            assert first == PartitionedCloudWatchLogEvent(
+                timestamp=1000,
+                message="a\nb\nc",
+                size=5,
+            )
+            assert second == PartitionedCloudWatchLogEvent(
+                timestamp=1101,
+                message="d",
+                size=1,
+            )
+            assert not partitioner.has_items
+
+        def test_packed_event_has_earliest_timestamp(self):
+            # GIVEN
+            raw_deque = deque([self._entry(1000, "a"), self._entry(999, "b")])
+            partitioner = CloudWatchLogEventPartitioner(raw_deque=raw_deque, packing_window_ms=100)
+
+            # WHEN
+            result = partitioner.next()
+
+            # THEN
+            assert result == PartitionedCloudWatchLogEvent(timestamp=999, message="a\nb", size=3)
+
+        def test_does_not_exceed_max_log_event_size(self):
+            # GIVEN
+            half = "x" * (module.PUT_LOG_EVENTS_CONSTRAINTS.max_log_event_size // 2)
+            raw_deque = deque([self._entry(1000, half), self._entry(1000, half)])
+            partitioner = CloudWatchLogEventPartitioner(raw_deque=raw_deque, packing_window_ms=100)
+
+            # WHEN
+            first = partitioner.next()
+            second = partitioner.next()
+
+            # THEN
+            assert first.message == half
+            assert second.message == half
+
+        def test_does_not_pack_events_of_unknown_size(self):
+            # GIVEN
+            raw_deque = deque([self._entry(1000, "a"), FormattedLogEntry(1000, "b")])
+            partitioner = CloudWatchLogEventPartitioner(raw_deque=raw_deque, packing_window_ms=100)
+
+            # WHEN
+            first = partitioner.next()
+            second = partitioner.next()
+
+            # THEN
+            assert first.message == "a"
+            assert second.message == "b"
+
+        def test_no_packing_by_default(self):
+            # GIVEN
+            raw_deque = deque([self._entry(1000, "a"), self._entry(1000, "b")])
+            partitioner = CloudWatchLogEventPartitioner(raw_deque=raw_deque)
+
+            # WHEN
+            first = partitioner.next()
+
+            # THEN
+            assert first.message == "a"
+            assert len(raw_deque) == 1
+
     class TestChunkString:
         def test_throws_when_chunk_size_too_small(self):
             # WHEN
@@ -507,6 +644,7 @@ class TestCloudWatchLogEventPartitioner:
             # GIVEN
             fake_string = MagicMock()
             # Create a "string" that just has a bunch of continuation bytes in UTF-8 (i.e. they all start with bit sequence: 10)
+            fake_string.isascii.return_value = False
             fake_string.encode.return_value = bytes([0x80] * 10)
 
             # WHEN
@@ -641,6 +779,7 @@ class TestCloudWatchLogStreamThread:
             log_group_name=log_group_name,
             log_stream_name=log_stream_name,
             stop_event=stop_event,
+            outage_detector=CloudWatchOutageDetector(),
         )
 
     @fixture(autouse=True)
@@ -841,12 +980,16 @@ class TestCloudWatchLogStreamThread:
         Then:
 
         1.  The method repeats this log upload attempt indefinitely until it succeeds.
-        2.  The method sleeps >= 1s to allow for transient error conditions to clear
+        2.  The method waits >= 1s between attempts, backing off exponentially up to the max
+            delay, and wakes up early if the stop event is set
+        3.  Errors are logged at most once per PUT_LOG_EVENTS_ERROR_LOG_INTERVAL_SECONDS, without
+            stack traces
         """
         # GIVEN
         logs_client_put_log_events: MagicMock = logs_client.put_log_events
         stop_event_is_set: MagicMock = stop_event.is_set
         stop_event_is_set.return_value = False
+        stop_event_wait: MagicMock = stop_event.wait
         log_events: list[CloudWatchLogEvent] = [
             CloudWatchLogEvent(
                 message="msg",
@@ -858,7 +1001,7 @@ class TestCloudWatchLogStreamThread:
         # Simulate 1000 boto3 put_log_events exceptions followed by success
         next_sequence_token = "next_sequence_token"
         put_log_events_success_response = {"nextSequenceToken": next_sequence_token}
-        put_log_events_exception = Exception("exception msg")
+        put_log_events_exception = EndpointConnectionError(endpoint_url="https://logs")
         num_exceptions = 1000
         logs_client_put_log_events.side_effect = itertools.chain(
             # Simulate large number of successive errors
@@ -871,31 +1014,153 @@ class TestCloudWatchLogStreamThread:
             patch.object(
                 cloud_watch_log_stream_thread, "_throttle_put_log_events"
             ) as throttle_mock,
+            patch.object(module, "monotonic", return_value=100.0),
         ):
             # WHEN
             cloud_watch_log_stream_thread._upload_logs(log_events=log_events)
 
-            # THEN
-            throttle_mock.assert_called_once_with()
-            assert mock_module_logger_error.call_count == num_exceptions
-            mock_module_logger_error.assert_has_calls(
-                [
-                    call(
-                        "Error uploading CloudWatch logs (sleeping %ds): %s",
-                        CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS,
-                        put_log_events_exception,
-                        stack_info=True,
-                    )
-                ]
-                * num_exceptions
+        # THEN
+        throttle_mock.assert_called_once_with()
+        assert logs_client_put_log_events.call_count == num_exceptions + 1
+        # Only the first error is logged, the rest are within the error log interval
+        mock_module_logger_error.assert_called_once_with(
+            "Error uploading CloudWatch logs (sleeping %.1fs): %s",
+            ANY_DELAY,
+            put_log_events_exception,
+        )
+        mock_module_logger.info.assert_any_call(
+            "Uploaded CloudWatch logs after %d more error(s)", num_exceptions - 1
+        )
+        # The outage that the errors indicated is over
+        assert not cloud_watch_log_stream_thread._outage_detector.in_outage
+        sleep_mock.assert_not_called()
+        assert stop_event_wait.call_count == num_exceptions
+        delays = [c.args[0] for c in stop_event_wait.call_args_list]
+        assert all(
+            1 <= delay <= CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_MAX_DELAY_SECONDS
+            for delay in delays
+        )
+        # The delays grow to the max delay
+        assert (
+            max(delays[-10:])
+            > CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_MAX_DELAY_SECONDS * 0.5
+        )
+
+    def test_upload_logs_logs_errors_periodically(
+        self,
+        cloud_watch_log_stream_thread: CloudWatchLogStreamThread,
+        logs_client: MagicMock,
+        stop_event: MagicMock,
+        mock_module_logger: MagicMock,
+    ) -> None:
+        # GIVEN
+        stop_event.is_set.return_value = False
+        put_log_events_exception = Exception("exception msg")
+        logs_client.put_log_events.side_effect = [
+            put_log_events_exception,
+            put_log_events_exception,
+            put_log_events_exception,
+            {},
+        ]
+        interval = CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_LOG_INTERVAL_SECONDS
+
+        with (
+            patch.object(cloud_watch_log_stream_thread, "_throttle_put_log_events"),
+            patch.object(module, "monotonic", side_effect=[0, 1, interval + 1]),
+        ):
+            # WHEN
+            cloud_watch_log_stream_thread._upload_logs(
+                log_events=[CloudWatchLogEvent(message="msg", timestamp=1)]
             )
-            assert sleep_mock.call_count == num_exceptions
 
-            class GreaterThanOne:
-                def __eq__(self, other: Any) -> bool:
-                    return other >= 1
+        # THEN
+        mock_module_logger.error.assert_has_calls(
+            [
+                call(
+                    "Error uploading CloudWatch logs (sleeping %.1fs): %s",
+                    ANY_DELAY,
+                    put_log_events_exception,
+                ),
+                call(
+                    "Error uploading CloudWatch logs (sleeping %.1fs, %d similar errors suppressed): %s",
+                    ANY_DELAY,
+                    1,
+                    put_log_events_exception,
+                ),
+            ]
+        )
+        assert mock_module_logger.error.call_count == 2
 
-            sleep_mock.assert_has_calls([call(GreaterThanOne())] * num_exceptions)
+    def test_upload_logs_waits_for_outage_probe(
+        self,
+        cloud_watch_log_stream_thread: CloudWatchLogStreamThread,
+        logs_client: MagicMock,
+        stop_event: MagicMock,
+    ) -> None:
+        # GIVEN
+        stop_event.is_set.return_value = False
+        outage_detector = MagicMock()
+        cloud_watch_log_stream_thread._outage_detector = outage_detector
+        logs_client.put_log_events.side_effect = [
+            EndpointConnectionError(endpoint_url="https://logs"),
+            {},
+        ]
+
+        with patch.object(cloud_watch_log_stream_thread, "_throttle_put_log_events"):
+            # WHEN
+            cloud_watch_log_stream_thread._upload_logs(
+                log_events=[CloudWatchLogEvent(message="msg", timestamp=1)]
+            )
+
+        # THEN
+        outage_detector.assert_has_calls(
+            [
+                call.wait_for_turn(stop_event),
+                call.record_result(success=False),
+                call.wait_for_turn(stop_event),
+                call.record_result(success=True),
+            ]
+        )
+
+    def test_upload_logs_stream_error_is_not_an_outage(
+        self,
+        cloud_watch_log_stream_thread: CloudWatchLogStreamThread,
+        logs_client: MagicMock,
+        stop_event: MagicMock,
+    ) -> None:
+        # GIVEN
+        stop_event.is_set.return_value = False
+        outage_detector = MagicMock()
+        cloud_watch_log_stream_thread._outage_detector = outage_detector
+        logs_client.put_log_events.side_effect = [
+            ClientError(
+                {
+                    "Error": {"Code": "ResourceNotFoundException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "PutLogEvents",
+            ),
+            {},
+        ]
+
+        with patch.object(cloud_watch_log_stream_thread, "_throttle_put_log_events"):
+            # WHEN
+            cloud_watch_log_stream_thread._upload_logs(
+                log_events=[CloudWatchLogEvent(message="msg", timestamp=1)]
+            )
+
+        # THEN
+        # The stream retries as before, but the error is not counted towards an outage
+        assert logs_client.put_log_events.call_count == 2
+        outage_detector.assert_has_calls(
+            [
+                call.wait_for_turn(stop_event),
+                call.release(),
+                call.wait_for_turn(stop_event),
+                call.record_result(success=True),
+            ]
+        )
+        assert call.record_result(success=False) not in outage_detector.mock_calls
 
     def test_upload_logs_boto_exception_after_stop_recovery(
         self,
@@ -954,11 +1219,10 @@ class TestCloudWatchLogStreamThread:
             mock_module_logger_error.assert_has_calls(
                 [
                     call(
-                        "Error uploading CloudWatch logs (sleeping %ds, %d attempts remaining): %s",
-                        CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS,
+                        "Error uploading CloudWatch logs (sleeping %.1fs, %d attempts remaining): %s",
+                        float(CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS),
                         stop_attempts,
                         put_log_events_exception,
-                        stack_info=True,
                     )
                     for stop_attempts in range(4, 4 - num_exceptions, -1)
                 ]
@@ -1018,11 +1282,10 @@ class TestCloudWatchLogStreamThread:
         mock_module_logger_error.assert_has_calls(
             [
                 call(
-                    "Error uploading CloudWatch logs (sleeping %ds, %d attempts remaining): %s",
-                    CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS,
+                    "Error uploading CloudWatch logs (sleeping %.1fs, %d attempts remaining): %s",
+                    float(CloudWatchLogStreamThread.PUT_LOG_EVENTS_ERROR_DELAY_SECONDS),
                     stop_attempts,
                     put_log_events_exception,
-                    stack_info=True,
                 )
                 for stop_attempts in range(4, -1, -1)
             ]
@@ -1035,6 +1298,8 @@ class TestCloudWatchLogStreamThread:
                 return other >= 1
 
         sleep_mock.assert_has_calls([call(GreaterThanOne())] * num_exceptions)
+        # Another stream can probe for the end of an outage in its place
+        assert cloud_watch_log_stream_thread._outage_detector._prober is None
 
     @mark.parametrize(
         argnames=(
@@ -1165,7 +1430,8 @@ class TestCloudWatchLogStreamThread:
         ):
             # GIVEN
             expected_log_event = PartitionedCloudWatchLogEvent(
-                log_event=CloudWatchLogEvent(timestamp=123, message="abc"),
+                timestamp=123,
+                message="abc",
                 size=3,
             )
             log_event_partitioner_mock.next.side_effect = [
@@ -1180,10 +1446,37 @@ class TestCloudWatchLogStreamThread:
                 result = cw_thread._collect_logs()
 
             # THEN
-            assert result == [expected_log_event.log_event]
+            assert result == [CloudWatchLogEvent(timestamp=123, message="abc")]
             assert log_event_partitioner_mock.next.call_count == 2
             batch_log_event_can_be_added_mock.assert_called_once_with(expected_log_event)
 
+        def test_sorts_out_of_order_log_events(
+            self,
+            log_event_partitioner_mock: MagicMock,
+            cw_thread: CloudWatchLogStreamThread,
+        ):
+            # GIVEN
+            log_events = [
+                PartitionedCloudWatchLogEvent(
+                    timestamp=timestamp,
+                    message=message,
+                    size=len(message),
+                )
+                for timestamp, message in ((2, "b"), (1, "a"), (2, "c"))
+            ]
+            log_event_partitioner_mock.next.side_effect = [*log_events, IndexError()]
+
+            # WHEN
+            with patch.object(module.CloudWatchLogEventBatch, "_validate_log_event_can_be_added"):
+                result = cw_thread._collect_logs()
+
+            # THEN
+            assert result == [
+                CloudWatchLogEvent(timestamp=1, message="a"),
+                CloudWatchLogEvent(timestamp=2, message="b"),
+                CloudWatchLogEvent(timestamp=2, message="c"),
+            ]
+
         @mark.parametrize(
             ("batch_full", "reason"),
             (
@@ -1237,15 +1530,199 @@ class TestCloudWatchLogStreamThread:
             if reason:
                 log_event_partitioner_mock.appendleft.assert_any_call(
                     PartitionedCloudWatchLogEvent(
-                        log_event=CloudWatchLogEvent(
-                            timestamp=expected_log_event.log_event["timestamp"],
-                            message=reason,
-                        ),
+                        timestamp=expected_log_event.timestamp,
+                        message=reason,
                         size=len(reason.encode("utf-8")),
                     )
                 )
 
 
+class TestCloudWatchOutageDetector:
+    @fixture
+    def outage_detector(self) -> CloudWatchOutageDetector:
+        return CloudWatchOutageDetector()
+
+    def test_detects_outage(
+        self, outage_detector: CloudWatchOutageDetector, mock_module_logger: MagicMock
+    ) -> None:
+        # WHEN
+        for _ in range(CloudWatchOutageDetector.OUTAGE_FAILURE_THRESHOLD):
+            outage_detector.record_result(success=False)
+
+        # THEN
+        assert outage_detector.in_outage
+        mock_module_logger.warning.assert_called_once()
+
+        # WHEN
+        outage_detector.record_result(success=True)
+
+        # THEN
+        assert not outage_detector.in_outage
+        mock_module_logger.info.assert_called_once()
+
+    def test_success_resets_failures(self, outage_detector: CloudWatchOutageDetector) -> None:
+        # WHEN
+        for _ in range(CloudWatchOutageDetector.OUTAGE_FAILURE_THRESHOLD - 1):
+            outage_detector.record_result(success=False)
+        outage_detector.record_result(success=True)
+        outage_detector.record_result(success=False)
+
+        # THEN
+        assert not outage_detector.in_outage
+
+    def test_only_one_stream_probes(self, outage_detector: CloudWatchOutageDetector) -> None:
+        # GIVEN
+        # The thread that detects the outage becomes the prober
+        for _ in range(CloudWatchOutageDetector.OUTAGE_FAILURE_THRESHOLD):
+            outage_detector.record_result(success=False)
+        waiting = Event()
+        resumed = Event()
+
+        def other_stream() -> None:
+            waiting.set()
+            outage_detector.wait_for_turn(Event())
+            resumed.set()
+
+        other = Thread(target=other_stream)
+
+        with patch.object(CloudWatchOutageDetector, "POLL_INTERVAL_SECONDS", 0.01):
+            # WHEN
+            other.start()
+            assert waiting.wait(timeout=5)
+
+            # THEN
+            # The other stream waits for the probe...
+            assert not resumed.wait(timeout=0.1)
+            outage_detector.wait_for_turn(Event())
+            outage_detector.record_result(success=False)
+            assert not resumed.is_set()
+
+            # WHEN
+            outage_detector.record_result(success=True)
+
+            # THEN
+            # ...and resumes once it succeeds
+            assert resumed.wait(timeout=5)
+            other.join(timeout=5)
+
+    def test_stopping_stream_does_not_wait(self, outage_detector: CloudWatchOutageDetector) -> None:
+        # GIVEN
+        for _ in range(CloudWatchOutageDetector.OUTAGE_FAILURE_THRESHOLD):
+            outage_detector.record_result(success=False)
+        stop_event = Event()
+        stop_event.set()
+        returned = Event()
+
+        def wait_for_turn() -> None:
+            outage_detector.wait_for_turn(stop_event)
+            returned.set()
+
+        other = Thread(target=wait_for_turn)
+
+        # WHEN
+        other.start()
+
+        # THEN
+        assert returned.wait(timeout=5)
+        other.join(timeout=5)
+
+    def test_release_lets_another_stream_probe(
+        self, outage_detector: CloudWatchOutageDetector
+    ) -> None:
+        # GIVEN
+        for _ in range(CloudWatchOutageDetector.OUTAGE_FAILURE_THRESHOLD):
+            outage_detector.record_result(success=False)
+
+        # WHEN
+        outage_detector.release()
+
+        # THEN
+        assert outage_detector._prober is None
+        assert outage_detector.in_outage
+
+
+@mark.parametrize(
+    argnames=("error", "expected"),
+    argvalues=(
+        param(EndpointConnectionError(endpoint_url="https://logs"), True, id="connection"),
+        param(NoCredentialsError(), True, id="no-credentials"),
+        param(
+            ClientError(
+                {
+                    "Error": {"Code": "ServiceUnavailableException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 503},
+                },
+                "PutLogEvents",
+            ),
+            True,
+            id="server-error",
+        ),
+        param(
+            ClientError(
+                {
+                    "Error": {"Code": "ThrottlingException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "PutLogEvents",
+            ),
+            True,
+            id="throttling",
+        ),
+        param(
+            ClientError(
+                {
+                    "Error": {"Code": "ExpiredTokenException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "PutLogEvents",
+            ),
+            True,
+            id="expired-credentials",
+        ),
+        param(
+            ClientError(
+                {
+                    "Error": {"Code": "InvalidParameterException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "PutLogEvents",
+            ),
+            False,
+            id="invalid-parameter",
+        ),
+        param(
+            ClientError(
+                {
+                    "Error": {"Code": "DataAlreadyAcceptedException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "PutLogEvents",
+            ),
+            False,
+            id="data-already-accepted",
+        ),
+        param(
+            ClientError(
+                {
+                    "Error": {"Code": "ResourceNotFoundException"},
+                    "ResponseMetadata": {"HTTPStatusCode": 400},
+                },
+                "PutLogEvents",
+            ),
+            False,
+            id="deleted-stream",
+        ),
+        param(Exception("exception msg"), False, id="other"),
+    ),
+)
+def test_is_outage_error(error: Exception, expected: bool) -> None:
+    # WHEN
+    result = module._is_outage_error(error)
+
+    # THEN
+    assert result == expected
+
+
 class TestCloudWatchHandler:
     """Tests for the CloudWatchHandler class"""
 
@@ -1312,6 +1789,7 @@ class TestCloudWatchHandler:
             log_stream_name=log_cw_stream_name,
             log_event_queue=handler._log_event_queue,
             stop_event=handler._stop_event,
+            packing_window_ms=None,
             daemon=True,
         )
         mock_cloud_watch_log_stream_thread_start.assert_called_once_with()
@@ -1350,9 +1828,44 @@ class TestCloudWatchHandler:
                 FormattedLogEntry(
                     timestamp=int(record.created * 1000),
                     message=record.message,
+                    size=len(record.message),
                 )
             )
 
+    @mark.parametrize(
+        ("message", "expected_size"),
+        (
+            param("abc", 3, id="ascii"),
+            param("日本語", 9, id="unicode"),
+            param("\ud800", None, id="lone-surrogate"),
+        ),
+    )
+    def test_emit_measures_message(
+        self,
+        handler: CloudWatchHandler,
+        message: str,
+        expected_size: Optional[int],
+    ) -> None:
+        """Tests that CloudWatchHandler.emit() records the UTF-8 encoded size of the message"""
+        # GIVEN
+        record = LogRecord(
+            name="someloggername",
+            level=INFO,
+            pathname=os.path.abspath(__file__),
+            lineno=1,
+            msg=message,
+            args=tuple(),
+            exc_info=None,
+        )
+
+        with patch.object(handler, "_log_event_queue") as log_queue_mock:
+            # WHEN
+            handler.emit(record)
+
+        # THEN
+        log_queue_mock.append.assert_called_once()
+        assert log_queue_mock.append.call_args.args[0].size == expected_size
+
     def test_emit_exception(
         self,
         handler: CloudWatchHandler,
@@ -1391,6 +1904,7 @@ class TestCloudWatchHandler:
                 FormattedLogEntry(
                     timestamp=int(record.created * 1000),
                     message=record.message,
+                    size=len(record.message),
                 )
             )
             handle_error_mock.assert_called_once_with(record)
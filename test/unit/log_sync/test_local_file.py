@@ -0,0 +1,211 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the background-writing local log file handler"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+import gzip
+import logging
+import zlib
+
+import pytest
+
+from deadline_worker_agent.log_sync.local_file import AsyncRotatingFileHandler
+import deadline_worker_agent.log_sync.local_file as local_file_mod
+
+
+@pytest.fixture
+def test_logger() -> Generator[logging.Logger, None, None]:
+    logger = logging.getLogger("deadline_worker_agent.test.local_file")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+def _attach(logger: logging.Logger, handler: AsyncRotatingFileHandler) -> None:
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+
+
+def _read_partial_gzip(path: Path) -> str:
+    """Decompresses a gzip file that has been flushed but not closed"""
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    return decompressor.decompress(path.read_bytes()).decode("utf-8")
+
+
+class TestAsyncRotatingFileHandler:
+    def test_writes_uncompressed(self, test_logger: logging.Logger, tmp_path: Path) -> None:
+        # GIVEN
+        log_file = tmp_path / "session.log"
+        handler = AsyncRotatingFileHandler(filename=log_file)
+        _attach(test_logger, handler)
+
+        # WHEN
+        test_logger.info("line 1")
+        test_logger.info("line 2")
+        handler.close()
+
+        # THEN
+        assert log_file.read_text() == "line 1\nline 2\n"
+
+    def test_writes_compressed(self, test_logger: logging.Logger, tmp_path: Path) -> None:
+        # GIVEN
+        log_file = tmp_path / "session.log.gz"
+        handler = AsyncRotatingFileHandler(filename=log_file, compress=True)
+        _attach(test_logger, handler)
+
+        # WHEN
+        for i in range(1000):
+            test_logger.info("progress: frame %d rendered", i)
+        handler.close()
+
+        # THEN
+        expected = "".join(f"progress: frame {i} rendered\n" for i in range(1000))
+        assert gzip.decompress(log_file.read_bytes()).decode("utf-8") == expected
+        assert log_file.stat().st_size < len(expected) / 4
+
+    def test_flushed_compressed_file_is_readable_before_close(
+        self, test_logger: logging.Logger, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        log_file = tmp_path / "session.log.gz"
+        handler = AsyncRotatingFileHandler(filename=log_file, compress=True)
+        _attach(test_logger, handler)
+
+        try:
+            # WHEN
+            test_logger.info("line 1")
+            handler.flush()
+
+            # THEN
+            assert _read_partial_gzip(log_file) == "line 1\n"
+        finally:
+            handler.close()
+
+    def test_flushes_periodically(self, test_logger: logging.Logger, tmp_path: Path) -> None:
+        # GIVEN
+        log_file = tmp_path / "session.log.gz"
+        handler = AsyncRotatingFileHandler(filename=log_file, compress=True, flush_interval=0.01)
+        _attach(test_logger, handler)
+
+        try:
+            # WHEN
+            test_logger.info("line 1")
+
+            # THEN
+            for _ in range(500):
+                if log_file.stat().st_size > 0 and _read_partial_gzip(log_file) == "line 1\n":
+                    break
+                handler._writer.join(0.01)
+            else:
+                pytest.fail("The log file was not flushed")
+        finally:
+            handler.close()
+
+    def test_appends_to_existing_compressed_file(
+        self, test_logger: logging.Logger, tmp_path: Path
+    ) -> None:
+        # GIVEN
+        log_file = tmp_path / "session.log.gz"
+        first = AsyncRotatingFileHandler(filename=log_file, compress=True)
+        _attach(test_logger, first)
+        test_logger.info("before restart")
+        first.close()
+        test_logger.removeHandler(first)
+
+        # WHEN
+        second = AsyncRotatingFileHandler(filename=log_file, compress=True)
+        _attach(test_logger, second)
+        test_logger.info("after restart")
+        second.close()
+
+        # THEN
+        assert gzip.decompress(log_file.read_bytes()) == b"before restart\nafter restart\n"
+
+    @pytest.mark.parametrize(
+        argnames=("compress", "filename", "rotated_filenames"),
+        argvalues=(
+            pytest.param(False, "session.log", ["session.log.1", "session.log.2"], id="plain"),
+            pytest.param(
+                True, "session.log.gz", ["session.log.1.gz", "session.log.2.gz"], id="compressed"
+            ),
+        ),
+    )
+    def test_rotates(
+        self,
+        test_logger: logging.Logger,
+        tmp_path: Path,
+        compress: bool,
+        filename: str,
+        rotated_filenames: list[str],
+    ) -> None:
+        # GIVEN
+        log_file = tmp_path / filename
+        handler = AsyncRotatingFileHandler(
+            filename=log_file, compress=compress, max_bytes=100, backup_count=2
+        )
+        _attach(test_logger, handler)
+
+        # WHEN
+        with patch.object(local_file_mod, "_COMPRESSION_LEVEL", 0):
+            for _ in range(20):
+                # Flushing writes the compressed data so that the on-disk size is known
+                test_logger.info("x" * 40)
+                handler.flush()
+        handler.close()
+
+        # THEN
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+            [filename, *rotated_filenames]
+        )
+        for name in rotated_filenames:
+            content = (tmp_path / name).read_bytes()
+            if compress:
+                content = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16).decompress(content)
+            assert content
+            assert set(content.decode("utf-8").splitlines()) == {"x" * 40}
+
+    def test_write_error_is_logged_once(self, test_logger: logging.Logger, tmp_path: Path) -> None:
+        # GIVEN
+        handler = AsyncRotatingFileHandler(filename=tmp_path / "session.log")
+        _attach(test_logger, handler)
+
+        with (
+            patch.object(handler, "_size_on_disk", side_effect=OSError("disk full")),
+            patch.object(handler, "_max_bytes", 1),
+            patch.object(local_file_mod, "logger") as mock_logger,
+        ):
+            # WHEN
+            test_logger.info("line 1")
+            test_logger.info("line 2")
+            handler.flush()
+
+        handler.close()
+
+        # THEN
+        mock_logger.warning.assert_called_once()
+
+    def test_emit_after_close_is_ignored(self, test_logger: logging.Logger, tmp_path: Path) -> None:
+        # GIVEN
+        log_file = tmp_path / "session.log"
+        handler = AsyncRotatingFileHandler(filename=log_file)
+        _attach(test_logger, handler)
+        handler.close()
+
+        # WHEN
+        test_logger.info("line 1")
+        handler.flush()
+
+        # THEN
+        assert log_file.read_text() == ""
+
+    def test_max_bytes_must_be_positive(self, tmp_path: Path) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            AsyncRotatingFileHandler(filename=tmp_path / "session.log", max_bytes=0)
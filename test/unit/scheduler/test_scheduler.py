@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import timedelta
 from pathlib import Path
+from threading import Barrier, Event
 from typing import Generator, Optional
 from unittest.mock import ANY, MagicMock, Mock, call, patch
 
@@ -188,6 +190,54 @@ class TestSchedulerRun:
         # THEN
         drain_mock.assert_called_once()
 
+    def test_raises_orchestration_error(
+        self,
+        scheduler: WorkerScheduler,
+    ) -> None:
+        """Tests that an exception that stops the orchestration of Sessions exits the Scheduler,
+        and that orchestration is stopped before the Scheduler drains"""
+
+        # GIVEN
+        error = Exception("orchestration failed")
+        calls = MagicMock()
+        with (
+            patch.object(scheduler, "_session_orchestrator", calls.orchestrator),
+            patch.object(scheduler, "_drain_scheduler", calls.drain),
+            patch.object(scheduler, "_sync", return_value=0),
+        ):
+            calls.orchestrator.check.side_effect = error
+
+            # THEN
+            with pytest.raises(Exception) as raise_ctx:
+                # WHEN
+                scheduler.run()
+
+        # THEN
+        assert raise_ctx.value is error
+        assert calls.mock_calls[0] == call.orchestrator.start()
+        assert calls.mock_calls[-2:] == [call.orchestrator.stop(), call.drain()]
+
+    def test_runs_session_dir_janitor(
+        self,
+        scheduler: WorkerScheduler,
+    ) -> None:
+        """Tests that the session directory janitor runs while the Scheduler is running, and is
+        told which session directories are in use"""
+
+        # GIVEN
+        janitor = MagicMock()
+        scheduler._session_dir_janitor = janitor
+        with (
+            patch.object(scheduler._shutdown, "is_set", side_effect=[True]),
+            patch.object(scheduler, "_drain_scheduler"),
+        ):
+            # WHEN
+            scheduler.run()
+
+        # THEN
+        janitor.start.assert_called_once_with(active_session_dirs=scheduler._active_session_dirs)
+        janitor.stop.assert_called_once_with()
+
     @pytest.mark.parametrize(
         "exception", [Exception("a message"), DeadlineRequestError(Exception("inner"))]
     )
@@ -535,6 +585,35 @@ class TestSchedulerSync:
         # THEN
         logger_warning.assert_any_call("Service requested shutdown initiated")
 
+    def test_hands_response_to_orchestrator(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        """Tests that while the Scheduler is running, the response is handed to the session
+        orchestrator instead of being applied on the heartbeat thread"""
+
+        # GIVEN
+        response = {
+            "assignedSessions": {},
+            "cancelSessionActions": {},
+            "updateIntervalSeconds": 15,
+        }
+        mock_update_worker_schedule.return_value = response
+        with (
+            patch.object(scheduler, "_update_sessions") as update_sessions_mock,
+            patch.object(scheduler, "_session_orchestrator") as orchestrator_mock,
+        ):
+            orchestrator_mock.running = True
+
+            # WHEN
+            interval = scheduler._sync()
+
+        # THEN
+        assert interval == 15
+        orchestrator_mock.submit.assert_called_once_with(response)
+        update_sessions_mock.assert_not_called()
+
     def test_truncates_message(
         self, scheduler: WorkerScheduler, mock_update_worker_schedule: MagicMock
     ) -> None:
@@ -549,21 +628,20 @@ class TestSchedulerSync:
         expected_message = "x" * 4096
         assert len(expected_message) <= UPDATE_WORKER_SCHEDULE_MAX_MESSAGE_CHARS
 
-        # WHEN
-        with patch.object(
-            scheduler,
-            "_action_updates_map",
-            {
-                "id-123": SessionActionStatus(
+        scheduler._record_action_updates(
+            [
+                SessionActionStatus(
                     id="id-123",
                     status=ActionStatus(
                         state=ActionState.RUNNING,
                         status_message=original_message,
                     ),
                 ),
-            },
-        ):
-            scheduler._sync()
+            ]
+        )
+
+        # WHEN
+        scheduler._sync()
 
         # THEN
         mock_update_worker_schedule.assert_called_once_with(
@@ -686,6 +764,325 @@ class TestSchedulerSync:
             assert status_as_boto.get("processExitCode", "FAIL") == expected_result
 
 
+class TestSessionActionUpdateJournal:
+    """Tests for how WorkerScheduler records, replays and acknowledges journaled Session Action
+    updates"""
+
+    @pytest.fixture
+    def replayed_updates(self) -> dict:
+        return {}
+
+    @pytest.fixture
+    def journal(self, replayed_updates: dict) -> MagicMock:
+        journal = MagicMock()
+        journal.replayed_updates = replayed_updates
+        return journal
+
+    @pytest.fixture
+    def scheduler(
+        self,
+        farm_id: str,
+        fleet_id: str,
+        worker_id: str,
+        client: MagicMock,
+        job_run_as_user_overrides: JobsRunAsUserOverride,
+        boto_session: Mock,
+        worker_logs_dir: Path,
+        journal: MagicMock,
+    ) -> WorkerScheduler:
+        return WorkerScheduler(
+            farm_id=farm_id,
+            fleet_id=fleet_id,
+            worker_id=worker_id,
+            deadline=client,
+            job_run_as_user_override=job_run_as_user_overrides,
+            boto_session=boto_session,
+            cleanup_session_user_processes=True,
+            worker_persistence_dir=Path("/var/lib/deadline"),
+            worker_logs_dir=worker_logs_dir,
+            session_action_update_journal=journal,
+        )
+
+    @pytest.fixture
+    def mock_update_worker_schedule(self) -> Generator[MagicMock, None, None]:
+        with patch.object(scheduler_mod, "update_worker_schedule") as mock:
+            yield mock
+
+    def test_records_completed_updates(
+        self, scheduler: WorkerScheduler, journal: MagicMock
+    ) -> None:
+        # WHEN
+        scheduler._handle_session_action_update(
+            SessionActionStatus(id="running", status=ActionStatus(state=ActionState.RUNNING))
+        )
+        scheduler._handle_session_action_update(
+            SessionActionStatus(
+                id="done",
+                completed_status="SUCCEEDED",
+                status=ActionStatus(state=ActionState.SUCCESS, exit_code=0),
+            )
+        )
+
+        # THEN
+        journal.record.assert_called_once_with(
+            {"done": {"completedStatus": "SUCCEEDED", "processExitCode": 0}}
+        )
+
+    def test_records_failed_actions_of_stopped_session(
+        self, scheduler: WorkerScheduler, journal: MagicMock
+    ) -> None:
+        # WHEN
+        scheduler._return_sessionactions_from_stopped_session(
+            assigned_session_actions=[
+                TaskRunAction(
+                    sessionActionId="AA", actionType="TASK_RUN", stepId="step-1", taskId="task-1"
+                ),
+                TaskRunAction(
+                    sessionActionId="BB", actionType="TASK_RUN", stepId="step-1", taskId="task-1"
+                ),
+            ],
+            failure_message="failed",
+        )
+
+        # THEN
+        recorded = {
+            action_id: update["completedStatus"]
+            for args in journal.record.call_args_list
+            for action_id, update in args.args[0].items()
+        }
+        assert recorded == {"AA": "FAILED", "BB": "NEVER_ATTEMPTED"}
+
+    def test_sync_acknowledges_completed_updates(
+        self,
+        scheduler: WorkerScheduler,
+        journal: MagicMock,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._record_action_updates(
+            [
+                SessionActionStatus(id="running", status=ActionStatus(state=ActionState.RUNNING)),
+                SessionActionStatus(
+                    id="done",
+                    completed_status="SUCCEEDED",
+                    status=ActionStatus(state=ActionState.SUCCESS),
+                ),
+            ]
+        )
+        journal.record.reset_mock()
+        manager = MagicMock()
+        manager.attach_mock(journal.sync, "sync")
+        manager.attach_mock(mock_update_worker_schedule, "update_worker_schedule")
+        manager.attach_mock(journal.acknowledge, "acknowledge")
+
+        # WHEN
+        scheduler._sync()
+
+        # THEN
+        assert [name for name, _, _ in manager.mock_calls if "." not in name] == [
+            "sync",
+            "update_worker_schedule",
+            "acknowledge",
+        ]
+        journal.acknowledge.assert_called_once_with(["done"])
+
+    @pytest.mark.parametrize("replayed_updates", [{"AA": {"completedStatus": "SUCCEEDED"}}])
+    def test_sync_sends_replayed_updates(
+        self,
+        scheduler: WorkerScheduler,
+        journal: MagicMock,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # WHEN
+        scheduler._sync()
+
+        # THEN
+        mock_update_worker_schedule.assert_called_once()
+        assert mock_update_worker_schedule.call_args.kwargs["updated_session_actions"] == {
+            "AA": {"completedStatus": "SUCCEEDED"}
+        }
+        journal.acknowledge.assert_called_once_with(["AA"])
+        assert scheduler._replayed_action_updates == {}
+
+    def test_sync_drops_replayed_updates_on_unrecoverable_error(
+        self,
+        scheduler: WorkerScheduler,
+        journal: MagicMock,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._replayed_action_updates = {"AA": {"completedStatus": "SUCCEEDED"}}
+        scheduler._record_action_updates(
+            [SessionActionStatus(id="BB", status=ActionStatus(state=ActionState.RUNNING))]
+        )
+        mock_update_worker_schedule.side_effect = [
+            DeadlineRequestUnrecoverableError(Exception("Session not found")),
+            MagicMock(),
+        ]
+
+        # WHEN
+        scheduler._sync()
+
+        # THEN
+        assert mock_update_worker_schedule.call_count == 2
+        assert (
+            "AA" in mock_update_worker_schedule.call_args_list[0].kwargs["updated_session_actions"]
+        )
+        assert mock_update_worker_schedule.call_args_list[1].kwargs["updated_session_actions"] == {
+            "BB": {}
+        }
+        journal.acknowledge.assert_any_call(["AA"])
+        assert scheduler._replayed_action_updates == {}
+
+    def test_sync_sends_updates_in_chunks(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._record_action_updates(
+            SessionActionStatus(id=f"action-{i}", completed_status="NEVER_ATTEMPTED")
+            for i in range(5)
+        )
+
+        with patch.object(scheduler_mod, "UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS", 2):
+            # WHEN
+            scheduler._sync()
+
+            # THEN
+            assert list(
+                mock_update_worker_schedule.call_args.kwargs["updated_session_actions"]
+            ) == ["action-0", "action-1"]
+            assert scheduler._unsent_action_updates == 3
+
+            # WHEN
+            scheduler._sync()
+            scheduler._sync()
+
+        # THEN
+        assert list(mock_update_worker_schedule.call_args.kwargs["updated_session_actions"]) == [
+            "action-4"
+        ]
+        assert scheduler._unsent_action_updates == 0
+        assert scheduler._action_updates_map == {}
+
+    def test_sync_sends_completed_updates_first(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._record_action_updates(
+            [
+                SessionActionStatus(id="running", status=ActionStatus(state=ActionState.RUNNING)),
+                SessionActionStatus(id="done", completed_status="SUCCEEDED"),
+            ]
+        )
+
+        with patch.object(scheduler_mod, "UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS", 1):
+            # WHEN
+            scheduler._sync()
+
+        # THEN
+        assert mock_update_worker_schedule.call_args.kwargs["updated_session_actions"] == {
+            "done": {"completedStatus": "SUCCEEDED"}
+        }
+        assert list(scheduler._action_updates_map) == ["running"]
+
+    def test_sync_bounds_request_size(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._record_action_updates(
+            SessionActionStatus(
+                id=f"action-{i}",
+                status=ActionStatus(state=ActionState.RUNNING, status_message="x" * 1000),
+            )
+            for i in range(3)
+        )
+
+        with patch.object(scheduler_mod, "UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS_BYTES", 3000):
+            # WHEN
+            scheduler._sync()
+
+        # THEN
+        assert list(mock_update_worker_schedule.call_args.kwargs["updated_session_actions"]) == [
+            "action-0",
+            "action-1",
+        ]
+        assert scheduler._unsent_action_updates == 1
+
+    def test_sync_keeps_update_recorded_while_in_flight(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._record_action_updates(
+            [SessionActionStatus(id="AA", status=ActionStatus(state=ActionState.RUNNING))]
+        )
+        completed = SessionActionStatus(id="AA", completed_status="SUCCEEDED")
+
+        def record_completion(**kwargs) -> MagicMock:
+            scheduler._record_action_updates([completed])
+            return MagicMock()
+
+        mock_update_worker_schedule.side_effect = record_completion
+
+        # WHEN
+        scheduler._sync()
+
+        # THEN
+        assert scheduler._action_updates_map == {"AA": completed}
+        assert scheduler._completed_action_updates == {"AA": {"completedStatus": "SUCCEEDED"}}
+        assert scheduler._progress_action_updates == {}
+
+    def test_drain_sends_all_updates(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        scheduler._record_action_updates(
+            SessionActionStatus(id=f"action-{i}", completed_status="NEVER_ATTEMPTED")
+            for i in range(5)
+        )
+
+        with (
+            patch.object(scheduler_mod, "UPDATE_WORKER_SCHEDULE_MAX_UPDATED_ACTIONS", 2),
+            patch.object(scheduler, "_shutdown_sessions", return_value=[MagicMock()]),
+            patch.object(scheduler, "_transition_to_stopping"),
+            patch.object(scheduler_mod, "wait"),
+        ):
+            scheduler._shutdown.set()
+
+            # WHEN
+            scheduler._drain_scheduler()
+
+        # THEN
+        assert mock_update_worker_schedule.call_count == 3
+        assert scheduler._action_updates_map == {}
+
+    def test_sync_raises_unrecoverable_error_without_replayed_updates(
+        self,
+        scheduler: WorkerScheduler,
+        mock_update_worker_schedule: MagicMock,
+    ) -> None:
+        # GIVEN
+        error = DeadlineRequestUnrecoverableError(Exception("Access denied"))
+        mock_update_worker_schedule.side_effect = error
+
+        # WHEN
+        with pytest.raises(DeadlineRequestUnrecoverableError) as raise_ctx:
+            scheduler._sync()
+
+        # THEN
+        assert raise_ctx.value is error
+        mock_update_worker_schedule.assert_called_once()
+
+
 class TestCreateNewSessions:
     """Tests for WorkerScheduler._create_new_sessions"""
 
@@ -1203,6 +1600,255 @@ class TestCreateNewSessions:
         else:
             assert scheduler._sessions[session_id].session.os_user is job_user
 
+    def test_provisions_sessions_concurrently(
+        self,
+        scheduler: WorkerScheduler,
+        worker_logs_dir: Path,
+        mock_session: MockSession,
+    ) -> None:
+        """Tests that Sessions assigned in the same cycle are provisioned concurrently, and that
+        Sessions for the same Job share a single request for the Job's details.
+        """
+        # GIVEN
+        job_id = "job-abcdef0123456789abcdef0123456789"
+        session_ids = [f"session-{i}" for i in range(3)]
+        assigned_sessions: dict[str, AssignedSession] = {
+            session_id: AssignedSession(
+                queueId="queue-abcdef0123456789abcdef0123456789",
+                jobId=job_id,
+                logConfiguration=LogConfiguration(
+                    logDriver="awslogs",
+                    options={
+                        "logGroupName": "logGroup",
+                        "logStreamName": "logStreamName",
+                    },
+                    parameters={
+                        "interval": "15",
+                    },
+                ),
+                sessionActions=[
+                    EnvironmentAction(
+                        actionType="ENV_ENTER",
+                        environmentId="env-1",
+                        sessionActionId=f"{session_id}-action-1",
+                    ),
+                ],
+            )
+            for session_id in session_ids
+        }
+        scheduler._job_run_as_user_override = JobsRunAsUserOverride(run_as_agent=True)
+        # All of the Sessions must be provisioning at the same time to pass this barrier
+        barrier = Barrier(len(session_ids), timeout=5)
+
+        def wait_for_barrier(*, queue_id: str) -> Path:
+            barrier.wait()
+            return worker_logs_dir
+
+        job_entity_mock = MagicMock()
+        job_entity_mock.job_details.return_value = JobDetails(
+            log_group_name="/aws/deadline/queue-0000",
+            schema_version=SpecificationRevision.v2023_09,
+        )
+
+        with (
+            patch.object(scheduler_mod, "JobEntities", return_value=job_entity_mock),
+            patch.object(scheduler, "_queue_log_dir_path", side_effect=wait_for_barrier),
+            patch.object(scheduler_mod.LogConfiguration, "from_boto"),
+            patch.object(scheduler, "_executor") as mock_executor,
+        ):
+            # WHEN
+            created = scheduler._create_new_sessions(assigned_sessions=assigned_sessions)
+
+        # THEN
+        assert created == set(session_ids)
+        assert set(scheduler._sessions.keys()) == set(session_ids)
+        job_entity_mock.job_details.assert_called_once_with()
+        assert mock_executor.submit.call_count == len(session_ids)
+        assert not scheduler._action_updates_map
+
+    def test_gives_sessions_cache_dir(
+        self,
+        scheduler: WorkerScheduler,
+        tmp_path: Path,
+        mock_session: MockSession,
+    ) -> None:
+        """Tests that Sessions are given their Queue's session cache directory in their
+        environment, and that the Queue's cache is in use while they run"""
+        # GIVEN
+        queue_id = "queue-abcdef0123456789abcdef0123456789"
+        assigned_sessions: dict[str, AssignedSession] = {
+            "session-1": AssignedSession(
+                queueId=queue_id,
+                jobId="job-abcdef0123456789abcdef0123456789",
+                logConfiguration=LogConfiguration(
+                    logDriver="awslogs",
+                    options={"logGroupName": "logGroup", "logStreamName": "logStreamName"},
+                    parameters={"interval": "15"},
+                ),
+                sessionActions=[
+                    EnvironmentAction(
+                        actionType="ENV_ENTER",
+                        environmentId="env-1",
+                        sessionActionId="action-1",
+                    ),
+                ],
+            )
+        }
+        scheduler._job_run_as_user_override = JobsRunAsUserOverride(run_as_agent=True)
+        session_cache = MagicMock()
+        session_cache.prepare_queue_dir.return_value = tmp_path / queue_id
+        scheduler._session_cache = session_cache
+        job_entity_mock = MagicMock()
+        job_entity_mock.job_details.return_value = JobDetails(
+            log_group_name="/aws/deadline/queue-0000",
+            schema_version=SpecificationRevision.v2023_09,
+        )
+
+        with (
+            patch.object(scheduler_mod, "JobEntities", return_value=job_entity_mock),
+            patch.object(scheduler_mod.LogConfiguration, "from_boto"),
+            patch.object(scheduler, "_executor"),
+            patch.object(scheduler_mod, "Session", wraps=MockSession) as session_cls,
+        ):
+            # WHEN
+            scheduler._create_new_sessions(assigned_sessions=assigned_sessions)
+
+        # THEN
+        session_cache.prepare_queue_dir.assert_called_once_with(queue_id=queue_id, os_user=None)
+        session_cache.acquire.assert_called_once_with(queue_id=queue_id)
+        session_cls.assert_called_once()
+        env = session_cls.call_args.kwargs["env"]
+        assert env["DEADLINE_SESSION_CACHE_DIR"] == str(tmp_path / queue_id)
+
+    def test_session_cache_dir_error(
+        self,
+        scheduler: WorkerScheduler,
+        mock_session: MockSession,
+    ) -> None:
+        """Tests that Sessions run without a cache directory when it can not be created"""
+        # GIVEN
+        assigned_sessions: dict[str, AssignedSession] = {
+            "session-1": AssignedSession(
+                queueId="queue-abcdef0123456789abcdef0123456789",
+                jobId="job-abcdef0123456789abcdef0123456789",
+                logConfiguration=LogConfiguration(
+                    logDriver="awslogs",
+                    options={"logGroupName": "logGroup", "logStreamName": "logStreamName"},
+                    parameters={"interval": "15"},
+                ),
+                sessionActions=[],
+            )
+        }
+        scheduler._job_run_as_user_override = JobsRunAsUserOverride(run_as_agent=True)
+        session_cache = MagicMock()
+        session_cache.prepare_queue_dir.side_effect = PermissionError("denied")
+        scheduler._session_cache = session_cache
+        job_entity_mock = MagicMock()
+        job_entity_mock.job_details.return_value = JobDetails(
+            log_group_name="/aws/deadline/queue-0000",
+            schema_version=SpecificationRevision.v2023_09,
+        )
+
+        with (
+            patch.object(scheduler_mod, "JobEntities", return_value=job_entity_mock),
+            patch.object(scheduler_mod.LogConfiguration, "from_boto"),
+            patch.object(scheduler, "_executor"),
+            patch.object(scheduler_mod, "Session", wraps=MockSession) as session_cls,
+        ):
+            # WHEN
+            scheduler._create_new_sessions(assigned_sessions=assigned_sessions)
+
+        # THEN
+        session_cls.assert_called_once()
+        assert "DEADLINE_SESSION_CACHE_DIR" not in session_cls.call_args.kwargs["env"]
+
+    def test_places_session_root_dir(
+        self,
+        scheduler: WorkerScheduler,
+        mock_session: MockSession,
+    ) -> None:
+        """Tests that Sessions are created in the directory chosen by the session root placer"""
+        # GIVEN
+        assigned_sessions: dict[str, AssignedSession] = {
+            "session-1": AssignedSession(
+                queueId="queue-abcdef0123456789abcdef0123456789",
+                jobId="job-abcdef0123456789abcdef0123456789",
+                logConfiguration=LogConfiguration(
+                    logDriver="awslogs",
+                    options={"logGroupName": "logGroup", "logStreamName": "logStreamName"},
+                    parameters={"interval": "15"},
+                ),
+                sessionActions=[],
+            )
+        }
+        scheduler._job_run_as_user_override = JobsRunAsUserOverride(run_as_agent=True)
+        placer = MagicMock()
+        placer.choose.return_value = Path("/mnt/nvme1/sessions")
+        scheduler._session_root_placer = placer
+        job_entity_mock = MagicMock()
+        job_entity_mock.job_details.return_value = JobDetails(
+            log_group_name="/aws/deadline/queue-0000",
+            schema_version=SpecificationRevision.v2023_09,
+        )
+
+        with (
+            patch.object(scheduler_mod, "JobEntities", return_value=job_entity_mock),
+            patch.object(scheduler_mod.LogConfiguration, "from_boto"),
+            patch.object(scheduler, "_executor"),
+            patch.object(scheduler_mod, "Session", wraps=MockSession) as session_cls,
+        ):
+            # WHEN
+            scheduler._create_new_sessions(assigned_sessions=assigned_sessions)
+
+        # THEN
+        placer.choose.assert_called_once_with()
+        session_cls.assert_called_once()
+        assert session_cls.call_args.kwargs["session_root_dir"] == Path("/mnt/nvme1/sessions")
+
+    def test_gives_sessions_dir_janitor(
+        self,
+        scheduler: WorkerScheduler,
+        mock_session: MockSession,
+    ) -> None:
+        """Tests that Sessions are given the session directory janitor, and that their working
+        directories are reported as active until they are removed"""
+        # GIVEN
+        assigned_sessions: dict[str, AssignedSession] = {
+            "session-1": AssignedSession(
+                queueId="queue-abcdef0123456789abcdef0123456789",
+                jobId="job-abcdef0123456789abcdef0123456789",
+                logConfiguration=LogConfiguration(
+                    logDriver="awslogs",
+                    options={"logGroupName": "logGroup", "logStreamName": "logStreamName"},
+                    parameters={"interval": "15"},
+                ),
+                sessionActions=[],
+            )
+        }
+        scheduler._job_run_as_user_override = JobsRunAsUserOverride(run_as_agent=True)
+        janitor = MagicMock()
+        scheduler._session_dir_janitor = janitor
+        job_entity_mock = MagicMock()
+        job_entity_mock.job_details.return_value = JobDetails(
+            log_group_name="/aws/deadline/queue-0000",
+            schema_version=SpecificationRevision.v2023_09,
+        )
+
+        with (
+            patch.object(scheduler_mod, "JobEntities", return_value=job_entity_mock),
+            patch.object(scheduler_mod.LogConfiguration, "from_boto"),
+            patch.object(scheduler, "_executor"),
+            patch.object(scheduler_mod, "Session", wraps=MockSession) as session_cls,
+        ):
+            # WHEN
+            scheduler._create_new_sessions(assigned_sessions=assigned_sessions)
+
+        # THEN
+        session_cls.assert_called_once()
+        assert session_cls.call_args.kwargs["session_dir_janitor"] is janitor
+        session = scheduler._sessions["session-1"].session
+        assert scheduler._active_session_dirs() == [session.working_directory]
+
     class MockSessionUser(SessionUser):
         user: str
 
@@ -1467,6 +2113,46 @@ class TestQueueAwsCredentialsManagement:
             )
             assert scheduler._queue_aws_credentials[hash_key] is result
 
+    def test_concurrent_requests_share_new_credentials(
+        self,
+        scheduler: WorkerScheduler,
+    ) -> None:
+        """Test that concurrent calls to _get_queue_aws_credentials for the same Queue only create
+        a single set of Queue credentials.
+        """
+
+        # GIVEN
+        queue_id = "queue-123456"
+        role_arn = "arn:aws:...:RoleArn!"
+        creating = Event()
+        release = Event()
+
+        def slow_create(**kwargs) -> MagicMock:
+            creating.set()
+            release.wait(timeout=5)
+            return MagicMock()
+
+        with (
+            patch.object(scheduler_mod, "QueueBoto3Session", side_effect=slow_create) as mock_cls,
+            patch.object(scheduler_mod, "AwsCredentialsRefresher"),
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            # WHEN
+            first = executor.submit(
+                scheduler._get_queue_aws_credentials, queue_id, role_arn, "session-1", None
+            )
+            assert creating.wait(timeout=5)
+            second = executor.submit(
+                scheduler._get_queue_aws_credentials, queue_id, role_arn, "session-2", None
+            )
+            release.set()
+            results = [first.result(timeout=5), second.result(timeout=5)]
+
+        # THEN
+        mock_cls.assert_called_once()
+        assert results[0] is not None
+        assert results[0] is results[1]
+
     @pytest.mark.parametrize(
         "exception",
         [
@@ -1525,6 +2211,182 @@ class TestQueueAwsCredentialsManagement:
             assert len(scheduler._queue_aws_credentials) == 0
 
 
+class TestUpdateSessionActionsFromScheduler:
+    """Tests for WorkerScheduler._update_session_actions_from_scheduler()"""
+
+    @pytest.fixture
+    def scheduler_session(self, scheduler: WorkerScheduler) -> MagicMock:
+        scheduler_session = MagicMock()
+        # The Session is running
+        scheduler_session.future.exception.side_effect = FutureTimeoutError()
+        scheduler._sessions = SessionMap({"session-1": scheduler_session})
+        return scheduler_session
+
+    @staticmethod
+    def _assigned_session(*action_ids: str) -> AssignedSession:
+        return AssignedSession(
+            queueId="queue-1",
+            jobId="job-1",
+            sessionActions=[
+                TaskRunAction(
+                    actionType="TASK_RUN",
+                    sessionActionId=action_id,
+                    stepId="step-1",
+                    taskId=f"task-{action_id}",
+                )
+                for action_id in action_ids
+            ],
+        )
+
+    def test_skips_unchanged_assignment(
+        self, scheduler: WorkerScheduler, scheduler_session: MagicMock
+    ) -> None:
+        # GIVEN
+        scheduler._update_session_actions_from_scheduler(
+            assigned_sessions={"session-1": self._assigned_session("action-1", "action-2")},
+            canceled_session_action={},
+        )
+
+        # WHEN
+        scheduler._update_session_actions_from_scheduler(
+            assigned_sessions={"session-1": self._assigned_session("action-1", "action-2")},
+            canceled_session_action={"session-1": ["action-2"]},
+        )
+
+        # THEN
+        scheduler_session.session.replace_assigned_actions.assert_called_once()
+        # Cancelations are still applied
+        scheduler_session.session.cancel_actions.assert_called_once_with(action_ids=["action-2"])
+
+    def test_replaces_changed_assignment(
+        self, scheduler: WorkerScheduler, scheduler_session: MagicMock
+    ) -> None:
+        # GIVEN
+        scheduler._update_session_actions_from_scheduler(
+            assigned_sessions={"session-1": self._assigned_session("action-1", "action-2")},
+            canceled_session_action={},
+        )
+        assigned_session = self._assigned_session("action-2", "action-3")
+
+        # WHEN
+        scheduler._update_session_actions_from_scheduler(
+            assigned_sessions={"session-1": assigned_session},
+            canceled_session_action={},
+        )
+
+        # THEN
+        assert scheduler_session.session.replace_assigned_actions.call_count == 2
+        scheduler_session.session.replace_assigned_actions.assert_called_with(
+            actions=assigned_session["sessionActions"]
+        )
+        assert scheduler._assigned_action_ids["session-1"] == ("action-2", "action-3")
+
+    def test_stopped_session_forgets_assignment(
+        self, scheduler: WorkerScheduler, scheduler_session: MagicMock
+    ) -> None:
+        # GIVEN
+        scheduler._assigned_action_ids["session-1"] = ("action-1",)
+        scheduler_session.future.exception.side_effect = None
+        scheduler_session.future.exception.return_value = Exception("Session failed")
+
+        with patch.object(
+            scheduler, "_return_sessionactions_from_stopped_session"
+        ) as mock_return_actions:
+            # WHEN
+            scheduler._update_session_actions_from_scheduler(
+                assigned_sessions={"session-1": self._assigned_session("action-1")},
+                canceled_session_action={},
+            )
+
+        # THEN
+        mock_return_actions.assert_called_once()
+        scheduler_session.session.replace_assigned_actions.assert_not_called()
+        assert "session-1" not in scheduler._assigned_action_ids
+
+
+class TestRemoveFinishedSessions:
+    """Tests for WorkerScheduler._remove_finished_sessions()"""
+
+    def test_tears_down_sessions_in_background(
+        self,
+        scheduler: WorkerScheduler,
+    ) -> None:
+        """Tests that Sessions that are no longer assigned are stopped by a background reaper
+        without blocking the scheduler, and that they are only removed from the SessionMap once
+        the reaper has completed.
+        """
+        # GIVEN
+        release_wait = Event()
+        scheduler_session = MagicMock()
+        scheduler_session.session.wait.side_effect = lambda: release_wait.wait(timeout=5)
+        scheduler._sessions = SessionMap({"session-1": scheduler_session})
+        scheduler._assigned_action_ids["session-1"] = ("action-1",)
+
+        with patch.object(scheduler._sessions, "deregister_session_user") as mock_deregister:
+            # WHEN
+            scheduler._remove_finished_sessions(assigned_sessions={})
+
+            # THEN
+            assert "session-1" in scheduler._sessions
+            reaper = scheduler._session_reapers["session-1"]
+            assert not reaper.done()
+
+            # WHEN
+            release_wait.set()
+            reaper.result(timeout=5)
+            scheduler._remove_finished_sessions(assigned_sessions={})
+
+        # THEN
+        scheduler_session.session.stop.assert_called_once_with(grace_time=timedelta())
+        scheduler_session.session.wait.assert_called_once_with()
+        mock_deregister.assert_called_once_with(scheduler_session)
+        assert "session-1" not in scheduler._sessions
+        assert not scheduler._session_reapers
+        assert "session-1" not in scheduler._assigned_action_ids
+
+    def test_releases_session_cache(
+        self,
+        scheduler: WorkerScheduler,
+    ) -> None:
+        """Tests that the Queue's session cache is released once a Session is removed"""
+        # GIVEN
+        scheduler_session = MagicMock()
+        scheduler_session.session._queue_id = "queue-1"
+        scheduler._sessions = SessionMap({"session-1": scheduler_session})
+        reaper = MagicMock()
+        reaper.done.return_value = True
+        reaper.exception.return_value = None
+        scheduler._session_reapers["session-1"] = reaper
+        session_cache = MagicMock()
+        scheduler._session_cache = session_cache
+
+        # WHEN
+        scheduler._remove_finished_sessions(assigned_sessions={"session-1": MagicMock()})
+
+        # THEN
+        session_cache.release.assert_called_once_with(queue_id="queue-1")
+
+    def test_does_not_reap_twice(
+        self,
+        scheduler: WorkerScheduler,
+    ) -> None:
+        """Tests that a Session that is already being torn down is not reaped again"""
+        # GIVEN
+        scheduler_session = MagicMock()
+        scheduler._sessions = SessionMap({"session-1": scheduler_session})
+        reaper = MagicMock()
+        reaper.done.return_value = False
+        scheduler._session_reapers["session-1"] = reaper
+
+        with patch.object(scheduler, "_executor") as mock_executor:
+            # WHEN
+            scheduler._remove_finished_sessions(assigned_sessions={})
+
+        # THEN
+        mock_executor.submit.assert_not_called()
+        assert "session-1" in scheduler._sessions
+
+
 class TestShutdownSessions:
     """Test cases for the WorkerScheduler._shutdown_sessions() method"""
 
@@ -1591,6 +2453,26 @@ class TestShutdownSessions:
         executor_submit.assert_has_calls(expected_executor_calls)
         assert len(expected_executor_calls) == executor_submit.call_count
 
+    def test_waits_for_sessions_lock(self, scheduler: WorkerScheduler) -> None:
+        """Tests that the Sessions are read under the sessions lock, since this is called from
+        other threads while the assignments are applied"""
+        # GIVEN
+        scheduler._sessions = SessionMap({"session-1": MagicMock()})
+
+        with (
+            patch.object(scheduler, "_executor") as mock_executor,
+            ThreadPoolExecutor(max_workers=1) as executor,
+        ):
+            with scheduler._sessions_lock:
+                # WHEN
+                future = executor.submit(scheduler._shutdown_sessions, None, None)
+
+                # THEN
+                with pytest.raises(FutureTimeoutError):
+                    future.result(timeout=0.1)
+                mock_executor.submit.assert_not_called()
+            assert len(future.result(timeout=5)) == 1
+
 
 class TestShutdown:
     """Test cases for WorkerScheduler.shutdown()"""
@@ -0,0 +1,197 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+
+import pytest
+
+from deadline_worker_agent.api_models import UpdatedSessionActionInfo
+from deadline_worker_agent.scheduler.session_action_journal import (
+    SESSION_ACTION_JOURNAL_FILENAME,
+    SessionActionUpdateJournal,
+)
+import deadline_worker_agent.scheduler.session_action_journal as journal_mod
+
+
+@pytest.fixture
+def journal_path(tmp_path: Path) -> Path:
+    return tmp_path / SESSION_ACTION_JOURNAL_FILENAME
+
+
+def _update(status: str = "SUCCEEDED") -> UpdatedSessionActionInfo:
+    return {
+        "completedStatus": status,  # type: ignore[typeddict-item]
+        "processExitCode": 0,
+        "startedAt": datetime(2024, 3, 17, 19, 8, 19, tzinfo=timezone.utc),
+        "endedAt": datetime(2024, 3, 17, 21, 8, 19, tzinfo=timezone.utc),
+    }
+
+
+class TestSessionActionUpdateJournal:
+    def test_new_journal_has_nothing_to_replay(self, journal_path: Path) -> None:
+        # WHEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+
+        # THEN
+        assert journal.replayed_updates == {}
+        assert journal_path.exists()
+        journal.close()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_journal_is_private(self, journal_path: Path) -> None:
+        # WHEN
+        SessionActionUpdateJournal(path=journal_path, worker_id="worker-1").close()
+
+        # THEN
+        assert journal_path.stat().st_mode & 0o777 == 0o600
+
+    def test_replays_unacknowledged_updates(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        journal.record({"AA": _update(), "BB": _update("FAILED")})
+        journal.record({"CC": _update()})
+        journal.acknowledge(["BB"])
+        journal.sync()
+        # The agent crashes without closing the journal
+
+        # WHEN
+        replayed = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+
+        # THEN
+        assert replayed.replayed_updates == {"AA": _update(), "CC": _update()}
+        replayed.close()
+        journal.close()
+
+    def test_acknowledging_replayed_updates_compacts(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        journal.record({"AA": _update()})
+        journal.close()
+        replayed = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+
+        # WHEN
+        replayed.acknowledge(["AA", "unknown"])
+
+        # THEN
+        assert replayed.replayed_updates == {}
+        assert journal_path.read_text().splitlines() == [json.dumps({"worker_id": "worker-1"})]
+        replayed.close()
+
+    def test_compacts_when_mostly_acknowledged(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        journal.record({"pending": _update()})
+        for i in range(journal_mod._MIN_RECORDS_BEFORE_COMPACTION):
+            journal.record({f"action-{i}": _update()})
+
+        # WHEN
+        journal.acknowledge(
+            f"action-{i}" for i in range(journal_mod._MIN_RECORDS_BEFORE_COMPACTION)
+        )
+
+        # THEN
+        lines = journal_path.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[1])["update"]["id"] == "pending"
+        journal.close()
+
+    def test_appends_acknowledgements_below_compaction_threshold(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        journal.record({"AA": _update(), "BB": _update()})
+
+        # WHEN
+        journal.acknowledge(["AA"])
+
+        # THEN
+        lines = journal_path.read_text().splitlines()
+        assert len(lines) == 4
+        assert json.loads(lines[-1]) == {"ack": ["AA"]}
+        journal.close()
+
+    def test_discards_journal_of_other_worker(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        journal.record({"AA": _update()})
+        journal.close()
+
+        # WHEN
+        other = SessionActionUpdateJournal(path=journal_path, worker_id="worker-2")
+
+        # THEN
+        assert other.replayed_updates == {}
+        assert journal_path.read_text().splitlines() == [json.dumps({"worker_id": "worker-2"})]
+        other.close()
+
+    def test_skips_corrupt_records(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        journal.record({"AA": _update()})
+        journal.close()
+        with journal_path.open("a") as file:
+            # A record that was partially written when the agent crashed
+            file.write('{"update": {"id": "BB", "in')
+
+        # WHEN
+        with patch.object(journal_mod, "logger") as logger_mock:
+            replayed = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+
+        # THEN
+        assert replayed.replayed_updates == {"AA": _update()}
+        logger_mock.warning.assert_called_once()
+        replayed.close()
+
+    def test_sync_fsyncs_only_when_dirty(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+
+        with patch.object(journal_mod.os, "fsync", wraps=os.fsync) as fsync_mock:
+            # WHEN
+            journal.sync()
+            journal.record({"AA": _update()})
+            journal.record({"BB": _update()})
+            journal.sync()
+            journal.sync()
+
+        # THEN
+        fsync_mock.assert_called_once()
+        journal.close()
+
+    def test_disabled_when_unwritable(self, tmp_path: Path) -> None:
+        # GIVEN
+        journal_path = tmp_path / "missing" / SESSION_ACTION_JOURNAL_FILENAME
+
+        # WHEN
+        with patch.object(journal_mod, "logger") as logger_mock:
+            journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+            journal.record({"AA": _update()})
+            journal.sync()
+            journal.acknowledge(["AA"])
+
+        # THEN
+        assert journal.replayed_updates == {}
+        logger_mock.warning.assert_called_once()
+        assert not journal_path.exists()
+
+    def test_disabled_after_write_error(self, journal_path: Path) -> None:
+        # GIVEN
+        journal = SessionActionUpdateJournal(path=journal_path, worker_id="worker-1")
+        file_mock = MagicMock()
+        file_mock.flush.side_effect = OSError("No space left on device")
+        journal._file = file_mock
+
+        # WHEN
+        with patch.object(journal_mod, "logger") as logger_mock:
+            journal.record({"AA": _update()})
+            journal.record({"BB": _update()})
+
+        # THEN
+        logger_mock.warning.assert_called_once()
+        file_mock.close.assert_called_once()
+        assert journal._file is None
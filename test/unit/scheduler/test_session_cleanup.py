@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import Event
 from typing import Generator
 from unittest.mock import MagicMock, patch
 import subprocess
@@ -130,6 +132,68 @@ class TestSessionUserCleanupManager:
             user_session_map_lock_mock.__enter__.assert_not_called()
             user_session_map_lock_mock.__exit__.assert_not_called()
 
+        def test_deregister_cleans_up_outside_lock(
+            self,
+            manager: SessionUserCleanupManager,
+            session: MagicMock,
+            os_user: SessionUser,
+        ):
+            # GIVEN
+            manager.register(session)
+
+            def assert_unlocked(user: SessionUser) -> None:
+                assert not manager._user_session_map_lock.locked()
+
+            with patch.object(
+                manager, "_cleanup_session_user", side_effect=assert_unlocked
+            ) as cleanup_mock:
+                # WHEN
+                manager.deregister(session)
+
+            # THEN
+            cleanup_mock.assert_called_once_with(os_user)
+            assert manager._user_cleanups[os_user.user].is_set()
+
+        def test_register_waits_for_user_cleanup(
+            self,
+            manager: SessionUserCleanupManager,
+            session: MagicMock,
+            os_user: SessionUser,
+        ):
+            # GIVEN
+            manager.register(session)
+            cleanup_started = Event()
+            release_cleanup = Event()
+
+            def blocking_cleanup(user: SessionUser) -> None:
+                cleanup_started.set()
+                release_cleanup.wait(timeout=5)
+
+            new_session = MagicMock()
+            new_session.os_user = os_user
+            new_session.id = "session-456"
+
+            with (
+                patch.object(manager, "_cleanup_session_user", side_effect=blocking_cleanup),
+                ThreadPoolExecutor(max_workers=2) as executor,
+            ):
+                deregister_future = executor.submit(manager.deregister, session)
+                assert cleanup_started.wait(timeout=5)
+
+                # WHEN
+                register_future = executor.submit(manager.register, new_session)
+
+                # THEN
+                with pytest.raises(FutureTimeoutError):
+                    register_future.result(timeout=0.2)
+                release_cleanup.set()
+                deregister_future.result(timeout=5)
+                register_future.result(timeout=5)
+
+            registered_sessions = dict(manager.registered_sessions)
+            assert registered_sessions[os_user.user] == {new_session.id: new_session}
+            assert os_user.user not in manager._user_cleanups
+
     class TestCleanupSessionUser:
         @pytest.fixture
         def cleanup_session_user_processes_mock(self) -> Generator[MagicMock, None, None]:
@@ -0,0 +1,154 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from threading import Event
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from deadline_worker_agent.scheduler.session_orchestrator import SessionOrchestrator
+import deadline_worker_agent.scheduler.session_orchestrator as orchestrator_mod
+
+
+def _response(
+    session_ids: list[str], cancel_session_actions: dict[str, list[str]] | None = None
+) -> Any:
+    return {
+        "assignedSessions": {session_id: MagicMock() for session_id in session_ids},
+        "cancelSessionActions": cancel_session_actions or {},
+        "updateIntervalSeconds": 15,
+    }
+
+
+class TestSessionOrchestrator:
+    def test_applies_on_orchestration_thread(self) -> None:
+        # GIVEN
+        applied = Event()
+        apply = MagicMock(side_effect=lambda response: applied.set())
+        orchestrator = SessionOrchestrator(apply=apply, wakeup=Event())
+        response = _response(["session-1"])
+        orchestrator.start()
+
+        try:
+            # WHEN
+            orchestrator.submit(response)
+
+            # THEN
+            assert applied.wait(timeout=5)
+            assert orchestrator.running
+        finally:
+            orchestrator.stop()
+
+        apply.assert_called_once_with(response)
+        assert not orchestrator.running
+
+    def test_heartbeat_is_not_blocked(self) -> None:
+        # GIVEN
+        applying = Event()
+        release = Event()
+
+        def slow_apply(response: Any) -> None:
+            applying.set()
+            release.wait(timeout=5)
+
+        apply = MagicMock(side_effect=slow_apply)
+        orchestrator = SessionOrchestrator(apply=apply, wakeup=Event())
+        orchestrator.start()
+        orchestrator.submit(_response(["session-1"]))
+        assert applying.wait(timeout=5)
+
+        # WHEN
+        # Responses keep arriving while the first one is being applied
+        orchestrator.submit(_response(["session-1", "session-2"], {"session-1": ["action-1"]}))
+        orchestrator.submit(_response(["session-2", "session-3"], {"session-2": ["action-2"]}))
+        release.set()
+        orchestrator.stop()
+
+        # THEN
+        # Only the latest response is applied, with the cancelations of the one that it replaced
+        assert apply.call_count == 2
+        applied = apply.call_args.args[0]
+        assert list(applied["assignedSessions"]) == ["session-2", "session-3"]
+        assert applied["cancelSessionActions"] == {
+            "session-1": ["action-1"],
+            "session-2": ["action-2"],
+        }
+
+    def test_merges_cancelations_of_same_session(self) -> None:
+        # GIVEN
+        apply = MagicMock()
+        orchestrator = SessionOrchestrator(apply=apply, wakeup=Event())
+        orchestrator.submit(_response(["session-1"], {"session-1": ["action-1", "action-2"]}))
+        orchestrator.submit(_response(["session-1"], {"session-1": ["action-2", "action-3"]}))
+
+        # WHEN
+        orchestrator.start()
+        orchestrator.stop()
+
+        # THEN
+        apply.assert_called_once()
+        assert apply.call_args.args[0]["cancelSessionActions"] == {
+            "session-1": ["action-1", "action-2", "action-3"]
+        }
+
+    def test_check_raises_apply_error(self) -> None:
+        # GIVEN
+        error = Exception("failed")
+        wakeup = Event()
+        orchestrator = SessionOrchestrator(apply=MagicMock(side_effect=error), wakeup=wakeup)
+        orchestrator.check()
+        orchestrator.start()
+
+        # WHEN
+        orchestrator.submit(_response(["session-1"]))
+
+        # THEN
+        assert wakeup.wait(timeout=5)
+        with pytest.raises(Exception) as raise_ctx:
+            orchestrator.check()
+        assert raise_ctx.value is error
+        orchestrator.stop()
+
+    def test_refetches_stale_assignment(self) -> None:
+        # GIVEN
+        apply = MagicMock()
+        wakeup = Event()
+        orchestrator = SessionOrchestrator(apply=apply, wakeup=wakeup)
+        fresh_response = _response(["session-2"])
+
+        with patch.object(orchestrator_mod, "monotonic", side_effect=[0.0, 120.0, 121.0, 122.0]):
+            orchestrator.submit(_response(["session-1"], {"session-1": ["action-1"]}))
+
+            # WHEN
+            orchestrator.start()
+
+            # THEN
+            # The stale response is not applied and a new one is requested
+            assert wakeup.wait(timeout=5)
+            apply.assert_not_called()
+
+            orchestrator.submit(fresh_response)
+            orchestrator.stop()
+
+        # The new response is applied with the cancelations of the stale one
+        apply.assert_called_once()
+        applied = apply.call_args.args[0]
+        assert list(applied["assignedSessions"]) == ["session-2"]
+        assert applied["cancelSessionActions"] == {"session-1": ["action-1"]}
+
+    def test_does_not_apply_stale_assignment_when_stopping(self) -> None:
+        # GIVEN
+        apply = MagicMock()
+        orchestrator = SessionOrchestrator(apply=apply, wakeup=Event())
+
+        with patch.object(orchestrator_mod, "monotonic", side_effect=[0.0, 120.0]):
+            orchestrator.submit(_response(["session-1"]))
+
+            # WHEN
+            orchestrator.start()
+            orchestrator.stop()
+
+        # THEN
+        apply.assert_not_called()
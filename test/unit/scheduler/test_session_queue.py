@@ -426,6 +426,57 @@ class TestCancelAll:
             )
 
 
+class TestReplace:
+    """Tests for SessionActionQueue.replace()"""
+
+    @staticmethod
+    def _task_run(action_id: str) -> TaskRunAction:
+        return TaskRunAction(
+            sessionActionId=action_id,
+            actionType="TASK_RUN",
+            taskId="taskId",
+            stepId="stepId",
+            parameters={},
+        )
+
+    def test_does_not_requeue_dequeued_action(self, session_queue: SessionActionQueue) -> None:
+        """Tests that an action that has been dequeued is not queued again by a response that was
+        received before the service learned that it completed"""
+
+        # GIVEN
+        session_queue.replace(actions=[self._task_run("action-1"), self._task_run("action-2")])
+        dequeued = session_queue.dequeue()
+        assert dequeued is not None and dequeued.id == "action-1"
+
+        # WHEN
+        session_queue.replace(
+            actions=[
+                self._task_run("action-1"),
+                self._task_run("action-2"),
+                self._task_run("action-3"),
+            ]
+        )
+
+        # THEN
+        assert [entry.definition["sessionActionId"] for entry in session_queue._actions] == [
+            "action-2",
+            "action-3",
+        ]
+        assert "action-1" not in session_queue._actions_by_id
+
+    def test_does_not_requeue_canceled_action(self, session_queue: SessionActionQueue) -> None:
+        # GIVEN
+        session_queue.replace(actions=[self._task_run("action-1"), self._task_run("action-2")])
+        session_queue.cancel_all()
+
+        # WHEN
+        session_queue.replace(actions=[self._task_run("action-1"), self._task_run("action-2")])
+
+        # THEN
+        assert session_queue.is_empty()
+        assert session_queue._actions_by_id == {}
+
+
 class TestIdentifiers:
     @pytest.mark.parametrize(
         argnames=("queue_entries", "expected_identifiers"),
@@ -533,3 +584,65 @@ class TestIdentifiers:
 
         # THEN
         assert identifiers == expected_identifiers
+
+
+class TestJobAttachmentsSyncPosition:
+    @pytest.fixture
+    def step_dependencies_entry(self) -> SyncInputJobAttachmentsStepDependenciesQueueEntry:
+        return SyncInputJobAttachmentsStepDependenciesQueueEntry(
+            Mock(),  # cancel event
+            SyncInputJobAttachmentsActionBoto(
+                sessionActionId="sync-step",
+                actionType="SYNC_INPUT_JOB_ATTACHMENTS",
+                stepId="step-2",
+            ),
+        )
+
+    @pytest.fixture
+    def job_entry(self) -> SyncInputJobAttachmentsQueueEntry:
+        return SyncInputJobAttachmentsQueueEntry(
+            Mock(),  # cancel event
+            SyncInputJobAttachmentsActionBoto(
+                sessionActionId="sync-job",
+                actionType="SYNC_INPUT_JOB_ATTACHMENTS",
+            ),
+        )
+
+    def test_job_attachments_sync_position(
+        self,
+        session_queue: SessionActionQueue,
+        step_dependencies_entry: SyncInputJobAttachmentsStepDependenciesQueueEntry,
+        job_entry: SyncInputJobAttachmentsQueueEntry,
+    ) -> None:
+        # GIVEN
+        session_queue._actions = [
+            EnvironmentQueueEntry(
+                Mock(),  # cancel event
+                EnvironmentAction(
+                    sessionActionId="env", actionType="ENV_ENTER", environmentId="envid"
+                ),
+            ),
+            step_dependencies_entry,
+            job_entry,
+        ]
+
+        # WHEN
+        position = session_queue.job_attachments_sync_position()
+
+        # THEN
+        # Syncing a step's dependencies does not sync the job's inputs
+        assert position == 2
+
+    def test_no_job_attachments_sync(
+        self,
+        session_queue: SessionActionQueue,
+        step_dependencies_entry: SyncInputJobAttachmentsStepDependenciesQueueEntry,
+    ) -> None:
+        # GIVEN
+        session_queue._actions = [step_dependencies_entry]
+
+        # WHEN
+        position = session_queue.job_attachments_sync_position()
+
+        # THEN
+        assert position is None
@@ -1,6 +1,8 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
 from typing import Generator, Optional, cast
 from unittest.mock import MagicMock, patch
 
@@ -25,10 +27,12 @@ from openjd.sessions import PosixSessionUser, WindowsSessionUser, SessionUser
 
 import pytest
 import os
+import time
 
 from deadline_worker_agent.api_models import (
     Attachments,
     BatchGetJobEntityResponse,
+    EntityError,
     EntityIdentifier,
     EnvironmentDetails as EnvironmentDetailsBoto,
     EnvironmentDetailsData,
@@ -50,6 +54,7 @@ from deadline_worker_agent.sessions.job_entities import (
     JobAttachmentDetails,
     JobDetails,
     JobEntities,
+    JobEntityRequestCoalescer,
     StepDetails,
 )
 from deadline_worker_agent.sessions.job_entities.job_details import (
@@ -745,10 +750,24 @@ class TestCaching:
             for id in job_ids
         ]
         expected_batches = [request[i : i + 5] for i in range(0, request_size, 5)]
-        mock_batch_get_job_entity.return_value = {
-            "entities": [],
-            "errors": [],
-        }
+
+        def batch_get_job_entity(*, identifiers: list[JobDetailsIdentifier], **kwargs) -> dict:
+            # Fail every requested entity so that none of them are requested again
+            return {
+                "entities": [],
+                "errors": [
+                    {
+                        "jobDetails": {
+                            "jobId": identifier["jobDetails"]["jobId"],
+                            "code": "ResourceNotFoundException",
+                            "message": "not found",
+                        }
+                    }
+                    for identifier in identifiers
+                ],
+            }
+
+        mock_batch_get_job_entity.side_effect = batch_get_job_entity
 
         # WHEN
         job_entities.cache_entities(request)
@@ -797,3 +816,278 @@ class TestCaching:
         # THEN
         job_entities.environment_details(environment_id=environment_id)
         mock_batch_get_job_entity.assert_called_once()
+
+
+class TestJobEntityRequestCoalescer:
+    @pytest.fixture
+    def coalescer(self, deadline_client: MagicMock) -> JobEntityRequestCoalescer:
+        return JobEntityRequestCoalescer(
+            deadline_client=deadline_client,
+            farm_id="farm-id",
+            fleet_id="fleet-id",
+            worker_id="worker-id",
+        )
+
+    @staticmethod
+    def _job_details_identifier(job_id: str) -> EntityIdentifier:
+        return JobDetailsIdentifier({"jobDetails": {"jobId": job_id}})
+
+    @staticmethod
+    def _respond(*, identifiers: list[EntityIdentifier], **kwargs) -> BatchGetJobEntityResponse:
+        """Responds with job details for every requested job"""
+        return {
+            "entities": [
+                JobDetailsBoto(
+                    {
+                        "jobDetails": cast(
+                            JobDetailsData, {"jobId": identifier["jobDetails"]["jobId"]}  # type: ignore[typeddict-item]
+                        )
+                    }
+                )
+                for identifier in identifiers
+            ],
+            "errors": [],
+        }
+
+    def test_concurrent_requests_are_merged(self, coalescer: JobEntityRequestCoalescer) -> None:
+        # GIVEN
+        first_request_started = Event()
+        release_first_request = Event()
+        requested_batches: list[list[str]] = []
+
+        def batch_get_job_entity(*, identifiers: list[EntityIdentifier], **kwargs):
+            requested_batches.append(
+                [identifier["jobDetails"]["jobId"] for identifier in identifiers]  # type: ignore[typeddict-item]
+            )
+            if len(requested_batches) == 1:
+                first_request_started.set()
+                release_first_request.wait()
+            return self._respond(identifiers=identifiers)
+
+        with patch.object(
+            job_entities_mod, "batch_get_job_entity", side_effect=batch_get_job_entity
+        ):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                # WHEN
+                first = executor.submit(coalescer.request, [self._job_details_identifier("job-1")])
+                first_request_started.wait()
+                # While the first request is in flight, three sessions ask for overlapping jobs
+                others = [
+                    executor.submit(
+                        coalescer.request,
+                        [self._job_details_identifier(job_id) for job_id in job_ids],
+                    )
+                    for job_ids in (["job-1", "job-2"], ["job-2", "job-3"], ["job-3"])
+                ]
+                # Wait for the others to be queued before releasing the first request
+                while len(coalescer._queue) < 2:
+                    time.sleep(0.01)
+                release_first_request.set()
+                results = [first.result()] + [future.result() for future in others]
+
+        # THEN
+        assert requested_batches == [["job-1"], ["job-2", "job-3"]]
+        assert [[record.data for record in records] for records in results] == [
+            [{"jobId": "job-1"}],
+            [{"jobId": "job-1"}, {"jobId": "job-2"}],
+            [{"jobId": "job-2"}, {"jobId": "job-3"}],
+            [{"jobId": "job-3"}],
+        ]
+        assert coalescer._pending == {}
+
+    def test_entities_of_different_jobs_are_distinct(
+        self, coalescer: JobEntityRequestCoalescer
+    ) -> None:
+        # GIVEN
+        identifiers: list[EntityIdentifier] = [
+            StepDetailsIdentifier({"stepDetails": {"jobId": "job-1", "stepId": "step-1"}}),
+            StepDetailsIdentifier({"stepDetails": {"jobId": "job-2", "stepId": "step-1"}}),
+        ]
+        response: BatchGetJobEntityResponse = {
+            "entities": [
+                StepDetailsBoto(
+                    {
+                        "stepDetails": {
+                            "jobId": "job-2",
+                            "stepId": "step-1",
+                            "schemaVersion": "jobtemplate-2023-09",
+                            "template": {},
+                        }
+                    }
+                ),
+            ],
+            "errors": [
+                {
+                    "stepDetails": {
+                        "jobId": "job-1",
+                        "stepId": "step-1",
+                        "code": "ResourceNotFoundException",
+                        "message": "not found",
+                    }
+                }
+            ],
+        }
+
+        with patch.object(
+            job_entities_mod, "batch_get_job_entity", return_value=response
+        ) as mock_batch_get_job_entity:
+            # WHEN
+            records = coalescer.request(identifiers)
+
+        # THEN
+        mock_batch_get_job_entity.assert_called_once()
+        assert records[0].data is None
+        assert records[0].error is not None
+        assert records[0].error["code"] == "ResourceNotFoundException"
+        assert records[1].data is not None
+        assert records[1].data["jobId"] == "job-2"
+        assert records[1].error is None
+
+    def test_unrecoverable_error_leaves_records_empty(
+        self, coalescer: JobEntityRequestCoalescer
+    ) -> None:
+        # GIVEN
+        with patch.object(
+            job_entities_mod,
+            "batch_get_job_entity",
+            side_effect=job_entities_mod.DeadlineRequestUnrecoverableError(Exception("denied")),
+        ):
+            # WHEN
+            records = coalescer.request([self._job_details_identifier("job-1")])
+
+        # THEN
+        assert records[0].data is None
+        assert records[0].error is None
+
+    def test_unexpected_error_is_raised_to_every_waiter(
+        self, coalescer: JobEntityRequestCoalescer
+    ) -> None:
+        # GIVEN
+        error = ValueError("malformed response")
+        responses = iter([error, None])
+
+        def batch_get_job_entity(**kwargs) -> BatchGetJobEntityResponse:
+            if (response := next(responses)) is not None:
+                raise response
+            return self._respond(**kwargs)
+
+        with patch.object(
+            job_entities_mod, "batch_get_job_entity", side_effect=batch_get_job_entity
+        ):
+            # WHEN
+            with pytest.raises(ValueError) as raised:
+                coalescer.request([self._job_details_identifier("job-1")])
+            records = coalescer.request([self._job_details_identifier("job-1")])
+
+        # THEN
+        assert raised.value is error
+        # Failed requests are not remembered
+        assert records[0].data == {"jobId": "job-1"}
+
+    @staticmethod
+    def _max_payload_size_exceeded(job_id: str) -> EntityError:
+        return cast(
+            EntityError,
+            {
+                "jobDetails": {
+                    "jobId": job_id,
+                    "code": "MaxPayloadSizeExceeded",
+                    "message": "payload too large",
+                }
+            },
+        )
+
+    def test_rerequests_entities_left_out_of_merged_response(
+        self, coalescer: JobEntityRequestCoalescer
+    ) -> None:
+        # GIVEN
+        requested_batches: list[list[str]] = []
+
+        def batch_get_job_entity(
+            *, identifiers: list[EntityIdentifier], **kwargs
+        ) -> BatchGetJobEntityResponse:
+            job_ids = [identifier["jobDetails"]["jobId"] for identifier in identifiers]  # type: ignore[typeddict-item]
+            requested_batches.append(job_ids)
+            # Only the first entity fits in each response. The merged response reports
+            # MaxPayloadSizeExceeded for the others, and the next one leaves them out.
+            response = self._respond(identifiers=identifiers[:1])
+            if len(requested_batches) == 1:
+                response["errors"] = [
+                    self._max_payload_size_exceeded(job_id) for job_id in job_ids[1:]
+                ]
+            return response
+
+        with patch.object(
+            job_entities_mod, "batch_get_job_entity", side_effect=batch_get_job_entity
+        ):
+            # WHEN
+            records = coalescer.request(
+                [self._job_details_identifier(job_id) for job_id in ("job-1", "job-2", "job-3")]
+            )
+
+        # THEN
+        assert requested_batches == [["job-1", "job-2", "job-3"], ["job-2", "job-3"], ["job-3"]]
+        assert [record.data for record in records] == [
+            {"jobId": "job-1"},
+            {"jobId": "job-2"},
+            {"jobId": "job-3"},
+        ]
+        assert all(record.error is None for record in records)
+
+    def test_requests_entities_on_their_own_when_merged_request_makes_no_progress(
+        self, coalescer: JobEntityRequestCoalescer
+    ) -> None:
+        # GIVEN
+        requested_batches: list[list[str]] = []
+
+        def batch_get_job_entity(
+            *, identifiers: list[EntityIdentifier], **kwargs
+        ) -> BatchGetJobEntityResponse:
+            job_ids = [identifier["jobDetails"]["jobId"] for identifier in identifiers]  # type: ignore[typeddict-item]
+            requested_batches.append(job_ids)
+            if len(identifiers) > 1:
+                return {
+                    "entities": [],
+                    "errors": [self._max_payload_size_exceeded(job_id) for job_id in job_ids],
+                }
+            return self._respond(identifiers=identifiers)
+
+        with patch.object(
+            job_entities_mod, "batch_get_job_entity", side_effect=batch_get_job_entity
+        ):
+            # WHEN
+            records = coalescer.request(
+                [self._job_details_identifier(job_id) for job_id in ("job-1", "job-2")]
+            )
+
+        # THEN
+        assert requested_batches == [["job-1", "job-2"], ["job-1"], ["job-2"]]
+        assert [record.data for record in records] == [{"jobId": "job-1"}, {"jobId": "job-2"}]
+
+    def test_job_entities_share_coalescer(
+        self,
+        coalescer: JobEntityRequestCoalescer,
+        deadline_client: MagicMock,
+        job_id: str,
+    ) -> None:
+        # GIVEN
+        job_entities = JobEntities(
+            farm_id="farm-id",
+            fleet_id="fleet-id",
+            worker_id="worker-id",
+            job_id=job_id,
+            deadline_client=deadline_client,
+            windows_credentials_resolver=None,
+            job_run_as_user_override=None,
+            request_coalescer=coalescer,
+        )
+        identifier = self._job_details_identifier(job_id)
+
+        with patch.object(coalescer, "request", wraps=coalescer.request) as mock_request:
+            with patch.object(job_entities_mod, "batch_get_job_entity", side_effect=self._respond):
+                # WHEN
+                job_entities.cache_entities([identifier])
+
+        # THEN
+        mock_request.assert_called_once_with([identifier])
+        assert job_entities._entity_record_map[job_id].data == {"jobId": job_id}
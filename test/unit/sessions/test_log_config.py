@@ -1,8 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from __future__ import annotations
+from datetime import timedelta
 from pathlib import Path
-from typing import cast
+from typing import Generator, cast
 from unittest.mock import MagicMock, patch
 import logging
 
@@ -11,7 +12,11 @@ import pytest
 from deadline_worker_agent.api_models import (
     LogConfiguration as BotoLogConfiguration,
 )
-from deadline_worker_agent.sessions.log_config import LogConfiguration, LogProvisioningError
+from deadline_worker_agent.sessions.log_config import (
+    LogConfiguration,
+    LogProvisioningError,
+    RepeatedLineSuppressor,
+)
 import deadline_worker_agent.sessions.log_config as log_config_mod
 
 
@@ -114,6 +119,83 @@ class TestLogConfiguration:
                 set_formatter_mock: MagicMock = local_file_handler.setFormatter
                 set_formatter_mock.assert_called_once_with(formatter)
 
+    @pytest.mark.parametrize(
+        argnames=("compression", "max_bytes"),
+        argvalues=(
+            pytest.param(True, None, id="compressed"),
+            pytest.param(False, 1000, id="rotated"),
+            pytest.param(True, 1000, id="compressed-and-rotated"),
+        ),
+    )
+    def test_create_local_file_handler_async(
+        self,
+        compression: bool,
+        max_bytes: int | None,
+        tmp_path: Path,
+    ) -> None:
+        """Tests that compressed or rotated local session logs are written by an
+        AsyncRotatingFileHandler"""
+
+        # GIVEN
+        session_log_file = tmp_path / "session-log.log.gz"
+        log_config = LogConfiguration.from_boto(
+            loggers=[],
+            log_configuration=BotoLogConfiguration(
+                logDriver="awslogs",
+                options={},
+                parameters={},
+            ),
+            session_log_file=session_log_file,
+            session_log_file_compression=compression,
+            session_log_file_max_bytes=max_bytes,
+        )
+
+        with patch.object(log_config_mod, "AsyncRotatingFileHandler") as mock_handler_cls:
+            # WHEN
+            handler = log_config.create_local_file_handler()
+
+        # THEN
+        mock_handler_cls.assert_called_once_with(
+            filename=session_log_file,
+            compress=compression,
+            max_bytes=max_bytes,
+            backup_count=log_config_mod.SESSION_LOCAL_LOG_BACKUP_COUNT,
+        )
+        assert handler is mock_handler_cls.return_value
+
+    @pytest.mark.parametrize(argnames="log_packing_window_ms", argvalues=(None, 100))
+    def test_create_remote_handler_packing_window(
+        self,
+        log_packing_window_ms: int | None,
+    ) -> None:
+        """Tests that the log packing window is passed to the CloudWatchHandler"""
+
+        # GIVEN
+        log_config = LogConfiguration.from_boto(
+            loggers=[],
+            log_configuration=BotoLogConfiguration(
+                logDriver="awslogs",
+                options={"logGroupName": "lg", "logStreamName": "ls"},
+                parameters={},
+            ),
+            session_log_file=None,
+            log_packing_window_ms=log_packing_window_ms,
+        )
+        boto_session = MagicMock()
+
+        with patch.object(log_config_mod, "CloudWatchHandler") as mock_handler_cls:
+            # WHEN
+            handler = log_config.create_remote_handler(boto_session=boto_session)
+
+        # THEN
+        mock_handler_cls.assert_called_once_with(
+            log_group_name="lg",
+            log_stream_name="ls",
+            logs_client=boto_session.client.return_value,
+            packing_window_ms=log_packing_window_ms,
+        )
+        assert handler is mock_handler_cls.return_value
+
     @pytest.mark.parametrize(
         argnames="log_provision_error_msg",
         argvalues=(
@@ -152,3 +234,216 @@ class TestLogConfiguration:
 
         # THEN
         assert raise_ctx.value.message == log_provision_error_msg
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def test_logger() -> Generator[logging.Logger, None, None]:
+    logger = logging.getLogger("deadline_worker_agent.test.log_config")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+class TestRepeatedLineSuppressor:
+    """Tests for the RepeatedLineSuppressor class"""
+
+    @pytest.fixture
+    def handler(self, test_logger: logging.Logger) -> _ListHandler:
+        handler = _ListHandler()
+        test_logger.addHandler(handler)
+        return handler
+
+    @pytest.fixture
+    def suppressor(self, handler: _ListHandler) -> RepeatedLineSuppressor:
+        suppressor = RepeatedLineSuppressor(
+            handler=handler, threshold=2, summary_interval=timedelta(hours=1)
+        )
+        handler.addFilter(suppressor)
+        return suppressor
+
+    def test_collapses_run_of_similar_lines(
+        self,
+        test_logger: logging.Logger,
+        handler: _ListHandler,
+        suppressor: RepeatedLineSuppressor,
+    ) -> None:
+        # GIVEN
+        lines = [f"Rendering {i}% [{'=' * i}>{' ' * (100 - i)}]" for i in range(101)]
+
+        # WHEN
+        for line in lines:
+            test_logger.info(line)
+        test_logger.info("Render complete")
+
+        # THEN
+        assert handler.messages == [
+            lines[0],
+            lines[1],
+            "... 98 similar lines suppressed",
+            lines[100],
+            "Render complete",
+        ]
+
+    def test_passes_dissimilar_lines(
+        self,
+        test_logger: logging.Logger,
+        handler: _ListHandler,
+        suppressor: RepeatedLineSuppressor,
+    ) -> None:
+        # GIVEN
+        lines = ["Loading scene", "Loading textures", "Rendering", "Rendering"]
+
+        # WHEN
+        for line in lines:
+            test_logger.info(line)
+
+        # THEN
+        assert handler.messages == lines
+
+    def test_summarizes_periodically(
+        self,
+        test_logger: logging.Logger,
+        handler: _ListHandler,
+    ) -> None:
+        # GIVEN
+        handler.addFilter(
+            RepeatedLineSuppressor(handler=handler, threshold=1, summary_interval=timedelta(0))
+        )
+
+        # WHEN
+        for i in range(3):
+            test_logger.info("frame %d", i)
+
+        # THEN
+        # Every suppressed line is due for a summary, so none are dropped
+        assert handler.messages == ["frame 0", "frame 1", "frame 2"]
+
+    def test_summary_uses_record_times(
+        self,
+        test_logger: logging.Logger,
+        handler: _ListHandler,
+    ) -> None:
+        # GIVEN
+        handler.addFilter(
+            RepeatedLineSuppressor(
+                handler=handler, threshold=1, summary_interval=timedelta(seconds=10)
+            )
+        )
+        records = [
+            test_logger.makeRecord(
+                test_logger.name, logging.INFO, __file__, 1, f"frame {i}", (), None
+            )
+            for i in range(6)
+        ]
+        for i, record in enumerate(records):
+            record.created = 1000 + i * 4
+
+        # WHEN
+        for record in records:
+            test_logger.handle(record)
+
+        # THEN
+        assert handler.messages == [
+            "frame 0",
+            "... 2 similar lines suppressed",
+            "frame 3",
+        ]
+        # The rest of the run is still pending
+        assert "frame 5" not in handler.messages
+
+    def test_flush_ends_run(
+        self,
+        test_logger: logging.Logger,
+        handler: _ListHandler,
+        suppressor: RepeatedLineSuppressor,
+    ) -> None:
+        # GIVEN
+        for i in range(5):
+            test_logger.info("frame %d", i)
+
+        # WHEN
+        suppressor.flush()
+        suppressor.flush()
+
+        # THEN
+        assert handler.messages == [
+            "frame 0",
+            "frame 1",
+            "... 2 similar lines suppressed",
+            "frame 4",
+        ]
+
+    def test_formats_large_counts(
+        self,
+        test_logger: logging.Logger,
+        handler: _ListHandler,
+        suppressor: RepeatedLineSuppressor,
+    ) -> None:
+        # GIVEN
+        for i in range(1237):
+            test_logger.info("frame %d", i)
+
+        # WHEN
+        suppressor.flush()
+
+        # THEN
+        assert "... 1,234 similar lines suppressed" in handler.messages
+
+    def test_threshold_must_be_positive(self) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            RepeatedLineSuppressor(handler=MagicMock(), threshold=0)
+
+
+def test_log_session_suppresses_repeated_lines(
+    test_logger: logging.Logger,
+    tmp_path: Path,
+) -> None:
+    # GIVEN
+    remote_handler = _ListHandler()
+    log_config = LogConfiguration.from_boto(
+        loggers=[test_logger],
+        log_configuration=BotoLogConfiguration(
+            logDriver="awslogs",
+            options={
+                "logGroupName": "lg",
+                "logStreamName": "ls",
+            },
+            parameters={
+                "interval": "15",
+            },
+        ),
+        session_log_file=tmp_path / "session.log",
+        repeated_line_threshold=1,
+    )
+
+    with patch.object(log_config, "create_remote_handler", return_value=remote_handler):
+        # WHEN
+        with log_config.log_session(
+            queue_id="queue-1234",
+            job_id="job-1234",
+            session_id="some-session",
+            boto_session=MagicMock(),
+        ):
+            for i in range(4):
+                test_logger.info("frame %d", i)
+
+    # THEN
+    expected = ["frame 0", "... 2 similar lines suppressed", "frame 3"]
+    assert remote_handler.messages == expected
+    assert [
+        line.split(" ", 3)[3] for line in (tmp_path / "session.log").read_text().splitlines()
+    ] == expected
+    assert remote_handler.filters == []
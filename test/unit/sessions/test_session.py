@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 from datetime import datetime, timedelta
-from pathlib import PurePosixPath, PureWindowsPath
+from pathlib import Path, PurePosixPath, PureWindowsPath
 from threading import Event, RLock
 from types import TracebackType
 from typing import Generator, Iterable, Literal, Optional
@@ -32,6 +32,7 @@ from openjd.sessions import (
 )
 
 from deadline_worker_agent.api_models import EnvironmentAction, TaskRunAction
+from deadline_worker_agent.job_attachments import CachingAssetSync
 from deadline_worker_agent.sessions import Session
 import deadline_worker_agent.sessions.session as session_mod
 from deadline_worker_agent.sessions.session import (
@@ -439,6 +440,48 @@ class TestSessionInit:
         else:
             assert not mock_openjd_session_cls.call_args.kwargs.get("path_mapping_rules", False)
 
+    @pytest.mark.parametrize(
+        argnames=("session_root_dir", "expected_root_dir"),
+        argvalues=(
+            pytest.param(
+                None,
+                session_mod.DEFAULT_POSIX_OPENJD_SESSION_DIR if os.name == "posix" else None,
+                id="default",
+            ),
+            pytest.param(Path("/mnt/nvme0/sessions"), Path("/mnt/nvme0/sessions"), id="placed"),
+        ),
+    )
+    def test_uses_session_root_dir(
+        self,
+        job_details: JobDetails,
+        mock_openjd_session_cls: MagicMock,
+        session_action_queue: MagicMock,
+        action_update_callback: MagicMock,
+        action_update_lock: MagicMock,
+        session_root_dir: Path | None,
+        expected_root_dir: Path | None,
+    ) -> None:
+        """Ensure that the working directory is created in the directory that the Session was
+        placed in, or in the default directory for the platform"""
+        # WHEN
+        Session(
+            id="session-1",
+            asset_sync=None,
+            job_details=job_details,
+            os_user=None,
+            queue=session_action_queue,
+            queue_id="queue-1",
+            job_id="job-1",
+            session_root_dir=session_root_dir,
+            action_update_callback=action_update_callback,
+            action_update_lock=action_update_lock,
+        )
+
+        # THEN
+        assert (
+            mock_openjd_session_cls.call_args.kwargs["session_root_directory"] == expected_root_dir
+        )
+
     @pytest.mark.parametrize(
         "env",
         [
@@ -1921,6 +1964,51 @@ class TestSessionCleanup:
         # THEN
         openjd_session_cleanup.assert_called_once_with()
 
+    @pytest.mark.skipif(os.name != "posix", reason="Working directories are discarded on POSIX")
+    @pytest.mark.parametrize(argnames="retain_session_dir", argvalues=(False, True))
+    def test_discards_working_dir(
+        self,
+        job_details: JobDetails,
+        os_user: SessionUser | None,
+        mock_openjd_session_cls: MagicMock,
+        mock_openjd_session: MagicMock,
+        session_action_queue: MagicMock,
+        action_update_callback: MagicMock,
+        action_update_lock: MagicMock,
+        retain_session_dir: bool,
+    ) -> None:
+        """Tests that the working directory is left to the session directory janitor to delete
+        in the background, unless it is retained"""
+        # GIVEN
+        janitor = MagicMock()
+        session = Session(
+            id="session-1",
+            asset_sync=None,
+            job_details=job_details,
+            os_user=os_user,
+            queue=session_action_queue,
+            queue_id="queue-1",
+            job_id="job-1",
+            retain_session_dir=retain_session_dir,
+            session_dir_janitor=janitor,
+            action_update_callback=action_update_callback,
+            action_update_lock=action_update_lock,
+        )
+
+        with patch.object(session, "_monitor_action", return_value=[]):
+            # WHEN
+            session._cleanup()
+
+        # THEN
+        assert mock_openjd_session_cls.call_args.kwargs["retain_working_dir"] is True
+        mock_openjd_session.cleanup.assert_called_once_with()
+        if retain_session_dir:
+            janitor.discard.assert_not_called()
+        else:
+            janitor.discard.assert_called_once_with(
+                mock_openjd_session.working_directory, os_user=os_user
+            )
+
     @pytest.fixture()
     def mock_asset_sync(self, session: Session) -> Generator[MagicMock, None, None]:
         with patch.object(session, "_asset_sync") as mock_asset_sync:
@@ -1971,6 +2059,153 @@ class TestSessionCleanup:
         )
 
 
+class TestSessionInputPrefetch:
+    """Tests for prefetching the job's input files in the background"""
+
+    @pytest.fixture
+    def caching_asset_sync(
+        self,
+        session: Session,
+        session_action_queue: MagicMock,
+        job_attachment_details: JobAttachmentDetails,
+    ) -> MagicMock:
+        caching_asset_sync = MagicMock(spec=CachingAssetSync)
+        session._asset_sync = caching_asset_sync
+        session._job_attachments_prefetch = True
+        session_action_queue.job_attachments_sync_position.return_value = 1
+        session_action_queue._job_entities.job_attachment_details.return_value = (
+            job_attachment_details
+        )
+        return caching_asset_sync
+
+    def test_prefetches_when_sync_is_queued_behind_other_actions(
+        self,
+        session: Session,
+        caching_asset_sync: MagicMock,
+        mock_openjd_session: MagicMock,
+        queue_id: str,
+    ) -> None:
+        # WHEN
+        session._start_input_prefetch()
+        assert session._prefetch_thread is not None
+        session._prefetch_thread.join(timeout=5)
+
+        # THEN
+        caching_asset_sync.prefetch_inputs.assert_called_once_with(
+            s3_settings=ANY,
+            attachments=ANY,
+            queue_id=queue_id,
+            job_id="job-1234",
+            session_dir=mock_openjd_session.working_directory,
+            storage_profiles_path_mapping_rules={},
+            cancel=session._prefetch_cancel,
+        )
+
+        # WHEN
+        session._start_input_prefetch()
+
+        # THEN
+        # The inputs are only prefetched once per session
+        caching_asset_sync.prefetch_inputs.assert_called_once()
+
+    @pytest.mark.parametrize(
+        argnames=("enabled", "sync_position"),
+        argvalues=(
+            pytest.param(False, 1, id="disabled"),
+            pytest.param(True, None, id="no-sync-queued"),
+            pytest.param(True, 0, id="sync-is-next"),
+        ),
+    )
+    def test_does_not_prefetch(
+        self,
+        session: Session,
+        caching_asset_sync: MagicMock,
+        session_action_queue: MagicMock,
+        enabled: bool,
+        sync_position: int | None,
+    ) -> None:
+        # GIVEN
+        session._job_attachments_prefetch = enabled
+        session_action_queue.job_attachments_sync_position.return_value = sync_position
+
+        # WHEN
+        session._start_input_prefetch()
+
+        # THEN
+        assert session._prefetch_thread is None
+        caching_asset_sync.prefetch_inputs.assert_not_called()
+
+    def test_does_not_prefetch_without_caching_asset_sync(
+        self,
+        session: Session,
+        session_action_queue: MagicMock,
+    ) -> None:
+        # GIVEN
+        session._job_attachments_prefetch = True
+        session_action_queue.job_attachments_sync_position.return_value = 1
+
+        # WHEN
+        session._start_input_prefetch()
+
+        # THEN
+        assert session._prefetch_thread is None
+
+    def test_prefetch_failure_is_logged(
+        self,
+        session: Session,
+        caching_asset_sync: MagicMock,
+    ) -> None:
+        # GIVEN
+        caching_asset_sync.prefetch_inputs.side_effect = Exception("access denied")
+
+        # WHEN
+        with patch.object(session_mod, "logger") as logger_mock:
+            session._prefetch_inputs(caching_asset_sync)
+
+        # THEN
+        logger_mock.info.assert_called_once()
+        assert "access denied" in logger_mock.info.call_args.args[0].msg
+
+    def test_sync_asset_inputs_stops_prefetch(
+        self,
+        session: Session,
+        caching_asset_sync: MagicMock,
+        job_attachment_details: JobAttachmentDetails,
+    ) -> None:
+        # GIVEN
+        prefetch_thread = MagicMock()
+        session._prefetch_thread = prefetch_thread
+        manager = MagicMock()
+        manager.attach_mock(prefetch_thread.join, "join")
+        manager.attach_mock(caching_asset_sync.sync_inputs, "sync_inputs")
+        caching_asset_sync.sync_inputs.return_value = (SummaryStatistics(), [])
+
+        # WHEN
+        session.sync_asset_inputs(  # type: ignore
+            cancel=Event(),
+            job_attachment_details=job_attachment_details,
+        )
+
+        # THEN
+        assert session._prefetch_cancel.is_set()
+        assert [c[0] for c in manager.mock_calls] == ["join", "sync_inputs"]
+
+    def test_cleanup_stops_prefetch(
+        self,
+        session: Session,
+    ) -> None:
+        # GIVEN
+        prefetch_thread = MagicMock()
+        session._prefetch_thread = prefetch_thread
+
+        # WHEN
+        session._cleanup()
+
+        # THEN
+        assert session._prefetch_cancel.is_set()
+        prefetch_thread.join.assert_called_once_with()
+
+
 class TestSessionStartAction:
     """Tests for Session._start_action()"""
 
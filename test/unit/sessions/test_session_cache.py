@@ -0,0 +1,180 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import os
+import stat
+import sys
+
+import pytest
+
+from openjd.sessions import PosixSessionUser
+
+from deadline_worker_agent.sessions.session_cache import SessionCache
+import deadline_worker_agent.sessions.session_cache as session_cache_mod
+
+QUEUE_1 = "queue-11111111111111111111111111111111"
+QUEUE_2 = "queue-22222222222222222222222222222222"
+
+
+def _write(path: Path, size: int, last_used: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (last_used, last_used))
+    if path.parent.parent.name.startswith("queue-"):
+        os.utime(path.parent, (last_used, last_used))
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SessionCache:
+    return SessionCache(root_dir=tmp_path / "cache", max_size_bytes=100)
+
+
+class TestSessionCache:
+    def test_max_size_must_be_positive(self, tmp_path: Path) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            SessionCache(root_dir=tmp_path, max_size_bytes=0)
+
+    def test_prepare_queue_dir(self, cache: SessionCache) -> None:
+        # WHEN
+        queue_dir = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=None)
+
+        # THEN
+        assert queue_dir == cache.root_dir / QUEUE_1
+        assert queue_dir.is_dir()
+        # Preparing it again re-uses the directory
+        assert cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=None) == queue_dir
+
+    @pytest.mark.parametrize("queue_id", ["..", "queue-1/..", "", "job-1"])
+    def test_prepare_queue_dir_rejects_invalid_queue_id(
+        self, cache: SessionCache, queue_id: str
+    ) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            cache.prepare_queue_dir(queue_id=queue_id, os_user=None)
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+    def test_prepare_queue_dir_for_job_user(self, cache: SessionCache) -> None:
+        # GIVEN
+        os_user = MagicMock(spec=PosixSessionUser)
+        os_user.group = "job-group"
+        os_user.is_process_user.return_value = False
+
+        with patch.object(session_cache_mod.shutil, "chown") as chown_mock:
+            # WHEN
+            queue_dir = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=os_user)
+
+        # THEN
+        chown_mock.assert_called_once_with(queue_dir, group="job-group")
+        # Files created by the job user are owned by the group, which the agent is a member of
+        assert stat.S_IMODE(queue_dir.stat().st_mode) == 0o2770
+        assert stat.S_IMODE(cache.root_dir.stat().st_mode) == 0o711
+
+    def test_evicts_least_recently_used(self, cache: SessionCache) -> None:
+        # GIVEN
+        queue_1 = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=None)
+        queue_2 = cache.prepare_queue_dir(queue_id=QUEUE_2, os_user=None)
+        _write(queue_1 / "oldest" / "file", size=40, last_used=1000)
+        _write(queue_2 / "older", size=40, last_used=2000)
+        _write(queue_1 / "newest" / "file", size=40, last_used=3000)
+
+        # WHEN
+        evicted_bytes = cache.evict()
+
+        # THEN
+        assert evicted_bytes == 40
+        assert not (queue_1 / "oldest").exists()
+        assert (queue_2 / "older").exists()
+        assert (queue_1 / "newest" / "file").exists()
+        assert sorted(p.name for p in queue_1.iterdir()) == ["newest"]
+
+    def test_recently_read_entry_is_kept(self, cache: SessionCache) -> None:
+        # GIVEN
+        queue_1 = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=None)
+        _write(queue_1 / "read", size=60, last_used=1000)
+        _write(queue_1 / "unread", size=60, last_used=2000)
+        os.utime(queue_1 / "read", (3000, 1000))
+
+        # WHEN
+        cache.evict()
+
+        # THEN
+        assert (queue_1 / "read").exists()
+        assert not (queue_1 / "unread").exists()
+
+    def test_does_not_evict_queue_in_use(self, cache: SessionCache) -> None:
+        # GIVEN
+        queue_1 = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=None)
+        queue_2 = cache.prepare_queue_dir(queue_id=QUEUE_2, os_user=None)
+        _write(queue_1 / "oldest", size=60, last_used=1000)
+        _write(queue_2 / "newest", size=60, last_used=2000)
+        cache.acquire(queue_id=QUEUE_1)
+
+        # WHEN
+        cache.evict()
+
+        # THEN
+        assert (queue_1 / "oldest").exists()
+        assert not (queue_2 / "newest").exists()
+
+        # WHEN
+        cache.release(queue_id=QUEUE_1)
+        _write(queue_2 / "newest", size=60, last_used=2000)
+        cache.evict()
+
+        # THEN
+        assert not (queue_1 / "oldest").exists()
+
+    def test_removes_incomplete_evictions(self, cache: SessionCache) -> None:
+        # GIVEN
+        queue_1 = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=None)
+        _write(queue_1 / ".evicted-0123" / "file", size=1, last_used=3000)
+        _write(queue_1 / "entry", size=1, last_used=1000)
+
+        # WHEN
+        cache.evict()
+
+        # THEN
+        assert sorted(p.name for p in queue_1.iterdir()) == ["entry"]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Job users are removed with sudo on POSIX")
+    def test_removes_as_job_user(self, cache: SessionCache) -> None:
+        # GIVEN
+        os_user = MagicMock(spec=PosixSessionUser)
+        os_user.user = "job-user"
+        os_user.group = "job-group"
+        os_user.is_process_user.return_value = False
+        with patch.object(session_cache_mod.shutil, "chown"):
+            queue_1 = cache.prepare_queue_dir(queue_id=QUEUE_1, os_user=os_user)
+        _write(queue_1 / "entry", size=200, last_used=1000)
+
+        with patch.object(session_cache_mod, "run") as run_mock:
+            # WHEN
+            cache.evict()
+
+        # THEN
+        run_mock.assert_called_once()
+        assert run_mock.call_args.args[0][:5] == ["sudo", "-u", "job-user", "-i", "rm"]
+        # Whatever the job user did not remove is removed by the agent
+        assert list(queue_1.iterdir()) == []
+
+    def test_start_and_stop(self, cache: SessionCache) -> None:
+        # GIVEN
+        with patch.object(cache, "evict") as evict_mock:
+            with patch.object(session_cache_mod, "_EVICTION_INTERVAL_SECONDS", 0.01):
+                # WHEN
+                cache.start()
+                thread = cache._thread
+                assert thread is not None
+                thread.join(timeout=0.2)
+                cache.stop()
+            thread.join(timeout=5)
+
+        # THEN
+        assert not thread.is_alive()
+        assert evict_mock.call_count > 0
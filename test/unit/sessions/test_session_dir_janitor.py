@@ -0,0 +1,217 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import os
+import sys
+import time
+
+import pytest
+
+from openjd.sessions import PosixSessionUser
+
+from deadline_worker_agent.sessions.session_dir_janitor import SessionDirJanitor
+import deadline_worker_agent.sessions.session_dir_janitor as janitor_mod
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def _session_dir(root_dir: Path, name: str, *, size: int, age_seconds: float) -> Path:
+    session_dir = root_dir / name
+    (session_dir / "nested").mkdir(parents=True)
+    (session_dir / "nested" / "file").write_bytes(b"x" * size)
+    last_modified = time.time() - age_seconds
+    os.utime(session_dir, (last_modified, last_modified))
+    return session_dir
+
+
+@pytest.fixture
+def root_dir(tmp_path: Path) -> Path:
+    root_dir = tmp_path / "sessions"
+    root_dir.mkdir()
+    return root_dir
+
+
+class TestSessionDirJanitor:
+    @pytest.mark.parametrize(
+        argnames=("max_age_seconds", "max_size_bytes"),
+        argvalues=((0, None), (None, 0), (-1, None)),
+    )
+    def test_budget_must_be_positive(
+        self, root_dir: Path, max_age_seconds: float | None, max_size_bytes: int | None
+    ) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            SessionDirJanitor(
+                root_dirs=[root_dir], max_age_seconds=max_age_seconds, max_size_bytes=max_size_bytes
+            )
+
+    def test_discard(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[])
+        session_dir = _session_dir(root_dir, "session-1abc", size=10, age_seconds=0)
+
+        # WHEN
+        janitor.discard(session_dir, os_user=None)
+
+        # THEN
+        # The directory is moved out of the way immediately...
+        assert [p.name for p in root_dir.iterdir()] == [".deleting-session-1abc"]
+        assert janitor.root_dirs == [root_dir]
+
+        # WHEN
+        deleted = janitor.collect()
+
+        # THEN
+        # ...and deleted later
+        assert deleted == 1
+        assert list(root_dir.iterdir()) == []
+
+    def test_discard_deletes_when_move_fails(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir])
+        session_dir = _session_dir(root_dir, "session-1abc", size=10, age_seconds=0)
+
+        with patch.object(Path, "rename", side_effect=OSError("busy")):
+            # WHEN
+            janitor.discard(session_dir, os_user=None)
+
+        # THEN
+        assert list(root_dir.iterdir()) == []
+
+    def test_keeps_retained_dirs_without_budget(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir])
+        session_dir = _session_dir(root_dir, "session-1abc", size=10, age_seconds=365 * DAY_SECONDS)
+
+        # WHEN
+        deleted = janitor.collect()
+
+        # THEN
+        assert deleted == 0
+        assert session_dir.exists()
+
+    def test_deletes_retained_dirs_older_than_max_age(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir], max_age_seconds=7 * DAY_SECONDS)
+        old = _session_dir(root_dir, "session-old", size=10, age_seconds=8 * DAY_SECONDS)
+        new = _session_dir(root_dir, "session-new", size=10, age_seconds=1 * DAY_SECONDS)
+
+        # WHEN
+        deleted = janitor.collect()
+
+        # THEN
+        assert deleted == 1
+        assert not old.exists()
+        assert new.exists()
+        assert [p.name for p in root_dir.iterdir()] == ["session-new"]
+
+    def test_deletes_oldest_retained_dirs_over_max_size(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir], max_size_bytes=100)
+        oldest = _session_dir(root_dir, "session-oldest", size=60, age_seconds=3 * DAY_SECONDS)
+        older = _session_dir(root_dir, "session-older", size=60, age_seconds=2 * DAY_SECONDS)
+        newest = _session_dir(root_dir, "session-newest", size=30, age_seconds=1 * DAY_SECONDS)
+
+        # WHEN
+        deleted = janitor.collect()
+
+        # THEN
+        assert deleted == 1
+        assert not oldest.exists()
+        assert older.exists()
+        assert newest.exists()
+
+    def test_never_deletes_active_or_recent_dirs(self, root_dir: Path, tmp_path: Path) -> None:
+        # GIVEN
+        other_root_dir = tmp_path / "scratch"
+        other_root_dir.mkdir()
+        janitor = SessionDirJanitor(root_dirs=[root_dir], max_size_bytes=1)
+        active = _session_dir(other_root_dir, "session-active", size=10, age_seconds=DAY_SECONDS)
+        recent = _session_dir(root_dir, "session-recent", size=10, age_seconds=60)
+        inactive = _session_dir(other_root_dir, "session-done", size=10, age_seconds=DAY_SECONDS)
+        janitor._active_session_dirs = lambda: [active]
+
+        # WHEN
+        janitor.collect()
+
+        # THEN
+        assert active.exists()
+        assert recent.exists()
+        # The directories of active Sessions are searched for retained directories as well
+        assert not inactive.exists()
+        assert janitor.root_dirs == [root_dir, other_root_dir]
+
+    def test_deletes_incomplete_deletions(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir])
+        _session_dir(root_dir, ".deleting-session-1abc", size=10, age_seconds=0)
+
+        # WHEN
+        deleted = janitor.collect()
+
+        # THEN
+        assert deleted == 1
+        assert list(root_dir.iterdir()) == []
+
+    def test_throttles_deletion(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir])
+        session_dir = root_dir / ".deleting-session-1abc"
+        session_dir.mkdir()
+        for i in range(5):
+            (session_dir / str(i)).touch()
+
+        with (
+            patch.object(janitor_mod, "_REMOVE_BATCH_SIZE", 2),
+            patch.object(janitor._stop, "wait", return_value=False) as wait_mock,
+        ):
+            # WHEN
+            janitor.collect()
+
+        # THEN
+        wait_mock.assert_called_with(janitor_mod._REMOVE_PAUSE_SECONDS)
+        assert list(root_dir.iterdir()) == []
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Job users are removed with sudo on POSIX")
+    def test_discard_removes_as_job_user(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir])
+        session_dir = _session_dir(root_dir, "session-1abc", size=10, age_seconds=0)
+        os_user = MagicMock(spec=PosixSessionUser)
+        os_user.user = "job-user"
+        os_user.is_process_user.return_value = False
+        janitor.discard(session_dir, os_user=os_user)
+
+        with patch.object(janitor_mod, "run") as run_mock:
+            # WHEN
+            janitor.collect()
+
+        # THEN
+        run_mock.assert_called_once()
+        command = run_mock.call_args.args[0]
+        assert command[:4] == ["sudo", "-u", "job-user", "-i"]
+        assert command[-3:] == ["rm", "-rf", str(root_dir / ".deleting-session-1abc")]
+        # Whatever the job user did not remove is removed by the agent
+        assert list(root_dir.iterdir()) == []
+
+    def test_start_and_stop(self, root_dir: Path) -> None:
+        # GIVEN
+        janitor = SessionDirJanitor(root_dirs=[root_dir])
+        active_session_dirs = MagicMock(return_value=[])
+        with patch.object(janitor, "collect") as collect_mock:
+            # WHEN
+            janitor.start(active_session_dirs=active_session_dirs)
+            thread = janitor._thread
+            assert thread is not None
+            thread.join(timeout=0.2)
+            janitor.stop()
+            thread.join(timeout=5)
+
+        # THEN
+        assert not thread.is_alive()
+        collect_mock.assert_called_once_with()
+        assert janitor._active_session_dirs is active_session_dirs
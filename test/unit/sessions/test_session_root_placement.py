@@ -0,0 +1,163 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+import sys
+
+import pytest
+
+from deadline_worker_agent.sessions.session_root_placement import (
+    SessionRootPlacementPolicy,
+    SessionRootPlacer,
+)
+import deadline_worker_agent.sessions.session_root_placement as placement_mod
+
+
+@pytest.fixture
+def root_dirs(tmp_path: Path) -> list[Path]:
+    root_dirs = [tmp_path / "small", tmp_path / "large"]
+    for root_dir in root_dirs:
+        root_dir.mkdir()
+    return root_dirs
+
+
+def _disk_usage(free_bytes: dict[Path, int]):
+    return lambda path: SimpleNamespace(free=free_bytes[Path(path)])
+
+
+def _io_counters(**total_bytes: int) -> dict[str, SimpleNamespace]:
+    return {
+        device: SimpleNamespace(read_bytes=device_bytes, write_bytes=0)
+        for device, device_bytes in total_bytes.items()
+    }
+
+
+class TestSessionRootPlacer:
+    def test_requires_root_dirs(self) -> None:
+        # THEN
+        with pytest.raises(ValueError):
+            # WHEN
+            SessionRootPlacer(root_dirs=[], policy=SessionRootPlacementPolicy.ROUND_ROBIN)
+
+    def test_round_robin(self, root_dirs: list[Path]) -> None:
+        # GIVEN
+        placer = SessionRootPlacer(
+            root_dirs=root_dirs, policy=SessionRootPlacementPolicy.ROUND_ROBIN
+        )
+
+        # WHEN
+        chosen = [placer.choose() for _ in range(4)]
+
+        # THEN
+        assert chosen == [root_dirs[0], root_dirs[1], root_dirs[0], root_dirs[1]]
+
+    def test_most_free_space(self, root_dirs: list[Path]) -> None:
+        # GIVEN
+        small, large = root_dirs
+        placer = SessionRootPlacer(
+            root_dirs=root_dirs, policy=SessionRootPlacementPolicy.MOST_FREE_SPACE
+        )
+
+        with patch.object(
+            placement_mod.shutil, "disk_usage", side_effect=_disk_usage({small: 10, large: 1000})
+        ):
+            # WHEN
+            chosen = [placer.choose() for _ in range(2)]
+
+        # THEN
+        assert chosen == [large, large]
+
+    def test_spreads_equal_candidates(self, root_dirs: list[Path]) -> None:
+        # GIVEN
+        placer = SessionRootPlacer(
+            root_dirs=root_dirs, policy=SessionRootPlacementPolicy.MOST_FREE_SPACE
+        )
+
+        with patch.object(
+            placement_mod.shutil,
+            "disk_usage",
+            side_effect=_disk_usage({root_dir: 100 for root_dir in root_dirs}),
+        ):
+            # WHEN
+            chosen = [placer.choose() for _ in range(2)]
+
+        # THEN
+        assert chosen == root_dirs
+
+    def test_least_io_load(self, root_dirs: list[Path]) -> None:
+        # GIVEN
+        busy, idle = root_dirs
+        placer = SessionRootPlacer(
+            root_dirs=root_dirs, policy=SessionRootPlacementPolicy.LEAST_IO_LOAD
+        )
+        samples = iter(
+            [
+                _io_counters(busy=0, idle=0),
+                _io_counters(busy=1000, idle=1),
+                _io_counters(busy=2000, idle=2),
+            ]
+        )
+        times = iter([1.0, 2.0, 3.0])
+
+        with (
+            patch.object(placement_mod.sys, "platform", "linux"),
+            patch.object(
+                placement_mod.psutil, "disk_io_counters", side_effect=lambda **_: next(samples)
+            ),
+            patch.object(placement_mod.time, "monotonic", side_effect=lambda: next(times)),
+            patch.object(
+                placement_mod, "_device_name", side_effect={busy: "busy", idle: "idle"}.get
+            ),
+        ):
+            # WHEN
+            chosen = [placer.choose() for _ in range(3)]
+
+        # THEN
+        # There is no IO rate until the counters have been sampled twice
+        assert chosen[0] == busy
+        assert chosen[1:] == [idle, idle]
+
+    @pytest.mark.skipif(sys.platform == "linux", reason="IO counters are used on Linux")
+    def test_least_io_load_falls_back_to_free_space(self, root_dirs: list[Path]) -> None:
+        # GIVEN
+        small, large = root_dirs
+        placer = SessionRootPlacer(
+            root_dirs=root_dirs, policy=SessionRootPlacementPolicy.LEAST_IO_LOAD
+        )
+
+        with patch.object(
+            placement_mod.shutil, "disk_usage", side_effect=_disk_usage({small: 10, large: 1000})
+        ):
+            # WHEN
+            chosen = placer.choose()
+
+        # THEN
+        assert chosen == large
+
+    def test_skips_missing_root_dirs(self, root_dirs: list[Path], tmp_path: Path) -> None:
+        # GIVEN
+        missing = tmp_path / "not-mounted"
+        placer = SessionRootPlacer(
+            root_dirs=[missing, *root_dirs], policy=SessionRootPlacementPolicy.ROUND_ROBIN
+        )
+
+        # WHEN
+        chosen = [placer.choose() for _ in range(2)]
+
+        # THEN
+        assert chosen == root_dirs
+
+    def test_no_root_dir_exists(self, tmp_path: Path) -> None:
+        # GIVEN
+        placer = SessionRootPlacer(
+            root_dirs=[tmp_path / "not-mounted"], policy=SessionRootPlacementPolicy.ROUND_ROBIN
+        )
+
+        # WHEN
+        chosen = placer.choose()
+
+        # THEN
+        assert chosen is None
@@ -4,6 +4,7 @@
 
 from __future__ import annotations
 from argparse import ArgumentParser
+from pathlib import Path
 
 import pytest
 import os
@@ -33,16 +34,32 @@ class TestArgumentParser:
         assert result.host_metrics_logging is None
         assert result.host_metrics_logging_interval_seconds is None
         assert result.local_session_logs is None
+        assert result.local_session_logs_compression is None
+        assert result.local_session_logs_max_size_mb is None
+        assert result.session_log_packing_window_ms is None
+        assert result.session_log_repeated_line_threshold is None
         assert result.logs_dir is None
         assert result.no_shutdown is None
         assert result.persistence_dir is None
         assert result.profile is None
         assert result.run_jobs_as_agent_user is None
         assert result.retain_session_dir is None
+        assert result.retain_session_dir_max_age_hours is None
+        assert result.retain_session_dir_max_size_gb is None
         assert result.structured_logs is None
         assert result.verbose is None
         assert result.posix_job_user is None
         assert result.windows_job_user is None
+        assert result.job_attachments_cache is None
+        assert result.job_attachments_cache_dir is None
+        assert result.job_attachments_cache_max_size_gb is None
+        assert result.job_attachments_output_journal is None
+        assert result.job_attachments_prefetch is None
+        assert result.session_cache is None
+        assert result.session_cache_dir is None
+        assert result.session_cache_max_size_gb is None
+        assert result.session_root_dirs is None
+        assert result.session_root_placement is None
 
     @pytest.mark.parametrize(
         ["farm_id"],
@@ -175,3 +192,142 @@ class TestArgumentParser:
 
         # THEN
         assert result.windows_job_user == windows_job_user
+
+    def test_job_attachments_cache(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the Job Attachments cache command-line arguments are parsed"""
+        # GIVEN
+        args = [
+            "--job-attachments-cache",
+            "--job-attachments-cache-dir",
+            "/mnt/scratch/cache",
+            "--job-attachments-cache-max-size-gb",
+            "12.5",
+        ]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.job_attachments_cache is True
+        assert result.job_attachments_cache_dir == Path("/mnt/scratch/cache")
+        assert result.job_attachments_cache_max_size_gb == 12.5
+
+    def test_local_session_logs_compression(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the local session log compression and rotation arguments are parsed"""
+        # GIVEN
+        args = [
+            "--local-session-logs-compression",
+            "--local-session-logs-max-size-mb",
+            "250",
+        ]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.local_session_logs_compression is True
+        assert result.local_session_logs_max_size_mb == 250
+
+    def test_session_log_packing_window_ms(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the --session-log-packing-window-ms argument is parsed"""
+        # GIVEN
+        args = ["--session-log-packing-window-ms", "100"]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.session_log_packing_window_ms == 100
+
+    def test_session_log_repeated_line_threshold(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the --session-log-repeated-line-threshold argument is parsed"""
+        # GIVEN
+        args = ["--session-log-repeated-line-threshold", "5"]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.session_log_repeated_line_threshold == 5
+
+    def test_job_attachments_output_journal(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the Job Attachments output journal flag is parsed"""
+        # GIVEN
+        args = ["--job-attachments-output-journal"]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.job_attachments_output_journal is True
+
+    def test_job_attachments_prefetch(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the Job Attachments prefetch flag is parsed"""
+        # GIVEN
+        args = ["--job-attachments-prefetch"]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.job_attachments_prefetch is True
+
+    def test_session_cache(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the session cache arguments are parsed"""
+        # GIVEN
+        args = [
+            "--session-cache",
+            "--session-cache-dir",
+            "/mnt/scratch/session_cache",
+            "--session-cache-max-size-gb",
+            "20",
+        ]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.session_cache is True
+        assert result.session_cache_dir == Path("/mnt/scratch/session_cache")
+        assert result.session_cache_max_size_gb == 20
+
+    def test_session_root_dirs(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the session root directories and placement policy are parsed"""
+        # GIVEN
+        args = [
+            "--session-root-dir",
+            "/mnt/nvme0/sessions",
+            "--session-root-dir",
+            "/mnt/nvme1/sessions",
+            "--session-root-placement",
+            "least-io-load",
+        ]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.session_root_dirs == [
+            Path("/mnt/nvme0/sessions"),
+            Path("/mnt/nvme1/sessions"),
+        ]
+        assert result.session_root_placement == "least-io-load"
+
+    def test_retain_session_dir_budget(self, arg_parser: ArgumentParser) -> None:
+        """Asserts that the budget of retained session directories is parsed"""
+        # GIVEN
+        args = [
+            "--retain-session-dir",
+            "--retain-session-dir-max-age-hours",
+            "168",
+            "--retain-session-dir-max-size-gb",
+            "100",
+        ]
+
+        # WHEN
+        result = arg_parser.parse_args(args, namespace=cli_args_mod.ParsedCommandLineArguments())
+
+        # THEN
+        assert result.retain_session_dir is True
+        assert result.retain_session_dir_max_age_hours == 168
+        assert result.retain_session_dir_max_size_gb == 100
@@ -38,10 +38,26 @@ def mock_worker_settings_cls() -> Generator[MagicMock, None, None]:
         "worker_logs_dir": Path("/var/log/amazon/deadline"),
         "worker_persistence_dir": Path("/var/lib/deadline"),
         "local_session_logs": None,
+        "local_session_logs_compression": False,
+        "local_session_logs_max_size_mb": None,
+        "session_log_packing_window_ms": None,
+        "session_log_repeated_line_threshold": None,
         "structured_logs": True,
         "host_metrics_logging": True,
         "host_metrics_logging_interval_seconds": 10,
         "retain_session_dir": False,
+        "retain_session_dir_max_age_hours": None,
+        "retain_session_dir_max_size_gb": None,
+        "job_attachments_cache": False,
+        "job_attachments_cache_dir": None,
+        "job_attachments_cache_max_size_gb": 50,
+        "job_attachments_output_journal": False,
+        "job_attachments_prefetch": False,
+        "session_cache": False,
+        "session_cache_dir": None,
+        "session_cache_max_size_gb": 50,
+        "session_root_dirs": None,
+        "session_root_placement": "most-free-space",
     }
 
     class FakeWorkerSettings:
@@ -399,6 +415,292 @@ class TestLoad:
         # THEN
         assert config.retain_session_dir == retain_session_dir
 
+    @pytest.mark.parametrize(
+        argnames=("job_attachments_cache", "job_attachments_cache_dir", "expected_cache_dir"),
+        argvalues=(
+            pytest.param(None, None, None, id="disabled"),
+            pytest.param(
+                True, None, Path("/var/lib/deadline/job_attachments_cache"), id="default-dir"
+            ),
+            pytest.param(True, Path("/mnt/scratch/cache"), Path("/mnt/scratch/cache"), id="dir"),
+        ),
+    )
+    def test_uses_job_attachments_cache(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        job_attachments_cache: bool | None,
+        job_attachments_cache_dir: Path | None,
+        expected_cache_dir: Path | None,
+    ) -> None:
+        # GIVEN
+        parsed_args.job_attachments_cache = job_attachments_cache
+        parsed_args.job_attachments_cache_dir = job_attachments_cache_dir
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.job_attachments_cache_dir == expected_cache_dir
+        assert config.job_attachments_cache_max_size_gb == 50
+
+    @pytest.mark.parametrize(
+        argnames=("session_cache", "session_cache_dir", "expected_cache_dir"),
+        argvalues=(
+            pytest.param(None, None, None, id="disabled"),
+            pytest.param(True, None, Path("/var/lib/deadline/session_cache"), id="default-dir"),
+            pytest.param(True, Path("/mnt/scratch/cache"), Path("/mnt/scratch/cache"), id="dir"),
+        ),
+    )
+    def test_uses_session_cache(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        session_cache: bool | None,
+        session_cache_dir: Path | None,
+        expected_cache_dir: Path | None,
+    ) -> None:
+        # GIVEN
+        parsed_args.session_cache = session_cache
+        parsed_args.session_cache_dir = session_cache_dir
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.session_cache_dir == expected_cache_dir
+        assert config.session_cache_max_size_gb == 50
+
+    @pytest.mark.parametrize(
+        argnames=("session_root_dirs", "expected_root_dirs"),
+        argvalues=(
+            pytest.param(None, [], id="default"),
+            pytest.param(
+                [Path("/mnt/nvme0/sessions"), Path("/mnt/nvme1/sessions")],
+                [Path("/mnt/nvme0/sessions"), Path("/mnt/nvme1/sessions")],
+                id="dirs",
+            ),
+        ),
+    )
+    def test_uses_session_root_dirs(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        session_root_dirs: list[Path] | None,
+        expected_root_dirs: list[Path],
+    ) -> None:
+        # GIVEN
+        parsed_args.session_root_dirs = session_root_dirs
+        parsed_args.session_root_placement = "least-io-load"
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.session_root_dirs == expected_root_dirs
+        assert config.session_root_placement == "least-io-load"
+
+    @pytest.mark.parametrize(argnames="job_attachments_output_journal", argvalues=(True, False))
+    def test_uses_job_attachments_output_journal(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        job_attachments_output_journal: bool,
+    ) -> None:
+        # GIVEN
+        parsed_args.job_attachments_output_journal = job_attachments_output_journal
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.job_attachments_output_journal is job_attachments_output_journal
+
+    @pytest.mark.parametrize(argnames="job_attachments_prefetch", argvalues=(True, False))
+    def test_uses_job_attachments_prefetch(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        job_attachments_prefetch: bool,
+    ) -> None:
+        # GIVEN
+        parsed_args.job_attachments_prefetch = job_attachments_prefetch
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.job_attachments_prefetch is job_attachments_prefetch
+
+    def test_uses_local_session_logs_compression(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+    ) -> None:
+        # GIVEN
+        parsed_args.local_session_logs_compression = True
+        parsed_args.local_session_logs_max_size_mb = 250
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.local_session_logs_compression is True
+        assert config.local_session_logs_max_size_mb == 250
+
+    @pytest.mark.parametrize(argnames="max_size_mb", argvalues=(0, -1))
+    def test_local_session_logs_max_size_must_be_positive(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        max_size_mb: float,
+    ) -> None:
+        # GIVEN
+        parsed_args.local_session_logs_max_size_mb = max_size_mb
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # THEN
+        with pytest.raises(config_mod.ConfigurationError):
+            config_mod.Configuration.load()
+
+    def test_uses_session_log_packing_window_ms(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+    ) -> None:
+        # GIVEN
+        parsed_args.session_log_packing_window_ms = 100
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.session_log_packing_window_ms == 100
+
+    @pytest.mark.parametrize(argnames="window_ms", argvalues=(0, -1))
+    def test_session_log_packing_window_must_be_positive(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        window_ms: int,
+    ) -> None:
+        # GIVEN
+        parsed_args.session_log_packing_window_ms = window_ms
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # THEN
+        with pytest.raises(config_mod.ConfigurationError):
+            config_mod.Configuration.load()
+
+    def test_uses_session_log_repeated_line_threshold(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+    ) -> None:
+        # GIVEN
+        parsed_args.session_log_repeated_line_threshold = 5
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.session_log_repeated_line_threshold == 5
+
+    @pytest.mark.parametrize(argnames="threshold", argvalues=(0, -1))
+    def test_session_log_repeated_line_threshold_must_be_positive(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        threshold: int,
+    ) -> None:
+        # GIVEN
+        parsed_args.session_log_repeated_line_threshold = threshold
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # THEN
+        with pytest.raises(config_mod.ConfigurationError):
+            config_mod.Configuration.load()
+
+    @pytest.mark.parametrize(argnames="max_size_gb", argvalues=(0, -1))
+    def test_job_attachments_cache_max_size_must_be_positive(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        max_size_gb: float,
+    ) -> None:
+        # GIVEN
+        parsed_args.job_attachments_cache_max_size_gb = max_size_gb
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # THEN
+        with pytest.raises(config_mod.ConfigurationError):
+            config_mod.Configuration.load()
+
+    @pytest.mark.parametrize(argnames="max_size_gb", argvalues=(0, -1))
+    def test_session_cache_max_size_must_be_positive(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        max_size_gb: float,
+    ) -> None:
+        # GIVEN
+        parsed_args.session_cache_max_size_gb = max_size_gb
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # THEN
+        with pytest.raises(config_mod.ConfigurationError):
+            config_mod.Configuration.load()
+
+    def test_uses_retain_session_dir_budget(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+    ) -> None:
+        # GIVEN
+        parsed_args.retain_session_dir_max_age_hours = 168
+        parsed_args.retain_session_dir_max_size_gb = 100
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # WHEN
+        config = config_mod.Configuration.load()
+
+        # THEN
+        assert config.retain_session_dir_max_age_hours == 168
+        assert config.retain_session_dir_max_size_gb == 100
+
+    @pytest.mark.parametrize(
+        argnames=("max_age_hours", "max_size_gb"),
+        argvalues=(
+            pytest.param(0, None, id="zero-age"),
+            pytest.param(-1, None, id="negative-age"),
+            pytest.param(None, 0, id="zero-size"),
+            pytest.param(None, -1, id="negative-size"),
+        ),
+    )
+    def test_retain_session_dir_budget_must_be_positive(
+        self,
+        parsed_args: config_mod.ParsedCommandLineArguments,
+        max_age_hours: float | None,
+        max_size_gb: float | None,
+    ) -> None:
+        # GIVEN
+        parsed_args.retain_session_dir_max_age_hours = max_age_hours
+        parsed_args.retain_session_dir_max_size_gb = max_size_gb
+        parsed_args.farm_id = "farm_id"
+        parsed_args.fleet_id = "fleet_id"
+
+        # THEN
+        with pytest.raises(config_mod.ConfigurationError):
+            config_mod.Configuration.load()
+
 
 class TestInit:
     """Tests for Configuration.__init__"""
@@ -973,6 +1275,13 @@ class TestInit:
 
         # Needed because MagicMock does not support gt/lt comparison
         mock_worker_settings.host_metrics_logging_interval_seconds = 10
+        mock_worker_settings.job_attachments_cache_max_size_gb = 50
+        mock_worker_settings.session_cache_max_size_gb = 50
+        mock_worker_settings.retain_session_dir_max_age_hours = None
+        mock_worker_settings.retain_session_dir_max_size_gb = None
+        mock_worker_settings.local_session_logs_max_size_mb = None
+        mock_worker_settings.session_log_packing_window_ms = None
+        mock_worker_settings.session_log_repeated_line_threshold = None
 
         # WHEN
         config = config_mod.Configuration(parsed_cli_args=parsed_args)
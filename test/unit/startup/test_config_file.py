@@ -685,6 +685,16 @@ FULL_CONFIG_FILE = """
 farm_id = "farm-1f0ece77172c441ebe295491a51cf6d5"
 fleet_id = "fleet-c4a9481caa88404fa878a7fb98f8a4dd"
 worker_persistence_dir = "/my/worker/persistence"
+job_attachments_cache = true
+job_attachments_cache_dir = "/mnt/scratch/cache"
+job_attachments_cache_max_size_gb = 100
+job_attachments_output_journal = true
+job_attachments_prefetch = true
+session_cache = true
+session_cache_dir = "/mnt/scratch/session_cache"
+session_cache_max_size_gb = 20
+session_root_dirs = ["/mnt/nvme0/sessions", "/mnt/nvme1/sessions"]
+session_root_placement = "round-robin"
 
 [aws]
 profile = "my_aws_profile_name"
@@ -694,6 +704,10 @@ allow_ec2_instance_profile = true
 verbose = true
 worker_logs_dir = "/var/log/amazon/deadline"
 local_session_logs = false
+local_session_logs_compression = true
+local_session_logs_max_size_mb = 500
+session_log_packing_window_ms = 100
+session_log_repeated_line_threshold = 5
 host_metrics_logging = true
 host_metrics_logging_interval_seconds = 1
 
@@ -702,6 +716,8 @@ run_jobs_as_agent_user = false
 posix_job_user = "user:group"
 shutdown_on_stop = false
 retain_session_dir = false
+retain_session_dir_max_age_hours = 168
+retain_session_dir_max_size_gb = 100
 
 [capabilities.amounts]
 "amount.slots" = 20
@@ -761,6 +777,19 @@ class TestConfigFileLoad:
         assert config.worker.farm_id == "farm-1f0ece77172c441ebe295491a51cf6d5"
         assert config.worker.fleet_id == "fleet-c4a9481caa88404fa878a7fb98f8a4dd"
         assert config.worker.worker_persistence_dir == Path("/my/worker/persistence")
+        assert config.worker.job_attachments_cache is True
+        assert config.worker.job_attachments_cache_dir == Path("/mnt/scratch/cache")
+        assert config.worker.job_attachments_cache_max_size_gb == 100
+        assert config.worker.job_attachments_output_journal is True
+        assert config.worker.job_attachments_prefetch is True
+        assert config.worker.session_cache is True
+        assert config.worker.session_cache_dir == Path("/mnt/scratch/session_cache")
+        assert config.worker.session_cache_max_size_gb == 20
+        assert config.worker.session_root_dirs == [
+            Path("/mnt/nvme0/sessions"),
+            Path("/mnt/nvme1/sessions"),
+        ]
+        assert config.worker.session_root_placement == "round-robin"
 
         assert config.aws.profile == "my_aws_profile_name"
         assert config.aws.allow_ec2_instance_profile is True
@@ -768,6 +797,10 @@ class TestConfigFileLoad:
         assert config.logging.verbose is True
         assert config.logging.worker_logs_dir == Path("/var/log/amazon/deadline")
         assert config.logging.local_session_logs is False
+        assert config.logging.local_session_logs_compression is True
+        assert config.logging.local_session_logs_max_size_mb == 500
+        assert config.logging.session_log_packing_window_ms == 100
+        assert config.logging.session_log_repeated_line_threshold == 5
         assert config.logging.host_metrics_logging is True
         assert config.logging.host_metrics_logging_interval_seconds == 1
 
@@ -775,6 +808,8 @@ class TestConfigFileLoad:
         assert config.os.posix_job_user == "user:group"
         assert config.os.shutdown_on_stop is False
         assert config.os.retain_session_dir is False
+        assert config.os.retain_session_dir_max_age_hours == 168
+        assert config.os.retain_session_dir_max_size_gb == 100
 
         assert config.capabilities.amounts == {"amount.slots": 20, "deadline:amount.pets": 99}
         assert config.capabilities.attributes == {
@@ -835,6 +870,16 @@ class TestConfigFileLoad:
             "farm_id": "farm-1f0ece77172c441ebe295491a51cf6d5",
             "fleet_id": "fleet-c4a9481caa88404fa878a7fb98f8a4dd",
             "worker_persistence_dir": Path("/my/worker/persistence"),
+            "job_attachments_cache": True,
+            "job_attachments_cache_dir": Path("/mnt/scratch/cache"),
+            "job_attachments_cache_max_size_gb": 100,
+            "job_attachments_output_journal": True,
+            "job_attachments_prefetch": True,
+            "session_cache": True,
+            "session_cache_dir": Path("/mnt/scratch/session_cache"),
+            "session_cache_max_size_gb": 20,
+            "session_root_dirs": [Path("/mnt/nvme0/sessions"), Path("/mnt/nvme1/sessions")],
+            "session_root_placement": "round-robin",
             # aws
             "profile": "my_aws_profile_name",
             "allow_instance_profile": True,
@@ -842,6 +887,10 @@ class TestConfigFileLoad:
             "verbose": True,
             "worker_logs_dir": Path("/var/log/amazon/deadline"),
             "local_session_logs": False,
+            "local_session_logs_compression": True,
+            "local_session_logs_max_size_mb": 500,
+            "session_log_packing_window_ms": 100,
+            "session_log_repeated_line_threshold": 5,
             "host_metrics_logging": True,
             "host_metrics_logging_interval_seconds": 1,
             # os
@@ -849,6 +898,8 @@ class TestConfigFileLoad:
             "posix_job_user": "user:group",
             "no_shutdown": True,  # opposite of 'shutdown_on_stop'
             "retain_session_dir": False,
+            "retain_session_dir_max_age_hours": 168,
+            "retain_session_dir_max_size_gb": 100,
             # capabilities
             "capabilities": Capabilities(
                 amounts={"amount.slots": 20, "deadline:amount.pets": 99},
@@ -17,6 +17,7 @@ import pytest
 from deadline_worker_agent.api_models import WorkerStatus
 from deadline_worker_agent.errors import ServiceShutdown
 from deadline_worker_agent.log_sync.loggers import ROOT_LOGGER
+from deadline_worker_agent.sessions.session_root_placement import SessionRootPlacementPolicy
 from deadline_worker_agent.startup import entrypoint as entrypoint_mod
 import deadline_worker_agent.scheduler.scheduler as scheduler_mod
 from deadline_worker_agent.startup.bootstrap import (
@@ -114,6 +115,13 @@ def mock_timed_rotating_file_handler() -> Generator[MagicMock, None, None]:
         yield mock_obj
 
 
+@pytest.fixture(autouse=True)
+def mock_session_action_update_journal() -> Generator[MagicMock, None, None]:
+    """This mocks the SessionActionUpdateJournal so that our tests don't perform actual file I/O"""
+    with patch.object(entrypoint_mod, "SessionActionUpdateJournal") as mock_obj:
+        yield mock_obj
+
+
 @pytest.fixture(autouse=True)
 def mock_worker_run() -> Generator[MagicMock, None, None]:
     """Mock the Worker.run() method which is an infinite loop"""
@@ -142,6 +150,15 @@ def configuration() -> MagicMock:
     config.sessions = True
     # Required because MagicMock does not support int comparison
     config.host_metrics_logging_interval_seconds = 10
+    config.job_attachments_cache_dir = None
+    config.session_cache_dir = None
+    config.session_root_dirs = []
+    config.retain_session_dir_max_age_hours = None
+    config.retain_session_dir_max_size_gb = None
+    config.local_session_logs_compression = False
+    config.local_session_logs_max_size_mb = None
+    config.session_log_packing_window_ms = None
+    config.session_log_repeated_line_threshold = None
     return config
 
 
@@ -310,6 +327,10 @@ def test_log_configuration(
         # Required because MagicMock does not support int comparison
         _config_mock.load().host_metrics_logging_interval_seconds = 10
         _config_mock.load().structured_logs = False
+        _config_mock.load().session_cache_dir = None
+        _config_mock.load().session_root_dirs = []
+        _config_mock.load().retain_session_dir_max_age_hours = None
+        _config_mock.load().retain_session_dir_max_size_gb = None
 
         # Mock logging.getLogger
         root_logger = MagicMock()
@@ -662,11 +683,152 @@ def test_passes_worker_logs_dir(
         worker_logs_dir=tmp_path,
         host_metrics_logging=ANY,
         host_metrics_logging_interval_seconds=ANY,
+        local_session_logs_compression=False,
+        local_session_logs_max_bytes=None,
+        session_log_packing_window_ms=None,
+        session_log_repeated_line_threshold=None,
         retain_session_dir=ANY,
+        job_attachments_cache=None,
+        job_attachments_output_journal=ANY,
+        job_attachments_prefetch=ANY,
+        session_cache=None,
+        session_root_placer=None,
+        session_dir_janitor=ANY,
+        session_action_update_journal=ANY,
         stop=ANY,
     )
 
 
+def test_passes_job_attachments_cache(
+    configuration: MagicMock,
+    tmp_path: Path,
+) -> None:
+    """Assert that the Worker is passed a Job Attachments cache when one is configured"""
+    # GIVEN
+    configuration.job_attachments_cache_dir = tmp_path
+    configuration.job_attachments_cache_max_size_gb = 1.5
+    with (
+        patch.object(entrypoint_mod, "Worker") as worker_mock,
+        patch.object(entrypoint_mod, "JobAttachmentsContentCache") as cache_cls_mock,
+    ):
+        # WHEN
+        entrypoint()
+
+    # THEN
+    cache_cls_mock.assert_called_once_with(root_dir=tmp_path, max_size_bytes=1_500_000_000)
+    worker_mock.assert_called_once()
+    assert worker_mock.call_args.kwargs["job_attachments_cache"] is cache_cls_mock.return_value
+
+
+def test_passes_session_cache(
+    configuration: MagicMock,
+    tmp_path: Path,
+) -> None:
+    """Assert that the Worker is passed a session cache when one is configured"""
+    # GIVEN
+    configuration.session_cache_dir = tmp_path
+    configuration.session_cache_max_size_gb = 2.5
+    with (
+        patch.object(entrypoint_mod, "Worker") as worker_mock,
+        patch.object(entrypoint_mod, "SessionCache") as cache_cls_mock,
+    ):
+        # WHEN
+        entrypoint()
+
+    # THEN
+    cache_cls_mock.assert_called_once_with(root_dir=tmp_path, max_size_bytes=2_500_000_000)
+    worker_mock.assert_called_once()
+    assert worker_mock.call_args.kwargs["session_cache"] is cache_cls_mock.return_value
+
+
+def test_passes_session_root_placer(
+    configuration: MagicMock,
+) -> None:
+    """Assert that the Worker is passed a session root placer when session root directories are
+    configured"""
+    # GIVEN
+    configuration.session_root_dirs = [Path("/mnt/nvme0/sessions"), Path("/mnt/nvme1/sessions")]
+    configuration.session_root_placement = "round-robin"
+    with patch.object(entrypoint_mod, "Worker") as worker_mock:
+        # WHEN
+        entrypoint()
+
+    # THEN
+    worker_mock.assert_called_once()
+    placer = worker_mock.call_args.kwargs["session_root_placer"]
+    assert placer.root_dirs == configuration.session_root_dirs
+    assert placer.policy == SessionRootPlacementPolicy.ROUND_ROBIN
+
+
+def test_passes_session_dir_janitor(
+    configuration: MagicMock,
+) -> None:
+    """Assert that the Worker is passed a session directory janitor with the retained session
+    directory budget from the configuration"""
+    # GIVEN
+    configuration.session_root_dirs = [Path("/mnt/nvme0/sessions")]
+    configuration.session_root_placement = "round-robin"
+    configuration.retain_session_dir_max_age_hours = 2
+    configuration.retain_session_dir_max_size_gb = 1.5
+    with (
+        patch.object(entrypoint_mod, "Worker") as worker_mock,
+        patch.object(entrypoint_mod, "SessionDirJanitor") as janitor_cls_mock,
+    ):
+        # WHEN
+        entrypoint()
+
+    # THEN
+    janitor_cls_mock.assert_called_once_with(
+        root_dirs=[Path("/mnt/nvme0/sessions")],
+        max_age_seconds=7200,
+        max_size_bytes=1_500_000_000,
+    )
+    worker_mock.assert_called_once()
+    assert worker_mock.call_args.kwargs["session_dir_janitor"] is janitor_cls_mock.return_value
+
+
+def test_passes_session_action_update_journal(
+    configuration: MagicMock,
+    mock_session_action_update_journal: MagicMock,
+    tmp_path: Path,
+) -> None:
+    """Assert that the Worker is passed a Session Action update journal in the Worker persistence
+    directory"""
+    # GIVEN
+    configuration.worker_persistence_dir = tmp_path
+    with patch.object(entrypoint_mod, "Worker") as worker_mock:
+        # WHEN
+        entrypoint()
+
+    # THEN
+    mock_session_action_update_journal.assert_called_once_with(
+        path=tmp_path / entrypoint_mod.SESSION_ACTION_JOURNAL_FILENAME,
+        worker_id=ANY,
+    )
+    worker_mock.assert_called_once()
+    assert (
+        worker_mock.call_args.kwargs["session_action_update_journal"]
+        is mock_session_action_update_journal.return_value
+    )
+
+
+def test_passes_local_session_logs_options(
+    configuration: MagicMock,
+) -> None:
+    """Assert that the Worker is passed the local session log compression and rotation size"""
+    # GIVEN
+    configuration.local_session_logs_compression = True
+    configuration.local_session_logs_max_size_mb = 2.5
+    with patch.object(entrypoint_mod, "Worker") as worker_mock:
+        # WHEN
+        entrypoint()
+
+    # THEN
+    worker_mock.assert_called_once()
+    assert worker_mock.call_args.kwargs["local_session_logs_compression"] is True
+    assert worker_mock.call_args.kwargs["local_session_logs_max_bytes"] == 2_500_000
+
+
 @patch.object(entrypoint_mod, "_logger")
 def test_worker_stop_exception(
     logger_mock: MagicMock,
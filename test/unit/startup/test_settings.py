@@ -173,6 +173,118 @@ FIELD_TEST_CASES: list[FieldTestCaseParams] = [
         expected_default=False,
         expected_default_factory_return_value=None,
     ),
+    FieldTestCaseParams(
+        field_name="retain_session_dir_max_age_hours",
+        expected_type=float,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="retain_session_dir_max_size_gb",
+        expected_type=float,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="local_session_logs_compression",
+        expected_type=bool,
+        expected_required=False,
+        expected_default=False,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="local_session_logs_max_size_mb",
+        expected_type=float,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_log_packing_window_ms",
+        expected_type=int,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_log_repeated_line_threshold",
+        expected_type=int,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="job_attachments_cache",
+        expected_type=bool,
+        expected_required=False,
+        expected_default=False,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="job_attachments_cache_dir",
+        expected_type=Path,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="job_attachments_cache_max_size_gb",
+        expected_type=float,
+        expected_required=False,
+        expected_default=50,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="job_attachments_output_journal",
+        expected_type=bool,
+        expected_required=False,
+        expected_default=False,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="job_attachments_prefetch",
+        expected_type=bool,
+        expected_required=False,
+        expected_default=False,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_cache",
+        expected_type=bool,
+        expected_required=False,
+        expected_default=False,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_cache_dir",
+        expected_type=Path,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_cache_max_size_gb",
+        expected_type=float,
+        expected_required=False,
+        expected_default=50,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_root_dirs",
+        expected_type=Path,
+        expected_required=False,
+        expected_default=None,
+        expected_default_factory_return_value=None,
+    ),
+    FieldTestCaseParams(
+        field_name="session_root_placement",
+        expected_type=ConstrainedStr,
+        expected_required=False,
+        expected_default="most-free-space",
+        expected_default_factory_return_value=None,
+    ),
 ]
 
 
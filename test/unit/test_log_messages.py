@@ -589,6 +589,8 @@ def test_messages_logged(
         (event.ti is None and event.type is None and event.subtype is None)
         or (event.type is not None)
     )
+    # Log events are created for every line that is logged, so they must not have an attribute dict
+    assert not hasattr(event, "__dict__")
 
 
 @pytest.mark.parametrize("message, expected_dict, expected_desc, expected_message", TEST_RECORDS)
@@ -12,7 +12,11 @@ import re
 
 from deadline_worker_agent.metrics import HostMetricsLogger
 import deadline_worker_agent.metrics as metrics_mod
-from deadline_worker_agent.log_messages import MetricsLogEvent
+from deadline_worker_agent.aws.deadline.rate_limiter import (
+    DeadlineRateLimiter,
+    DeadlineRateLimiterState,
+)
+from deadline_worker_agent.log_messages import MetricsLogEvent, MetricsLogEventSubtype
 
 
 @pytest.fixture(autouse=True)
@@ -76,6 +80,33 @@ class TestHostMetricsLogger:
         )
         mock_timer_cls.return_value.start.assert_called_once()
 
+    def test_logs_deadline_rate_limiter(self, logger: MagicMock):
+        # GIVEN
+        rate_limiter = MagicMock(spec=DeadlineRateLimiter)
+        rate_limiter.state.return_value = DeadlineRateLimiterState(
+            rate=2.5, tokens=1.7, waiting=3, throttles=4, paused_seconds=12.34
+        )
+        host_metrics_logger = HostMetricsLogger(
+            logger=logger, interval_s=1, deadline_rate_limiter=rate_limiter
+        )
+
+        with patch.object(host_metrics_logger, "_set_timer"):
+            # WHEN
+            host_metrics_logger.log_metrics()
+
+        # THEN
+        assert logger.info.call_count == 2
+        event = logger.info.call_args.args[0]
+        assert isinstance(event, MetricsLogEvent)
+        assert event.subtype == MetricsLogEventSubtype.DEADLINE_API.value
+        assert event.metrics == {
+            "requests-per-second-limit": "2.5",
+            "available-requests": "1",
+            "waiting-requests": "3",
+            "throttled-requests": "4",
+            "paused-seconds": "12.3",
+        }
+
     def test_log_metrics_sets_timer(
         self,
         host_metrics_logger: HostMetricsLogger,
@@ -6,14 +6,27 @@ from deadline_worker_agent.session_events import (
     log_before_call,
     LoggingAllowList,
     LOGGING_ALLOW_LIST,
+    PreviousRequestRecord,
 )
-from typing import Any, Dict
+from types import SimpleNamespace
+from typing import Any, Dict, Generator, cast
+from unittest.mock import patch
 import datetime
 import json
 
+import deadline_worker_agent.session_events as session_events_mod
+
 from deadline_worker_agent.log_messages import ApiRequestLogEvent, ApiResponseLogEvent
 
 
+@pytest.fixture(autouse=True)
+def api_record() -> Generator[PreviousRequestRecord, None, None]:
+    # Deduplication must not carry over between tests
+    api_record = PreviousRequestRecord()
+    with patch.object(session_events_mod, "API_RECORD", api_record):
+        yield api_record
+
+
 def test_logging_allow_list():
     # This test exists to ensure that no ACCIDENTAL changes are made to the logging allow-list
 
@@ -667,3 +680,202 @@ def test_log_after_ignore_list(
     log_before_call("after-call." + api_name, params)
 
     assert all(api_name not in msg for msg in caplog.messages)
+
+
+_SCHEDULE_URL = "https://**********.execute-api.us-west-2.amazonaws.com/2020-08-21/farms/farm-0000000000000000000000000000000/fleets/fleet-0000000000000000000000000000000/workers/worker-0000000000000000000000000000000/schedule"
+
+
+def _schedule_request(body: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "url_path": "/2020-08-21/farms/farm-0000000000000000000000000000000/fleets/fleet-0000000000000000000000000000000/workers/worker-0000000000000000000000000000000/schedule",
+        "body": json.dumps(body).encode(),
+        "url": _SCHEDULE_URL,
+    }
+
+
+def _schedule_response(assigned_sessions: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "ResponseMetadata": {
+            "RequestId": "abc878ee-32b5-44d4-885f-29071648328c",
+            "HTTPStatusCode": 200,
+        },
+        "assignedSessions": assigned_sessions,
+        "cancelSessionActions": {},
+        "updateIntervalSeconds": 15,
+    }
+
+
+def _http_response(parsed: Dict[str, Any]) -> SimpleNamespace:
+    body = {k: v for k, v in parsed.items() if k != "ResponseMetadata"}
+    return SimpleNamespace(content=json.dumps(body).encode())
+
+
+def _request_events(caplog: pytest.LogCaptureFixture) -> list[ApiRequestLogEvent]:
+    events = [record.msg for record in caplog.records]
+    assert all(isinstance(event, ApiRequestLogEvent) for event in events)
+    return cast(list[ApiRequestLogEvent], events)
+
+
+def _response_events(caplog: pytest.LogCaptureFixture) -> list[ApiResponseLogEvent]:
+    events = [record.msg for record in caplog.records]
+    assert all(isinstance(event, ApiResponseLogEvent) for event in events)
+    return cast(list[ApiResponseLogEvent], events)
+
+
+class TestDeduplication:
+    @pytest.mark.parametrize(
+        argnames="operation",
+        argvalues=("UpdateWorkerSchedule", "BatchGetJobEntity", "AssumeQueueRoleForWorker"),
+    )
+    def test_repeated_request_is_shortened(
+        self, operation: str, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        params = _schedule_request({"identifiers": [{"jobDetails": {"jobId": "job-1"}}]})
+
+        # WHEN
+        log_before_call(f"before-call.deadline.{operation}", params)
+        log_before_call(f"before-call.deadline.{operation}", dict(params))
+
+        # THEN
+        assert len(caplog.records) == 2
+        repeat = _request_events(caplog)[1]
+        assert repeat.operation == f"deadline:{operation}"
+        assert repeat.params == "(Unchanged since last request)"
+        assert repeat.deadline_resource is None
+
+    def test_changed_request_is_logged(self, caplog: pytest.LogCaptureFixture) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        event_name = "before-call.deadline.UpdateWorkerSchedule"
+        first = _schedule_request({"updatedSessionActions": {}})
+        second = _schedule_request(
+            {"updatedSessionActions": {"sessionaction-1": {"progressPercent": 50.0}}}
+        )
+
+        # WHEN
+        log_before_call(event_name, first)
+        log_before_call(event_name, second)
+        log_before_call(event_name, first)
+
+        # THEN
+        assert len(caplog.records) == 3
+
+    def test_operations_are_deduplicated_separately(self, caplog: pytest.LogCaptureFixture) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        params = _schedule_request({})
+
+        # WHEN
+        log_before_call("before-call.deadline.UpdateWorkerSchedule", params)
+        log_before_call("before-call.deadline.UpdateWorker", params)
+        log_before_call("before-call.deadline.UpdateWorkerSchedule", params)
+
+        # THEN
+        assert [(event.operation, event.params) for event in _request_events(caplog)] == [
+            ("deadline:UpdateWorkerSchedule", {}),
+            ("deadline:UpdateWorker", {}),
+            ("deadline:UpdateWorkerSchedule", "(Unchanged since last request)"),
+        ]
+
+    def test_unknown_operation_is_not_deduplicated(self, caplog: pytest.LogCaptureFixture) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        params = _schedule_request({"requestParam": "requestValue"})
+
+        # WHEN
+        log_before_call("before-call.deadline.NotAnAPI", params)
+        log_before_call("before-call.deadline.NotAnAPI", params)
+
+        # THEN
+        assert len(caplog.records) == 2
+
+    @pytest.mark.parametrize(argnames="with_http_response", argvalues=(True, False))
+    def test_repeated_response_is_marked_duplicate(
+        self, with_http_response: bool, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        event_name = "after-call.deadline.UpdateWorkerSchedule"
+        parsed = _schedule_response({"session-1": {"queueId": "queue-1", "jobId": "job-1"}})
+        kwargs = {"http_response": _http_response(parsed)} if with_http_response else {}
+
+        # WHEN
+        log_after_call(event_name, parsed, **kwargs)
+        log_after_call(event_name, parsed, **kwargs)
+
+        # THEN
+        events = _response_events(caplog)
+        assert len(events) == 2
+        assert events[0].params == {
+            "assignedSessions": {"session-1": {"queueId": "queue-1", "jobId": "job-1"}},
+            "cancelSessionActions": {},
+            "updateIntervalSeconds": 15,
+        }
+        assert events[1].params == "(Duplicate removed, see previous response)"
+        assert events[1].request_id == "abc878ee-32b5-44d4-885f-29071648328c"
+
+    def test_repeated_raw_response_is_not_redacted(self) -> None:
+        # GIVEN
+        event_name = "after-call.deadline.UpdateWorkerSchedule"
+        parsed = _schedule_response({})
+        http_response = _http_response(parsed)
+        log_after_call(event_name, parsed, http_response=http_response)
+
+        with patch.object(session_events_mod, "_redaction_plan") as mock_redaction_plan:
+            # WHEN
+            log_after_call(event_name, parsed, http_response=http_response)
+
+        # THEN
+        mock_redaction_plan.assert_not_called()
+
+    def test_response_differing_in_redacted_fields_is_marked_duplicate(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        event_name = "after-call.deadline.AssumeQueueRoleForWorker"
+
+        def response(secret: str) -> Dict[str, Any]:
+            return {
+                "ResponseMetadata": {"RequestId": "request-1", "HTTPStatusCode": 200},
+                "credentials": {"accessKeyId": "access-key", "secretAccessKey": secret},
+            }
+
+        # WHEN
+        log_after_call(event_name, response("secret-1"))
+        log_after_call(event_name, response("secret-2"))
+
+        # THEN
+        assert _response_events(caplog)[1].params == "(Duplicate removed, see previous response)"
+
+    def test_error_response_is_not_deduplicated(self, caplog: pytest.LogCaptureFixture) -> None:
+        # GIVEN
+        caplog.set_level(0)
+        event_name = "after-call.deadline.UpdateWorkerSchedule"
+        parsed = {
+            "ResponseMetadata": {"RequestId": "request-1", "HTTPStatusCode": 500},
+            "Error": {"Message": "This is a test", "Code": "InternalServerException"},
+        }
+
+        # WHEN
+        log_after_call(event_name, parsed, http_response=_http_response(parsed))
+        log_after_call(event_name, parsed, http_response=_http_response(parsed))
+
+        # THEN
+        assert [event.params for event in _response_events(caplog)] == [{}, {}]
+
+
+def test_record_keeps_one_digest_per_operation() -> None:
+    # GIVEN
+    record = PreviousRequestRecord()
+
+    # WHEN
+    for i in range(100):
+        record.is_repeat(
+            operation_name="deadline:UpdateWorkerSchedule", kind="request", digest=bytes([i])
+        )
+
+    # THEN
+    assert len(record._digests) == 1
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
 from threading import Event
 from typing import Generator
@@ -82,17 +83,22 @@ def mock_logger() -> Generator[MagicMock, None, None]:
 
 
 @pytest.fixture(autouse=True)
-def requests_put() -> Generator[MagicMock, None, None]:
-    """Mock requests.put()"""
-    with patch.object(worker_mod.requests, "put") as mock:
+def mock_imds_cls() -> Generator[MagicMock, None, None]:
+    """Mock the Ec2InstanceMetadataClient class so that no requests are made to IMDS"""
+    with patch.object(worker_mod, "Ec2InstanceMetadataClient") as mock:
         yield mock
 
 
-@pytest.fixture(autouse=True)
-def requests_get() -> Generator[MagicMock, None, None]:
-    """Mock requests.get()"""
-    with patch.object(worker_mod.requests, "get") as mock:
-        yield mock
+@pytest.fixture
+def imds_get_token(mock_imds_cls: MagicMock) -> MagicMock:
+    """Mock Ec2InstanceMetadataClient.get_token()"""
+    return mock_imds_cls.return_value.get_token
+
+
+@pytest.fixture
+def imds_get(mock_imds_cls: MagicMock) -> MagicMock:
+    """Mock Ec2InstanceMetadataClient.get()"""
+    return mock_imds_cls.return_value.get
 
 
 @pytest.fixture(autouse=True)
@@ -154,7 +160,18 @@ class TestInit:
             cleanup_session_user_processes=ANY,
             worker_persistence_dir=ANY,
             worker_logs_dir=worker_logs_dir,
+            local_session_logs_compression=False,
+            local_session_logs_max_bytes=None,
+            session_log_packing_window_ms=None,
+            session_log_repeated_line_threshold=None,
             retain_session_dir=ANY,
+            job_attachments_cache=None,
+            job_attachments_output_journal=False,
+            job_attachments_prefetch=False,
+            session_cache=None,
+            session_root_placer=None,
+            session_dir_janitor=None,
+            session_action_update_journal=None,
             stop=ANY,
         )
 
@@ -192,6 +209,19 @@ class TestRun:
 
 
 class TestMonitorEc2Shutdown:
+    @pytest.fixture(autouse=True)
+    def query_executor(self, mock_thread_pool_executor_cls: MagicMock) -> MagicMock:
+        """Runs the IMDS queries submitted by Worker._monitor_ec2_shutdown() synchronously"""
+
+        def submit(fn, *args, **kwargs) -> Future:
+            future: Future = Future()
+            future.set_result(fn(*args, **kwargs))
+            return future
+
+        executor = mock_thread_pool_executor_cls.return_value.__enter__.return_value
+        executor.submit.side_effect = submit
+        return executor
+
     @pytest.fixture
     def is_asg_terminated(self) -> bool:
         return False
@@ -372,39 +402,23 @@ class TestMonitorEc2Shutdown:
 
 
 class TestEC2MetadataQueries:
-    def test_get_imdsv2_token(self, worker: Worker, requests_put: MagicMock) -> None:
+    def test_get_imdsv2_token(self, worker: Worker, imds_get_token: MagicMock) -> None:
         # GIVEN
         fake_token = "TOKEN_FAKE_VALUE"
-        response_mock = MagicMock()
-        requests_put.return_value = response_mock
-        response_mock.status_code = 200
-        response_mock.text = fake_token
+        imds_get_token.return_value = fake_token
 
         # WHEN
         result = worker._get_ec2_metadata_imdsv2_token()
 
         # THEN
         assert result == fake_token
-        requests_put.assert_called_once_with(
-            "http://169.254.169.254/latest/api/token",
-            headers={"X-aws-ec2-metadata-token-ttl-seconds": "10"},
-        )
+        imds_get_token.assert_called_once_with()
 
-    def test_get_imdsv2_token_cannot_connect(self, worker: Worker, requests_put: MagicMock) -> None:
-        # GIVEN
-        requests_put.side_effect = worker_mod.requests.ConnectionError("Error")
-
-        # WHEN
-        result = worker._get_ec2_metadata_imdsv2_token()
-
-        # THEN
-        assert result is None
-
-    def test_get_imdsv2_token_imds_inactive(self, worker: Worker, requests_put: MagicMock) -> None:
+    def test_get_imdsv2_token_imds_unavailable(
+        self, worker: Worker, imds_get_token: MagicMock
+    ) -> None:
         # GIVEN
-        response_mock = MagicMock()
-        response_mock.status_code = 402
-        requests_put.return_value = response_mock
+        imds_get_token.return_value = None
 
         # WHEN
         result = worker._get_ec2_metadata_imdsv2_token()
@@ -423,7 +437,7 @@ class TestEC2MetadataQueries:
     def test_spot_shutdown(
         self,
         worker: Worker,
-        requests_get: MagicMock,
+        imds_get: MagicMock,
         mock_logger: MagicMock,
         action_type: str,
         is_interrupt: bool,
@@ -436,16 +450,13 @@ class TestEC2MetadataQueries:
         # See: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/spot-instance-termination-notices.html # noqa: E501
         response_mock.status_code = 200
         response_mock.text = f'{{ "action": "{action_type}", "time": "{timeout.isoformat()}Z" }}'
-        requests_get.return_value = response_mock
+        imds_get.return_value = response_mock
 
         # WHEN
         result = worker._get_spot_instance_shutdown_action_timeout(imdsv2_token=fake_token)
 
         # THEN
-        requests_get.assert_called_once_with(
-            "http://169.254.169.254/latest/meta-data/spot/instance-action",
-            headers={"X-aws-ec2-metadata-token": fake_token},
-        )
+        imds_get.assert_called_once_with("spot/instance-action", token=fake_token)
         if not is_interrupt:
             assert result is None
         else:
@@ -461,7 +472,7 @@ class TestEC2MetadataQueries:
     def test_spot_shutdown_in_past(
         self,
         worker: Worker,
-        requests_get: MagicMock,
+        imds_get: MagicMock,
         mock_logger: MagicMock,
     ) -> None:
         # GIVEN
@@ -472,7 +483,7 @@ class TestEC2MetadataQueries:
         # See: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/spot-instance-termination-notices.html # noqa: E501
         response_mock.status_code = 200
         response_mock.text = f'{{ "action": "terminate", "time": "{timeout.isoformat()}Z" }}'
-        requests_get.return_value = response_mock
+        imds_get.return_value = response_mock
 
         # WHEN
         result = worker._get_spot_instance_shutdown_action_timeout(imdsv2_token=fake_token)
@@ -484,7 +495,7 @@ class TestEC2MetadataQueries:
     def test_spot_shutdown_missing_time(
         self,
         worker: Worker,
-        requests_get: MagicMock,
+        imds_get: MagicMock,
         mock_logger: MagicMock,
     ) -> None:
         # GIVEN
@@ -493,7 +504,7 @@ class TestEC2MetadataQueries:
         # See: https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/spot-instance-termination-notices.html # noqa: E501
         response_mock.status_code = 200
         response_mock.text = '{ "action": "terminate" }'
-        requests_get.return_value = response_mock
+        imds_get.return_value = response_mock
 
         # WHEN
         result = worker._get_spot_instance_shutdown_action_timeout(imdsv2_token=fake_token)
@@ -504,9 +515,9 @@ class TestEC2MetadataQueries:
             "Missing 'time' property from ec2 metadata instance-action response"
         )
 
-    def test_spot_shutdown_cannot_connect(self, worker: Worker, requests_get: MagicMock) -> None:
+    def test_spot_shutdown_cannot_connect(self, worker: Worker, imds_get: MagicMock) -> None:
         # GIVEN
-        requests_get.side_effect = worker_mod.requests.ConnectionError("Error")
+        imds_get.return_value = None
 
         # WHEN
         result = worker._get_spot_instance_shutdown_action_timeout(imdsv2_token="token")
@@ -514,11 +525,11 @@ class TestEC2MetadataQueries:
         # THEN
         assert result is None
 
-    def test_spot_shutdown_imds_inactive(self, worker: Worker, requests_get: MagicMock) -> None:
+    def test_spot_shutdown_imds_inactive(self, worker: Worker, imds_get: MagicMock) -> None:
         # GIVEN
         response_mock = MagicMock()
         response_mock.status_code = 402
-        requests_get.return_value = response_mock
+        imds_get.return_value = response_mock
 
         # WHEN
         result = worker._get_spot_instance_shutdown_action_timeout(imdsv2_token="token")
@@ -539,7 +550,7 @@ class TestEC2MetadataQueries:
         ],
     )
     def test_asg_terminate(
-        self, worker: Worker, requests_get: MagicMock, lifecycle_state: str, expected_result: bool
+        self, worker: Worker, imds_get: MagicMock, lifecycle_state: str, expected_result: bool
     ) -> None:
         # See: https://docs.aws.amazon.com/autoscaling/ec2/userguide/retrieving-target-lifecycle-state-through-imds.html # noqa: E501
         # GIVEN
@@ -547,21 +558,18 @@ class TestEC2MetadataQueries:
         response_mock = MagicMock()
         response_mock.status_code = 200
         response_mock.text = lifecycle_state
-        requests_get.return_value = response_mock
+        imds_get.return_value = response_mock
 
         # WHEN
         result = worker._is_asg_terminated(imdsv2_token=fake_token)
 
         # THEN
         assert result == expected_result
-        requests_get.assert_called_once_with(
-            "http://169.254.169.254/latest/meta-data/autoscaling/target-lifecycle-state",
-            headers={"X-aws-ec2-metadata-token": fake_token},
-        )
+        imds_get.assert_called_once_with("autoscaling/target-lifecycle-state", token=fake_token)
 
-    def test_asg_terminate_cannot_connect(self, worker: Worker, requests_get: MagicMock) -> None:
+    def test_asg_terminate_cannot_connect(self, worker: Worker, imds_get: MagicMock) -> None:
         # GIVEN
-        requests_get.side_effect = worker_mod.requests.ConnectionError("Error")
+        imds_get.return_value = None
 
         # WHEN
         result = worker._is_asg_terminated(imdsv2_token="token")
@@ -569,11 +577,11 @@ class TestEC2MetadataQueries:
         # THEN
         assert not result
 
-    def test_asg_terminate_imds_inactive(self, worker: Worker, requests_get: MagicMock) -> None:
+    def test_asg_terminate_imds_inactive(self, worker: Worker, imds_get: MagicMock) -> None:
         # GIVEN
         response_mock = MagicMock()
         response_mock.status_code = 402
-        requests_get.return_value = response_mock
+        imds_get.return_value = response_mock
 
         # WHEN
         result = worker._is_asg_terminated(imdsv2_token="token")